@@ -0,0 +1,95 @@
+"""Measures the import time of the app's entry points with `python -X importtime` and prints the result as JSON.
+
+Usage: python -m benchmarks.import_time [module ...]
+"""
+
+import json
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+
+DEFAULT_MODULES = [
+    "src.app.main",
+    "src.app.importer",
+]
+
+HEAVY_PACKAGES = [
+    "alembic",
+    "dateutil",
+    "googleapiclient",
+    "httpx",
+    "pss_fleet_data",
+    "pydantic",
+    "pydrive2",
+    "sqlalchemy",
+    "sqlalchemy_utils",
+    "sqlmodel",
+    "yaml",
+]
+
+IMPORT_TIME_LINE_REGEX = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class ImportTimeReport:
+    module: str
+    cumulative_us: int
+    heavy_packages_loaded: list[str]
+    slowest: list[ImportTime]
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """Parses the output of `python -X importtime`.
+
+    Args:
+        output (str): The stderr output of a python process started with `-X importtime`.
+
+    Returns:
+        list[ImportTime]: One entry per imported module, in the order they've been printed.
+    """
+    result = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE_REGEX.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            result.append(ImportTime(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return result
+
+
+def measure(module: str, python_executable: Optional[str] = None, top: int = 10) -> ImportTimeReport:
+    process = subprocess.run(
+        [python_executable or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = parse_import_times(process.stderr)
+    loaded_packages = {import_time.module.split(".")[0] for import_time in import_times}
+    own_import = next((import_time for import_time in reversed(import_times) if import_time.module == module), None)
+
+    return ImportTimeReport(
+        module=module,
+        cumulative_us=own_import.cumulative_us if own_import else 0,
+        heavy_packages_loaded=sorted(loaded_packages.intersection(HEAVY_PACKAGES)),
+        slowest=sorted(import_times, key=lambda import_time: import_time.self_us, reverse=True)[:top],
+    )
+
+
+def main(modules: Iterable[str]):
+    reports = [asdict(measure(module)) for module in modules]
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_MODULES)
@@ -0,0 +1,442 @@
+"""Runs the import pipeline end to end on a synthetic corpus and prints the results as JSON.
+
+With the `fake` transport, the Google Drive client and the PSS Fleet Data API client are the fakes from `tests/fake_classes.py` with injected
+latency and errors. With the `http` transport, the real clients talk to local stand-in servers (see `benchmarks/stand_ins`), so the HTTP
+stacks, connection handling & error parsing of the clients are part of the measurement. The Collection files are tracked in a sqlite database
+and the downloads are written to a temporary folder, so only the remote services are fake. Retries wait for the same back-off as in
+production, so injected errors also cost time.
+
+Usage: python -m benchmarks.pipeline [--mode {bulk,loop}] [--transport {fake,http}] [--files N] [--file-size BYTES] [--output FILE] ...
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, redirect_stdout
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterable, Optional, Union
+from unittest import mock
+
+from pss_fleet_data import PssFleetDataClient
+
+from src.app.core.clock import Clock
+from src.app.core.config import ConfigRepository
+from src.app.core.gdrive import GoogleDriveClient
+from src.app.core.models.filesystem import FileSystem
+from src.app.core.tracing import Span
+from src.app.database.db_repository import DatabaseRepository
+from src.app.importer import tracing
+from src.app.importer.importer import Importer
+from tests.fake_classes import FakeConfig, FakeGDriveFile, FakeGoogleDriveClient, FakePssFleetDataClient
+
+from .stand_ins import (
+    ConstantLatency,
+    DriveFile,
+    DriveStandIn,
+    FaultInjector,
+    FaultProfile,
+    FleetDataApiStandIn,
+    LogNormalLatency,
+    create_private_key,
+)
+
+
+MODE_BULK = "bulk"
+MODE_LOOP = "loop"
+
+TRANSPORT_FAKE = "fake"
+TRANSPORT_HTTP = "http"
+
+CORPUS_START = datetime(2020, 1, 1)
+FILE_NAME_FORMAT = "pss-top-100_%Y%m%d-%H%M%S.json"
+
+
+@dataclass(frozen=True)
+class BenchmarkOptions:
+    mode: str = MODE_BULK
+    transport: str = TRANSPORT_FAKE
+    file_count: int = 2000
+    file_size: int = 10_000
+    size_jitter: float = 0.0
+    chunk_size: int = 250
+    download_latency: float = 0.0
+    upload_latency: float = 0.0
+    download_error_rate: float = 0.0
+    upload_error_rate: float = 0.0
+    latency_sigma: float = 0.0  # http transport only: The spread of the log-normal latencies around the median set above. 0 is constant.
+    throttle_rate: float = 0.0  # http transport only: The chance of a request to be rate-limited.
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    p50: float
+    p99: float
+    max: float
+
+
+@dataclass(frozen=True)
+class BenchmarkReport:
+    options: Any  # The options of the run, e.g. `BenchmarkOptions`
+    duration_seconds: float
+    imported_count: int
+    failed_count: int
+    bytes_imported: int
+    files_per_second: float
+    bytes_per_second: float
+    item_latency_seconds: LatencySummary
+    download_latency_seconds: LatencySummary
+    import_latency_seconds: LatencySummary
+    peak_rss_bytes: Optional[int]
+
+
+class HttpErrorResponse:
+    reason: str = "Injected error"
+    status: int = 503
+
+
+class SpanCollector:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def get_durations(self, name: str) -> list[float]:
+        return [(span.end_time_ns - span.start_time_ns) / 1e9 for span in self.spans if span.name == name]
+
+
+class SyntheticGoogleDriveClient(FakeGoogleDriveClient):
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, rng: Optional[random.Random] = None):
+        super().__init__()
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.__rng: random.Random = rng or random.Random()
+
+    def get_file_content_string(self, gdrive_file: FakeGDriveFile, encoding: str = "utf-8") -> str:
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.__rng.random() < self.error_rate:
+            import googleapiclient.errors
+            import pydrive2.files
+
+            raise pydrive2.files.ApiRequestError(googleapiclient.errors.HttpError(HttpErrorResponse(), b"{}"))
+
+        return super().get_file_content_string(gdrive_file, encoding)
+
+
+class SyntheticPssFleetDataClient(FakePssFleetDataClient):
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, rng: Optional[random.Random] = None):
+        super().__init__()
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.__rng: random.Random = rng or random.Random()
+
+    async def upload_collection(self, file_path: Union[Path, str], api_key: Optional[str] = None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.__rng.random() < self.error_rate:
+            raise ConnectionError("Injected upload error")
+
+        return await super().upload_collection(file_path, api_key=api_key)
+
+
+def create_collection_content(timestamp: datetime, size: int) -> str:
+    """Creates the contents of a Collection file of about `size` bytes. Files can't be smaller than the metadata."""
+    content = {
+        "meta": {
+            "timestamp": timestamp.isoformat(),
+            "duration": 5.0,
+            "fleet_count": 0,
+            "user_count": 0,
+            "tournament_running": False,
+            "schema_version": 9,
+            "max_tournament_battle_attempts": 6,
+        },
+        "fleets": [],
+        "users": [],
+        "padding": "",
+    }
+    padding_length = max(size - len(json.dumps(content)), 0)
+    content["padding"] = "x" * padding_length
+    return json.dumps(content)
+
+
+def create_corpus(
+    file_count: int,
+    file_size: int,
+    size_jitter: float = 0.0,
+    start: datetime = CORPUS_START,
+    rng: Optional[random.Random] = None,
+) -> list[FakeGDriveFile]:
+    """Creates one Collection file per hour, starting at `start`.
+
+    Args:
+        file_count (int): The number of files to create.
+        file_size (int): The average size of a file in bytes.
+        size_jitter (float, optional): The maximum relative deviation from `file_size`, e.g. `0.2` for +/- 20 %. Defaults to 0.0.
+        start (datetime, optional): The timestamp of the first file. Defaults to `CORPUS_START`.
+        rng (random.Random, optional): The source of the size deviations. Defaults to a new `random.Random`.
+
+    Returns:
+        list[FakeGDriveFile]: The files, ordered by timestamp.
+    """
+    rng = rng or random.Random()
+
+    result = []
+    for i in range(file_count):
+        timestamp = start + timedelta(hours=i)
+        size = int(file_size * (1 + rng.uniform(-size_jitter, size_jitter)))
+        content = create_collection_content(timestamp, size)
+        file_name = timestamp.strftime(FILE_NAME_FORMAT)
+        result.append(FakeGDriveFile(f"synthetic-{i:06d}", file_name, len(content), timestamp + timedelta(seconds=30), content))
+    return result
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Returns the `p`-th percentile (0-100) of `values` by the nearest-rank method."""
+    if not values:
+        return 0.0
+
+    sorted_values = sorted(values)
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(values: list[float]) -> LatencySummary:
+    return LatencySummary(p50=percentile(values, 50), p99=percentile(values, 99), max=max(values, default=0.0))
+
+
+async def run_benchmark(options: BenchmarkOptions, work_directory: Union[Path, str]) -> BenchmarkReport:
+    work_directory = Path(work_directory)
+    rng = random.Random(options.seed)
+    corpus = create_corpus(options.file_count, options.file_size, options.size_jitter, rng=rng)
+    config = create_config(work_directory, options.mode, options.file_count, options.chunk_size)
+
+    with ExitStack() as stack:
+        if options.transport == TRANSPORT_HTTP:
+            gdrive_client, fleet_data_client = start_stand_ins(options, corpus, config, work_directory, rng, stack)
+        else:
+            gdrive_client = SyntheticGoogleDriveClient(options.download_latency, options.download_error_rate, random.Random(rng.random()))
+            gdrive_client.files = corpus
+            fleet_data_client = SyntheticPssFleetDataClient(options.upload_latency, options.upload_error_rate, random.Random(rng.random()))
+            stack.enter_context(mock.patch("src.app.importer.importer.GoogleDriveClient", return_value=gdrive_client))
+
+        modified_before = corpus[-1].modified_date + timedelta(hours=1) if corpus else None
+        spans, duration = await run_importer(config, options.mode, gdrive_client, fleet_data_client, modified_before)
+
+    return create_report(options, spans, duration)
+
+
+def create_config(work_directory: Path, mode: str, file_count: int, chunk_size: int) -> FakeConfig:
+    """Creates the configuration of a run tracking its files in a sqlite database in `work_directory`."""
+    database_path = work_directory / "benchmark.sqlite"
+    config = FakeConfig(f"sqlite+aiosqlite:///{database_path}", f"sqlite:///{database_path}")
+    config.temp_download_folder = work_directory / "downloads"
+    config.chunk_size = chunk_size if mode == MODE_LOOP else max(file_count, 1)
+    config.chunk_target_duration = 0  # Chunks of `chunk_size` files keep runs comparable
+    config.progress_interval = 0
+    return config
+
+
+async def run_importer(
+    config: FakeConfig,
+    mode: str,
+    gdrive_client: Union[FakeGoogleDriveClient, GoogleDriveClient],
+    fleet_data_client: Union[FakePssFleetDataClient, PssFleetDataClient],
+    modified_before: Optional[datetime],
+    clock: Optional[Clock] = None,
+) -> tuple[list[Span], float]:
+    """Runs a single bulk import or the import loop up to `modified_before` on a fresh database.
+
+    In loop mode, the importer creates its own Google Drive client, so patch `GoogleDriveClient` or point `config` at a stand-in beforehand.
+
+    Returns:
+        tuple[list[Span], float]: The spans recorded and the duration of the run in seconds.
+    """
+    filesystem = FileSystem()
+    importer = Importer(config, fleet_data_client, filesystem=filesystem, clock=clock)
+    collector = SpanCollector()
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(ConfigRepository, ConfigRepository.get_config.__name__, return_value=config))
+        stack.enter_context(redirect_stdout(sys.stderr))  # The importer prints the start & end of each bulk import.
+        stack.callback(DatabaseRepository.clear_db)
+        stack.callback(tracing.TRACER.set_exporter, None)
+
+        DatabaseRepository.clear_db()
+        DatabaseRepository.get_db()
+        tracing.TRACER.set_exporter(collector)
+
+        start = perf_counter()
+        if mode == MODE_LOOP:
+            await importer.run_import_loop(modified_before=modified_before, filesystem=filesystem)
+        else:
+            await importer.run_bulk_import(gdrive_client, filesystem=filesystem)
+        duration = perf_counter() - start
+
+    return collector.spans, duration
+
+
+def start_stand_ins(
+    options: BenchmarkOptions,
+    corpus: list[FakeGDriveFile],
+    config: FakeConfig,
+    work_directory: Path,
+    rng: random.Random,
+    stack: ExitStack,
+) -> tuple[GoogleDriveClient, PssFleetDataClient]:
+    """Starts the stand-in servers, points `config` at them and creates the real clients. The servers are stopped, when `stack` closes."""
+    drive_faults = FaultProfile(
+        latency=create_latency(options.download_latency, options.latency_sigma),
+        throttle_rate=options.throttle_rate,
+        error_rate=options.download_error_rate,
+    )
+    fleet_data_api_faults = FaultProfile(
+        latency=create_latency(options.upload_latency, options.latency_sigma),
+        throttle_rate=options.throttle_rate,
+        error_rate=options.upload_error_rate,
+    )
+    drive_files = [DriveFile(file.id, file.name, file.content.encode(), file.modified_date) for file in corpus]
+    drive = stack.enter_context(DriveStandIn(drive_files, FaultInjector(drive_faults, rng.getrandbits(32))))
+    fleet_data_api = stack.enter_context(FleetDataApiStandIn(FaultInjector(fleet_data_api_faults, rng.getrandbits(32))))
+
+    config.gdrive_api_endpoint = drive.url
+    config.gdrive_project_id = "benchmark"
+    config.gdrive_private_key_id = "benchmark"
+    config.gdrive_private_key = create_private_key()
+    config.gdrive_client_email = "benchmark@benchmark.iam.gserviceaccount.com"
+    config.gdrive_client_id = "benchmark"
+    config.gdrive_service_account_file_path = str(work_directory / "service_account.json")
+    config.gdrive_settings_file_path = str(work_directory / "settings.yaml")
+    config.api_default_server_url = fleet_data_api.url.rstrip("/")
+
+    gdrive_client = GoogleDriveClient(
+        config.gdrive_project_id,
+        config.gdrive_private_key_id,
+        config.gdrive_private_key,
+        config.gdrive_client_email,
+        config.gdrive_client_id,
+        config.gdrive_scopes,
+        config.gdrive_folder_id,
+        config.gdrive_service_account_file_path,
+        config.gdrive_settings_file_path,
+        api_endpoint=config.gdrive_api_endpoint,
+    )
+    gdrive_client.initialize()
+    return gdrive_client, PssFleetDataClient(config.api_default_server_url, config.api_key)
+
+
+def create_latency(median: float, sigma: float) -> Union[ConstantLatency, LogNormalLatency]:
+    if sigma > 0 and median > 0:
+        return LogNormalLatency(median, sigma)
+    return ConstantLatency(median)
+
+
+def create_report(options: Any, spans: Iterable[Span], duration: float) -> BenchmarkReport:
+    collector = SpanCollector()
+    collector.spans = list(spans)
+
+    queue_item_spans = [span for span in collector.spans if span.name == tracing.SPAN_QUEUE_ITEM]
+    imported_spans = [span for span in queue_item_spans if span.attributes.get("state") == "imported"]
+    bytes_imported = sum(int(span.attributes.get("gdrive_file.size", 0)) for span in imported_spans)
+
+    return BenchmarkReport(
+        options=options,
+        duration_seconds=duration,
+        imported_count=len(imported_spans),
+        failed_count=len([span for span in queue_item_spans if span.attributes.get("state") == "failed"]),
+        bytes_imported=bytes_imported,
+        files_per_second=len(imported_spans) / duration if duration else 0.0,
+        bytes_per_second=bytes_imported / duration if duration else 0.0,
+        item_latency_seconds=summarize_latencies(collector.get_durations(tracing.SPAN_QUEUE_ITEM)),
+        download_latency_seconds=summarize_latencies(collector.get_durations(tracing.SPAN_DOWNLOAD)),
+        import_latency_seconds=summarize_latencies(collector.get_durations(tracing.SPAN_IMPORT)),
+        peak_rss_bytes=get_peak_rss_bytes(),
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[BenchmarkOptions, Optional[str], str]:
+    defaults = BenchmarkOptions()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pipeline", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode", choices=[MODE_BULK, MODE_LOOP], default=defaults.mode, help="Run a single bulk import or the import loop in chunks."
+    )
+    parser.add_argument(
+        "--transport",
+        choices=[TRANSPORT_FAKE, TRANSPORT_HTTP],
+        default=defaults.transport,
+        help="Call fake clients in-process or the real clients against local stand-in servers.",
+    )
+    parser.add_argument("--files", type=int, default=defaults.file_count, help="The number of files in the corpus.")
+    parser.add_argument("--file-size", type=int, default=defaults.file_size, help="The average file size in bytes.")
+    parser.add_argument("--size-jitter", type=float, default=defaults.size_jitter, help="The maximum relative deviation of a file's size.")
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="The number of files per bulk import in loop mode.")
+    parser.add_argument("--download-latency", type=float, default=defaults.download_latency, help="Seconds added to each download.")
+    parser.add_argument("--upload-latency", type=float, default=defaults.upload_latency, help="Seconds added to each upload.")
+    parser.add_argument("--download-error-rate", type=float, default=defaults.download_error_rate, help="The chance of a download attempt to fail.")
+    parser.add_argument("--upload-error-rate", type=float, default=defaults.upload_error_rate, help="The chance of an upload attempt to fail.")
+    parser.add_argument(
+        "--latency-sigma", type=float, default=defaults.latency_sigma, help="http only: The spread of log-normal latencies. 0 is constant."
+    )
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="http only: The chance of a request to be rate-limited.")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="The seed of the corpus and the injected errors.")
+    parser.add_argument("--output", help="Write the report to this file instead of stdout.")
+    parser.add_argument("--log-level", default="CRITICAL", help="The level of the importer's log messages printed to stderr.")
+    args = parser.parse_args(argv)
+
+    options = BenchmarkOptions(
+        mode=args.mode,
+        transport=args.transport,
+        file_count=args.files,
+        file_size=args.file_size,
+        size_jitter=args.size_jitter,
+        chunk_size=args.chunk_size,
+        download_latency=args.download_latency,
+        upload_latency=args.upload_latency,
+        download_error_rate=args.download_error_rate,
+        upload_error_rate=args.upload_error_rate,
+        latency_sigma=args.latency_sigma,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    return options, args.output, args.log_level
+
+
+def main(argv: Optional[list[str]] = None):
+    options, output, log_level = parse_args(argv)
+    logging.basicConfig(level=log_level.upper(), stream=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="pss_fleet_data_importer_benchmark_") as work_directory:
+        report = asyncio.run(run_benchmark(options, work_directory))
+
+    result = json.dumps(asdict(report), indent=2)
+    if output:
+        Path(output).write_text(result + "\n", encoding="utf-8")
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Records the Google Drive listing & timings of a production run and replays them through the import pipeline.
+
+`record` lists the Collection files in the configured Google Drive folder and keeps only their names, sizes and modified dates. If a trace
+file of a production run is given (see `TRACE_FILE_PATH`), the time each file took to download & to import is recorded, too. The recording
+is written as gzipped JSON with one row per file.
+
+`replay` feeds a recording to the importer with the fake clients from `tests/fake_classes.py`. Each download & upload takes as long as it
+did in production (scaled by `--time-scale`). Files without recorded timings take as long as a randomly chosen file with timings. The report
+has the same shape as the one of `benchmarks.pipeline`.
+
+Usage:
+    python -m benchmarks.replay record --output FILE [--trace-file FILE] [--modified-after ISO] [--modified-before ISO]
+    python -m benchmarks.replay replay FILE [--mode {bulk,loop}] [--time-scale X] [--modified-after ISO] [--modified-before ISO] ...
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from unittest import mock
+
+from src.app.core import utils
+from src.app.core.gdrive import GDriveFile, GoogleDriveClient
+from src.app.importer import tracing
+from tests.fake_classes import FakeGoogleDriveClient, FakePssFleetDataClient
+
+from .pipeline import MODE_BULK, MODE_LOOP, BenchmarkReport, create_collection_content, create_config, create_report, run_importer
+
+
+RECORDING_VERSION = 1
+RECORDING_FIELDS = ("name", "size", "modified_date", "download_seconds", "import_seconds")
+
+
+@dataclass(frozen=True)
+class RecordedFile:
+    name: str
+    size: int
+    modified_date: datetime
+    download_seconds: Optional[float] = None
+    import_seconds: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Recording:
+    recorded_at: datetime
+    files: tuple[RecordedFile, ...]
+
+    def between(self, modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None) -> "Recording":
+        """Returns the files modified after `modified_after` and before `modified_before`, like the importer would list them."""
+        files = tuple(
+            file
+            for file in self.files
+            if (not modified_after or file.modified_date > modified_after) and (not modified_before or file.modified_date < modified_before)
+        )
+        return replace(self, files=files)
+
+    def save(self, file_path: Union[Path, str]):
+        content = {
+            "version": RECORDING_VERSION,
+            "recorded_at": self.recorded_at.isoformat(),
+            "fields": list(RECORDING_FIELDS),
+            "files": [[file.name, file.size, file.modified_date.isoformat(), file.download_seconds, file.import_seconds] for file in self.files],
+        }
+        with gzip.open(file_path, "wt", encoding="utf-8") as fp:
+            json.dump(content, fp, separators=(",", ":"))
+
+    @staticmethod
+    def load(file_path: Union[Path, str]) -> "Recording":
+        with gzip.open(file_path, "rt", encoding="utf-8") as fp:
+            content = json.load(fp)
+
+        if content.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {content.get('version')}")
+
+        files = tuple(
+            RecordedFile(name, size, datetime.fromisoformat(modified_date), download_seconds, import_seconds)
+            for name, size, modified_date, download_seconds, import_seconds in content["files"]
+        )
+        return Recording(datetime.fromisoformat(content["recorded_at"]), files)
+
+
+@dataclass(frozen=True)
+class ReplayOptions:
+    recording: str
+    file_count: int
+    mode: str = MODE_BULK
+    chunk_size: int = 250
+    time_scale: float = 1.0
+    modified_after: Optional[str] = None
+    modified_before: Optional[str] = None
+    seed: int = 0
+
+
+class TimingProfile:
+    """The recorded durations of an operation by file name. Files without a recorded duration get the one of a random file with one."""
+
+    def __init__(self, durations: dict[str, Optional[float]], time_scale: float = 1.0, rng: Optional[random.Random] = None):
+        self.__durations: dict[str, float] = {name: seconds for name, seconds in durations.items() if seconds is not None}
+        self.__known_durations: list[float] = sorted(self.__durations.values())
+        self.__time_scale: float = time_scale
+        self.__rng: random.Random = rng or random.Random()
+
+    def get_seconds(self, name: str) -> float:
+        seconds = self.__durations.get(name)
+        if seconds is None:
+            seconds = self.__rng.choice(self.__known_durations) if self.__known_durations else 0.0
+        return seconds * self.__time_scale
+
+
+class ReplayGoogleDriveClient(FakeGoogleDriveClient):
+    """Lists the recorded files and downloads generated contents of the recorded size, taking as long as the recorded download."""
+
+    def __init__(self, files: Iterable[RecordedFile], download_timings: TimingProfile):
+        super().__init__()
+        self.files = [GDriveFile(f"replay-{i:06d}", file.name, file.size, None, file.modified_date) for i, file in enumerate(files)]
+        self.__download_timings: TimingProfile = download_timings
+
+    def get_file_content_string(self, gdrive_file: GDriveFile, encoding: str = "utf-8") -> str:
+        time.sleep(self.__download_timings.get_seconds(gdrive_file.name))
+        return create_collection_content(utils.extract_timestamp_from_gdrive_file_name(gdrive_file.name), gdrive_file.size)
+
+
+class ReplayPssFleetDataClient(FakePssFleetDataClient):
+    """Accepts uploads & updates, taking as long as the recorded import."""
+
+    def __init__(self, import_timings: TimingProfile):
+        super().__init__()
+        self.__import_timings: TimingProfile = import_timings
+
+    async def update_collection(self, collection_id: int, file_path: Union[Path, str], api_key: Optional[str] = None):
+        await asyncio.sleep(self.__import_timings.get_seconds(Path(file_path).name))
+        return await super().update_collection(collection_id, file_path, api_key=api_key)
+
+    async def upload_collection(self, file_path: Union[Path, str], api_key: Optional[str] = None):
+        await asyncio.sleep(self.__import_timings.get_seconds(Path(file_path).name))
+        return await super().upload_collection(file_path, api_key=api_key)
+
+
+def read_timings(trace_file_path: Union[Path, str]) -> tuple[dict[str, float], dict[str, float]]:
+    """Reads the time spent downloading & importing each file from a trace file written by `JsonLinesSpanExporter`.
+
+    Download times are the sum of the `download.fetch` spans of a file, so they include failed attempts, but not the back-off between them.
+
+    Returns:
+        tuple[dict[str, float], dict[str, float]]: The download & import times in seconds by file name.
+    """
+    spans: dict[str, dict] = {}
+    with open(trace_file_path, "r", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                span = json.loads(line)
+                spans[span["spanId"]] = span
+
+    file_names: dict[str, str] = {}  # By span ID of the queue item span
+    for span in spans.values():
+        if span["name"] == tracing.SPAN_QUEUE_ITEM:
+            attributes = {attribute["key"]: attribute["value"] for attribute in span["attributes"]}
+            if "gdrive_file.name" in attributes:
+                file_names[span["spanId"]] = attributes["gdrive_file.name"]["stringValue"]
+
+    download_seconds: dict[str, float] = {}
+    import_seconds: dict[str, float] = {}
+    for span in spans.values():
+        durations = {tracing.SPAN_DOWNLOAD_FETCH: download_seconds, tracing.SPAN_IMPORT: import_seconds}.get(span["name"])
+        file_name = find_file_name(span, spans, file_names)
+        if durations is None or file_name is None:
+            continue
+
+        seconds = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e9
+        durations[file_name] = durations.get(file_name, 0.0) + seconds
+
+    return download_seconds, import_seconds
+
+
+def find_file_name(span: dict, spans: dict[str, dict], file_names: dict[str, str]) -> Optional[str]:
+    """Returns the file name of the queue item span `span` descends from, if any."""
+    while span:
+        if span["spanId"] in file_names:
+            return file_names[span["spanId"]]
+        span = spans.get(span["parentSpanId"])
+    return None
+
+
+def record(
+    gdrive_client: Union[GoogleDriveClient, FakeGoogleDriveClient],
+    trace_file_path: Optional[Union[Path, str]] = None,
+    modified_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+) -> Recording:
+    """Records the files listed by `gdrive_client`. File IDs & checksums are dropped. Timings are read from `trace_file_path`, if given.
+
+    Like everywhere else in the app, modified dates are stored in UTC without timezone information.
+    """
+    download_seconds, import_seconds = read_timings(trace_file_path) if trace_file_path else ({}, {})
+
+    files = tuple(
+        RecordedFile(
+            gdrive_file.name,
+            gdrive_file.size,
+            utils.remove_timezone(gdrive_file.modified_date),
+            download_seconds.get(gdrive_file.name),
+            import_seconds.get(gdrive_file.name),
+        )
+        for gdrive_file in gdrive_client.list_files_by_modified_date(modified_after=modified_after, modified_before=modified_before)
+    )
+    return Recording(utils.get_now(), tuple(sorted(files, key=lambda file: file.modified_date)))
+
+
+async def run_replay(recording: Recording, options: ReplayOptions, work_directory: Union[Path, str]) -> BenchmarkReport:
+    rng = random.Random(options.seed)
+    download_timings = TimingProfile({file.name: file.download_seconds for file in recording.files}, options.time_scale, random.Random(rng.random()))
+    import_timings = TimingProfile({file.name: file.import_seconds for file in recording.files}, options.time_scale, random.Random(rng.random()))
+
+    gdrive_client = ReplayGoogleDriveClient(recording.files, download_timings)
+    fleet_data_client = ReplayPssFleetDataClient(import_timings)
+    config = create_config(Path(work_directory), options.mode, len(recording.files), options.chunk_size)
+
+    modified_before = recording.files[-1].modified_date + timedelta(seconds=1) if recording.files else None
+    with mock.patch("src.app.importer.importer.GoogleDriveClient", return_value=gdrive_client):
+        spans, duration = await run_importer(config, options.mode, gdrive_client, fleet_data_client, modified_before)
+
+    return create_report(options, spans, duration)
+
+
+def create_gdrive_client_from_config() -> GoogleDriveClient:
+    from src.app.core.config import ConfigRepository
+
+    configuration = ConfigRepository.get_config()
+    gdrive_client = GoogleDriveClient(
+        configuration.gdrive_project_id,
+        configuration.gdrive_private_key_id,
+        configuration.gdrive_private_key,
+        configuration.gdrive_client_email,
+        configuration.gdrive_client_id,
+        configuration.gdrive_scopes,
+        configuration.gdrive_folder_id,
+        configuration.gdrive_service_account_file_path,
+        configuration.gdrive_settings_file_path,
+        api_endpoint=configuration.gdrive_api_endpoint,
+    )
+    gdrive_client.initialize()
+    return gdrive_client
+
+
+def parse_timestamp(value: str) -> datetime:
+    return utils.remove_timezone(datetime.fromisoformat(value))
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    defaults = ReplayOptions("", 0)
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record the Google Drive listing configured via environment variables.")
+    record_parser.add_argument("--output", required=True, help="The file to write the recording to.")
+    record_parser.add_argument("--trace-file", help="A trace file of a production run to take the download & import times from.")
+
+    replay_parser = subparsers.add_parser("replay", help="Replay a recording through the import pipeline.")
+    replay_parser.add_argument("recording", help="The recording to replay.")
+    replay_parser.add_argument("--mode", choices=[MODE_BULK, MODE_LOOP], default=defaults.mode, help="Run a single bulk import or the import loop.")
+    replay_parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="The number of files per bulk import in loop mode.")
+    replay_parser.add_argument("--time-scale", type=float, default=defaults.time_scale, help="The factor applied to all recorded durations.")
+    replay_parser.add_argument("--seed", type=int, default=defaults.seed, help="The seed for choosing durations of files without recorded ones.")
+    replay_parser.add_argument("--output", help="Write the report to this file instead of stdout.")
+    replay_parser.add_argument("--log-level", default="CRITICAL", help="The level of the importer's log messages printed to stderr.")
+
+    for subparser in (record_parser, replay_parser):
+        subparser.add_argument("--modified-after", type=parse_timestamp, help="Only include files modified after this point in time.")
+        subparser.add_argument("--modified-before", type=parse_timestamp, help="Only include files modified before this point in time.")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    args = parse_args(argv)
+
+    if args.command == "record":
+        recording = record(create_gdrive_client_from_config(), args.trace_file, args.modified_after, args.modified_before)
+        recording.save(args.output)
+        print(f"Recorded {len(recording.files)} files to: {args.output}", file=sys.stderr)
+        return
+
+    logging.basicConfig(level=args.log_level.upper(), stream=sys.stderr)
+    recording = Recording.load(args.recording).between(args.modified_after, args.modified_before)
+    options = ReplayOptions(
+        recording=args.recording,
+        file_count=len(recording.files),
+        mode=args.mode,
+        chunk_size=args.chunk_size,
+        time_scale=args.time_scale,
+        modified_after=args.modified_after.isoformat() if args.modified_after else None,
+        modified_before=args.modified_before.isoformat() if args.modified_before else None,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="pss_fleet_data_importer_replay_") as work_directory:
+        report = asyncio.run(run_replay(recording, options, work_directory))
+
+    result = json.dumps(asdict(report), indent=2)
+    if args.output:
+        Path(args.output).write_text(result + "\n", encoding="utf-8")
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
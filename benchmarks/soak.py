@@ -0,0 +1,140 @@
+"""Fast-forwards the hourly import loop through months of Collection files on a virtual clock and prints the results as JSON.
+
+One file arrives in the Google Drive folder every hour, 30 seconds after its timestamp. The import loop lists the files that have arrived by
+the virtual time, imports them and sleeps until the next hour, which advances the virtual clock instead of waiting. Everything else runs in
+real time, so the report shows the real time each cycle of the loop takes (its overhead) and, in virtual time, how long files wait between
+their arrival and their import. With `--watch`, the loop polls for each file in watch mode (see `WATCH_MODE`).
+
+Usage: python -m benchmarks.soak [--days N] [--file-size BYTES] [--chunk-size N] [--watch] [--output FILE] ...
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
+from unittest import mock
+
+from src.app.core.clock import VirtualClock
+from src.app.importer import tracing
+from tests.fake_classes import FakeGoogleDriveClient, FakePssFleetDataClient
+
+from .pipeline import MODE_LOOP, LatencySummary, SpanCollector, create_config, create_corpus, run_importer, summarize_latencies
+
+
+@dataclass(frozen=True)
+class SoakOptions:
+    days: int = 30
+    file_size: int = 10_000
+    chunk_size: int = 250
+    watch: bool = False
+
+
+@dataclass(frozen=True)
+class SoakReport:
+    options: SoakOptions
+    cycle_count: int
+    imported_count: int
+    real_duration_seconds: float
+    virtual_duration_seconds: float
+    cycle_overhead_seconds: LatencySummary
+    arrival_to_import_seconds: LatencySummary
+
+
+class ArrivingGoogleDriveClient(FakeGoogleDriveClient):
+    """Only lists the files that have been modified by the time of `clock`."""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock: VirtualClock = clock
+
+    def list_files_by_modified_date(self, modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None):
+        now = self.clock.now()
+        for gdrive_file in super().list_files_by_modified_date(modified_after, modified_before):
+            if gdrive_file.modified_date <= now:
+                yield gdrive_file
+
+
+class ClockedPssFleetDataClient(FakePssFleetDataClient):
+    """Notes the time of `clock` when a Collection gets uploaded."""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock: VirtualClock = clock
+        self.uploaded_at: dict[str, datetime] = {}
+
+    async def upload_collection(self, file_path: Union[Path, str], api_key: Optional[str] = None):
+        self.uploaded_at[Path(file_path).name] = self.clock.now()
+        return await super().upload_collection(file_path, api_key=api_key)
+
+
+async def run_soak(options: SoakOptions, work_directory: Union[Path, str]) -> SoakReport:
+    corpus = create_corpus(options.days * 24, options.file_size)
+    clock = VirtualClock(corpus[0].modified_date)
+    start = clock.now()
+
+    gdrive_client = ArrivingGoogleDriveClient(clock)
+    gdrive_client.files = corpus
+    fleet_data_client = ClockedPssFleetDataClient(clock)
+    config = create_config(Path(work_directory), MODE_LOOP, len(corpus), options.chunk_size)
+    config.watch_mode = options.watch
+
+    modified_before = corpus[-1].modified_date + timedelta(hours=1)
+    with mock.patch("src.app.importer.importer.GoogleDriveClient", return_value=gdrive_client):
+        spans, duration = await run_importer(config, MODE_LOOP, gdrive_client, fleet_data_client, modified_before, clock=clock)
+
+    collector = SpanCollector()
+    collector.spans = spans
+    cycle_durations = collector.get_durations(tracing.SPAN_BULK_IMPORT)
+    arrival_to_import = [
+        (fleet_data_client.uploaded_at[gdrive_file.name] - gdrive_file.modified_date).total_seconds()
+        for gdrive_file in corpus
+        if gdrive_file.name in fleet_data_client.uploaded_at
+    ]
+
+    return SoakReport(
+        options=options,
+        cycle_count=len(cycle_durations),
+        imported_count=len(fleet_data_client.uploaded_at),
+        real_duration_seconds=duration,
+        virtual_duration_seconds=(clock.now() - start).total_seconds(),
+        cycle_overhead_seconds=summarize_latencies(cycle_durations),
+        arrival_to_import_seconds=summarize_latencies(arrival_to_import),
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[SoakOptions, Optional[str], str]:
+    defaults = SoakOptions()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.soak", description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=defaults.days, help="The number of days of hourly files to import.")
+    parser.add_argument("--file-size", type=int, default=defaults.file_size, help="The size of a file in bytes.")
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="The maximum number of files per bulk import.")
+    parser.add_argument("--watch", action="store_true", help="Poll for each file in watch mode instead of waiting for the next full hour.")
+    parser.add_argument("--output", help="Write the report to this file instead of stdout.")
+    parser.add_argument("--log-level", default="CRITICAL", help="The level of the importer's log messages printed to stderr.")
+    args = parser.parse_args(argv)
+
+    return SoakOptions(days=args.days, file_size=args.file_size, chunk_size=args.chunk_size, watch=args.watch), args.output, args.log_level
+
+
+def main(argv: Optional[list[str]] = None):
+    options, output, log_level = parse_args(argv)
+    logging.basicConfig(level=log_level.upper(), stream=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="pss_fleet_data_importer_soak_") as work_directory:
+        report = asyncio.run(run_soak(options, work_directory))
+
+    result = json.dumps(asdict(report), indent=2)
+    if output:
+        Path(output).write_text(result + "\n", encoding="utf-8")
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
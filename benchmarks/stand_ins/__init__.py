@@ -0,0 +1,42 @@
+"""Local HTTP servers standing in for Google Drive & the PSS Fleet Data API, with configurable latency & faults."""
+
+from .drive import DriveFile, DriveStandIn, WatchChannel, create_private_key
+from .faults import (
+    FAULT_CONFLICT,
+    FAULT_ERROR,
+    FAULT_THROTTLE,
+    FAULT_TIMEOUT,
+    ConstantLatency,
+    ExponentialLatency,
+    FaultInjector,
+    FaultProfile,
+    LogNormalLatency,
+    UniformLatency,
+    parse_latency,
+)
+from .fleet_data_api import FleetDataApiStandIn
+from .server import StandInServer
+
+
+__all__ = [
+    # Classes
+    ConstantLatency.__name__,
+    DriveFile.__name__,
+    DriveStandIn.__name__,
+    ExponentialLatency.__name__,
+    FaultInjector.__name__,
+    FaultProfile.__name__,
+    FleetDataApiStandIn.__name__,
+    LogNormalLatency.__name__,
+    StandInServer.__name__,
+    UniformLatency.__name__,
+    WatchChannel.__name__,
+    # Constants
+    "FAULT_CONFLICT",
+    "FAULT_ERROR",
+    "FAULT_THROTTLE",
+    "FAULT_TIMEOUT",
+    # Functions
+    create_private_key.__name__,
+    parse_latency.__name__,
+]
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import re
+import threading
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+import dateutil.parser
+
+from .faults import FAULT_ERROR, FAULT_THROTTLE, FaultInjector
+from .server import Request, Response, StandInServer
+
+
+QUERY_TERM_PATTERN = re.compile(r"^(not )?(title|name) contains '(.*)'$|^(modifiedDate|modifiedTime) ([<>]=?) '(.*)'$")
+FILES_PATH_PATTERN = re.compile(r"^/drive/(v2|v3)/files(?:/([^/]+))?$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d+)-(\d*)$")
+WATCH_PATH_PATTERN = re.compile(r"^/drive/v2/files/([^/]+)/watch$")
+CHANNELS_STOP_PATH = "/drive/v2/channels/stop"
+
+
+@dataclass(frozen=True)
+class DriveFile:
+    file_id: str
+    name: str
+    content: bytes
+    modified_date: datetime
+
+    @property
+    def md5_checksum(self) -> str:
+        return hashlib.md5(self.content).hexdigest()
+
+    def to_v2_json(self) -> dict[str, Any]:
+        return {
+            "kind": "drive#file",
+            "id": self.file_id,
+            "title": self.name,
+            "mimeType": "application/json",
+            "fileSize": str(len(self.content)),
+            "md5Checksum": self.md5_checksum,
+            "modifiedDate": format_timestamp(self.modified_date),
+        }
+
+    def to_v3_json(self) -> dict[str, Any]:
+        return {
+            "kind": "drive#file",
+            "id": self.file_id,
+            "name": self.name,
+            "mimeType": "application/json",
+            "size": str(len(self.content)),
+            "md5Checksum": self.md5_checksum,
+            "modifiedTime": format_timestamp(self.modified_date),
+        }
+
+
+@dataclass
+class WatchChannel:
+    channel_id: str
+    resource_id: str
+    address: str
+    token: Optional[str]
+    expiration: Optional[str]
+    message_count: int = 0
+
+
+class DriveStandIn(StandInServer):
+    """Stands in for the Google Drive API v2 & v3 `files.list` & `files.get` endpoints and for the OAuth 2.0 token endpoint.
+
+    It also stands in for the v2 `files.watch` & `channels.stop` endpoints. Call `notify_channels` to post a change notification to the
+    address of each open channel, like Google Drive does when a watched folder changes.
+
+    Point `GoogleDriveClient` at it via its `api_endpoint`. Access tokens are handed out without checking the signed assertion, but the
+    client still signs it, so its credentials need a real RSA key (see `create_private_key`).
+    """
+
+    def __init__(self, files: Iterable[DriveFile] = (), faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(faults, host, port)
+        self.__files: dict[str, DriveFile] = {}
+        self.__files_lock: threading.Lock = threading.Lock()
+        self.__channels: dict[str, WatchChannel] = {}
+        self.add_files(files)
+
+    @property
+    def channels(self) -> list[WatchChannel]:
+        with self.__files_lock:
+            return list(self.__channels.values())
+
+    def add_files(self, files: Iterable[DriveFile]):
+        with self.__files_lock:
+            self.__files.update((file.file_id, file) for file in files)
+
+    def notify_channels(self, resource_state: str = "update", changed: str = "children") -> list[int]:
+        """Posts a change notification to each open channel.
+
+        Returns:
+            list[int]: The HTTP status code returned for each notification.
+        """
+        with self.__files_lock:
+            channels = list(self.__channels.values())
+
+        status_codes = []
+        for channel in channels:
+            channel.message_count += 1
+            headers = {
+                "X-Goog-Channel-ID": channel.channel_id,
+                "X-Goog-Message-Number": str(channel.message_count),
+                "X-Goog-Resource-ID": channel.resource_id,
+                "X-Goog-Resource-State": resource_state,
+                "X-Goog-Changed": changed,
+            }
+            if channel.token:
+                headers["X-Goog-Channel-Token"] = channel.token
+            if channel.expiration:
+                headers["X-Goog-Channel-Expiration"] = channel.expiration
+
+            request = urllib.request.Request(channel.address, data=b"", headers=headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    status_codes.append(response.status)
+            except urllib.error.HTTPError as exc:
+                status_codes.append(exc.code)
+        return status_codes
+
+    def handle(self, request: Request, fault: Optional[str]) -> Response:
+        if request.method == "POST" and request.path == "/token":
+            return Response.json(200, {"access_token": "stand-in", "token_type": "Bearer", "expires_in": 3600})
+
+        if request.method == "POST" and request.path == CHANNELS_STOP_PATH:
+            return self.__stop_channel(request)
+
+        watch_match = WATCH_PATH_PATTERN.match(request.path)
+        if request.method == "POST" and watch_match:
+            return self.__watch_file(request, watch_match.group(1))
+
+        match = FILES_PATH_PATTERN.match(request.path)
+        if request.method != "GET" or not match:
+            return create_error_response(404, "notFound", f"Unknown endpoint: {request.method} {request.path}")
+
+        if fault == FAULT_THROTTLE:
+            return create_error_response(429, "rateLimitExceeded", "Rate Limit Exceeded")
+        if fault == FAULT_ERROR:
+            return create_error_response(503, "backendError", "Backend Error")
+
+        version, file_id = match.groups()
+        if file_id:
+            return self.__get_file(request, version, file_id)
+        return self.__list_files(request, version)
+
+    def __get_file(self, request: Request, version: str, file_id: str) -> Response:
+        file = self.__files.get(file_id)
+        if not file:
+            return create_error_response(404, "notFound", f"File not found: {file_id}")
+
+        if request.query.get("alt") != "media":
+            return Response.json(200, file.to_v2_json() if version == "v2" else file.to_v3_json())
+
+        range_match = RANGE_PATTERN.match(request.headers.get("range", ""))
+        if not range_match or not file.content:
+            return Response(200, file.content, "application/octet-stream")
+
+        start = int(range_match.group(1))
+        end = min(int(range_match.group(2) or len(file.content) - 1), len(file.content) - 1)
+        stop = end + 1
+        return Response(206, file.content[start:stop], "application/octet-stream", {"Content-Range": f"bytes {start}-{end}/{len(file.content)}"})
+
+    def __watch_file(self, request: Request, file_id: str) -> Response:
+        body = json.loads(request.body or b"{}")
+        if body.get("type") != "web_hook" or not body.get("address") or not body.get("id"):
+            return create_error_response(400, "badRequest", "A web_hook channel requires an ID and an address.")
+
+        channel = WatchChannel(body["id"], f"resource-{file_id}", body["address"], body.get("token"), body.get("expiration"))
+        with self.__files_lock:
+            if channel.channel_id in self.__channels:
+                return create_error_response(400, "channelIdNotUnique", f"Channel ID not unique: {channel.channel_id}")
+            self.__channels[channel.channel_id] = channel
+
+        result = {"kind": "api#channel", "id": channel.channel_id, "resourceId": channel.resource_id, "resourceUri": request.path}
+        if channel.expiration:
+            result["expiration"] = channel.expiration
+        return Response.json(200, result)
+
+    def __stop_channel(self, request: Request) -> Response:
+        body = json.loads(request.body or b"{}")
+        with self.__files_lock:
+            channel = self.__channels.get(body.get("id"))
+            if not channel or channel.resource_id != body.get("resourceId"):
+                return create_error_response(404, "notFound", f"Channel not found: {body.get('id')}")
+            del self.__channels[channel.channel_id]
+        return Response(204)
+
+    def __list_files(self, request: Request, version: str) -> Response:
+        try:
+            matches_query = parse_query(request.query.get("q", ""))
+        except ValueError as exc:
+            return create_error_response(400, "invalidQuery", str(exc))
+
+        with self.__files_lock:
+            files = [file for file in self.__files.values() if matches_query(file)]
+        files.sort(key=lambda file: (file.modified_date, file.file_id))
+
+        page_size = int(request.query.get("maxResults" if version == "v2" else "pageSize", 100))
+        offset = int(request.query.get("pageToken", 0))
+        page_end = offset + page_size
+        page = files[offset:page_end]
+
+        result: dict[str, Any] = {"kind": "drive#fileList"}
+        if version == "v2":
+            result["items"] = [file.to_v2_json() for file in page]
+        else:
+            result["files"] = [file.to_v3_json() for file in page]
+        if page_end < len(files):
+            result["nextPageToken"] = str(page_end)
+        return Response.json(200, result)
+
+
+def create_error_response(status: int, reason: str, message: str) -> Response:
+    return Response.json(
+        status, {"error": {"code": status, "message": message, "errors": [{"domain": "global", "reason": reason, "message": message}]}}
+    )
+
+
+def create_private_key() -> str:
+    """Creates an RSA private key in PEM format, for the service account credentials of a `GoogleDriveClient` talking to a `DriveStandIn`."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()).decode()
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    return to_utc(timestamp).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def parse_query(query: str) -> Callable[[DriveFile], bool]:
+    """Parses the subset of the Drive search query language used by `GoogleDriveClient`. Terms must be joined by `and`, parents are ignored.
+
+    Raises:
+        ValueError: Raised, if the query contains an unsupported term.
+    """
+    conditions: list[Callable[[DriveFile], bool]] = []
+
+    for term in filter(None, (term.strip() for term in query.split(" and "))):
+        if " in parents" in term:
+            continue
+
+        match = QUERY_TERM_PATTERN.match(term)
+        if not match:
+            raise ValueError(f"Unsupported query term: {term}")
+
+        negated, name_field, value, _, operator, timestamp = match.groups()
+        if name_field:
+            conditions.append(lambda file, value=value, negated=bool(negated): (value in file.name) != negated)
+        else:
+            conditions.append(create_timestamp_condition(operator, to_utc(dateutil.parser.parse(timestamp))))
+
+    return lambda file: all(condition(file) for condition in conditions)
+
+
+def create_timestamp_condition(operator: str, timestamp: datetime) -> Callable[[DriveFile], bool]:
+    comparisons: dict[str, Callable[[datetime], bool]] = {
+        "<": lambda modified_date: modified_date < timestamp,
+        "<=": lambda modified_date: modified_date <= timestamp,
+        ">": lambda modified_date: modified_date > timestamp,
+        ">=": lambda modified_date: modified_date >= timestamp,
+    }
+    comparison = comparisons[operator]
+    return lambda file: comparison(to_utc(file.modified_date))
+
+
+def to_utc(timestamp: datetime) -> datetime:
+    """Returns `timestamp` in UTC. Naive timestamps are assumed to be in UTC, like in the Drive search query language."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
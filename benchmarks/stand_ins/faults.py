@@ -0,0 +1,116 @@
+import math
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+
+FAULT_ERROR = "error"
+FAULT_THROTTLE = "throttle"
+FAULT_TIMEOUT = "timeout"
+FAULT_CONFLICT = "conflict"
+
+
+class LatencyDistribution(Protocol):
+    def sample(self, rng: random.Random) -> float:
+        pass
+
+
+@dataclass(frozen=True)
+class ConstantLatency:
+    seconds: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass(frozen=True)
+class UniformLatency:
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True)
+class ExponentialLatency:
+    mean: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class LogNormalLatency:
+    """Most requests take about `median` seconds, with a long tail. The higher `sigma`, the longer the tail."""
+
+    median: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma) if self.median > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Describes how a stand-in misbehaves. Rates are the chance per request, checked in the order: timeout, throttle, error, conflict."""
+
+    latency: LatencyDistribution = field(default_factory=ConstantLatency)
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 10.0  # How long to stall a timed out request before dropping the connection.
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    conflict_rate: float = 0.0
+
+
+class FaultInjector:
+    def __init__(self, profile: Optional[FaultProfile] = None, seed: Optional[int] = None):
+        self.profile: FaultProfile = profile or FaultProfile()
+        self.__rng: random.Random = random.Random(seed)
+        self.__lock: threading.Lock = threading.Lock()
+
+    def get_delay(self) -> float:
+        with self.__lock:
+            return max(self.profile.latency.sample(self.__rng), 0.0)
+
+    def get_fault(self, conflict_possible: bool = False) -> Optional[str]:
+        """Decides, which fault to inject into the next request, if any.
+
+        Args:
+            conflict_possible (bool, optional): Whether the request can fail with a conflict. Defaults to False.
+
+        Returns:
+            Optional[str]: One of the FAULT_* constants or `None`.
+        """
+        with self.__lock:
+            roll = self.__rng.random()
+
+        for fault, rate in (
+            (FAULT_TIMEOUT, self.profile.timeout_rate),
+            (FAULT_THROTTLE, self.profile.throttle_rate),
+            (FAULT_ERROR, self.profile.error_rate),
+            (FAULT_CONFLICT, self.profile.conflict_rate if conflict_possible else 0.0),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+
+def parse_latency(value: str) -> LatencyDistribution:
+    """Parses a latency distribution from the command line, e.g. `0.05`, `uniform:0.01,0.1`, `exponential:0.05` or `lognormal:0.05,0.8`."""
+    kind, _, arguments = value.partition(":")
+    if not arguments:
+        return ConstantLatency(float(kind))
+
+    parameters = [float(argument) for argument in arguments.split(",")]
+    distributions = {
+        "constant": ConstantLatency,
+        "uniform": UniformLatency,
+        "exponential": ExponentialLatency,
+        "lognormal": LogNormalLatency,
+    }
+    if kind not in distributions:
+        raise ValueError(f"Unknown latency distribution '{kind}'. Expected one of: {', '.join(distributions.keys())}")
+    return distributions[kind](*parameters)
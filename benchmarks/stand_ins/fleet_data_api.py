@@ -0,0 +1,155 @@
+import email.parser
+import email.policy
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import dateutil.parser
+
+from .faults import FAULT_CONFLICT, FAULT_ERROR, FAULT_THROTTLE, FaultInjector
+from .server import Request, Response, StandInServer
+
+
+UPDATE_PATH_PATTERN = re.compile(r"^/collections/upload/(\d+)$")
+
+
+class FleetDataApiStandIn(StandInServer):
+    """Stands in for the endpoints of the PSS Fleet Data API used by the importer: ping, upload, update & listing Collection metadata.
+
+    Point `PssFleetDataClient` at its `url`. Uploaded Collections are only kept as metadata. The API key isn't checked. Uploads & updates
+    can fail with a conflict, the other endpoints can't.
+    """
+
+    def __init__(self, faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(faults, host, port)
+        self.__collections: dict[int, dict[str, Any]] = {}
+        self.__collections_lock: threading.Lock = threading.Lock()
+        self.__next_collection_id: int = 1
+
+    @property
+    def collections(self) -> list[dict[str, Any]]:
+        """The metadata of all Collections uploaded, ordered by `collection_id`."""
+        with self.__collections_lock:
+            return [dict(collection) for _, collection in sorted(self.__collections.items())]
+
+    def can_conflict(self, request: Request) -> bool:
+        return request.method in ("POST", "PUT")
+
+    def handle(self, request: Request, fault: Optional[str]) -> Response:
+        if fault == FAULT_THROTTLE:
+            return create_error_response(request, 429, "RATE_LIMITED", "Too many requests.")
+        if fault == FAULT_ERROR:
+            return create_error_response(request, 500, "SERVER_ERROR", "An internal server error occurred.")
+
+        update_match = UPDATE_PATH_PATTERN.match(request.path)
+        if request.method == "GET" and request.path == "/ping":
+            return Response.json(200, {"ping": "Pong!"})
+        if request.method == "GET" and request.path.rstrip("/") == "/collections":
+            return self.__list_collections(request)
+        if request.method == "POST" and request.path == "/collections/upload":
+            return self.__upload_collection(request, fault)
+        if request.method == "PUT" and update_match:
+            return self.__update_collection(request, int(update_match.group(1)), fault)
+        return create_error_response(request, 404, "NOT_FOUND", f"Unknown endpoint: {request.method} {request.path}")
+
+    def __list_collections(self, request: Request) -> Response:
+        from_date = parse_timestamp(request.query["fromDate"]) if "fromDate" in request.query else None
+        to_date = parse_timestamp(request.query["toDate"]) if "toDate" in request.query else None
+
+        with self.__collections_lock:
+            collections = [dict(collection) for collection in self.__collections.values()]
+        collections = [collection for collection in collections if is_in_range(parse_timestamp(collection["timestamp"]), from_date, to_date)]
+
+        collections.sort(key=lambda collection: parse_timestamp(collection["timestamp"]), reverse=request.query.get("desc", "").lower() == "true")
+        skip = int(request.query.get("skip", 0))
+        stop = skip + int(request.query.get("take", 100))
+        return Response.json(200, collections[skip:stop])
+
+    def __update_collection(self, request: Request, collection_id: int, fault: Optional[str]) -> Response:
+        metadata = read_collection_metadata(request)
+        if metadata is None:
+            return create_error_response(request, 422, "INVALID_JSON_FORMAT", "The uploaded file is not a valid Collection.")
+
+        with self.__collections_lock:
+            collection = self.__collections.get(collection_id)
+            if not collection:
+                return create_error_response(request, 404, "COLLECTION_NOT_FOUND", f"There's no Collection with the ID {collection_id}.")
+            if fault == FAULT_CONFLICT or parse_timestamp(collection["timestamp"]) != parse_timestamp(metadata["timestamp"]):
+                return create_error_response(request, 409, "CONFLICT", "The timestamp of the Collection doesn't match the uploaded one.")
+
+            collection.update(create_collection_metadata(collection_id, metadata))
+            return Response.json(200, collection)
+
+    def __upload_collection(self, request: Request, fault: Optional[str]) -> Response:
+        metadata = read_collection_metadata(request)
+        if metadata is None:
+            return create_error_response(request, 422, "INVALID_JSON_FORMAT", "The uploaded file is not a valid Collection.")
+
+        timestamp = parse_timestamp(metadata["timestamp"])
+        with self.__collections_lock:
+            if fault == FAULT_CONFLICT or any(parse_timestamp(collection["timestamp"]) == timestamp for collection in self.__collections.values()):
+                return create_error_response(request, 409, "NON_UNIQUE_TIMESTAMP", f"There's already a Collection with the timestamp {timestamp}.")
+
+            collection_id = self.__next_collection_id
+            self.__next_collection_id += 1
+            self.__collections[collection_id] = create_collection_metadata(collection_id, metadata)
+            return Response.json(201, self.__collections[collection_id])
+
+
+def create_collection_metadata(collection_id: int, metadata: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "collection_id": collection_id,
+        "timestamp": metadata["timestamp"],
+        "duration": metadata.get("duration", 0.0),
+        "fleet_count": metadata.get("fleet_count", 0),
+        "user_count": metadata.get("user_count", 0),
+        "tourney_running": metadata.get("tournament_running", False),
+        "data_version": metadata.get("schema_version"),
+        "schema_version": metadata.get("schema_version", 9),
+        "max_tournament_battle_attempts": metadata.get("max_tournament_battle_attempts"),
+    }
+
+
+def create_error_response(request: Request, status: int, code: str, message: str) -> Response:
+    content = {
+        "code": code,
+        "message": message,
+        "details": message,
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "url": request.path,
+        "suggestion": "",
+        "links": [],
+    }
+    return Response.json(status, content)
+
+
+def is_in_range(timestamp: datetime, from_date: Optional[datetime], to_date: Optional[datetime]) -> bool:
+    return (from_date is None or timestamp >= from_date) and (to_date is None or timestamp <= to_date)
+
+
+def parse_timestamp(value: str) -> datetime:
+    timestamp = dateutil.parser.parse(value)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def read_collection_metadata(request: Request) -> Optional[dict[str, Any]]:
+    """Reads the `meta` object of the Collection file uploaded as `collection_file`. Returns `None`, if there's none."""
+    header = f"Content-Type: {request.headers.get('content-type', '')}\r\n\r\n".encode()
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(header + request.body)
+    if not message.is_multipart():
+        return None
+
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") != "collection_file":
+            continue
+        try:
+            metadata = json.loads(part.get_payload(decode=True)).get("meta")
+        except (AttributeError, ValueError):
+            return None
+        if isinstance(metadata, dict) and "timestamp" in metadata:
+            return metadata
+    return None
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from .faults import FAULT_TIMEOUT, FaultInjector
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes = b""
+    content_type: str = "application/json"
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def json(status: int, content: Any, headers: Optional[dict[str, str]] = None) -> "Response":
+        return Response(status, json.dumps(content).encode(), headers=headers or {})
+
+
+class StandInServer:
+    """Serves a local stand-in for a remote API from a daemon thread. Subclasses implement `handle`.
+
+    Connections are kept alive (HTTP/1.1), so clients can pool them like they would with the real API. Before a request is handled, it's
+    delayed and may be failed as configured by the `FaultInjector`.
+    """
+
+    def __init__(self, faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0):
+        self.faults: FaultInjector = faults or FaultInjector()
+        self.request_count: int = 0
+        self.fault_counts: dict[str, int] = {}
+        self.__counter_lock: threading.Lock = threading.Lock()
+        self.__http_server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self.__create_request_handler())
+        self.__http_server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self.__http_server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__http_server.serve_forever, name=type(self).__name__, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+        if self.__thread:
+            self.__thread.join()
+
+    def handle(self, request: Request, fault: Optional[str]) -> Response:
+        """Answers `request`. If `fault` is set, the response has to reflect it."""
+        raise NotImplementedError()
+
+    def can_conflict(self, request: Request) -> bool:
+        """Whether `request` can fail with a conflict."""
+        return False
+
+    def record_request(self, fault: Optional[str]):
+        with self.__counter_lock:
+            self.request_count += 1
+            if fault:
+                self.fault_counts[fault] = self.fault_counts.get(fault, 0) + 1
+
+    def __create_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class StandInRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.__handle("GET")
+
+            def do_POST(self):
+                self.__handle("POST")
+
+            def do_PUT(self):
+                self.__handle("PUT")
+
+            def log_message(self, *args):  # Load tests would flood stderr otherwise.
+                pass
+
+            def __handle(self, method: str):
+                url = urllib.parse.urlsplit(self.path)
+                content_length = int(self.headers.get("Content-Length") or 0)
+                request = Request(
+                    method,
+                    urllib.parse.unquote(url.path),
+                    dict(urllib.parse.parse_qsl(url.query)),
+                    {key.lower(): value for key, value in self.headers.items()},
+                    self.rfile.read(content_length) if content_length else b"",
+                )
+
+                time.sleep(stand_in.faults.get_delay())
+                fault = stand_in.faults.get_fault(conflict_possible=stand_in.can_conflict(request))
+                stand_in.record_request(fault)
+
+                if fault == FAULT_TIMEOUT:
+                    time.sleep(stand_in.faults.profile.timeout_seconds)
+                    self.close_connection = True  # Drop the connection without a response, like a gateway timing out.
+                    return
+
+                response = stand_in.handle(request, fault)
+                self.send_response(response.status)
+                self.send_header("Content-Type", response.content_type)
+                self.send_header("Content-Length", str(len(response.body)))
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(response.body)
+
+        return StandInRequestHandler
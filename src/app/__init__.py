@@ -1,13 +1,21 @@
-from . import core, database, importer, models
+import importlib
+from types import ModuleType
 
 
 __app_name__ = "importer"
 __version__ = "0.3.2"
 
 
+# Sub-packages are imported on first access, so that importing a single module (e.g. `core.config`) doesn't load the whole app.
 __all__ = [
-    core.__name__,
-    database.__name__,
-    importer.__name__,
-    models.__name__,
+    "core",
+    "database",
+    "importer",
+    "models",
 ]
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,12 @@ import abc
 from datetime import datetime
 from typing import Iterable, Optional
 
-from sqlalchemy.sql.operators import is_
-from sqlmodel import asc, col, select
+from sqlalchemy.sql.operators import is_, is_not
+from sqlmodel import asc, col, desc, or_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..database import crud
-from ..database.models import CollectionFileDB
+from ..database.models import CollectionFileDB, ImportCheckpointDB, ImportRunDB
 
 
 class AbstractCollectionFileRepository(abc.ABC):
@@ -15,12 +15,26 @@ class AbstractCollectionFileRepository(abc.ABC):
     def add(self, collection_file: CollectionFileDB):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def claim_files(
+        self, collection_file_ids: Iterable[int], lease_owner: str, lease_expires_at: datetime, now: datetime
+    ) -> list[CollectionFileDB]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_earliest_expired_lease_gdrive_modified_date(self, now: datetime) -> Optional[datetime]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_by_id(self, collection_file_id: int) -> Optional[CollectionFileDB]:
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def get_latest_imported_gdrive_modified_date(self) -> Optional[datetime]:
+    async def get_latest_imported_gdrive_modified_date(self, modified_before: Optional[datetime] = None) -> Optional[datetime]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list_due_retries(self, now: datetime, limit: Optional[int] = None) -> list[CollectionFileDB]:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -31,6 +45,10 @@ class AbstractCollectionFileRepository(abc.ABC):
     async def refresh_files(self, collection_files: Iterable[CollectionFileDB]) -> list[CollectionFileDB]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def renew_leases(self, lease_owner: str, lease_expires_at: datetime) -> int:
+        raise NotImplementedError
+
 
 class SqlModelCollectionFileRepository(AbstractCollectionFileRepository):
     def __init__(self, session: AsyncSession):
@@ -39,11 +57,67 @@ class SqlModelCollectionFileRepository(AbstractCollectionFileRepository):
     def add(self, collection_file: CollectionFileDB):
         self.session.add(collection_file)
 
+    async def claim_files(
+        self, collection_file_ids: Iterable[int], lease_owner: str, lease_expires_at: datetime, now: datetime
+    ) -> list[CollectionFileDB]:
+        """Leases the files, which haven't been imported, aren't waiting for a retry and aren't leased by another importer instance, to
+        `lease_owner` until the unit of work is committed.
+
+        Rows locked by another instance claiming files at the same time are skipped instead of waited for (not supported by SQLite).
+        """
+        query = (
+            select(CollectionFileDB)
+            .where(col(CollectionFileDB.collection_file_id).in_(list(collection_file_ids)))
+            .where(is_(CollectionFileDB.imported, False))
+            .where(or_(is_(CollectionFileDB.error, False), col(CollectionFileDB.next_attempt_at) <= now))
+            .where(
+                or_(
+                    is_(CollectionFileDB.lease_owner, None),
+                    CollectionFileDB.lease_owner == lease_owner,
+                    col(CollectionFileDB.lease_expires_at) <= now,
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+        collection_files = (await self.session.exec(query)).all()
+
+        for collection_file in collection_files:
+            collection_file.lease_owner = lease_owner
+            collection_file.lease_expires_at = lease_expires_at
+            self.session.add(collection_file)
+
+        return list(collection_files)
+
+    async def get_earliest_expired_lease_gdrive_modified_date(self, now: datetime) -> Optional[datetime]:
+        """Returns the earliest modified date of the files, which have been leased, but not released before the lease expired."""
+        query = (
+            select(CollectionFileDB.gdrive_modified_date)
+            .where(is_not(CollectionFileDB.lease_owner, None))
+            .where(col(CollectionFileDB.lease_expires_at) <= now)
+            .order_by(asc(CollectionFileDB.gdrive_modified_date))
+        )
+        return (await self.session.exec(query)).first()
+
     async def get_by_id(self, collection_file_id: int) -> Optional[CollectionFileDB]:
         return await crud.get_collection_file_by_id(self.session, collection_file_id)
 
-    async def get_latest_imported_gdrive_modified_date(self) -> Optional[datetime]:
-        return await crud.get_latest_imported_gdrive_modified_date(self.session)
+    async def get_latest_imported_gdrive_modified_date(self, modified_before: Optional[datetime] = None) -> Optional[datetime]:
+        return await crud.get_latest_imported_gdrive_modified_date(self.session, modified_before=modified_before)
+
+    async def list_due_retries(self, now: datetime, limit: Optional[int] = None) -> list[CollectionFileDB]:
+        """Lists the files, which failed to import and are due for another attempt, the longest overdue first."""
+        query = (
+            select(CollectionFileDB)
+            .where(is_(CollectionFileDB.error, True))
+            .where(is_(CollectionFileDB.imported, False))
+            .where(col(CollectionFileDB.next_attempt_at) <= now)
+            .order_by(asc(CollectionFileDB.next_attempt_at))
+        )
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return list((await self.session.exec(query)).all())
 
     async def list_files(self, imported: Optional[bool] = None, gdrive_file_ids: Optional[list[str]] = None) -> list[CollectionFileDB]:
         async with self.session:
@@ -62,3 +136,85 @@ class SqlModelCollectionFileRepository(AbstractCollectionFileRepository):
             await self.session.refresh(collection_file)
 
         return collection_files
+
+    async def renew_leases(self, lease_owner: str, lease_expires_at: datetime) -> int:
+        """Extends the leases held by `lease_owner` until `lease_expires_at`, once the unit of work is committed.
+
+        Returns:
+            int: The number of leases renewed.
+        """
+        query = select(CollectionFileDB).where(CollectionFileDB.lease_owner == lease_owner)
+        collection_files = (await self.session.exec(query)).all()
+
+        for collection_file in collection_files:
+            collection_file.lease_expires_at = lease_expires_at
+            self.session.add(collection_file)
+
+        return len(collection_files)
+
+
+class AbstractImportCheckpointRepository(abc.ABC):
+    @abc.abstractmethod
+    async def get_watermark(self, name: str) -> Optional[datetime]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def advance_watermark(self, name: str, watermark: datetime, updated_at: datetime) -> bool:
+        raise NotImplementedError
+
+
+class SqlModelImportCheckpointRepository(AbstractImportCheckpointRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_watermark(self, name: str) -> Optional[datetime]:
+        query = select(ImportCheckpointDB.watermark).where(ImportCheckpointDB.name == name)
+        return (await self.session.exec(query)).first()
+
+    async def advance_watermark(self, name: str, watermark: datetime, updated_at: datetime) -> bool:
+        """Moves the watermark of the checkpoint `name` forward to `watermark`, creating the checkpoint, if it doesn't exist.
+
+        Returns:
+            bool: `False`, if the checkpoint's watermark is at or past `watermark` already.
+        """
+        query = select(ImportCheckpointDB).where(ImportCheckpointDB.name == name).with_for_update()
+        checkpoint = (await self.session.exec(query)).first()
+
+        if checkpoint is None:
+            checkpoint = ImportCheckpointDB(name=name, watermark=watermark, updated_at=updated_at)
+        elif checkpoint.watermark < watermark:
+            checkpoint.watermark = watermark
+            checkpoint.updated_at = updated_at
+        else:
+            return False
+
+        self.session.add(checkpoint)
+        return True
+
+
+class AbstractImportRunRepository(abc.ABC):
+    @abc.abstractmethod
+    def add(self, import_run: ImportRunDB):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list_runs(self, limit: Optional[int] = None) -> list[ImportRunDB]:
+        raise NotImplementedError
+
+
+class SqlModelImportRunRepository(AbstractImportRunRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(self, import_run: ImportRunDB):
+        self.session.add(import_run)
+
+    async def list_runs(self, limit: Optional[int] = None) -> list[ImportRunDB]:
+        """Lists the most recent import runs first."""
+        async with self.session:
+            query = select(ImportRunDB).order_by(desc(ImportRunDB.started_at))
+
+            if limit is not None:
+                query = query.limit(limit)
+
+            return (await self.session.exec(query)).all()
@@ -1,8 +1,10 @@
 from .from_collection_file_db import FromCollectionFileDB
 from .from_gdrive_file import FromGdriveFile
+from .from_run_statistics import FromRunStatistics
 
 
 __all__ = [
     FromCollectionFileDB.__name__,
     FromGdriveFile.__name__,
+    FromRunStatistics.__name__,
 ]
@@ -1,10 +1,11 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 from ..core.gdrive import GDriveFile
 from ..core.models.cancellation_token import CancellationToken
 from ..database.models import CollectionFileDB
 from ..models.queue_item import QueueItem
+from ..models.run_statistics import RunStatistics
 
 
 class FromCollectionFileDB:
@@ -14,6 +15,7 @@ class FromCollectionFileDB:
         collection_files: Iterable[CollectionFileDB],
         target_directory: Path,
         cancel_token: CancellationToken,
+        statistics: Optional[RunStatistics] = None,
     ) -> list[QueueItem]:
         gdrive_files_by_id = {gdrive_file.id: gdrive_file for gdrive_file in gdrive_files}
         collection_files_by_gdrive_file_id = {collection_file.gdrive_file_id: collection_file for collection_file in collection_files}
@@ -32,11 +34,12 @@ class FromCollectionFileDB:
                 collection_file.collection_file_id,
                 target_directory,
                 cancel_token,
+                statistics=statistics,
             )
 
-            if collection_file.imported is not None:
-                queue_item.status.imported.value = collection_file.imported
-
             result.append(queue_item)
 
+        if statistics:
+            statistics.add_files(len(result))
+
         return result
@@ -0,0 +1,30 @@
+from ..core import utils
+from ..database.models import ImportRunDB
+from ..models.queue_item import QueueItemState
+from ..models.run_statistics import RunStatistics
+
+
+class FromRunStatistics:
+    @staticmethod
+    def to_import_run(statistics: RunStatistics) -> ImportRunDB:
+        state_durations = statistics.state_durations
+
+        import_run = ImportRunDB(
+            started_at=statistics.started_at,
+            finished_at=statistics.finished_at or utils.get_now(),
+            modified_after=utils.remove_timezone(statistics.modified_after),
+            modified_before=utils.remove_timezone(statistics.modified_before),
+            file_count=statistics.file_count,
+            downloaded_count=statistics.downloaded_count,
+            imported_count=statistics.imported_count,
+            download_error_count=statistics.download_error_count,
+            import_error_count=statistics.import_error_count,
+            retry_count=statistics.retry_count,
+            bytes_downloaded=statistics.bytes_downloaded,
+            bytes_imported=statistics.bytes_imported,
+            queued_seconds=state_durations[QueueItemState.QUEUED],
+            downloading_seconds=state_durations[QueueItemState.DOWNLOADING],
+            downloaded_seconds=state_durations[QueueItemState.DOWNLOADED],
+            importing_seconds=state_durations[QueueItemState.IMPORTING],
+        )
+        return import_run
@@ -1,10 +1,22 @@
-from . import config, gdrive, models, utils
+import importlib
+from types import ModuleType
 
 
+# Modules are imported on first access, so that importing `config` doesn't load the Google Drive client or pydantic.
 __all__ = [
     # Modules
-    config.__name__,
-    gdrive.__name__,
-    models.__name__,
-    utils.__name__,
+    "clock",
+    "config",
+    "gdrive",
+    "metrics",
+    "models",
+    "tracing",
+    "utils",
+    "webhook",
 ]
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
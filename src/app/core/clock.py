@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+from . import utils
+
+
+class Clock:
+    """Tells the time & waits. The import loop schedules its runs with a clock, so that they can be fast-forwarded in tests & benchmarks."""
+
+    def now(self) -> datetime:
+        """Returns the current date & time in UTC, but without timezone information, like `utils.get_now`."""
+        raise NotImplementedError()
+
+    async def sleep(self, seconds: float):
+        raise NotImplementedError()
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return utils.get_now()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when told to. Sleeping advances the clock instead of waiting, so hours pass in an instant.
+
+    It's safe to read the clock from other threads, e.g. from download workers, while the event loop advances it.
+    """
+
+    def __init__(self, start: datetime):
+        self.__now: datetime = utils.remove_timezone(start)
+        self.__lock: threading.Lock = threading.Lock()
+        self.slept_seconds: float = 0.0
+
+    def now(self) -> datetime:
+        with self.__lock:
+            return self.__now
+
+    def advance(self, seconds: float):
+        if seconds < 0:
+            raise ValueError("A clock can't go back in time.")
+
+        with self.__lock:
+            self.__now += timedelta(seconds=seconds)
+
+    async def sleep(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.advance(seconds)
+        self.slept_seconds += seconds
+        await asyncio.sleep(0)  # Let other tasks run, like a real sleep would.
+
+
+__all__ = [
+    # Classes
+    Clock.__name__,
+    SystemClock.__name__,
+    VirtualClock.__name__,
+]
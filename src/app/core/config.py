@@ -13,14 +13,38 @@ class ConfigBase:
     pss_start_date: datetime = datetime(2016, 1, 6, tzinfo=timezone.utc)
     earliest_data_date: datetime = datetime(2019, 10, 10, tzinfo=timezone.utc)
     temp_download_folder: Path = Path("./downloads")
-    download_thread_pool_size: int = int(os.getenv("FLEET_DATA_IMPORTER_WORKER_COUNT", 3))
+    download_thread_pool_size: int = int(os.getenv("FLEET_DATA_IMPORTER_WORKER_COUNT", 3))  # Concurrent downloads to start with when autotuning
+    download_max_concurrency: int = int(os.getenv("DOWNLOAD_MAX_CONCURRENCY", 16))
+    upload_max_concurrency: int = int(os.getenv("UPLOAD_MAX_CONCURRENCY", 4))
     log_folder: Optional[str] = os.getenv("LOG_FOLDER_PATH")
     log_level: Optional[str] = os.getenv("LOG_LEVEL")
-    chunk_size: int = int(os.getenv("CHUNK_SIZE", 250))
+    log_debug_rate_limit: int = int(os.getenv("LOG_DEBUG_RATE_LIMIT", 0))  # Max. debug messages per second per message, 0 = no limit
+    trace_file_path: Optional[str] = os.getenv("TRACE_FILE_PATH")
+    metrics_port: Optional[int] = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+    chunk_size: int = int(os.getenv("CHUNK_SIZE", 250))  # Files in the first chunk, or in each chunk, if adaptive chunk sizing is disabled
+    chunk_min_size: int = int(os.getenv("CHUNK_MIN_SIZE", 50))
+    chunk_max_size: int = int(os.getenv("CHUNK_MAX_SIZE", 2000))
+    chunk_target_duration: float = float(os.getenv("CHUNK_TARGET_DURATION", 600))  # Seconds importing a chunk should take, 0 = fixed chunk size
+    progress_interval: float = float(os.getenv("PROGRESS_INTERVAL", 60))  # Seconds between progress reports, 0 = no reports
+    watch_poll_interval: float = float(os.getenv("WATCH_POLL_INTERVAL", 30))  # Seconds between the first polls for the next file in watch mode
+    watch_max_poll_interval: float = float(os.getenv("WATCH_MAX_POLL_INTERVAL", 300))
+    push_webhook_url: Optional[str] = os.getenv("PUSH_WEBHOOK_URL")  # HTTPS URL Google Drive posts change notifications to
+    push_webhook_port: int = int(os.getenv("PUSH_WEBHOOK_PORT", 8080))
+    push_channel_ttl: float = float(os.getenv("PUSH_CHANNEL_TTL", 86400))  # Seconds until a notification channel expires & gets replaced
+    instance_id: Optional[str] = os.getenv("IMPORTER_INSTANCE_ID")  # Owner of the files leased by this instance, see `instance_id_file_path`
+    lease_duration: float = float(os.getenv("LEASE_DURATION", 3600))  # Seconds until files leased for a chunk may be claimed by other instances
+    retry_max_attempts: int = int(os.getenv("RETRY_MAX_ATTEMPTS", 5))  # Attempts to import a file before giving up on it, 1 = no retries
+    retry_base_delay: float = float(os.getenv("RETRY_BASE_DELAY", 600))  # Seconds until the first retry, doubling with each failed attempt
+    retry_max_delay: float = float(os.getenv("RETRY_MAX_DELAY", 86400))
+    retry_batch_size: int = int(os.getenv("RETRY_BATCH_SIZE", 25))  # Files retried at once
+    journal_file_path: Optional[str] = os.getenv("JOURNAL_FILE_PATH")  # Defaults to a file in the download folder, see `import_journal_file_path`
+    download_memory_budget: int = int(os.getenv("DOWNLOAD_MEMORY_BUDGET", 0))  # Max. bytes of file contents held by downloads at once, 0 = no limit
 
     # PSS Fleet Data API
     api_default_server_url: str = os.getenv("FLEET_DATA_API_URL", "https://fleetdata.dolores2.xyz")
     api_key: Optional[str] = os.getenv("FLEET_DATA_API_KEY")
+    api_circuit_failure_threshold: int = int(os.getenv("API_CIRCUIT_FAILURE_THRESHOLD", 5))  # Failed calls in a row pausing uploads, 0 = never pause
+    api_circuit_probe_interval: float = float(os.getenv("API_CIRCUIT_PROBE_INTERVAL", 60))  # Seconds between pings while uploads are paused
 
     # Google Drive
     gdrive_project_id: str = os.getenv("GDRIVE_SERVICE_PROJECT_ID")
@@ -30,15 +54,20 @@ class ConfigBase:
     gdrive_client_id: str = os.getenv("GDRIVE_SERVICE_CLIENT_ID")
     gdrive_scopes: list[str] = ["https://www.googleapis.com/auth/drive"]
     gdrive_folder_id: str = os.getenv("GDRIVE_FOLDER_ID", "10wOZgAQk_0St2Y_jC3UW497LVpBNxWmP")
+    gdrive_api_endpoint: Optional[str] = os.getenv("GDRIVE_API_ENDPOINT")  # Root URL of the Google APIs, e.g. of a local stand-in
+    gdrive_max_requests_per_second: float = float(os.getenv("GDRIVE_MAX_REQUESTS_PER_SECOND", 0))  # Across all backfill workers, 0 = no limit
     gdrive_service_account_file_path: str = "client_secrets.json"
     gdrive_settings_file_path: str = "settings.yaml"
 
     # Flags
     debug_mode: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
+    autotune_concurrency: bool = os.getenv("AUTOTUNE_CONCURRENCY", "true").lower() == "true"
     in_github_actions: bool = os.getenv("GITHUB_ACTIONS", "false").lower() == "true"  # True if in github actions
     keep_downloaded_files: bool = os.getenv("KEEP_DOWNLOADED_FILES", "false").lower() == "true"
+    profile_bulk_imports: bool = os.getenv("PROFILE_BULK_IMPORTS", "false").lower() == "true"
     reinitialize_database_on_startup: bool = os.getenv("REINITIALIZE_DATABASE", "false").lower() == "true"
     update_existing_collections: bool = os.getenv("UPDATE_EXISTING_COLLECTIONS", "false").lower() == "true"
+    watch_mode: bool = os.getenv("WATCH_MODE", "false").lower() == "true"
 
     # Database
     db_engine_echo: bool = os.getenv("DATABASE_ENGINE_ECHO", "false") == "true"
@@ -70,6 +99,17 @@ class ConfigBase:
     def db_server_and_port(self) -> str:
         return self.db_url.split("@")[1]
 
+    @property
+    def import_journal_file_path(self) -> Path:
+        if self.journal_file_path:
+            return Path(self.journal_file_path)
+        return Path(self.temp_download_folder).joinpath("journal.jsonl")
+
+    @property
+    def instance_id_file_path(self) -> Path:
+        """The file next to the import journal, which keeps the ID of this instance across restarts, unless `instance_id` is set."""
+        return self.import_journal_file_path.with_name("instance_id")
+
     @property
     def log_file_name(self) -> Optional[str]:
         return "pss_fleet_data_importer_" + datetime.now(tz=timezone.utc).strftime("%Y%m%d-%H%M%S") + ".log"
@@ -86,6 +126,10 @@ class ConfigBase:
             return Path(self.log_folder)
         return None
 
+    def get_profile_file_path(self, chunk_size: int, start: datetime, end: datetime) -> Path:
+        file_name = f"pss_fleet_data_importer_profile_{start.strftime("%Y%m%d-%H%M%S")}_{end.strftime("%Y%m%d-%H%M%S")}_{chunk_size}_files.prof"
+        return (self.log_folder_path or Path(".")).joinpath(file_name)
+
 
 @dataclass(frozen=True)
 class Config(ConfigBase):
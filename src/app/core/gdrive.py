@@ -1,36 +1,49 @@
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator, Iterable, Optional
-
-import dateutil.parser
-import pydrive2.auth
-import pydrive2.drive
-from pydrive2.files import ApiRequestError, FileNotDownloadableError, GoogleDriveFile
+from typing import TYPE_CHECKING, Generator, Iterable, Optional
 
 from ..log.log_core import gdrive as log
 from . import utils
 from .models.filesystem import FileSystem
+from .models.rate_limiter import RateLimiter
+
+
+if TYPE_CHECKING:  # pydrive2 & dateutil are imported where they're used, to keep the start-up of the app fast.
+    import pydrive2.auth
+    import pydrive2.drive
+    from pydrive2.files import GoogleDriveFile
 
 
 class GDriveFile:
-    def __init__(self, google_drive_file: GoogleDriveFile):
-        self.id: str = google_drive_file["id"]
-        self.name: str = get_gdrive_file_name(google_drive_file)
-        self.size: int = int(google_drive_file["fileSize"])
-        self.md5_checksum: Optional[str] = google_drive_file.get("md5Checksum")
-        self.modified_date: datetime = dateutil.parser.parse(google_drive_file["modifiedDate"])
-        self.__google_drive_file: GoogleDriveFile = google_drive_file
-
-    def get_content_string(self, mimetype: Optional[str] = None, encoding: str = "utf-8", remove_bom: bool = False):
-        try:
-            with log.download_file(self.name):
-                result = self.__google_drive_file.GetContentString(mimetype, encoding, remove_bom)
-        except (ApiRequestError, FileNotDownloadableError) as exc:
-            log.download_file_error(self.name, exc)
-            raise exc
+    """The metadata of a file in Google Drive required to plan and perform its import. Use `GoogleDriveClient` to download its contents."""
+
+    __slots__ = ("id", "name", "size", "md5_checksum", "modified_date")
+
+    def __init__(self, file_id: str, name: str, size: int, md5_checksum: Optional[str], modified_date: datetime):
+        self.id: str = file_id
+        self.name: str = name
+        self.size: int = size
+        self.md5_checksum: Optional[str] = md5_checksum
+        self.modified_date: datetime = modified_date
+
+    def __repr__(self) -> str:
+        return f"<GDriveFile id={self.id}, name={self.name}, size={self.size}, modified_date={self.modified_date}>"
+
+
+class DriveChannel:
+    """A notification channel registered with Google Drive. Google Drive posts a notification to the channel's address for each change."""
 
-        return result
+    __slots__ = ("id", "resource_id", "token", "expiration")
+
+    def __init__(self, channel_id: str, resource_id: str, token: str, expiration: Optional[datetime]):
+        self.id: str = channel_id
+        self.resource_id: str = resource_id
+        self.token: str = token
+        self.expiration: Optional[datetime] = expiration
+
+    def __repr__(self) -> str:
+        return f"<DriveChannel id={self.id}, resource_id={self.resource_id}, expiration={self.expiration}>"
 
 
 class GoogleDriveClient:
@@ -45,9 +58,14 @@ class GoogleDriveClient:
         folder_id: str,
         service_account_file_path: str,
         settings_file_path: str,
+        api_endpoint: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ) -> None:
         log.client_creating()
 
+        self.__api_endpoint: Optional[str] = api_endpoint
+        self.__rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+
         self.__client_email: str = client_email
         self.__client_id: str = client_id
         self.__folder_id: str = folder_id
@@ -60,8 +78,8 @@ class GoogleDriveClient:
 
         self.__base_criteria: str = f"'{self.__folder_id}' in parents and title contains 'pss-top-100' and not title contains 'of'"
 
-        self.__gauth: pydrive2.auth.GoogleAuth = None
-        self.__drive: pydrive2.drive.GoogleDrive = None
+        self.__gauth: "pydrive2.auth.GoogleAuth" = None
+        self.__drive: "pydrive2.drive.GoogleDrive" = None
 
     def list_files_by_modified_date(
         self, modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None
@@ -78,19 +96,116 @@ class GoogleDriveClient:
 
         params = {"q": " and ".join(criteria)}
 
-        google_drive_files: list[GoogleDriveFile] = self.__drive.ListFile(param=params).GetList()
+        self.__rate_limiter.acquire()
+        google_drive_files: list["GoogleDriveFile"] = self.__drive.ListFile(param=params).GetList()
         file_list = FromGoogleDriveFile.to_gdrive_files(google_drive_files)
+        del google_drive_files  # Release the metadata, auth & http handles of the pydrive2 files right away.
 
         for file in file_list:
             yield file
 
+    def list_files_by_name_prefix(self, prefix: str) -> Generator[GDriveFile, None, None]:
+        """Lists the files with a name starting with `prefix`. It's a much cheaper request than listing files by modified date.
+
+        Google Drive can't match titles by prefix, so the results of `title contains` are filtered down to the names starting with `prefix`.
+        """
+        self.__ensure_initialized()
+
+        params = {"q": f"{self.__base_criteria} and title contains '{prefix}'"}
+        self.__rate_limiter.acquire()
+        google_drive_files: list["GoogleDriveFile"] = self.__drive.ListFile(param=params).GetList()
+
+        for file in FromGoogleDriveFile.to_gdrive_files(google_drive_files):
+            if file.name.startswith(prefix):
+                yield file
+
+    def get_file_content_string(self, gdrive_file: GDriveFile, encoding: str = "utf-8") -> str:
+        """Downloads the contents of a file by its ID.
+
+        Args:
+            gdrive_file (GDriveFile): The file to download.
+            encoding (str, optional): The encoding of the file's contents. Defaults to "utf-8".
+
+        Raises:
+            ApiRequestError: Raised, if the Google Drive API returned an error.
+            FileNotDownloadableError: Raised, if the file can't be downloaded.
+
+        Returns:
+            str: The decoded contents of the file.
+        """
+        from pydrive2.files import ApiRequestError, FileNotDownloadableError
+
+        if not self.__drive:
+            self.initialize()
+
+        self.__rate_limiter.acquire()
+        try:
+            with log.download_file(gdrive_file.name):
+                google_drive_file = self.__drive.CreateFile({"id": gdrive_file.id})
+                content = b"".join(google_drive_file.GetContentIOBuffer())
+        except (ApiRequestError, FileNotDownloadableError) as exc:
+            log.download_file_error(gdrive_file.name, exc)
+            raise exc
+
+        return content.decode(encoding)
+
+    def watch_folder(self, address: str, channel_id: str, token: str, expiration: datetime) -> DriveChannel:
+        """Registers a channel, through which Google Drive notifies `address` of changes to the folder, until `expiration`.
+
+        Args:
+            address (str): The HTTPS URL to post notifications to.
+            channel_id (str): A unique ID for the channel.
+            token (str): A secret sent with each notification to verify it's been sent through this channel.
+            expiration (datetime): When the channel should expire, in UTC. Google Drive might choose an earlier expiration.
+
+        Raises:
+            ApiRequestError: Raised, if the Google Drive API returned an error.
+
+        Returns:
+            DriveChannel: The channel registered.
+        """
+        service = self.__get_service()
+        body = {
+            "id": channel_id,
+            "type": "web_hook",
+            "address": address,
+            "token": token,
+            "expiration": str(int(expiration.replace(tzinfo=timezone.utc).timestamp() * 1000)),
+        }
+        response = service.files().watch(fileId=self.__folder_id, body=body).execute()
+
+        channel_expiration = None
+        if response.get("expiration"):
+            channel_expiration = utils.remove_timezone(datetime.fromtimestamp(int(response["expiration"]) / 1000, tz=timezone.utc))
+
+        channel = DriveChannel(response["id"], response["resourceId"], token, channel_expiration)
+        log.channel_registered(channel.id, channel.expiration)
+        return channel
+
+    def stop_channel(self, channel: DriveChannel) -> None:
+        """Stops the notifications through `channel`."""
+        self.__get_service().channels().stop(body={"id": channel.id, "resourceId": channel.resource_id}).execute()
+        log.channel_stopped(channel.id)
+
+    def __get_service(self):
+        if not self.__drive:
+            self.initialize()
+        if self.__gauth.service is None:
+            self.__gauth.Authorize()
+        return self.__gauth.service
+
     def __ensure_initialized(self) -> None:
+        import pydrive2.auth
+
         try:
             self.__drive.ListFile({"q": f"{self.__base_criteria} and title contains 'highaöegjoyödfmj giod'"}).GetList()
         except (pydrive2.auth.InvalidConfigError, AttributeError):
             self.initialize()
 
     def initialize(self, filesystem: FileSystem = FileSystem()) -> None:
+        import pydrive2.auth
+        import pydrive2.drive
+
         service_account_file_path = Path(self.__service_account_file_path)
         if filesystem.exists(service_account_file_path) and not utils.is_empty_file(service_account_file_path, filesystem):
             log.credentials_json_exists(service_account_file_path)
@@ -120,10 +235,27 @@ class GoogleDriveClient:
         credentials = pydrive2.auth.ServiceAccountCredentials.from_json_keyfile_name(
             service_account_file_path,
             self.__scopes,
+            token_uri=urllib.parse.urljoin(self.__api_endpoint, "token") if self.__api_endpoint else None,
         )
         self.__gauth.credentials = credentials
+        if self.__api_endpoint:
+            self.__authorize_with_api_endpoint()
         self.__drive = pydrive2.drive.GoogleDrive(self.__gauth)
 
+    def __authorize_with_api_endpoint(self) -> None:
+        """Builds the Drive v2 service of `self.__gauth` for `self.__api_endpoint` instead of the Google APIs, e.g. for a local stand-in."""
+        import googleapiclient.discovery
+
+        log.api_endpoint_set(self.__api_endpoint)
+        self.__gauth.http = self.__gauth.Get_Http_Object()
+        self.__gauth.service = googleapiclient.discovery.build(
+            "drive",
+            "v2",
+            http=self.__gauth.http,
+            cache_discovery=False,
+            client_options={"api_endpoint": urllib.parse.urljoin(self.__api_endpoint, "drive/v2/")},
+        )
+
     @staticmethod
     def create_service_account_credential_json(
         project_id: str,
@@ -170,15 +302,23 @@ class GoogleDriveClient:
 
 class FromGoogleDriveFile:
     @staticmethod
-    def to_gdrive_file(source: GoogleDriveFile) -> GDriveFile:
-        return GDriveFile(source)
+    def to_gdrive_file(source: "GoogleDriveFile") -> GDriveFile:
+        import dateutil.parser
+
+        return GDriveFile(
+            source["id"],
+            get_gdrive_file_name(source),
+            int(source["fileSize"]),
+            source.get("md5Checksum"),
+            dateutil.parser.parse(source["modifiedDate"]),
+        )
 
     @staticmethod
-    def to_gdrive_files(sources: Iterable[GoogleDriveFile]) -> GDriveFile:
+    def to_gdrive_files(sources: Iterable["GoogleDriveFile"]) -> list[GDriveFile]:
         return [FromGoogleDriveFile.to_gdrive_file(source) for source in sources]
 
 
-def get_gdrive_file_name(gdrive_file: GoogleDriveFile) -> str:
+def get_gdrive_file_name(gdrive_file: "GoogleDriveFile") -> str:
     """Returns the file name of a `GoogleDriveFile` of API version 2 or 3.
 
     Args:
@@ -193,7 +333,8 @@ def get_gdrive_file_name(gdrive_file: GoogleDriveFile) -> str:
 
 __all__ = [
     # Classes
-    GoogleDriveClient.__name__,
-    # External references
+    DriveChannel.__name__,
+    FromGoogleDriveFile.__name__,
     GDriveFile.__name__,
+    GoogleDriveClient.__name__,
 ]
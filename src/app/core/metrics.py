@@ -0,0 +1,260 @@
+import abc
+import math
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Callable, Generator, Iterable, Mapping, Optional, Union
+
+
+LabelValues = tuple[str, ...]
+Number = Union[int, float]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric(abc.ABC):
+    metric_type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = tuple(label_names)
+        self._lock: threading.Lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _label_values(self, labels: Mapping[str, str]) -> LabelValues:
+        if set(labels.keys()) != set(self.label_names):
+            raise ValueError(f"Metric '{self.name}' requires the labels {self.label_names}, got: {tuple(labels.keys())}")
+        return tuple(str(labels[label_name]) for label_name in self.label_names)
+
+    @abc.abstractmethod
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def _sample(self, name: str, label_values: LabelValues, value: Number, extra_labels: Optional[Mapping[str, str]] = None) -> str:
+        labels = dict(zip(self.label_names, label_values, strict=True))
+        labels.update(extra_labels or {})
+
+        if labels:
+            rendered_labels = ",".join(f'{label_name}="{escape_label_value(label_value)}"' for label_name, label_value in labels.items())
+            return f"{name}{{{rendered_labels}}} {format_value(value)}"
+        return f"{name} {format_value(value)}"
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[LabelValues, Number] = {}
+
+    def inc(self, amount: Number = 1, **labels: str):
+        if amount < 0:
+            raise ValueError("Counters can only be increased.")
+
+        label_values = self._label_values(labels)
+        with self._lock:
+            self.__values[label_values] = self.__values.get(label_values, 0) + amount
+
+    def get(self, **labels: str) -> Number:
+        return self.__values.get(self._label_values(labels), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self.__values)
+        return [self._sample(f"{self.name}_total", label_values, value) for label_values, value in sorted(values.items())]
+
+
+class Gauge(Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[LabelValues, Number] = {}
+        self.__collect_function: Optional[Callable[[], Mapping[LabelValues, Number]]] = None
+
+    def set(self, value: Number, **labels: str):
+        label_values = self._label_values(labels)
+        with self._lock:
+            self.__values[label_values] = value
+
+    def get(self, **labels: str) -> Number:
+        return self.__values.get(self._label_values(labels), 0)
+
+    def set_collect_function(self, collect_function: Optional[Callable[[], Mapping[LabelValues, Number]]]):
+        """Sets a function to be called on each scrape instead of reporting the values set via `set`.
+
+        Args:
+            collect_function (Callable[[], Mapping[LabelValues, Number]], optional): Returns the current values by label values. `None` removes the function.
+        """
+        self.__collect_function = collect_function
+
+    def _render_samples(self) -> list[str]:
+        collect_function = self.__collect_function
+        if collect_function:
+            values = dict(collect_function())
+        else:
+            with self._lock:
+                values = dict(self.__values)
+        return [self._sample(self.name, label_values, value) for label_values, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.__bucket_counts: dict[LabelValues, list[int]] = {}
+        self.__sums: dict[LabelValues, float] = {}
+        self.__counts: dict[LabelValues, int] = {}
+
+    def get_count(self, **labels: str) -> int:
+        return self.__counts.get(self._label_values(labels), 0)
+
+    def get_sum(self, **labels: str) -> float:
+        return self.__sums.get(self._label_values(labels), 0.0)
+
+    def observe(self, value: float, **labels: str):
+        label_values = self._label_values(labels)
+        with self._lock:
+            bucket_counts = self.__bucket_counts.setdefault(label_values, [0] * len(self.buckets))
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[i] += 1
+            self.__sums[label_values] = self.__sums.get(label_values, 0.0) + value
+            self.__counts[label_values] = self.__counts.get(label_values, 0) + 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Generator[None, None, None]:
+        """Observes the duration of the `with` block in seconds, even if it raises an error."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            bucket_counts = {label_values: list(counts) for label_values, counts in self.__bucket_counts.items()}
+            sums = dict(self.__sums)
+            counts = dict(self.__counts)
+
+        lines = []
+        for label_values in sorted(counts.keys()):
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts[label_values], strict=True):
+                lines.append(self._sample(f"{self.name}_bucket", label_values, bucket_count, {"le": format_value(upper_bound)}))
+            lines.append(self._sample(f"{self.name}_bucket", label_values, counts[label_values], {"le": "+Inf"}))
+            lines.append(self._sample(f"{self.name}_sum", label_values, sums[label_values]))
+            lines.append(self._sample(f"{self.name}_count", label_values, counts[label_values]))
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = ""):
+        self.__prefix: str = prefix
+        self.__metrics: dict[str, Metric] = {}
+        self.__lock: threading.Lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self.__register(Counter(self.__prefix + name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Gauge:
+        return self.__register(Gauge(self.__prefix + name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.__register(Histogram(self.__prefix + name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """Renders all registered metrics in the Prometheus text exposition format."""
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def __register[T: Metric](self, metric: T) -> T:
+        with self.__lock:
+            if metric.name in self.__metrics:
+                raise ValueError(f"A metric with the name '{metric.name}' has already been registered.")
+            self.__metrics[metric.name] = metric
+        return metric
+
+
+class MetricsServer:
+    """Serves the metrics of a `MetricsRegistry` at `/metrics` from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "0.0.0.0"):
+        self.__registry: MetricsRegistry = registry
+        self.__http_server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self.__create_request_handler())
+        self.__http_server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.__http_server.server_address[1]
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__http_server.serve_forever, name="Metrics server", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+        if self.__thread:
+            self.__thread.join()
+
+    def __create_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        registry = self.__registry
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # Scrapes would flood stderr otherwise.
+                pass
+
+        return MetricsRequestHandler
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: Number) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return f"{value:.1f}"
+    return repr(value)
+
+
+__all__ = [
+    # Classes
+    Counter.__name__,
+    Gauge.__name__,
+    Histogram.__name__,
+    MetricsRegistry.__name__,
+    MetricsServer.__name__,
+]
@@ -1,17 +1,34 @@
-from . import base_error
-from .cancellation_token import CancellationToken
-from .collection_file import CollectionFileBase
-from .collection_file_change import CollectionFileChange
-from .status import ImportStatus, StatusFlag
+import importlib
+from typing import Any
 
 
-__all__ = [
+# Attributes are imported on first access, so that importing e.g. `filesystem` doesn't load pydantic.
+__attribute_modules = {
     # Module
-    base_error.__name__,
+    "base_error": None,
     # Classes
-    CancellationToken.__name__,
-    CollectionFileBase.__name__,
-    CollectionFileChange.__name__,
-    ImportStatus.__name__,
-    StatusFlag.__name__,
-]
+    "AimdLimiter": "aimd_limiter",
+    "ByteBudget": "byte_budget",
+    "CancellationToken": "cancellation_token",
+    "ChunkSizer": "chunk_sizer",
+    "CircuitBreaker": "circuit_breaker",
+    "CollectionFileBase": "collection_file",
+    "CollectionFileChange": "collection_file_change",
+    "ImportStatus": "status",
+    "RateLimiter": "rate_limiter",
+    "StatusFlag": "status",
+    "WatermarkTracker": "watermark_tracker",
+}
+
+
+__all__ = list(__attribute_modules.keys())
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __attribute_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name = __attribute_modules[name]
+    if module_name is None:
+        return importlib.import_module(f".{name}", __name__)
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
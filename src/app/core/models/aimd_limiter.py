@@ -0,0 +1,184 @@
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+from ...log.log_core import aimd_limiter as log
+from .cancellation_token import CancellationToken
+
+
+class AimdLimiter:
+    """Limits the number of concurrent operations to a limit tuned by additive increase & multiplicative decrease (AIMD).
+
+    Operations report their latency when they succeed and report an overload when they've been throttled or timed out. After a window of
+    successful operations, the limit is raised by 1, unless the 95th percentile of their latencies rose beyond `latency_tolerance` times
+    the baseline. Otherwise, and on each overload, the limit is cut by `decrease_factor`. Overloads reported by operations in flight during
+    a cut don't cut the limit again, since they started before it. Slots are granted in the order they've been requested.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: Optional[float] = 2.0,
+        min_window_size: int = 10,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Args:
+            name (str): The name of the operations limited, used in logs & metrics.
+            initial_limit (int): The limit to start with.
+            min_limit (int, optional): The lowest limit. Defaults to 1.
+            max_limit (int, optional): The highest limit. `None` keeps the limit at `initial_limit`. Defaults to None.
+            decrease_factor (float, optional): The factor to cut the limit by. Defaults to 0.5.
+            latency_tolerance (float, optional): The factor by which the p95 latency of a window may exceed the baseline. `None` ignores latencies. Defaults to 2.0.
+            min_window_size (int, optional): The minimum number of successful operations per window. A window spans at least `limit` operations. Defaults to 10.
+            poll_interval (float, optional): The number of seconds between checks of the cancel token while waiting. Defaults to 0.5.
+        """
+        self.name: str = name
+        self.__min_limit: int = max(min_limit, 1)
+        self.__max_limit: int = max(max_limit or initial_limit, self.__min_limit)
+        self.__limit: int = min(max(initial_limit, self.__min_limit), self.__max_limit)
+        self.__decrease_factor: float = decrease_factor
+        self.__latency_tolerance: Optional[float] = latency_tolerance
+        self.__min_window_size: int = min_window_size
+        self.__poll_interval: float = poll_interval
+
+        self.__in_flight: int = 0
+        self.__waiting: deque[object] = deque()  # A ticket per operation waiting for a slot, in the order requested
+        self.__started_before_cut: int = 0  # Operations in flight during the last cut, which haven't reported back yet
+        self.__latencies: list[float] = []
+        self.__baseline_latency: Optional[float] = None
+        self.__condition: threading.Condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    @property
+    def limit(self) -> int:
+        return self.__limit
+
+    @property
+    def max_limit(self) -> int:
+        return self.__max_limit
+
+    def acquire(self, cancel_token: Optional[CancellationToken] = None):
+        """Blocks until fewer operations than the limit are in flight and adds one.
+
+        Raises:
+            OperationCancelledError: Raised, if the `cancel_token` got cancelled while waiting.
+        """
+        with self.__condition:
+            if not self.__waiting and self.__in_flight < self.__limit:
+                self.__in_flight += 1
+                return
+
+            ticket = object()
+            self.__waiting.append(ticket)
+            try:
+                while self.__waiting[0] is not ticket or self.__in_flight >= self.__limit:
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    self.__condition.wait(self.__poll_interval)
+            finally:
+                self.__waiting.remove(ticket)
+                self.__condition.notify_all()  # The next operation in line may start, too.
+
+            self.__in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Adds an operation in flight, if fewer operations than the limit are in flight and no other operation is waiting for a slot.
+
+        Returns:
+            bool: `True`, if the operation may start.
+        """
+        with self.__condition:
+            if self.__waiting or self.__in_flight >= self.__limit:
+                return False
+
+            self.__in_flight += 1
+            return True
+
+    def release(self):
+        with self.__condition:
+            self.__in_flight = max(self.__in_flight - 1, 0)
+            self.__condition.notify_all()
+
+    @contextmanager
+    def slot(self, cancel_token: Optional[CancellationToken] = None) -> Generator[None, None, None]:
+        self.acquire(cancel_token=cancel_token)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self, latency: float):
+        """Records an operation, which succeeded after `latency` seconds, and raises the limit at the end of a healthy window."""
+        with self.__condition:
+            if self.__started_before_cut:
+                self.__started_before_cut -= 1
+                return
+
+            self.__latencies.append(latency)
+            if len(self.__latencies) < max(self.__limit, self.__min_window_size):
+                return
+
+            p95_latency = get_percentile(self.__latencies, 95)
+            self.__latencies.clear()
+
+            if self.__latency_too_high(p95_latency):
+                self.__decrease(f"p95 latency of {p95_latency:.2f} seconds")
+            elif self.__limit < self.__max_limit:
+                self.__limit += 1
+                log.limit_increased(self.name, self.__limit)
+                self.__condition.notify_all()
+
+    def record_overload(self, reason: str):
+        """Records an operation, which has been throttled or timed out, and cuts the limit."""
+        with self.__condition:
+            if self.__started_before_cut:
+                self.__started_before_cut -= 1
+                return
+
+            self.__latencies.clear()
+            self.__decrease(reason)
+
+    def __decrease(self, reason: str):
+        limit = max(math.floor(self.__limit * self.__decrease_factor), self.__min_limit)
+        self.__started_before_cut = max(self.__in_flight - 1, 0)  # The operation reporting the overload is done
+        if limit != self.__limit:
+            self.__limit = limit
+            log.limit_decreased(self.name, self.__limit, reason)
+
+    def __latency_too_high(self, p95_latency: float) -> bool:
+        if not self.__latency_tolerance:
+            return False
+
+        if self.__baseline_latency is None or p95_latency < self.__baseline_latency:
+            self.__baseline_latency = p95_latency
+            return False
+
+        too_high = p95_latency > self.__baseline_latency * self.__latency_tolerance
+        # The baseline follows lasting changes, e.g. by the time of day, slowly, so that a rise within a few windows is still detected.
+        self.__baseline_latency += (p95_latency - self.__baseline_latency) * 0.1
+        return too_high
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """Returns the value, which `percentile` percent of `values` are lower than or equal to (nearest-rank method)."""
+    values = sorted(values)
+    rank = max(math.ceil(percentile / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+__all__ = [
+    # Classes
+    AimdLimiter.__name__,
+    # Functions
+    get_percentile.__name__,
+]
@@ -0,0 +1,85 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+from ...log.log_core import byte_budget as log
+from .cancellation_token import CancellationToken
+
+
+class ByteBudget:
+    """Limits the number of bytes held in memory by concurrent operations.
+
+    A reservation blocks until the bytes in flight plus the requested size fit into the budget. A reservation larger than the whole budget
+    is admitted, once nothing else is in flight, so that it can't block forever. Reservations are admitted in the order they've been
+    requested, so that a large reservation waiting for bytes to be released isn't overtaken by a stream of small ones.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, poll_interval: float = 0.5):
+        """
+        Args:
+            max_bytes (int, optional): The maximum number of bytes in flight. `None` or a value lower than 1 disable the limit. Defaults to None.
+            poll_interval (float, optional): The number of seconds between checks of the cancel token while waiting. Defaults to 0.5.
+        """
+        self.__max_bytes: Optional[int] = max_bytes if max_bytes and max_bytes > 0 else None
+        self.__poll_interval: float = poll_interval
+        self.__in_flight: int = 0
+        self.__waiting: deque[object] = deque()  # A ticket per waiting reservation, in the order requested
+        self.__condition: threading.Condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self.__max_bytes
+
+    def acquire(self, size: int, cancel_token: Optional[CancellationToken] = None):
+        """Blocks until `size` bytes can be admitted and adds them to the bytes in flight.
+
+        Raises:
+            OperationCancelledError: Raised, if the `cancel_token` got cancelled while waiting.
+        """
+        with self.__condition:
+            if not self.__waiting and self.__can_admit(size):
+                self.__in_flight += size
+                return
+
+            log.wait_for_budget(size, self.__in_flight, self.__max_bytes)
+            ticket = object()
+            self.__waiting.append(ticket)
+            try:
+                while self.__waiting[0] is not ticket or not self.__can_admit(size):
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    self.__condition.wait(self.__poll_interval)
+            finally:
+                self.__waiting.remove(ticket)
+                self.__condition.notify_all()  # The next reservation in line may fit, too.
+
+            self.__in_flight += size
+
+    def release(self, size: int):
+        with self.__condition:
+            self.__in_flight = max(self.__in_flight - size, 0)
+            self.__condition.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int, cancel_token: Optional[CancellationToken] = None) -> Generator[None, None, None]:
+        self.acquire(size, cancel_token=cancel_token)
+        try:
+            yield
+        finally:
+            self.release(size)
+
+    def __can_admit(self, size: int) -> bool:
+        if self.__max_bytes is None or self.__in_flight == 0:
+            return True
+        return self.__in_flight + size <= self.__max_bytes
+
+
+__all__ = [
+    # Classes
+    ByteBudget.__name__,
+]
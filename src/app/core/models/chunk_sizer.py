@@ -0,0 +1,69 @@
+from typing import Optional
+
+from ...log.log_core import chunk_sizer as log
+
+
+class ChunkSizer:
+    """Sizes the next chunk of a bulk import, so that importing it takes about `target_duration` seconds.
+
+    The throughput observed for full chunks is smoothed, so that a single slow or fast chunk doesn't swing the size. A size changes by a
+    factor of 2 at most per chunk and is kept within `min_size` and `max_size`.
+    """
+
+    def __init__(self, initial_size: int, min_size: int, max_size: int, target_duration: Optional[float] = None, smoothing: float = 0.5):
+        """
+        Args:
+            initial_size (int): The size of the first chunk. It's the fixed size of all chunks, if adaptive sizing is disabled.
+            min_size (int): The smallest size chosen.
+            max_size (int): The largest size chosen.
+            target_duration (float, optional): The number of seconds importing a chunk should take. `None` or a value lower than or equal to 0 disable adaptive sizing. Defaults to None.
+            smoothing (float, optional): The weight of the latest throughput in the smoothed throughput, between 0 and 1. Defaults to 0.5.
+        """
+        self.__min_size: int = max(min_size, 1)
+        self.__max_size: int = max(max_size, self.__min_size)
+        self.__size: int = max(initial_size, 1)
+        self.__target_duration: Optional[float] = target_duration if target_duration and target_duration > 0 else None
+        self.__smoothing: float = smoothing
+        self.__files_per_second: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.__target_duration is not None
+
+    @property
+    def files_per_second(self) -> Optional[float]:
+        """The smoothed throughput of the chunks recorded so far."""
+        return self.__files_per_second
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def record(self, file_count: int, duration: float) -> int:
+        """Records the import of a full chunk of `file_count` files, which took `duration` seconds, and sizes the next chunk.
+
+        Returns:
+            int: The size of the next chunk.
+        """
+        if not self.enabled or file_count <= 0 or duration <= 0:
+            return self.__size
+
+        files_per_second = file_count / duration
+        if self.__files_per_second is None:
+            self.__files_per_second = files_per_second
+        else:
+            self.__files_per_second = self.__smoothing * files_per_second + (1 - self.__smoothing) * self.__files_per_second
+
+        size = round(self.__files_per_second * self.__target_duration)
+        size = min(max(size, self.__size // 2, self.__min_size), self.__size * 2, self.__max_size)
+        if size != self.__size:
+            log.size_changed(self.__size, size, self.__files_per_second)
+            self.__size = size
+
+        return self.__size
+
+
+__all__ = [
+    # Classes
+    ChunkSizer.__name__,
+]
@@ -0,0 +1,48 @@
+from ...log.log_core import circuit_breaker as log
+
+
+class CircuitBreaker:
+    """Stops calls to a service, once `failure_threshold` calls in a row failed, e.g. because the service is down for maintenance.
+
+    While the circuit is open, callers are expected to probe the service with a cheap request and to close the circuit via `record_success`
+    once a probe succeeds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5):
+        """
+        Args:
+            name (str): The name of the service, used in logs.
+            failure_threshold (int, optional): The number of failed calls in a row opening the circuit. A value lower than 1 keeps the circuit closed. Defaults to 5.
+        """
+        self.name: str = name
+        self.__failure_threshold: int = failure_threshold
+        self.__consecutive_failures: int = 0
+        self.__open: bool = False
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self.__consecutive_failures
+
+    @property
+    def is_open(self) -> bool:
+        return self.__open
+
+    def record_failure(self):
+        """Records a call, which failed without a response from the service, and opens the circuit after `failure_threshold` in a row."""
+        self.__consecutive_failures += 1
+        if not self.__open and 0 < self.__failure_threshold <= self.__consecutive_failures:
+            self.__open = True
+            log.circuit_opened(self.name, self.__consecutive_failures)
+
+    def record_success(self):
+        """Records a call, which got a response from the service, and closes the circuit."""
+        self.__consecutive_failures = 0
+        if self.__open:
+            self.__open = False
+            log.circuit_closed(self.name)
+
+
+__all__ = [
+    # Classes
+    CircuitBreaker.__name__,
+]
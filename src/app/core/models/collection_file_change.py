@@ -7,6 +7,7 @@ class CollectionFileChange:
     collection_file_id: int = None
     imported: Optional[bool] = None
     error: Optional[bool] = None
+    last_error: Optional[str] = None
 
     def __str__(self) -> str:
         changes = []
@@ -17,6 +18,9 @@ class CollectionFileChange:
         if self.error is not None:
             changes.append(f"error={self.error}")
 
+        if self.last_error is not None:
+            changes.append(f"last_error={self.last_error}")
+
         return ", ".join(changes)
 
     def __repr__(self) -> str:
@@ -25,6 +29,7 @@ class CollectionFileChange:
                 f"collection_file_id={self.collection_file_id}",
                 f"imported={self.imported}",
                 f"error={self.error}",
+                f"last_error={self.last_error}",
             ]
         )
         return f"<CollectionFileChange: {attributes}>"
@@ -2,8 +2,6 @@ import json
 from pathlib import Path
 from typing import Optional, Union
 
-import yaml
-
 
 class FileSystem:
     def delete(self, path: Union[Path, str], *, missing_ok: bool = False):
@@ -17,6 +15,8 @@ class FileSystem:
             json.dump(content, fp, indent=indent)
 
     def dump_yaml(self, path: Union[Path, str], content: dict):
+        import yaml
+
         with open(path, "w") as fp:
             yaml.dump(content, fp)
 
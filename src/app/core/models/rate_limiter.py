@@ -0,0 +1,57 @@
+import multiprocessing
+import multiprocessing.context
+import time
+from typing import Optional
+
+from ...log.log_core import rate_limiter as log
+
+
+class RateLimiter:
+    """Spaces out requests, so that no more than `max_per_second` requests start per second.
+
+    The time of the next free slot is kept in shared memory, so a limiter passed to worker processes on their creation limits the requests
+    of all processes together.
+    """
+
+    def __init__(self, max_per_second: Optional[float] = None, context: Optional[multiprocessing.context.BaseContext] = None):
+        """
+        Args:
+            max_per_second (float, optional): The maximum number of requests per second. `None` or a value lower than or equal to 0 disable the limit. Defaults to None.
+            context (BaseContext, optional): The multiprocessing context of the processes sharing the limiter. Defaults to the default context.
+        """
+        context = context or multiprocessing.get_context()
+        self.__interval: float = 1.0 / max_per_second if max_per_second and max_per_second > 0 else 0.0
+        self.__next_slot = context.Value("d", 0.0) if self.__interval else None  # Seconds since the epoch
+
+    @property
+    def max_per_second(self) -> Optional[float]:
+        return 1.0 / self.__interval if self.__interval else None
+
+    def reserve(self) -> float:
+        """Reserves the next free slot.
+
+        Returns:
+            float: The number of seconds to wait before the request may start.
+        """
+        if not self.__interval:
+            return 0.0
+
+        with self.__next_slot.get_lock():
+            now = time.time()  # Unlike monotonic clocks, it's the same in all processes.
+            slot = max(self.__next_slot.value, now)
+            self.__next_slot.value = slot + self.__interval
+
+        return slot - now
+
+    def acquire(self):
+        """Blocks until the next free slot."""
+        wait_for_seconds = self.reserve()
+        if wait_for_seconds > 0:
+            log.wait_for_slot(wait_for_seconds)
+            time.sleep(wait_for_seconds)
+
+
+__all__ = [
+    # Classes
+    RateLimiter.__name__,
+]
@@ -1,8 +1,13 @@
 from threading import Lock
+from typing import TYPE_CHECKING, Optional
 
 from .cancellation_token import CancellationToken
 
 
+if TYPE_CHECKING:
+    from ...models.run_statistics import RunStatistics
+
+
 class StatusFlag:
     def __init__(self, name: str, initial_value: bool):
         self.__value: bool = initial_value
@@ -35,6 +40,7 @@ class ImportStatus:
         self.bulk_database_running = StatusFlag("bulk_database_running", False)
         self.cancel_token: CancellationToken = CancellationToken()
         self.download_worker_timed_out = StatusFlag("download_worker_timed_out", False)
+        self.run_statistics: Optional["RunStatistics"] = None
 
     @property
     def cancelled(self) -> bool:
@@ -0,0 +1,74 @@
+import bisect
+from datetime import datetime
+from typing import Hashable, Mapping, Optional
+
+
+class WatermarkTracker:
+    """Tracks the low watermark of items completing in any order: the latest position, up to which all items have been completed.
+
+    Items are ordered by their position, e.g. the modified date of a file. Items completed ahead of an item still pending are held in a
+    reorder buffer, until the pending item completes, too. Several items may share a position.
+    """
+
+    def __init__(self, positions: Mapping[Hashable, datetime], watermark: Optional[datetime] = None):
+        """
+        Args:
+            positions (Mapping[Hashable, datetime]): The position of each item by its key. Items at or before `watermark` are ignored.
+            watermark (datetime, optional): The watermark before any item has been completed. Defaults to None.
+        """
+        self.__watermark: Optional[datetime] = watermark
+        self.__keys: list[Hashable] = sorted(
+            (key for key, position in positions.items() if watermark is None or position > watermark), key=lambda key: positions[key]
+        )
+        self.__positions: list[datetime] = [positions[key] for key in self.__keys]
+        self.__indices: dict[Hashable, int] = {key: index for index, key in enumerate(self.__keys)}
+        self.__completed: set[int] = set()  # The reorder buffer
+        self.__next_index: int = 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.__keys) - self.__next_index - len(self.__completed)
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        return self.__watermark
+
+    def complete(self, key: Hashable) -> bool:
+        """Marks the item with `key` as completed. Unknown keys & items completed before are ignored.
+
+        Returns:
+            bool: `True`, if the watermark advanced.
+        """
+        index = self.__indices.get(key)
+        if index is None or index < self.__next_index:
+            return False
+
+        self.__completed.add(index)
+        if index != self.__next_index:
+            return False
+
+        while self.__next_index in self.__completed:
+            self.__completed.remove(self.__next_index)
+            self.__next_index += 1
+
+        # Items sharing a position with a pending item don't advance the watermark to that position.
+        position = self.__positions[self.__next_index - 1]
+        if self.__next_index < len(self.__positions) and self.__positions[self.__next_index] == position:
+            position = self.__get_position_before(self.__next_index)
+
+        if position is None or (self.__watermark is not None and position <= self.__watermark):
+            return False
+
+        self.__watermark = position
+        return True
+
+    def __get_position_before(self, index: int) -> Optional[datetime]:
+        first_index = bisect.bisect_left(self.__positions, self.__positions[index])
+        if first_index == 0:
+            return None
+        return self.__positions[first_index - 1]
+
+
+__all__ = [
+    WatermarkTracker.__name__,
+]
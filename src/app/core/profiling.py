@@ -0,0 +1,56 @@
+import cProfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, Optional, Union
+
+from ..log.log_core import profiling as log
+
+
+class Profiler:
+    """Profiles a block of code with `cProfile`.
+
+    Since Python 3.12, `cProfile` profiles all threads of the process, including threads started while profiling, like the download worker
+    and its thread pool. Only one profiler can be active at a time, so if another profiler is active already, nothing will be profiled.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled: bool = enabled
+        self.__profile: Optional[cProfile.Profile] = None
+
+    @contextmanager
+    def profile(self) -> Generator[None, None, None]:
+        if not self.enabled:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as exc:
+            log.profiler_unavailable(exc)
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.__profile = profile
+
+    def dump(self, file_path: Union[Path, str]) -> bool:
+        """Writes the profile to `file_path` in the `pstats` format.
+
+        Returns:
+            bool: `True`, if a file has been written. `False`, if nothing has been profiled.
+        """
+        if not self.__profile:
+            return False
+
+        self.__profile.dump_stats(file_path)
+        return True
+
+
+__all__ = [
+    # Classes
+    Profiler.__name__,
+]
@@ -0,0 +1,169 @@
+import json
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator, Mapping, Optional, Protocol, Union
+
+
+AttributeValue = Union[bool, int, float, str]
+
+# See: https://opentelemetry.io/docs/specs/otlp/#json-protobuf-encoding
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_UNSET = 0
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "start_time_ns", "end_time_ns", "attributes", "status_code", "status_message")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        start_time_ns: Optional[int] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ):
+        self.trace_id: str = trace_id
+        self.span_id: str = secrets.token_hex(8)
+        self.parent_span_id: Optional[str] = parent_span_id
+        self.name: str = name
+        self.start_time_ns: int = start_time_ns or time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.attributes: dict[str, AttributeValue] = dict(attributes or {})
+        self.status_code: int = STATUS_CODE_UNSET
+        self.status_message: Optional[str] = None
+
+    @property
+    def ended(self) -> bool:
+        return self.end_time_ns is not None
+
+    def set_error(self, exception: BaseException):
+        self.status_code = STATUS_CODE_ERROR
+        self.status_message = f"{type(exception).__name__}: {exception}"
+
+    def to_otlp_json(self) -> dict[str, Any]:
+        """Returns the span in the shape of a span in the OTLP/JSON encoding."""
+        result = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [{"key": key, "value": to_otlp_any_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.status_message:
+            result["status"]["message"] = self.status_message
+        return result
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span):
+        pass
+
+
+class JsonLinesSpanExporter:
+    """Appends each finished span as a single line of JSON to a file."""
+
+    def __init__(self, file_path: Union[Path, str]):
+        self.file_path: Path = Path(file_path)
+        self.__lock: threading.Lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_otlp_json(), separators=(",", ":"))
+        with self.__lock:
+            with open(self.file_path, "a", encoding="utf-8") as fp:
+                fp.write(line + "\n")
+
+
+class Tracer:
+    """Records spans and hands them to a `SpanExporter` when they end. Without an exporter, no spans are created and all methods accept `None`."""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.__exporter: Optional[SpanExporter] = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.__exporter is not None
+
+    def set_exporter(self, exporter: Optional[SpanExporter]):
+        self.__exporter = exporter
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        start_time_ns: Optional[int] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ) -> Optional[Span]:
+        if not self.enabled:
+            return None
+
+        if parent:
+            return Span(name, parent.trace_id, parent.span_id, start_time_ns=start_time_ns, attributes=attributes)
+        return Span(name, secrets.token_hex(16), start_time_ns=start_time_ns, attributes=attributes)
+
+    def end_span(self, span: Optional[Span], end_time_ns: Optional[int] = None, attributes: Optional[Mapping[str, AttributeValue]] = None):
+        """Ends and exports `span`. Spans that already ended are ignored."""
+        exporter = self.__exporter
+        if span is None or span.ended or exporter is None:
+            return
+
+        span.attributes.update(attributes or {})
+        span.end_time_ns = end_time_ns or time.time_ns()
+        exporter.export(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_time_ns: int,
+        end_time_ns: Optional[int] = None,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ):
+        """Records a span of an operation that has already finished."""
+        span = self.start_span(name, parent=parent, start_time_ns=start_time_ns, attributes=attributes)
+        self.end_span(span, end_time_ns=end_time_ns)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ) -> Generator[Optional[Span], None, None]:
+        """Records the `with` block as a span. If the block raises an error, the span's status will be set to error."""
+        span = self.start_span(name, parent=parent, attributes=attributes)
+        try:
+            yield span
+        except BaseException as exc:
+            if span:
+                span.set_error(exc)
+            raise
+        finally:
+            self.end_span(span)
+
+
+def to_otlp_any_value(value: AttributeValue) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+__all__ = [
+    # Classes
+    JsonLinesSpanExporter.__name__,
+    Span.__name__,
+    SpanExporter.__name__,
+    Tracer.__name__,
+]
@@ -7,6 +7,12 @@ from typing import Any, Awaitable, Callable, Iterable, Mapping, Optional, Union
 from .models.filesystem import FileSystem
 
 
+GDRIVE_FILE_NAME_FORMATS = [  # The current format comes first.
+    "pss-top-100_%Y%m%d-%H%M%S.json",
+    "pss-top-100-%Y%m%d-%H%M%S.json",
+]
+
+
 def create_async_thread(
     coro: Callable[..., Awaitable[Any]],
     name: str = None,
@@ -36,10 +42,7 @@ def extract_timestamp_from_gdrive_file_name(file_name: str) -> datetime:
     Returns:
         datetime: The extracted timestamp as a timezone-naive `datetime`.
     """
-    format_strings = [
-        "pss-top-100_%Y%m%d-%H%M%S.json",
-        "pss-top-100-%Y%m%d-%H%M%S.json",
-    ]
+    format_strings = GDRIVE_FILE_NAME_FORMATS
     expected_file_name_lengths = [len(format_string) + 2 for format_string in format_strings]
 
     if len(file_name) not in expected_file_name_lengths:
@@ -54,6 +57,20 @@ def extract_timestamp_from_gdrive_file_name(file_name: str) -> datetime:
     raise ValueError(f"The provided file name '{file_name}' did not match any of the expected formats: {format_strings}")
 
 
+def get_gdrive_file_name_prefix(timestamp: datetime) -> str:
+    """Returns the start of the name of a Collection file recorded in the hour of `timestamp`, in the current file name format.
+
+    Args:
+        timestamp (datetime): The time of recording.
+
+    Returns:
+        str: The file name up to and including the hour, e.g. `pss-top-100_20240816-12`.
+    """
+    format_string = GDRIVE_FILE_NAME_FORMATS[0]
+    minute_index = format_string.index("%M")
+    return timestamp.strftime(format_string[:minute_index])
+
+
 def get_next_full_hour(dt: datetime) -> datetime:
     """Get a `datetime` representing the next full hour relative to the input.
 
@@ -102,6 +119,7 @@ def remove_timezone(dt: Optional[datetime]) -> datetime:
 __all__ = [
     create_async_thread.__name__,
     extract_timestamp_from_gdrive_file_name.__name__,
+    get_gdrive_file_name_prefix.__name__,
     get_next_full_hour.__name__,
     get_now.__name__,
     is_empty_file.__name__,
@@ -0,0 +1,103 @@
+import hmac
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Mapping, Optional
+
+from ..log.log_core import webhook as log
+
+
+RESOURCE_STATE_SYNC = "sync"  # Sent once, when a channel has been registered. Doesn't indicate a change.
+
+
+class DriveNotification:
+    __slots__ = ("channel_id", "resource_id", "resource_state", "message_number", "changed")
+
+    def __init__(self, channel_id: str, resource_id: str, resource_state: str, message_number: int, changed: tuple[str, ...] = ()):
+        self.channel_id: str = channel_id
+        self.resource_id: str = resource_id
+        self.resource_state: str = resource_state
+        self.message_number: int = message_number
+        self.changed: tuple[str, ...] = changed
+
+    def __repr__(self) -> str:
+        return f"<DriveNotification channel_id={self.channel_id}, resource_state={self.resource_state}, message_number={self.message_number}>"
+
+
+class NotificationReceiver:
+    """Receives the change notifications posted by Google Drive from a daemon thread and hands them to a callback.
+
+    Notifications not carrying the token of a channel registered via `expect_channel` are rejected. The callback is called from the
+    receiver's thread, so it must be thread-safe and return quickly, since Google Drive waits for the response.
+    """
+
+    def __init__(self, on_notification: Callable[[DriveNotification], None], port: int, host: str = "0.0.0.0"):
+        self.__on_notification: Callable[[DriveNotification], None] = on_notification
+        self.__tokens: dict[str, str] = {}  # By channel ID
+        self.__http_server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self.__create_request_handler())
+        self.__http_server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.__http_server.server_address[1]
+
+    def expect_channel(self, channel_id: str, token: str):
+        self.__tokens[channel_id] = token
+
+    def forget_channel(self, channel_id: str):
+        self.__tokens.pop(channel_id, None)
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__http_server.serve_forever, name="Notification receiver", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+        if self.__thread:
+            self.__thread.join()
+
+    def handle(self, headers: Mapping[str, str]) -> int:
+        """Hands a notification to the callback, if it's authentic, and returns the HTTP status code to respond with."""
+        channel_id = headers.get("X-Goog-Channel-ID", "")
+        expected_token = self.__tokens.get(channel_id)
+        if expected_token is None or not hmac.compare_digest(expected_token, headers.get("X-Goog-Channel-Token", "")):
+            log.notification_rejected(channel_id)
+            return 403
+
+        notification = DriveNotification(
+            channel_id,
+            headers.get("X-Goog-Resource-ID", ""),
+            headers.get("X-Goog-Resource-State", ""),
+            int(headers.get("X-Goog-Message-Number") or 0),
+            tuple(filter(None, headers.get("X-Goog-Changed", "").split(","))),
+        )
+        log.notification_received(notification)
+        if notification.resource_state != RESOURCE_STATE_SYNC:
+            self.__on_notification(notification)
+        return 200
+
+    def __create_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        receiver = self
+
+        class NotificationRequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length") or 0)
+                if content_length:
+                    self.rfile.read(content_length)  # Notifications of files.watch don't have a body, but drain it anyway.
+
+                self.send_response(receiver.handle(self.headers))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):  # Notifications are logged via the app's logger instead.
+                pass
+
+        return NotificationRequestHandler
+
+
+__all__ = [
+    # Classes
+    DriveNotification.__name__,
+    NotificationReceiver.__name__,
+]
@@ -5,6 +5,7 @@ from sqlalchemy.sql.operators import is_
 from sqlmodel import asc, col, desc, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..core import utils
 from .models import CollectionFileDB
 
 
@@ -59,9 +60,12 @@ async def list_collection_files(session: AsyncSession, imported: Optional[bool]
         return list(results.all())
 
 
-async def get_latest_imported_gdrive_modified_date(session: AsyncSession) -> Optional[datetime]:
+async def get_latest_imported_gdrive_modified_date(session: AsyncSession, modified_before: Optional[datetime] = None) -> Optional[datetime]:
     async with session:
         query = select(CollectionFileDB).where(is_(CollectionFileDB.imported, True)).order_by(desc(CollectionFileDB.gdrive_modified_date))
+
+        if modified_before:
+            query = query.where(col(CollectionFileDB.gdrive_modified_date) < utils.remove_timezone(modified_before))
         result = await session.exec(query)
         collection_file = result.first()
         if collection_file:
@@ -2,9 +2,6 @@ import asyncio
 import io
 from typing import AsyncGenerator, Optional
 
-import alembic.command
-import sqlalchemy_utils
-from alembic.config import Config as AlembicConfig
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_scoped_session, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
@@ -80,6 +77,10 @@ class Database:
             echo (bool, optional): Determines, if SQL statements should be logged to `stdout`. Defaults to `self.echo`.
             reinitialize (bool, optional): Determines, if all tables should be dropped before being recreated. Defaults to False.
         """
+        import alembic.command
+        import sqlalchemy_utils
+        from alembic.config import Config as AlembicConfig
+
         sync_connection_string = sync_connection_string or self.sync_connection_string
         async_connection_string = async_connection_string or self.async_connection_string
         echo = echo or self.echo
@@ -102,6 +103,9 @@ class Database:
         log.database_updated(db_name)
 
     def alembic_current_is_head(self, sync_connection_string: Optional[str] = None):
+        import alembic.command
+        from alembic.config import Config as AlembicConfig
+
         sync_connection_string = sync_connection_string or self.sync_connection_string
         output_buffer = io.StringIO()
 
@@ -1,5 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
+from sqlalchemy import BigInteger
 from sqlmodel import Field, SQLModel
 
 from ..core.models import CollectionFileBase
@@ -15,8 +17,46 @@ class CollectionFileDB(SQLModel, CollectionFileBase, table=True):
     timestamp: datetime = Field(index=True, unique=True)
     imported: bool = Field(default=False)
     error: bool = Field(default=False)
+    lease_owner: Optional[str] = Field(default=None)  # The importer instance working on the file
+    lease_expires_at: Optional[datetime] = Field(default=None, index=True)
+    attempt_count: int = Field(default=0)
+    next_attempt_at: Optional[datetime] = Field(default=None, index=True)  # When to retry a failed file, if at all
+    last_error: Optional[str] = Field(default=None)
+
+
+class ImportCheckpointDB(SQLModel, table=True):
+    __tablename__ = "import_checkpoint"
+
+    import_checkpoint_id: int = Field(primary_key=True, index=True, default=None, sa_column_kwargs={"name": "id"})
+    name: str = Field(index=True, unique=True)  # The time range imported, see `importer.get_checkpoint_name`
+    watermark: datetime  # All files modified up to this date & time have been imported
+    updated_at: datetime
+
+
+class ImportRunDB(SQLModel, table=True):
+    __tablename__ = "import_run"
+
+    import_run_id: int = Field(primary_key=True, index=True, default=None, sa_column_kwargs={"name": "id"})
+    started_at: datetime = Field(index=True)
+    finished_at: datetime
+    modified_after: Optional[datetime] = Field(default=None)
+    modified_before: Optional[datetime] = Field(default=None)
+    file_count: int = Field(default=0)
+    downloaded_count: int = Field(default=0)
+    imported_count: int = Field(default=0)
+    download_error_count: int = Field(default=0)
+    import_error_count: int = Field(default=0)
+    retry_count: int = Field(default=0)
+    bytes_downloaded: int = Field(default=0, sa_type=BigInteger)
+    bytes_imported: int = Field(default=0, sa_type=BigInteger)
+    queued_seconds: float = Field(default=0.0)
+    downloading_seconds: float = Field(default=0.0)
+    downloaded_seconds: float = Field(default=0.0)
+    importing_seconds: float = Field(default=0.0)
 
 
 __all__ = [
     CollectionFileDB.__name__,
+    ImportCheckpointDB.__name__,
+    ImportRunDB.__name__,
 ]
@@ -4,13 +4,22 @@ from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import async_scoped_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..adapters.repository import AbstractCollectionFileRepository, SqlModelCollectionFileRepository
+from ..adapters.repository import (
+    AbstractCollectionFileRepository,
+    AbstractImportCheckpointRepository,
+    AbstractImportRunRepository,
+    SqlModelCollectionFileRepository,
+    SqlModelImportCheckpointRepository,
+    SqlModelImportRunRepository,
+)
 from ..log.log_database import async_auto_rollback_session as log
 from .db_repository import DatabaseRepository
 
 
 class AbstractUnitOfWork(abc.ABC):
     collection_files: AbstractCollectionFileRepository
+    import_checkpoints: AbstractImportCheckpointRepository
+    import_runs: AbstractImportRunRepository
 
     async def __aenter__(self) -> "AbstractUnitOfWork":
         return self
@@ -37,6 +46,8 @@ class SqlModelUnitOfWork(AbstractUnitOfWork):
         async with self.session_factory() as self.session:
             async with self.session.begin():
                 self.collection_files = SqlModelCollectionFileRepository(self.session)
+                self.import_checkpoints = SqlModelImportCheckpointRepository(self.session)
+                self.import_runs = SqlModelImportRunRepository(self.session)
                 return await super().__aenter__()
 
     async def __aexit__(self, exc_type, exception, _):
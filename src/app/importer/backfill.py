@@ -0,0 +1,301 @@
+import asyncio
+import multiprocessing
+import multiprocessing.queues
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Callable, Optional, Union
+
+from ..core import config, utils
+from ..core.gdrive import GoogleDriveClient
+from ..core.models.rate_limiter import RateLimiter
+from ..log import base as logger_base
+from ..log.log_importer import backfill as log
+from .importer import Importer, get_checkpoint_modified_after, get_checkpoint_name
+
+
+@dataclass(frozen=True)
+class BackfillWindow:
+    index: int
+    modified_after: datetime
+    modified_before: datetime
+
+
+@dataclass(frozen=True)
+class WindowProgress:
+    window_index: int
+    watermark: datetime
+    file_count: int = 0
+    imported_count: int = 0
+    bytes_imported: int = 0
+    finished: bool = False
+
+
+def split_time_range(start: datetime, end: datetime, window_count: int) -> list[BackfillWindow]:
+    """Splits the time range from `start` to `end` into up to `window_count` windows of whole hours of roughly the same length.
+
+    The first window starts at the full hour of `start`, the last window ends at `end`. There're fewer windows, if the time range
+    spans fewer hours than `window_count`.
+    """
+    start = utils.remove_timezone(start).replace(minute=0, second=0, microsecond=0)
+    end = utils.remove_timezone(end)
+    if end <= start:
+        return []
+
+    hour_count = int((end - start) / timedelta(hours=1)) or 1
+    window_count = max(min(window_count, hour_count), 1)
+
+    windows = []
+    for index in range(window_count):
+        window_start = start + timedelta(hours=hour_count * index // window_count)
+        window_end = start + timedelta(hours=hour_count * (index + 1) // window_count) if index < window_count - 1 else end
+        windows.append(BackfillWindow(index, window_start, window_end))
+    return windows
+
+
+class BackfillProgress:
+    """Merges the progress reported by the workers importing the windows of a backfill."""
+
+    def __init__(self, windows: list[BackfillWindow]):
+        self.windows: list[BackfillWindow] = windows
+        self.__progress: dict[int, WindowProgress] = {window.index: WindowProgress(window.index, window.modified_after) for window in windows}
+
+    @property
+    def bytes_imported(self) -> int:
+        return sum(progress.bytes_imported for progress in self.__progress.values())
+
+    @property
+    def covered_fraction(self) -> float:
+        """The fraction of the backfilled time range up to the watermarks of the windows."""
+        total_seconds = sum((window.modified_before - window.modified_after).total_seconds() for window in self.windows)
+        if not total_seconds:
+            return 1.0
+
+        covered_seconds = 0.0
+        for window in self.windows:
+            progress = self.__progress[window.index]
+            watermark = window.modified_before if progress.finished else min(utils.remove_timezone(progress.watermark), window.modified_before)
+            covered_seconds += max((watermark - window.modified_after).total_seconds(), 0.0)
+        return covered_seconds / total_seconds
+
+    @property
+    def file_count(self) -> int:
+        return sum(progress.file_count for progress in self.__progress.values())
+
+    @property
+    def finished_window_count(self) -> int:
+        return len([progress for progress in self.__progress.values() if progress.finished])
+
+    @property
+    def imported_count(self) -> int:
+        return sum(progress.imported_count for progress in self.__progress.values())
+
+    def get_eta(self, elapsed_seconds: float) -> Optional[timedelta]:
+        """Extrapolates the time left from the time range covered so far."""
+        covered_fraction = self.covered_fraction
+        if not covered_fraction:
+            return None
+        return timedelta(seconds=elapsed_seconds * (1.0 - covered_fraction) / covered_fraction)
+
+    def update(self, progress: WindowProgress):
+        self.__progress[progress.window_index] = progress
+
+
+async def backfill_window(
+    importer: Importer,
+    gdrive_client: GoogleDriveClient,
+    window: BackfillWindow,
+    report: Optional[Callable[[WindowProgress], None]] = None,
+) -> WindowProgress:
+    """Imports the files modified within `window`, one chunk at a time, continuing after the latest file imported within the window."""
+    checkpoint_name = get_checkpoint_name(window.modified_after, window.modified_before)
+    watermark = await get_checkpoint_modified_after(checkpoint_name, modified_after=window.modified_after, modified_before=window.modified_before)
+    progress = WindowProgress(window.index, watermark)
+    stalled = False
+    log.window_start(window, watermark)
+
+    while utils.remove_timezone(watermark) < window.modified_before:
+        if importer.status.cancel_token.cancelled:
+            break
+
+        last_modified_date = await importer.run_bulk_import(
+            gdrive_client, modified_after=watermark, modified_before=window.modified_before, checkpoint_name=checkpoint_name
+        )
+        statistics = importer.status.run_statistics
+        if importer.api_circuit.is_open:
+            # Files kept during the outage hold the watermark back. They're imported by the next run, once the API is available again.
+            await importer.wait_for_api_recovery()
+            continue
+
+        if not statistics.listed_file_count:
+            watermark = window.modified_before  # Nothing left to list within the window.
+            break
+
+        if utils.remove_timezone(last_modified_date) <= utils.remove_timezone(watermark):
+            # The first file listed hasn't been completed, e.g. due to a download timeout. It's listed again by the next backfill.
+            stalled = True
+            log.window_stalled(window, watermark)
+            break
+
+        watermark = last_modified_date
+        progress = WindowProgress(
+            window.index,
+            watermark,
+            progress.file_count + statistics.file_count,
+            progress.imported_count + statistics.imported_count,
+            progress.bytes_imported + statistics.bytes_imported,
+        )
+        if report:
+            report(progress)
+
+    progress = WindowProgress(
+        window.index,
+        watermark,
+        progress.file_count,
+        progress.imported_count,
+        progress.bytes_imported,
+        finished=not importer.status.cancel_token.cancelled and not stalled,
+    )
+    if report:
+        report(progress)
+    log.window_finish(window, progress)
+    return progress
+
+
+class WorkerConfig(config.ConfigBase):
+    """The app's configuration with the limits of a single worker. The app's `Config` can't be changed."""
+
+    def __init__(self, overrides: dict[str, Union[int, str]]):
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+
+__progress_queue: Optional[multiprocessing.queues.Queue] = None
+__gdrive_rate_limiter: Optional[RateLimiter] = None
+__config_overrides: dict[str, int] = {}
+
+
+def initialize_worker(progress_queue: multiprocessing.queues.Queue, gdrive_rate_limiter: RateLimiter, config_overrides: dict[str, int]):
+    """Runs once in each worker process. The queue & the rate limiter are shared with the coordinator, so they're passed on creation."""
+    global __progress_queue, __gdrive_rate_limiter, __config_overrides
+
+    __progress_queue = progress_queue
+    __gdrive_rate_limiter = gdrive_rate_limiter
+    __config_overrides = config_overrides
+
+    logger_base.configure_logging_from_app_config(config.ConfigRepository.get_config())
+
+
+def run_window(window: BackfillWindow) -> WindowProgress:
+    """Imports a window in a worker process with its own clients."""
+    return asyncio.run(run_window_async(window))
+
+
+async def run_window_async(window: BackfillWindow) -> WindowProgress:
+    from pss_fleet_data import PssFleetDataClient
+
+    configuration = WorkerConfig(__config_overrides)
+    configuration = WorkerConfig({**__config_overrides, **get_window_config_overrides(configuration, window)})
+    fleet_data_client = PssFleetDataClient(configuration.api_default_server_url, configuration.api_key)
+    importer = Importer(configuration, fleet_data_client, gdrive_rate_limiter=__gdrive_rate_limiter)
+    gdrive_client = await asyncio.to_thread(importer.create_gdrive_client)
+
+    return await backfill_window(importer, gdrive_client, window, report=__progress_queue.put)
+
+
+def get_window_config_overrides(configuration: config.ConfigBase, window: BackfillWindow) -> dict[str, str]:
+    """Gives each window its own journal & instance ID, so that workers importing windows at the same time don't rewrite each other's journal.
+
+    The folder of a window is named after its time range, so that a restarted backfill resumes the window's journal & reclaims its leases.
+    """
+    window_name = f"backfill-{window.modified_after:%Y%m%d%H%M%S}-{window.modified_before:%Y%m%d%H%M%S}"
+    journal_file_path = configuration.import_journal_file_path
+    overrides = {"journal_file_path": str(journal_file_path.parent.joinpath(window_name, journal_file_path.name))}
+
+    if configuration.instance_id:
+        overrides["instance_id"] = f"{configuration.instance_id}-{window_name}"
+    return overrides
+
+
+def get_worker_config_overrides(configuration: config.ConfigBase, worker_count: int) -> dict[str, int]:
+    """Splits the limits on concurrency & memory among the workers, so that together they stay within the configured limits."""
+    return {
+        "download_thread_pool_size": max(configuration.download_thread_pool_size // worker_count, 1),
+        "download_max_concurrency": max(configuration.download_max_concurrency // worker_count, 1),
+        "upload_max_concurrency": max(configuration.upload_max_concurrency // worker_count, 1),
+        "download_memory_budget": configuration.download_memory_budget // worker_count if configuration.download_memory_budget > 0 else 0,
+        "progress_interval": 0,  # The coordinator reports the progress of all workers.
+    }
+
+
+async def run_backfill(
+    configuration: config.ConfigBase,
+    start: datetime,
+    end: datetime,
+    worker_count: int,
+    window_count: Optional[int] = None,
+) -> BackfillProgress:
+    """Imports the files modified from `start` to `end` with `worker_count` processes, each importing one window of the time range at a time.
+
+    Returns:
+        BackfillProgress: The merged progress of the windows.
+    """
+    windows = split_time_range(start, end, window_count or worker_count)
+    progress = BackfillProgress(windows)
+    worker_count = max(min(worker_count, len(windows)), 1)
+    log.backfill_start(start, end, len(windows), worker_count)
+
+    context = multiprocessing.get_context("spawn")  # Forking would copy the event loop & the threads of the coordinator.
+    progress_queue = context.Queue()
+    gdrive_rate_limiter = RateLimiter(configuration.gdrive_max_requests_per_second, context=context)
+    config_overrides = get_worker_config_overrides(configuration, worker_count)
+
+    started_at = monotonic()
+    last_report_at = started_at
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(
+        worker_count, mp_context=context, initializer=initialize_worker, initargs=(progress_queue, gdrive_rate_limiter, config_overrides)
+    ) as executor:
+        futures = [loop.run_in_executor(executor, run_window, window) for window in windows]
+        pending = set(futures)
+
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=1.0)
+            drain_progress_queue(progress_queue, progress)
+
+            if configuration.progress_interval > 0 and monotonic() - last_report_at >= configuration.progress_interval:
+                last_report_at = monotonic()
+                log.backfill_progress(progress, progress.get_eta(last_report_at - started_at))
+
+    drain_progress_queue(progress_queue, progress)
+    for window, future in zip(windows, futures, strict=True):
+        if future.exception():
+            log.window_error(window, future.exception())
+        else:
+            progress.update(future.result())
+
+    log.backfill_finish(progress, timedelta(seconds=monotonic() - started_at))
+    return progress
+
+
+def drain_progress_queue(progress_queue: multiprocessing.queues.Queue, progress: BackfillProgress):
+    while True:
+        try:
+            progress.update(progress_queue.get_nowait())
+        except queue.Empty:
+            return
+
+
+__all__ = [
+    # Classes
+    BackfillProgress.__name__,
+    BackfillWindow.__name__,
+    WindowProgress.__name__,
+    # Functions
+    backfill_window.__name__,
+    run_backfill.__name__,
+    split_time_range.__name__,
+]
@@ -2,22 +2,28 @@ import logging
 import random
 import time
 from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import timedelta
 from pathlib import Path
-from typing import Any, Iterable, Optional, Protocol, Union
-
-import pydrive2.files
+from typing import Any, Callable, Iterable, Optional, Protocol, Union
 
 from ..core import utils
 from ..core.gdrive import GDriveFile, GoogleDriveClient
+from ..core.models.aimd_limiter import AimdLimiter
+from ..core.models.byte_budget import ByteBudget
 from ..core.models.cancellation_token import CancellationToken, OperationCancelledError
 from ..core.models.filesystem import FileSystem
+from ..core.tracing import Span
 from ..log.log_importer import download_worker as log
-from ..models.queue_item import QueueItem
+from ..models.queue_item import QueueItem, QueueItemFailure, QueueItemState
+from . import metrics, tracing
 from . import utils as importer_utils
 from .exceptions import DownloadFailedError
 
 
+GDRIVE_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
 class DownloadFunction(Protocol):
     def __call__(self, queue_item: QueueItem, *args, cancel_token: CancellationToken, **kwargs) -> QueueItem:
         pass
@@ -30,11 +36,19 @@ def worker(
     debug_mode: bool,
     cancel_token: CancellationToken,
     worker_timeout: float = 60.0,
+    memory_budget: Optional[int] = None,
     filesystem: FileSystem = FileSystem(),
+    on_downloaded: Optional[Callable[[QueueItem], None]] = None,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ):
+    """Downloads the files of `queue_items` in a thread pool. With a `concurrency_limiter`, the pool has a thread per download it may admit."""
     log.download_worker_started()
 
-    log.thread_pool_setup(thread_pool_size)
+    if concurrency_limiter:
+        thread_pool_size = max(thread_pool_size, concurrency_limiter.max_limit)
+
+    log.thread_pool_setup(thread_pool_size, memory_budget)
+    byte_budget = ByteBudget(memory_budget)
     executor = ThreadPoolExecutor(thread_pool_size, thread_name_prefix="Download gdrive file")
     futures = setup_futures(
         executor,
@@ -43,12 +57,15 @@ def worker(
         cancel_token=cancel_token,
         additional_func_args=(gdrive_client, debug_mode),
         max_download_attempts=3,
+        byte_budget=byte_budget,
         filesystem=filesystem,
+        on_downloaded=on_downloaded,
+        concurrency_limiter=concurrency_limiter,
     )
 
     log.wait_for_futures()
     for future, queue_item in futures:
-        wait_for_future(future, queue_item, executor, cancel_token, worker_timeout)
+        wait_for_future(future, queue_item, executor, cancel_token, worker_timeout, concurrency_limiter=concurrency_limiter)
 
     if cancel_token.cancelled:
         log.thread_pool_cancel()
@@ -65,13 +82,14 @@ def wait_for_future(
     executor: ThreadPoolExecutor,
     cancel_token: CancellationToken,
     timeout: float = 60.0,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ):
     if cancel_token.cancelled:
         if not future.done():
             future.cancel()
         return
 
-    wait_for_download(future, queue_item, executor, timeout)
+    wait_for_download(future, queue_item, executor, timeout, concurrency_limiter=concurrency_limiter)
 
 
 def wait_for_download(
@@ -79,29 +97,48 @@ def wait_for_download(
     queue_item: QueueItem,
     executor: ThreadPoolExecutor,
     timeout: float = 60,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ) -> QueueItem:
     try:
-        future.result(timeout=timeout)
+        wait_for_result(future, queue_item, timeout)
     except (CancelledError, OperationCancelledError):
         pass
     except TimeoutError:
-        queue_item.status.download_error.value = True
-        queue_item.status.download_timed_out.value = True
+        queue_item.status.fail(QueueItemFailure.DOWNLOAD_TIMED_OUT)
 
         executor.shutdown(False, cancel_futures=True)
+        if concurrency_limiter:
+            concurrency_limiter.record_overload("a download timeout")
 
         log.future_timeout(queue_item.item_no)
     except Exception as exc:
-        queue_item.status.download_error.value = True
+        queue_item.status.fail(QueueItemFailure.DOWNLOAD_ERROR)
 
         log.future_error(queue_item.item_no, exc)
     else:
-        queue_item.status.downloaded.value = True
         queue_item.status.downloaded_at = utils.get_now()
+        queue_item.status.transition(QueueItemState.DOWNLOADED)
 
     return queue_item
 
 
+def wait_for_result(future: Future, queue_item: QueueItem, timeout: float = 60):
+    """Waits for the download of `queue_item` to finish within `timeout` seconds after it started. Waiting for a slot of the concurrency
+    limiter or for memory of the byte budget doesn't count, since a download may wait there behind others, which started later.
+
+    Raises:
+        TimeoutError: Raised, if the download didn't finish within `timeout` seconds after it started.
+    """
+    while True:
+        started_at = queue_item.status.download_started_at
+        remaining = timeout if started_at is None else max(started_at + timeout - time.perf_counter(), 0.0)
+        try:
+            return future.result(timeout=remaining)
+        except TimeoutError:
+            if started_at is not None:
+                raise
+
+
 def setup_futures(
     executor: ThreadPoolExecutor,
     queue_items: Iterable[QueueItem],
@@ -131,21 +168,74 @@ def download_gdrive_file(
     gdrive_client: GoogleDriveClient,
     log_stack_trace_on_download_error: bool,
     max_download_attempts: int = 3,
+    byte_budget: Optional[ByteBudget] = None,
     filesystem: FileSystem = FileSystem(),
+    on_downloaded: Optional[Callable[[QueueItem], None]] = None,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ):
-    if file_already_downloaded(queue_item, filesystem=filesystem):
-        log.file_exists(queue_item.item_no, queue_item.target_file_path)
-        return
+    """Downloads the file of `queue_item` to disk, unless it's been downloaded before. Calls `on_downloaded` from the download thread.
+
+    A download waits for a slot of the `concurrency_limiter` before reserving memory, so that waiting downloads don't hold on to memory.
+    """
+    queue_item.status.transition(QueueItemState.DOWNLOADING)
+
+    if queue_item.trace_span:
+        tracing.TRACER.record_span(tracing.SPAN_DOWNLOAD_QUEUED, queue_item.trace_span.start_time_ns, parent=queue_item.trace_span)
+
+    with tracing.TRACER.span(tracing.SPAN_DOWNLOAD, parent=queue_item.trace_span) as download_span:
+        if file_already_downloaded(queue_item, filesystem=filesystem):
+            log.file_exists(queue_item.item_no, queue_item.target_file_path)
+            if on_downloaded:
+                on_downloaded(queue_item)
+            return
+
+        byte_budget = byte_budget or ByteBudget()
+        slot = concurrency_limiter.slot(queue_item.status.cancel_token) if concurrency_limiter else nullcontext()
+
+        # The file contents are held in memory from the download until they've been written to disk.
+        with (
+            slot,
+            byte_budget.reserve(queue_item.gdrive_file.size, queue_item.status.cancel_token),
+        ):
+            queue_item.status.download_started_at = time.perf_counter()
+            download_and_write_gdrive_file(
+                queue_item,
+                gdrive_client,
+                log_stack_trace_on_download_error,
+                max_download_attempts,
+                trace_span=download_span,
+                filesystem=filesystem,
+                concurrency_limiter=concurrency_limiter,
+            )
+
+    log.downloaded_file(queue_item.item_no, queue_item.target_file_path)
+    if on_downloaded:
+        on_downloaded(queue_item)
+
+
+def download_and_write_gdrive_file(
+    queue_item: QueueItem,
+    gdrive_client: GoogleDriveClient,
+    log_stack_trace_on_download_error: bool,
+    max_download_attempts: int,
+    trace_span: Optional[Span] = None,
+    filesystem: FileSystem = FileSystem(),
+    concurrency_limiter: Optional[AimdLimiter] = None,
+):
+    import pydrive2.files
 
     try:
-        file_contents = download_gdrive_file_contents(
-            queue_item.gdrive_file,
-            gdrive_client,
-            queue_item.status.cancel_token,
-            queue_item.item_no,
-            max_download_attempts,
-            log_stack_trace_on_download_error,
-        )
+        with tracing.TRACER.span(tracing.SPAN_DOWNLOAD_FETCH, parent=trace_span):
+            file_contents = download_gdrive_file_contents(
+                queue_item.gdrive_file,
+                gdrive_client,
+                queue_item.status.cancel_token,
+                queue_item.item_no,
+                max_download_attempts,
+                log_stack_trace_on_download_error,
+                on_retry=queue_item.status.record_retry,
+                concurrency_limiter=concurrency_limiter,
+            )
     except (pydrive2.files.ApiRequestError, pydrive2.files.FileNotDownloadableError) as download_error:
         raise DownloadFailedError(queue_item.gdrive_file.name, str(download_error), inner_exception=download_error) from download_error
 
@@ -153,19 +243,18 @@ def download_gdrive_file(
         raise DownloadFailedError(queue_item.gdrive_file.name, "The downloaded file was empty.")
 
     try:
-        write_gdrive_file_to_disk(
-            file_contents,
-            queue_item.target_file_path,
-            queue_item.status.cancel_token,
-            queue_item.item_no,
-            queue_item.gdrive_file.name,
-            max_download_attempts,
-        )
+        with tracing.TRACER.span(tracing.SPAN_DOWNLOAD_WRITE, parent=trace_span):
+            write_gdrive_file_to_disk(
+                file_contents,
+                queue_item.target_file_path,
+                queue_item.status.cancel_token,
+                queue_item.item_no,
+                queue_item.gdrive_file.name,
+                max_download_attempts,
+            )
     except IOError as io_error:
         raise DownloadFailedError(queue_item.gdrive_file.name, str(io_error), inner_exception=io_error) from io_error
 
-    log.downloaded_file(queue_item.item_no, queue_item.target_file_path)
-
 
 def file_already_downloaded(queue_item: QueueItem, filesystem: FileSystem = FileSystem()) -> bool:
     if importer_utils.check_if_exists(queue_item.target_file_path, queue_item.gdrive_file.size, filesystem):
@@ -184,31 +273,60 @@ def download_gdrive_file_contents(
     item_no: int,
     max_download_attempts: int,
     log_stack_trace: bool,
+    on_retry: Optional[Callable[[], None]] = None,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ) -> str:
+    """Downloads the contents of `gdrive_file`, retrying failed attempts. Reports throttled attempts & latencies to the `concurrency_limiter`."""
+    import pydrive2.files
+
     download_error: Union[pydrive2.files.ApiRequestError, pydrive2.files.FileNotDownloadableError] = None
 
     for attempt in range(max_download_attempts):
         cancel_token.raise_if_cancelled("Cancelled download of file no. %i: %s", item_no, gdrive_file.name, log_level=logging.DEBUG)
 
         log.downloading_gdrive_file(attempt, item_no, gdrive_file.name)
+        if attempt > 0:
+            metrics.RETRIES.inc(operation=metrics.OPERATION_DOWNLOAD)
+            if on_retry:
+                on_retry()
 
+        start = time.perf_counter()
         try:
-            file_contents = gdrive_file.get_content_string()
+            with metrics.DOWNLOAD_DURATION.time():
+                file_contents = gdrive_client.get_file_content_string(gdrive_file)
         except (pydrive2.files.ApiRequestError, pydrive2.files.FileNotDownloadableError) as exc:
             download_error = exc
+            if concurrency_limiter and is_throttled(exc):
+                concurrency_limiter.record_overload(f"a throttled download ({exc.error.get('code')})")
             sleep_for = timedelta(seconds=2 ^ attempt, microseconds=random.randint(0, 1000000))
             log.download_error(item_no, gdrive_file.name, log_stack_trace, download_error, sleep_for)
             time.sleep(sleep_for.total_seconds())  # Wait for a increasing time before retrying as recommended in the google API docs
             continue
 
+        if concurrency_limiter:
+            concurrency_limiter.record_success(time.perf_counter() - start)
+
         cancel_token.raise_if_cancelled("Cancelled download of file no. %i: %s", item_no, gdrive_file.name, log_level=logging.DEBUG)
         log.file_contents_downloaded(item_no, gdrive_file.name)
+        metrics.DOWNLOADED_BYTES.inc(gdrive_file.size)
 
         return file_contents
 
     raise download_error
 
 
+def is_throttled(download_error: Exception) -> bool:
+    """Returns `True`, if Google Drive rejected a request due to rate limits or server load, rather than due to the file requested."""
+    import pydrive2.files
+
+    if not isinstance(download_error, pydrive2.files.ApiRequestError):
+        return False
+
+    code = download_error.error.get("code")
+    reasons = {error.get("reason") for error in download_error.error.get("errors", [])}
+    return code == 429 or (isinstance(code, int) and code >= 500) or bool(reasons.intersection(GDRIVE_RATE_LIMIT_REASONS))
+
+
 def write_gdrive_file_to_disk(
     file_contents: str,
     file_path: Union[Path, str],
@@ -220,9 +338,12 @@ def write_gdrive_file_to_disk(
 ):
     io_error: IOError = None
 
-    for _ in range(max_write_attempts):
+    for attempt in range(max_write_attempts):
         cancel_token.raise_if_cancelled("Cancelled download of file no. %i: %s", item_no, gdrive_file_name, log_level=logging.DEBUG)
 
+        if attempt > 0:
+            metrics.RETRIES.inc(operation=metrics.OPERATION_WRITE)
+
         try:
             filesystem.write(file_path, file_contents)
             return
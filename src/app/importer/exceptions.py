@@ -14,6 +14,13 @@ class DownloadFailedError(ImporterBaseError):
         return f"<{DownloadFailedError.__name__} file_name={self.file_name}, reason={self.reason}, inner_exception={type(self.inner_exception)}>"
 
 
+class ApiUnavailableError(ImporterBaseError):
+    def __init__(self, service_name: str):
+        self.service_name: str = service_name
+        super().__init__(f"The {service_name} is unavailable. Calls are paused until it responds again.")
+
+
 __all__ = [
+    ApiUnavailableError.__name__,
     DownloadFailedError.__name__,
 ]
@@ -1,12 +1,19 @@
 import asyncio
+import time
+from typing import Optional
 
+import httpx
 from pss_fleet_data import PssFleetDataClient
-from pss_fleet_data.core.exceptions import ApiError, ConflictError, NonUniqueTimestampError
+from pss_fleet_data.core.exceptions import ApiError, ConflictError, NonUniqueTimestampError, ServerError, TooManyRequestsError
 
 from ..core import utils
+from ..core.models.aimd_limiter import AimdLimiter
+from ..core.models.circuit_breaker import CircuitBreaker
 from ..core.models.filesystem import FileSystem
 from ..log.log_importer import import_worker as log
-from ..models import QueueItem
+from ..models import QueueItem, QueueItemFailure, QueueItemState
+from . import metrics, tracing
+from .exceptions import ApiUnavailableError
 
 
 async def process_queue_item(
@@ -16,19 +23,34 @@ async def process_queue_item(
     update_existing_collections: bool = False,
     import_attempts: int = 2,
     filesystem: FileSystem = FileSystem(),
+    concurrency_limiter: Optional[AimdLimiter] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
 ):
-    if skip_file_import_on_error(queue_item, filesystem=filesystem):
+    """Imports the downloaded file of `queue_item`.
+
+    Raises:
+        ApiUnavailableError: Raised, if the `circuit_breaker` is open or the upload failed with a server error or without the API responding,
+            e.g. due to a timeout. The queue item is left unfinished, so that it can be imported later.
+    """
+    with tracing.TRACER.span(tracing.SPAN_VALIDATE, parent=queue_item.trace_span):
+        skip_file = skip_file_import_on_error(queue_item, filesystem=filesystem)
+
+    if skip_file:
         log.skip_file_error(queue_item.item_no, queue_item.gdrive_file.name)
     else:
         log.import_start(queue_item.item_no, queue_item.target_file_path)
-        await do_import(
-            fleet_data_client,
-            queue_item,
-            keep_downloaded_files,
-            update_existing_collections=update_existing_collections,
-            import_attempts=import_attempts,
-            filesystem=filesystem,
-        )
+        queue_item.status.transition(QueueItemState.IMPORTING)
+        with tracing.TRACER.span(tracing.SPAN_IMPORT, parent=queue_item.trace_span):
+            await do_import(
+                fleet_data_client,
+                queue_item,
+                keep_downloaded_files,
+                update_existing_collections=update_existing_collections,
+                import_attempts=import_attempts,
+                filesystem=filesystem,
+                concurrency_limiter=concurrency_limiter,
+                circuit_breaker=circuit_breaker,
+            )
 
 
 async def do_import(
@@ -38,33 +60,69 @@ async def do_import(
     update_existing_collections: bool = False,
     import_attempts: int = 2,
     filesystem: FileSystem = FileSystem(),
+    concurrency_limiter: Optional[AimdLimiter] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
 ):
     collection_exists = False
 
     try:
-        await upload_collection(fleet_data_client, queue_item, import_attempts=import_attempts, reraise_non_unique_timestamp_error=True)
+        await upload_collection(
+            fleet_data_client,
+            queue_item,
+            import_attempts=import_attempts,
+            reraise_non_unique_timestamp_error=True,
+            concurrency_limiter=concurrency_limiter,
+            circuit_breaker=circuit_breaker,
+        )
     except NonUniqueTimestampError:
         collection_exists = True
-    except ApiError as exc:
-        log.file_import_api_error(queue_item.item_no, queue_item.gdrive_file.name, exc)
-        queue_item.status.import_error.value = True
+    except ApiUnavailableError:
+        raise
+    except Exception as exc:
+        fail_import(queue_item, exc)
     else:
-        queue_item.status.imported.value = True
+        queue_item.status.transition(QueueItemState.IMPORTED)
 
     if collection_exists:
         if update_existing_collections:
-            try:
-                await update_collection(fleet_data_client, queue_item, import_attempts=import_attempts)
-            except ApiError as exc:
-                log.file_import_api_error(queue_item.item_no, queue_item.gdrive_file.name, exc)
-                queue_item.status.import_error.value = True
-            else:
-                queue_item.status.imported.value = True
+            await do_update(
+                fleet_data_client,
+                queue_item,
+                import_attempts=import_attempts,
+                concurrency_limiter=concurrency_limiter,
+                circuit_breaker=circuit_breaker,
+            )
         else:
-            queue_item.status.imported.value = True
+            queue_item.status.transition(QueueItemState.IMPORTED)
+
+    if queue_item.status.imported:
+        queue_item.status.imported_at = utils.get_now()
 
-    if queue_item.status.imported and not keep_downloaded_files:
-        filesystem.delete(queue_item.target_file_path, missing_ok=True)
+        if not keep_downloaded_files:
+            filesystem.delete(queue_item.target_file_path, missing_ok=True)
+
+
+async def do_update(
+    fleet_data_client: PssFleetDataClient,
+    queue_item: QueueItem,
+    import_attempts: int = 2,
+    concurrency_limiter: Optional[AimdLimiter] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+):
+    try:
+        await update_collection(
+            fleet_data_client,
+            queue_item,
+            import_attempts=import_attempts,
+            concurrency_limiter=concurrency_limiter,
+            circuit_breaker=circuit_breaker,
+        )
+    except ApiUnavailableError:
+        raise
+    except Exception as exc:
+        fail_import(queue_item, exc)
+    else:
+        queue_item.status.transition(QueueItemState.IMPORTED)
 
 
 async def upload_collection(
@@ -72,13 +130,24 @@ async def upload_collection(
     queue_item: QueueItem,
     reraise_non_unique_timestamp_error: bool = False,
     import_attempts: int = 2,
+    concurrency_limiter: Optional[AimdLimiter] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
 ):
     import_error: Exception = None
 
     for attempt in range(import_attempts):
+        raise_if_circuit_open(circuit_breaker)
+        if attempt > 0:
+            metrics.RETRIES.inc(operation=metrics.OPERATION_UPLOAD)
+            queue_item.status.record_retry()
+
+        start = time.perf_counter()
         try:
-            collection_metadata = await fleet_data_client.upload_collection(queue_item.target_file_path)
+            with metrics.UPLOAD_DURATION.time(operation=metrics.OPERATION_UPLOAD):
+                collection_metadata = await fleet_data_client.upload_collection(queue_item.target_file_path)
         except NonUniqueTimestampError as exc:
+            if circuit_breaker:
+                circuit_breaker.record_success()
             if reraise_non_unique_timestamp_error:
                 raise exc
             log.collection_upload_skipped(queue_item.item_no, queue_item.target_file_path)
@@ -86,19 +155,24 @@ async def upload_collection(
         except Exception as exc:
             import_error = exc
             log.file_import_error(queue_item.item_no, queue_item.target_file_path, exc)
+            record_upload_error(exc, concurrency_limiter=concurrency_limiter, circuit_breaker=circuit_breaker)
         else:
+            record_upload_success(time.perf_counter() - start, concurrency_limiter=concurrency_limiter, circuit_breaker=circuit_breaker)
             log.file_import_completed(queue_item.item_no, queue_item.target_file_path, collection_metadata.collection_id)
+            metrics.UPLOADED_BYTES.inc(queue_item.gdrive_file.size)
             return
 
         await asyncio.sleep(2 ^ attempt)
 
-    raise import_error
+    raise_import_error(import_error, circuit_breaker)
 
 
 async def update_collection(
     fleet_data_client: PssFleetDataClient,
     queue_item: QueueItem,
     import_attempts: int = 2,
+    concurrency_limiter: Optional[AimdLimiter] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
 ):
     import_error: Exception = None
 
@@ -106,23 +180,83 @@ async def update_collection(
     existing_collection_metadata = await fleet_data_client.get_most_recent_collection_metadata_by_timestamp(timestamp)
 
     for attempt in range(import_attempts):
+        raise_if_circuit_open(circuit_breaker)
+        if attempt > 0:
+            metrics.RETRIES.inc(operation=metrics.OPERATION_UPDATE)
+            queue_item.status.record_retry()
+
+        start = time.perf_counter()
         try:
-            collection_metadata = await fleet_data_client.update_collection(existing_collection_metadata.collection_id, queue_item.target_file_path)
+            with metrics.UPLOAD_DURATION.time(operation=metrics.OPERATION_UPDATE):
+                collection_metadata = await fleet_data_client.update_collection(
+                    existing_collection_metadata.collection_id, queue_item.target_file_path
+                )
         except ConflictError:
+            if circuit_breaker:
+                circuit_breaker.record_success()
             log.collection_update_skipped(queue_item.item_no, queue_item.target_file_path)
             return
         except Exception as exc:
             import_error = exc
             log.file_import_error(queue_item.item_no, queue_item.target_file_path, exc)
+            record_upload_error(exc, concurrency_limiter=concurrency_limiter, circuit_breaker=circuit_breaker)
         else:
+            record_upload_success(time.perf_counter() - start, concurrency_limiter=concurrency_limiter, circuit_breaker=circuit_breaker)
             log.file_import_update_completed(queue_item.item_no, queue_item.target_file_path, collection_metadata.collection_id)
+            metrics.UPLOADED_BYTES.inc(queue_item.gdrive_file.size)
             return
 
         await asyncio.sleep(2 ^ attempt)
 
+    raise_import_error(import_error, circuit_breaker)
+
+
+def fail_import(queue_item: QueueItem, import_error: Exception):
+    log.file_import_api_error(queue_item.item_no, queue_item.gdrive_file.name, import_error)
+    queue_item.status.fail(QueueItemFailure.IMPORT_ERROR)
+
+
+def is_api_unavailable(upload_error: Exception) -> bool:
+    """Returns `True`, if an upload failed with a server error or didn't get a response, e.g. due to a timeout, rather than due to the file."""
+    return isinstance(upload_error, (ServerError, httpx.TransportError, TimeoutError))
+
+
+def raise_if_circuit_open(circuit_breaker: Optional[CircuitBreaker]):
+    if circuit_breaker and circuit_breaker.is_open:
+        raise ApiUnavailableError(circuit_breaker.name)
+
+
+def raise_import_error(import_error: Exception, circuit_breaker: Optional[CircuitBreaker]):
+    """Raises the error of the last import attempt. If the API is unavailable, raises `ApiUnavailableError` instead, so that the file is kept
+    and imported later rather than recorded as failed.
+    """
+    if circuit_breaker and is_api_unavailable(import_error):
+        raise ApiUnavailableError(circuit_breaker.name) from import_error
     raise import_error
 
 
+def record_upload_error(upload_error: Exception, concurrency_limiter: Optional[AimdLimiter] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+    """Reports an upload, which has been throttled, failed with a server error or didn't get a response, e.g. due to a timeout."""
+    api_unavailable = is_api_unavailable(upload_error)
+
+    if concurrency_limiter and (api_unavailable or isinstance(upload_error, TooManyRequestsError)):
+        concurrency_limiter.record_overload(f"a failed upload ({type(upload_error).__name__})")
+
+    if circuit_breaker:
+        if api_unavailable:
+            circuit_breaker.record_failure()
+        elif isinstance(upload_error, ApiError):
+            circuit_breaker.record_success()  # The API responded, so it's available.
+
+
+def record_upload_success(latency: float, concurrency_limiter: Optional[AimdLimiter] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+    if concurrency_limiter:
+        concurrency_limiter.record_success(latency)
+
+    if circuit_breaker:
+        circuit_breaker.record_success()
+
+
 def skip_file_import_on_error(queue_item: QueueItem, filesystem: FileSystem = FileSystem()) -> bool:
     if queue_item.status.cancel_token.cancelled:
         return True
@@ -1,49 +1,106 @@
 import asyncio
+import socket
 import threading
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Iterable, Optional
 
-from httpx import ConnectError
-from pss_fleet_data import PssFleetDataClient
-
-from ..converters import FromCollectionFileDB, FromGdriveFile
+from ..converters import FromCollectionFileDB, FromGdriveFile, FromRunStatistics
 from ..core import utils
+from ..core.clock import Clock, SystemClock
 from ..core.config import Config
 from ..core.gdrive import GDriveFile, GoogleDriveClient
+from ..core.models.aimd_limiter import AimdLimiter
 from ..core.models.cancellation_token import CancellationToken
+from ..core.models.chunk_sizer import ChunkSizer
+from ..core.models.circuit_breaker import CircuitBreaker
 from ..core.models.collection_file_change import CollectionFileChange
 from ..core.models.filesystem import FileSystem
+from ..core.models.rate_limiter import RateLimiter
+from ..core.models.watermark_tracker import WatermarkTracker
+from ..core.profiling import Profiler
+from ..core.tracing import Span
+from ..database.db_repository import DatabaseRepository
 from ..database.models import CollectionFileDB
 from ..database.unit_of_work import AbstractUnitOfWork, SqlModelUnitOfWork
 from ..log.log_importer import importer as log
-from ..models import ImportStatus, QueueItem
-from . import download_worker, import_worker
+from ..models import ImportStatus, QueueItem, RunStatistics
+from . import download_worker, import_worker, journal, metrics, preflight, retry, tracing
+from .exceptions import ApiUnavailableError
+from .progress import ProgressReporter
+from .push import PushNotifications
+
+
+if TYPE_CHECKING:
+    from pss_fleet_data import PssFleetDataClient
 
 
 class Importer:
     def __init__(
         self,
         config: Config,
-        pss_fleet_data_client: PssFleetDataClient,
+        pss_fleet_data_client: "PssFleetDataClient",
         filesystem: FileSystem = FileSystem(),
+        clock: Optional[Clock] = None,
+        gdrive_rate_limiter: Optional[RateLimiter] = None,
     ):
         self.config: Config = config
-        self.fleet_data_client: PssFleetDataClient = pss_fleet_data_client
+        self.fleet_data_client: "PssFleetDataClient" = pss_fleet_data_client
         self.filesystem = filesystem
+        self.clock: Clock = clock or SystemClock()
+        self.gdrive_rate_limiter: RateLimiter = gdrive_rate_limiter or RateLimiter(config.gdrive_max_requests_per_second)
+        self.retry_policy: retry.RetryPolicy = retry.RetryPolicy(config.retry_max_attempts, config.retry_base_delay, config.retry_max_delay)
+        self.chunk_sizer: ChunkSizer = ChunkSizer(config.chunk_size, config.chunk_min_size, config.chunk_max_size, config.chunk_target_duration)
+        self.download_limiter: AimdLimiter = create_concurrency_limiter(
+            metrics.OPERATION_DOWNLOAD, config.download_thread_pool_size, config.download_max_concurrency, config.autotune_concurrency
+        )
+        self.upload_limiter: AimdLimiter = create_concurrency_limiter(
+            metrics.OPERATION_UPLOAD, 1, config.upload_max_concurrency, config.autotune_concurrency
+        )
+        self.api_circuit: CircuitBreaker = CircuitBreaker("PSS Fleet Data API", config.api_circuit_failure_threshold)
+        self.watch_gdrive_client: Optional[GoogleDriveClient] = None  # Created once, when watching for the next file for the first time
 
         self.status = ImportStatus()
+        self.progress = ProgressReporter(self.config.progress_interval)
 
     def cancel_workers(self):
         log.workers_cancel()
         self.status.cancel_token.cancel()
 
     async def check_api_server_connection(self) -> bool:
+        from httpx import ConnectError
+
         try:
             await self.fleet_data_client.ping()
             return True
         except ConnectError:
             return False
 
+    async def run_preflight(
+        self,
+        gdrive_client: GoogleDriveClient,
+        initialize_database: Optional[Callable[[], Any]] = None,
+    ) -> list[preflight.PreflightStepResult]:
+        """Authenticates with Google Drive, pings the PSS Fleet Data API and initializes the database concurrently.
+
+        Args:
+            gdrive_client (GoogleDriveClient): The client to authenticate.
+            initialize_database (Callable[[], Any], optional): Creates and migrates the database. Defaults to `DatabaseRepository.get_db`.
+
+        Returns:
+            list[preflight.PreflightStepResult]: The result of each step.
+        """
+        initialize_database = initialize_database or DatabaseRepository.get_db
+
+        return await preflight.run_steps(
+            {
+                preflight.STEP_GDRIVE: lambda: asyncio.to_thread(gdrive_client.initialize),
+                preflight.STEP_API_SERVER: self.check_api_server_connection,
+                preflight.STEP_DATABASE: lambda: asyncio.to_thread(initialize_database),
+            }
+        )
+
     async def run_import_loop(
         self,
         run_once: bool = False,
@@ -53,129 +110,585 @@ class Importer:
     ):
         cancel_message = "Import cancelled. Exiting import loop."
 
-        import_modified_after = await get_updated_modified_after(modified_after=modified_after)
+        checkpoint_name = get_checkpoint_name(modified_after, modified_before)
+        import_modified_after = await get_checkpoint_modified_after(checkpoint_name, modified_after=modified_after, modified_before=modified_before)
+        import_hour = import_modified_after  # The hour of the next file expected. Files are listed from the exact watermark, though.
+        metrics.track_watermark(import_modified_after, clock=self.clock)
 
-        while True:
-            if self.status.cancel_token.log_if_cancelled(cancel_message):
-                break
-
-            if import_modified_after and modified_before and import_modified_after >= modified_before:
-                break
-
-            if import_modified_after and utils.get_next_full_hour(import_modified_after) > utils.get_now():
-                await wait_for_next_import()
-            else:
-                gdrive_client = GoogleDriveClient(
-                    self.config.gdrive_project_id,
-                    self.config.gdrive_private_key_id,
-                    self.config.gdrive_private_key,
-                    self.config.gdrive_client_email,
-                    self.config.gdrive_client_id,
-                    self.config.gdrive_scopes,
-                    self.config.gdrive_folder_id,
-                    self.config.gdrive_service_account_file_path,
-                    self.config.gdrive_settings_file_path,
-                )
-                gdrive_client.initialize()
+        push_notifications = await self.start_push_notifications()
+        retries: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if self.status.cancel_token.log_if_cancelled(cancel_message):
+                    break
+
+                if import_modified_after and modified_before and import_modified_after >= modified_before:
+                    break
+
+                # While the API is unavailable, the watermark stays before the files kept for later, so waiting for their hour wouldn't wait.
+                if self.api_circuit.is_open or (import_hour and utils.get_next_full_hour(import_hour) > self.clock.now()):
+                    if not await self.wait_for_next_run(import_hour, push_notifications):
+                        continue
 
-                import_modified_after = await self.run_bulk_import(
+                retries = self.start_retries(retries, filesystem=filesystem)
+                gdrive_client = self.create_gdrive_client()
+                last_modified_date = await self.run_bulk_import(
                     gdrive_client,
                     modified_after=import_modified_after,
                     modified_before=modified_before,
                     filesystem=filesystem,
+                    checkpoint_name=checkpoint_name,
                 )
-                import_modified_after = utils.get_next_full_hour(import_modified_after)
+                import_hour = get_next_import_hour(import_hour, import_modified_after, last_modified_date, self.clock.now())
+                import_modified_after = last_modified_date or import_modified_after
+                metrics.track_watermark(import_modified_after, clock=self.clock)
+
+                if run_once or self.time_range_finished(modified_before):
+                    break
+        except BaseException:
+            if retries:
+                retries.cancel()
+            raise
+        finally:
+            if retries:
+                await asyncio.gather(retries, return_exceptions=True)
+            if push_notifications:
+                await push_notifications.stop()
+
+    def time_range_finished(self, modified_before: Optional[datetime]) -> bool:
+        """Returns `True`, if the last bulk import listed no files left before `modified_before` and no more files can appear before it."""
+        statistics = self.status.run_statistics
+        return bool(
+            modified_before and statistics and not statistics.listed_file_count and self.clock.now() >= utils.remove_timezone(modified_before)
+        )
+
+    def start_retries(self, retries: Optional[asyncio.Task] = None, filesystem: FileSystem = FileSystem()) -> Optional[asyncio.Task]:
+        """Starts retrying failed files in the background, unless retries are disabled or still running.
+
+        Returns:
+            Optional[asyncio.Task]: The task retrying files.
+        """
+        if not self.retry_policy.enabled or (retries and not retries.done()):
+            return retries
+
+        return asyncio.create_task(self.retry_failed_files(filesystem=filesystem), name="Retries")
+
+    async def retry_failed_files(self, gdrive_client: Optional[GoogleDriveClient] = None, filesystem: FileSystem = FileSystem()) -> int:
+        """Retries the files, which failed to import before and are due for another attempt, in batches of `config.retry_batch_size`.
+
+        Retries run alongside the bulk imports of new files with a download thread of their own. They lease files under an owner of their own,
+        so that a bulk import running at the same time won't import the same files.
+
+        Returns:
+            int: The number of files imported.
+        """
+        attempted_collection_file_ids: set[int] = set()
+        imported_count = 0
 
-                if run_once:
+        try:
+            while not self.status.cancel_token.cancelled and not self.api_circuit.is_open:
+                due_collection_files = [
+                    collection_file
+                    for collection_file in await retry.list_due_retries(self.clock.now(), limit=self.config.retry_batch_size)
+                    if collection_file.collection_file_id not in attempted_collection_file_ids
+                ]
+                if not due_collection_files:
                     break
 
+                attempted_collection_file_ids.update(collection_file.collection_file_id for collection_file in due_collection_files)
+                gdrive_client = gdrive_client or await asyncio.to_thread(self.create_gdrive_client)
+                imported_count += await self.retry_collection_files(gdrive_client, due_collection_files, filesystem=filesystem)
+        except Exception as exc:
+            log.retries_error(exc)
+
+        return imported_count
+
+    async def retry_collection_files(
+        self, gdrive_client: GoogleDriveClient, collection_files: list[CollectionFileDB], filesystem: FileSystem = FileSystem()
+    ) -> int:
+        log.retries_due(len(collection_files))
+        gdrive_files = await asyncio.to_thread(retry.find_gdrive_files, gdrive_client, collection_files)
+
+        found_gdrive_file_ids = {gdrive_file.id for gdrive_file in gdrive_files}
+        for item_no, collection_file in enumerate(collection_files, 1):
+            if collection_file.gdrive_file_id not in found_gdrive_file_ids:
+                change = CollectionFileChange(collection_file_id=collection_file.collection_file_id, error=True, last_error=retry.GDRIVE_FILE_MISSING)
+                await update_database(change, item_no, retry_policy=self.retry_policy, now=self.clock.now())
+
+        if not gdrive_files:
+            return 0
+
+        lease_owner = f"{get_instance_id(self.config, filesystem)}-retry"
+        collection_files = await self.claim_gdrive_files(gdrive_files, lease_owner)
+        claimed_gdrive_file_ids = {collection_file.gdrive_file_id for collection_file in collection_files}
+        gdrive_files = [gdrive_file for gdrive_file in gdrive_files if gdrive_file.id in claimed_gdrive_file_ids]
+
+        statistics = RunStatistics()
+        with tracing.TRACER.span(tracing.SPAN_RETRY) as retry_span:
+            queue_items = FromCollectionFileDB.to_queue_items(
+                gdrive_files, collection_files, self.config.temp_download_folder, self.status.cancel_token, statistics=statistics
+            )
+            async with self.hold_leases(lease_owner):
+                await self.import_queue_items(queue_items, gdrive_client, retry_span, 1, filesystem=filesystem)  # A single thread keeps retries light
+
+        statistics.finish()
+        log.retries_finished(statistics.imported_count, statistics.file_count)
+        return statistics.imported_count
+
+    async def wait_for_next_run(self, watermark: datetime, push_notifications: Optional[PushNotifications] = None) -> bool:
+        """Waits until the next import is due, for a change notification, for the next file or for the next full hour.
+
+        While the PSS Fleet Data API is unavailable, waits for it to become available again instead, but no longer than until the next full hour.
+
+        Returns:
+            bool: `True`, if the caller should run an import now. `False`, if the caller should check again, whether an import is due.
+        """
+        if self.api_circuit.is_open:
+            return await self.wait_for_api_recovery()
+
+        if push_notifications:
+            return await self.wait_for_notification(push_notifications)
+
+        if self.config.watch_mode:
+            if not self.watch_gdrive_client:
+                self.watch_gdrive_client = await asyncio.to_thread(self.create_gdrive_client)
+            return await self.watch_for_next_file(self.watch_gdrive_client, watermark)
+
+        await wait_for_next_import(self.clock)
+        return False
+
+    async def start_push_notifications(self) -> Optional[PushNotifications]:
+        """Registers a notification channel for the Google Drive folder, if `config.push_webhook_url` is set.
+
+        Returns:
+            Optional[PushNotifications]: The running notifications or `None`, if they're disabled or couldn't be set up.
+        """
+        if not self.config.push_webhook_url:
+            return None
+
+        try:
+            push_notifications = PushNotifications(
+                self.config.push_webhook_url, self.config.push_webhook_port, self.config.push_channel_ttl, clock=self.clock
+            )
+        except OSError as exc:
+            log.push_notifications_disabled(exc)
+            return None
+
+        try:
+            await push_notifications.start(self.create_gdrive_client())
+        except Exception as exc:
+            await push_notifications.stop()
+            log.push_notifications_disabled(exc)
+            return None
+
+        return push_notifications
+
+    async def wait_for_notification(self, push_notifications: PushNotifications) -> bool:
+        """Waits for Google Drive to report a change, but no longer than until the regular import after the next full hour.
+
+        Returns:
+            bool: `True`, if the caller should run an import now. `False`, if the time ran out.
+        """
+        await push_notifications.renew_if_expiring()
+
+        wait_until = utils.get_next_full_hour(self.clock.now()) + timedelta(minutes=1)
+        wait_for_seconds = (wait_until - self.clock.now()).total_seconds()
+        log.push_notification_wait(wait_for_seconds)
+
+        if await push_notifications.wait(wait_for_seconds):
+            log.push_notification_triggers_import()
+            return True
+        return False
+
+    async def wait_for_api_recovery(self) -> bool:
+        """Pings the PSS Fleet Data API every `config.api_circuit_probe_interval` seconds, until it responds or the next full hour has passed.
+
+        Returns:
+            bool: `True`, if the caller should run an import now: to upload the files kept during the outage or to download new files.
+            `False`, if waiting has been cancelled.
+        """
+        wait_until = utils.get_next_full_hour(self.clock.now()) + timedelta(minutes=1)
+        log.api_recovery_wait((wait_until - self.clock.now()).total_seconds())
+
+        while not self.status.cancel_token.cancelled:
+            if await self.probe_api():
+                return True
+
+            wait_for_seconds = (wait_until - self.clock.now()).total_seconds()
+            if wait_for_seconds <= 0:
+                return True
+
+            probe_interval = min(self.config.api_circuit_probe_interval, wait_for_seconds)
+            log.api_probe_failed(probe_interval)
+            await self.clock.sleep(probe_interval)
+
+        return False
+
+    async def probe_api(self) -> bool:
+        """Pings the PSS Fleet Data API and closes the circuit, if it responds.
+
+        Returns:
+            bool: `True`, if the API is available.
+        """
+        try:
+            available = await self.check_api_server_connection()
+        except Exception:
+            available = False
+
+        if available:
+            self.api_circuit.record_success()
+        return available
+
+    def create_gdrive_client(self) -> GoogleDriveClient:
+        gdrive_client = GoogleDriveClient(
+            self.config.gdrive_project_id,
+            self.config.gdrive_private_key_id,
+            self.config.gdrive_private_key,
+            self.config.gdrive_client_email,
+            self.config.gdrive_client_id,
+            self.config.gdrive_scopes,
+            self.config.gdrive_folder_id,
+            self.config.gdrive_service_account_file_path,
+            self.config.gdrive_settings_file_path,
+            api_endpoint=self.config.gdrive_api_endpoint,
+            rate_limiter=self.gdrive_rate_limiter,
+        )
+        gdrive_client.initialize()
+        return gdrive_client
+
+    async def watch_for_next_file(self, gdrive_client: GoogleDriveClient, watermark: datetime) -> bool:
+        """Waits until the file recorded in the hour of `watermark` is due and polls Google Drive for it by name, backing off while it's late.
+
+        When the hour has passed without the file appearing, the caller should run a regular import to pick up whatever has been modified.
+
+        Returns:
+            bool: `True`, if the caller should run an import now. `False`, if watching has been cancelled.
+        """
+        expected_at = utils.remove_timezone(watermark).replace(minute=0, second=0, microsecond=0)
+        deadline = expected_at + timedelta(hours=1)
+        file_name_prefix = utils.get_gdrive_file_name_prefix(expected_at)
+
+        wait_for_seconds = (expected_at - self.clock.now()).total_seconds()
+        if wait_for_seconds > 0:
+            log.watch_wait(wait_for_seconds, file_name_prefix)
+            await self.clock.sleep(wait_for_seconds)
+
+        poll_interval = self.config.watch_poll_interval
+        while not self.status.cancel_token.cancelled:
+            if self.clock.now() >= deadline:
+                log.watch_deadline_passed(file_name_prefix)
+                return True
+
+            with metrics.GDRIVE_LIST_DURATION.time():
+                gdrive_files = await asyncio.to_thread(list, gdrive_client.list_files_by_name_prefix(file_name_prefix))
+            if gdrive_files:
+                log.watch_file_found(file_name_prefix)
+                return True
+
+            log.watch_file_missing(file_name_prefix, poll_interval)
+            await self.clock.sleep(min(poll_interval, (deadline - self.clock.now()).total_seconds()))
+            poll_interval = min(poll_interval * 2, self.config.watch_max_poll_interval)
+
+        return False
+
     async def run_bulk_import(
         self,
         gdrive_client: GoogleDriveClient,
         modified_after: Optional[datetime] = None,
         modified_before: Optional[datetime] = None,
         filesystem: FileSystem = FileSystem(),
+        checkpoint_name: Optional[str] = None,
     ) -> datetime:
-        start = utils.get_now()
-        log.bulk_import_start_time(start)
+        """Imports the next chunk of files modified within the time range.
+
+        Files complete out of order, so the watermark returned only covers the files listed up to the first file not completed, e.g. due to a
+        download timeout or because it didn't fit into the chunk. It's saved to the checkpoint `checkpoint_name`, as it advances.
+
+        Returns:
+            datetime: The modified date, up to which all files listed have been imported, have failed or are being imported by other instances.
+        """
+        statistics = RunStatistics(modified_after=modified_after, modified_before=modified_before)
+        self.status.run_statistics = statistics
+        log.bulk_import_start_time(statistics.started_at)
         log.bulk_import_start(modified_after, modified_before)
 
-        log.download_gdrive_file_list_params(modified_after=modified_after, modified_before=modified_before)
+        profiler = Profiler(enabled=self.config.profile_bulk_imports)
 
-        gdrive_files = get_gdrive_file_list(gdrive_client, modified_after=modified_after, modified_before=modified_before)
+        with tracing.TRACER.span(tracing.SPAN_BULK_IMPORT) as bulk_import_span, profiler.profile(), self.progress.track(statistics):
+            list_modified_after = await get_expired_lease_modified_after(modified_after, self.clock.now())
+            log.download_gdrive_file_list_params(modified_after=list_modified_after, modified_before=modified_before)
 
-        log.download_gdrive_file_list_length(len(gdrive_files), self.config.chunk_size)
-        if len(gdrive_files) > self.config.chunk_size:
-            gdrive_files = gdrive_files[: self.config.chunk_size]
+            with tracing.TRACER.span(tracing.SPAN_GDRIVE_LIST, parent=bulk_import_span):
+                gdrive_files = get_gdrive_file_list(gdrive_client, modified_after=list_modified_after, modified_before=modified_before)
 
-        if not gdrive_files:
-            return modified_after
+            chunk_size = self.chunk_sizer.size
+            metrics.CHUNK_SIZE.set(chunk_size)
+            log.download_gdrive_file_list_length(len(gdrive_files), chunk_size)
+            statistics.listed_file_count = len(gdrive_files)
+            tracker = create_watermark_tracker(gdrive_files, modified_after)
+            if len(gdrive_files) > chunk_size:
+                gdrive_files = gdrive_files[:chunk_size]
+
+            if not gdrive_files:
+                return tracker.watermark
 
+            with tracing.TRACER.span(tracing.SPAN_DB_INSERT, parent=bulk_import_span):
+                lease_owner = get_instance_id(self.config, filesystem)
+            collection_files = await self.claim_gdrive_files(gdrive_files, lease_owner)
+
+            # Files leased by other instances are theirs to import. Should an instance fail to import them, they'll be listed again.
+            claimed_gdrive_file_ids = {collection_file.gdrive_file_id for collection_file in collection_files}
+            leased_gdrive_file_ids = [gdrive_file.id for gdrive_file in gdrive_files if gdrive_file.id not in claimed_gdrive_file_ids]
+            gdrive_files = [gdrive_file for gdrive_file in gdrive_files if gdrive_file.id in claimed_gdrive_file_ids]
+            await self.advance_checkpoint(tracker, leased_gdrive_file_ids, checkpoint_name)
+
+            if not gdrive_files:
+                return tracker.watermark
+
+            log.queue_items_create()
+            queue_items = FromCollectionFileDB.to_queue_items(
+                gdrive_files, collection_files, self.config.temp_download_folder, self.status.cancel_token, statistics=statistics
+            )
+            metrics.track_run_statistics(statistics)
+            metrics.track_concurrency_limits([self.download_limiter, self.upload_limiter])
+            metrics.track_circuit_breaker(self.api_circuit)
+
+            log.downloads_imports_count(
+                len(queue_items), len([collection_file for collection_file in collection_files if not collection_file.imported])
+            )
+            import_journal = journal.ImportJournal(self.config.import_journal_file_path, filesystem=filesystem)
+            filesystem.mkdir(import_journal.file_path.parent, create_parents=True, exist_ok=True)
+            journal.restore_queue_items(queue_items, import_journal.replay(), filesystem=filesystem)
+
+            async with self.hold_leases(lease_owner):
+                await self.import_queue_items(
+                    queue_items,
+                    gdrive_client,
+                    bulk_import_span,
+                    self.config.download_thread_pool_size,
+                    filesystem=filesystem,
+                    on_completed=lambda queue_item: self.advance_checkpoint(tracker, [queue_item.gdrive_file.id], checkpoint_name),
+                    import_journal=import_journal,
+                    download_limiter=self.download_limiter,
+                    upload_limiter=self.upload_limiter,
+                )
+            import_journal.compact(queue_item.gdrive_file.id for queue_item in queue_items if queue_item.status.done)
+            report_spooled_files(queue_items)
+
+        statistics.finish()
+        log.bulk_import_finish(statistics)
+        log.bulk_import_finish_time(statistics)
+        await save_run_statistics(statistics)
+
+        # Only full chunks tell how long a chunk of the current size takes. Smaller ones are dominated by the overhead of a bulk import.
+        if statistics.listed_file_count > chunk_size:
+            metrics.CHUNK_SIZE.set(self.chunk_sizer.record(statistics.file_count, statistics.duration.total_seconds()))
+
+        if profiler.enabled:
+            self.write_profile(profiler, statistics.file_count, statistics.started_at, statistics.finished_at, filesystem=filesystem)
+
+        return tracker.watermark
+
+    async def advance_checkpoint(self, tracker: WatermarkTracker, gdrive_file_ids: Iterable[str], checkpoint_name: Optional[str] = None):
+        """Marks the files as completed and saves the watermark to the checkpoint `checkpoint_name`, if it advanced."""
+        advanced = False
+        for gdrive_file_id in gdrive_file_ids:
+            advanced = tracker.complete(gdrive_file_id) or advanced
+
+        if advanced and checkpoint_name:
+            await save_checkpoint(checkpoint_name, tracker.watermark, self.clock.now())
+
+    async def claim_gdrive_files(self, gdrive_files: Iterable[GDriveFile], lease_owner: str) -> list[CollectionFileDB]:
+        """Creates the database entries for new `gdrive_files` and leases them to `lease_owner`.
+
+        Returns:
+            list[CollectionFileDB]: The entries of the files leased to `lease_owner`, skipping those leased by other instances.
+        """
         collection_files = create_collection_files(gdrive_files)
         collection_files = await insert_new_collection_files(collection_files)
+        return await claim_collection_files(
+            collection_files,
+            lease_owner,
+            self.clock.now() + timedelta(seconds=self.config.lease_duration),
+            self.clock.now(),
+        )
+
+    @asynccontextmanager
+    async def hold_leases(self, lease_owner: str) -> AsyncGenerator[None, None]:
+        """Renews the leases of `lease_owner` every half `config.lease_duration` while in the `async with` block, so that other instances
+        don't claim the files of a chunk taking longer than the lease duration.
+        """
+        stopped = asyncio.Event()
+        renew_task = asyncio.create_task(self.renew_leases_periodically(lease_owner, stopped), name="Lease renewal")
+        try:
+            yield
+        finally:
+            stopped.set()
+            await renew_task
+
+    async def renew_leases_periodically(self, lease_owner: str, stopped: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(stopped.wait(), timeout=self.config.lease_duration / 2)
+                return
+            except TimeoutError:
+                try:
+                    await renew_collection_file_leases(lease_owner, self.clock.now() + timedelta(seconds=self.config.lease_duration))
+                except Exception as exc:
+                    log.leases_renewal_error(lease_owner, exc)
+
+    async def import_queue_items(
+        self,
+        queue_items: list[QueueItem],
+        gdrive_client: GoogleDriveClient,
+        parent_span: Optional[Span],
+        thread_pool_size: int,
+        filesystem: FileSystem = FileSystem(),
+        on_completed: Optional[Callable[[QueueItem], Awaitable[Any]]] = None,
+        import_journal: Optional[journal.ImportJournal] = None,
+        download_limiter: Optional[AimdLimiter] = None,
+        upload_limiter: Optional[AimdLimiter] = None,
+    ):
+        """Downloads the files of `queue_items` in a worker thread, starts importing them in order as they arrive and records the outcome of each.
 
-        log.queue_items_create()
-        queue_items = FromCollectionFileDB.to_queue_items(gdrive_files, collection_files, self.config.temp_download_folder, self.status.cancel_token)
+        Queue items downloaded or imported before, e.g. restored from `import_journal`, aren't downloaded or imported again. `on_completed`
+        is awaited for each queue item, once its outcome has been recorded. The `download_limiter` & `upload_limiter` limit the number of
+        concurrent downloads & imports. Without them, `thread_pool_size` files are downloaded and a single file is imported at a time.
+        """
+        tracing.start_queue_item_spans(queue_items, parent_span)
 
         log.download_folder_create(self.config.temp_download_folder)
         filesystem.mkdir(self.config.temp_download_folder, create_parents=True, exist_ok=True)
 
-        log.downloads_imports_count(queue_items)
-
         download_worker_thread = create_download_worker_thread(
-            queue_items,
+            [queue_item for queue_item in queue_items if not queue_item.status.downloaded],
             gdrive_client,
-            self.config.download_thread_pool_size,
+            thread_pool_size,
             self.config.debug_mode,
             self.status.cancel_token,
+            memory_budget=self.config.download_memory_budget,
             filesystem=filesystem,
+            on_downloaded=import_journal.record_downloaded if import_journal else None,
+            concurrency_limiter=download_limiter,
         )
         download_worker_thread.start()
 
+        upload_limiter = upload_limiter or AimdLimiter(metrics.OPERATION_UPLOAD, 1)
+        import_tasks: list[asyncio.Task] = []
+        try:
+            for queue_item in queue_items:
+                await wait_for_item_download(queue_item)
+
+                if queue_item.status.download_timed_out:
+                    break
+
+                if not upload_limiter.try_acquire():
+                    await asyncio.to_thread(upload_limiter.acquire)
+
+                import_task = self.complete_queue_item(
+                    queue_item, upload_limiter, filesystem=filesystem, import_journal=import_journal, on_completed=on_completed
+                )
+                import_tasks.append(asyncio.create_task(import_task))
+        finally:
+            for result in await asyncio.gather(*import_tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    log.import_task_error(result)
+
+        await asyncio.to_thread(download_worker_thread.join)
+
         for queue_item in queue_items:
-            await wait_for_item_download(queue_item)
+            tracing.TRACER.end_span(queue_item.trace_span, attributes=tracing.get_queue_item_status_attributes(queue_item))
 
-            if queue_item.status.download_timed_out:
-                break
+    async def complete_queue_item(
+        self,
+        queue_item: QueueItem,
+        upload_limiter: AimdLimiter,
+        filesystem: FileSystem = FileSystem(),
+        import_journal: Optional[journal.ImportJournal] = None,
+        on_completed: Optional[Callable[[QueueItem], Awaitable[Any]]] = None,
+    ):
+        """Imports the file of `queue_item` and records the outcome. Releases the slot of the `upload_limiter` acquired for it, once done.
+
+        While the PSS Fleet Data API is unavailable, the downloaded file is kept and no outcome is recorded, so that it's imported by a later run.
+        """
+        try:
+            change = await self.import_queue_item(queue_item, filesystem=filesystem, import_journal=import_journal, upload_limiter=upload_limiter)
+
+            with tracing.TRACER.span(tracing.SPAN_DB_UPDATE, parent=queue_item.trace_span):
+                await update_database(change, queue_item.item_no, retry_policy=self.retry_policy, now=self.clock.now())
+
+            if on_completed:
+                await on_completed(queue_item)
 
-            if queue_item.status.download_error:
-                await update_database(CollectionFileChange(collection_file_id=queue_item.collection_file_id, error=True), queue_item.item_no)
-                continue
+            tracing.TRACER.end_span(queue_item.trace_span, attributes=tracing.get_queue_item_status_attributes(queue_item))
+        except ApiUnavailableError:
+            log.queue_item_spooled(queue_item.item_no, queue_item.gdrive_file.name)
+        finally:
+            upload_limiter.release()
 
+    async def import_queue_item(
+        self,
+        queue_item: QueueItem,
+        filesystem: FileSystem = FileSystem(),
+        import_journal: Optional[journal.ImportJournal] = None,
+        upload_limiter: Optional[AimdLimiter] = None,
+    ) -> CollectionFileChange:
+        """Imports the downloaded file of `queue_item`, unless it failed to download or has been imported before.
+
+        Raises:
+            ApiUnavailableError: Raised, if the PSS Fleet Data API is unavailable.
+
+        Returns:
+            CollectionFileChange: The outcome to record in the database.
+        """
+        if queue_item.status.download_error:
+            return CollectionFileChange(collection_file_id=queue_item.collection_file_id, error=True, last_error=get_last_error(queue_item))
+
+        if not queue_item.status.imported:
+            import_worker.raise_if_circuit_open(self.api_circuit)
             await import_worker.process_queue_item(
                 queue_item,
                 self.fleet_data_client,
                 self.config.keep_downloaded_files,
                 update_existing_collections=self.config.update_existing_collections,
                 filesystem=filesystem,
+                concurrency_limiter=upload_limiter,
+                circuit_breaker=self.api_circuit,
             )
+            if import_journal:
+                import_journal.record(queue_item)
+
+        import_error = queue_item.status.import_error
+        return CollectionFileChange(
+            collection_file_id=queue_item.collection_file_id,
+            imported=not import_error,
+            error=import_error,
+            last_error=get_last_error(queue_item),
+        )
 
-            if queue_item.status.import_error:
-                await update_database(
-                    CollectionFileChange(collection_file_id=queue_item.collection_file_id, imported=False, error=True),
-                    queue_item.item_no,
-                )
-            else:
-                await update_database(
-                    CollectionFileChange(collection_file_id=queue_item.collection_file_id, imported=True, error=False),
-                    queue_item.item_no,
-                )
-
-        download_worker_thread.join()
-
-        end = utils.get_now()
-        log.bulk_import_finish(queue_items, modified_after, modified_before)
-        log.bulk_import_finish_time(len(queue_items), start, end)
+    def write_profile(
+        self,
+        profiler: Profiler,
+        chunk_size: int,
+        start: datetime,
+        end: datetime,
+        filesystem: FileSystem = FileSystem(),
+    ):
+        profile_file_path = self.config.get_profile_file_path(chunk_size, start, end)
+        filesystem.mkdir(profile_file_path.parent, create_parents=True, exist_ok=True)
 
-        last_imported_file_modified_date = max((queue_item.gdrive_file.modified_date for queue_item in queue_items if queue_item.status.done))
-        return last_imported_file_modified_date
+        if profiler.dump(profile_file_path):
+            log.profile_written(profile_file_path)
 
 
-async def get_updated_modified_after(modified_after: Optional[datetime] = None, uow: AbstractUnitOfWork = None):
+async def get_updated_modified_after(
+    modified_after: Optional[datetime] = None, uow: AbstractUnitOfWork = None, modified_before: Optional[datetime] = None
+):
+    """Returns the modified date to continue importing from: the hour after the latest file imported before `modified_before`."""
     uow = uow or SqlModelUnitOfWork()
 
     async with uow:
-        latest_imported_modified_date = await uow.collection_files.get_latest_imported_gdrive_modified_date()
+        latest_imported_modified_date = await uow.collection_files.get_latest_imported_gdrive_modified_date(modified_before=modified_before)
 
     if latest_imported_modified_date:
         latest_imported_modified_date = utils.get_next_full_hour(latest_imported_modified_date)
@@ -188,13 +701,176 @@ async def get_updated_modified_after(modified_after: Optional[datetime] = None,
     return modified_after
 
 
+def get_checkpoint_name(modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None) -> str:
+    """Names the checkpoint of importing the files modified within a time range, so that imports of other time ranges don't move it."""
+    if modified_after is None and modified_before is None:
+        return "import"
+
+    modified_after = utils.remove_timezone(modified_after).isoformat() if modified_after else ""
+    modified_before = utils.remove_timezone(modified_before).isoformat() if modified_before else ""
+    return f"import:{modified_after}..{modified_before}"
+
+
+async def get_checkpoint_modified_after(
+    checkpoint_name: str,
+    modified_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+    uow: Optional[AbstractUnitOfWork] = None,
+) -> Optional[datetime]:
+    """Returns the modified date to continue importing from: the watermark of the checkpoint `checkpoint_name`, if it's been saved before.
+
+    Otherwise returns the hour after the latest file imported, like `get_updated_modified_after`.
+    """
+    uow = uow or SqlModelUnitOfWork()
+
+    async with uow:
+        watermark = await uow.import_checkpoints.get_watermark(checkpoint_name)
+
+    if watermark is None:
+        return await get_updated_modified_after(modified_after=modified_after, modified_before=modified_before)
+
+    log.checkpoint_resume(checkpoint_name, watermark)
+    if modified_after:
+        return max(utils.remove_timezone(modified_after), watermark)
+    return watermark
+
+
+async def save_checkpoint(checkpoint_name: str, watermark: datetime, now: datetime, uow: Optional[AbstractUnitOfWork] = None):
+    """Moves the watermark of the checkpoint `checkpoint_name` forward. A watermark behind the saved one, e.g. of another instance, is ignored."""
+    uow = uow or SqlModelUnitOfWork()
+
+    async with uow:
+        if await uow.import_checkpoints.advance_watermark(checkpoint_name, watermark, now):
+            with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_UPDATE):
+                await uow.commit()
+
+            log.checkpoint_save(checkpoint_name, watermark)
+
+
+def create_watermark_tracker(gdrive_files: Iterable[GDriveFile], watermark: Optional[datetime] = None) -> WatermarkTracker:
+    """Tracks the low watermark of all `gdrive_files` listed, so that it stays behind the files, which didn't fit into the chunk."""
+    return WatermarkTracker(
+        {gdrive_file.id: utils.remove_timezone(gdrive_file.modified_date) for gdrive_file in gdrive_files},
+        watermark=utils.remove_timezone(watermark) if watermark else None,
+    )
+
+
+def get_next_import_hour(
+    import_hour: Optional[datetime], watermark: Optional[datetime], last_modified_date: Optional[datetime], now: datetime
+) -> datetime:
+    """Returns the hour of the next file expected, after an import from `watermark` up to `last_modified_date`. The import loop waits for
+    it to pass, before importing again. The watermark itself isn't rounded, so that files left within an hour are listed by the next import.
+
+    If nothing has been imported before `import_hour` has passed, e.g. when a change notification reported another change than the next
+    file, the hour is kept, so that the file is still imported once it appears.
+    """
+    if last_modified_date and last_modified_date != watermark:
+        return utils.get_next_full_hour(last_modified_date)
+    if import_hour and utils.get_next_full_hour(import_hour) > now:
+        return import_hour
+    return utils.get_next_full_hour(import_hour or now)
+
+
+async def get_expired_lease_modified_after(
+    modified_after: Optional[datetime], now: datetime, uow: Optional[AbstractUnitOfWork] = None
+) -> Optional[datetime]:
+    """Returns the modified date to list files from, so that files with an expired lease are listed again.
+
+    A lease expires, if an importer instance stopped before it finished importing the leased files.
+    """
+    uow = uow or SqlModelUnitOfWork()
+
+    async with uow:
+        expired_lease_modified_date = await uow.collection_files.get_earliest_expired_lease_gdrive_modified_date(now)
+
+    if expired_lease_modified_date is None:
+        return modified_after
+
+    expired_lease_modified_after = expired_lease_modified_date - timedelta(seconds=1)  # Files are listed by modified date > modified_after
+    if modified_after and utils.remove_timezone(modified_after) <= expired_lease_modified_after:
+        return modified_after
+
+    log.expired_leases_found(expired_lease_modified_date)
+    return expired_lease_modified_after
+
+
+def get_instance_id(config: Config, filesystem: FileSystem = FileSystem()) -> str:
+    """Returns the owner of the files leased by this instance: `config.instance_id` or else the ID kept next to the import journal.
+
+    A restarted instance keeps its ID, so that it reclaims the files it leased before right away and resumes their chunk from the journal.
+    """
+    if config.instance_id:
+        return config.instance_id
+
+    file_path = config.instance_id_file_path
+    if filesystem.exists(file_path):
+        instance_id = filesystem.read(file_path).strip()
+        if instance_id:
+            return instance_id
+
+    instance_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+    filesystem.mkdir(file_path.parent, create_parents=True, exist_ok=True)
+    filesystem.write(file_path, instance_id)
+    log.instance_id_created(instance_id, file_path)
+    return instance_id
+
+
+async def claim_collection_files(
+    collection_files: Iterable[CollectionFileDB],
+    lease_owner: str,
+    lease_expires_at: datetime,
+    now: datetime,
+    uow: Optional[AbstractUnitOfWork] = None,
+) -> list[CollectionFileDB]:
+    """Leases the `collection_files`, which aren't leased by other importer instances, to `lease_owner`.
+
+    Returns:
+        list[CollectionFileDB]: The files leased to `lease_owner`.
+    """
+    uow = uow or SqlModelUnitOfWork()
+    collection_files = list(collection_files)
+
+    async with uow:
+        claimed_collection_files = await uow.collection_files.claim_files(
+            [collection_file.collection_file_id for collection_file in collection_files], lease_owner, lease_expires_at, now
+        )
+        claimed_collection_file_ids = {collection_file.collection_file_id for collection_file in claimed_collection_files}
+
+        with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_UPDATE):
+            await uow.commit()
+
+    log.collection_files_claimed(len(claimed_collection_file_ids), len(collection_files))
+    return [collection_file for collection_file in collection_files if collection_file.collection_file_id in claimed_collection_file_ids]
+
+
+async def renew_collection_file_leases(lease_owner: str, lease_expires_at: datetime, uow: Optional[AbstractUnitOfWork] = None) -> int:
+    """Extends the leases held by `lease_owner` until `lease_expires_at`.
+
+    Returns:
+        int: The number of leases renewed.
+    """
+    uow = uow or SqlModelUnitOfWork()
+
+    async with uow:
+        renewed_count = await uow.collection_files.renew_leases(lease_owner, lease_expires_at)
+
+        with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_UPDATE):
+            await uow.commit()
+
+    log.leases_renewed(renewed_count, lease_owner, lease_expires_at)
+    return renewed_count
+
+
 def create_download_worker_thread(
     queue_items: Iterable[QueueItem],
     gdrive_client: GoogleDriveClient,
     thread_pool_size: int,
     debug_mode: bool,
     cancel_token: CancellationToken,
+    memory_budget: Optional[int] = None,
     filesystem: FileSystem = FileSystem(),
+    on_downloaded: Optional[Callable[[QueueItem], None]] = None,
+    concurrency_limiter: Optional[AimdLimiter] = None,
 ) -> threading.Thread:
     download_worker_thread = threading.Thread(
         target=download_worker.worker,
@@ -208,7 +884,10 @@ def create_download_worker_thread(
         ],
         kwargs={
             "worker_timeout": 60.0,
+            "memory_budget": memory_budget,
             "filesystem": filesystem,
+            "on_downloaded": on_downloaded,
+            "concurrency_limiter": concurrency_limiter,
         },
         daemon=True,
     )
@@ -229,7 +908,7 @@ def get_gdrive_file_list(
 ) -> list[GDriveFile]:
     log.download_gdrive_file_list_start()
 
-    with log.download_gdrive_file_list_duration():
+    with log.download_gdrive_file_list_duration(), metrics.GDRIVE_LIST_DURATION.time():
         gdrive_files = list(gdrive_client.list_files_by_modified_date(modified_after, modified_before))
 
     gdrive_files = sorted(gdrive_files, key=lambda gdrive_file: gdrive_file.name.replace("-", "_"))
@@ -253,7 +932,8 @@ async def insert_new_collection_files(collection_files: Iterable[CollectionFileD
         for collection_file in new_collection_files:
             uow.collection_files.add(collection_file)
 
-        await uow.commit()
+        with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_INSERT):
+            await uow.commit()
 
         new_collection_files = await uow.collection_files.refresh_files(new_collection_files)
 
@@ -261,21 +941,55 @@ async def insert_new_collection_files(collection_files: Iterable[CollectionFileD
         return result
 
 
+def report_spooled_files(queue_items: Iterable[QueueItem]):
+    """Logs & reports the number of files downloaded, but not imported, because the PSS Fleet Data API has been unavailable."""
+    spooled_count = len([queue_item for queue_item in queue_items if queue_item.status.downloaded and not queue_item.status.done])
+    metrics.SPOOLED_FILES.set(spooled_count)
+    if spooled_count:
+        log.files_spooled(spooled_count)
+
+
+def create_concurrency_limiter(name: str, initial_limit: int, max_limit: int, autotune: bool) -> AimdLimiter:
+    """Creates a limiter tuning the concurrency of the operations `name` between 1 and `max_limit`, or keeping it at `initial_limit`."""
+    if autotune:
+        return AimdLimiter(name, initial_limit, max_limit=max(max_limit, initial_limit))
+    return AimdLimiter(name, initial_limit, min_limit=initial_limit, max_limit=initial_limit)
+
+
 async def wait_for_item_download(queue_item: QueueItem):
     while not queue_item.status.downloaded and not queue_item.status.download_error:
         await asyncio.sleep(0.1)
 
 
-async def wait_for_next_import():
-    now = utils.get_now()
+async def wait_for_next_import(clock: Optional[Clock] = None):
+    clock = clock or SystemClock()
+    now = clock.now()
     wait_until = utils.get_next_full_hour(now) + timedelta(minutes=1)
-    wait_for_seconds = (wait_until - utils.get_now()).total_seconds()
+    wait_for_seconds = (wait_until - clock.now()).total_seconds()
 
     log.wait_for_import(wait_for_seconds, wait_until)
-    await asyncio.sleep(wait_for_seconds)
+    await clock.sleep(wait_for_seconds)
+
+
+async def save_run_statistics(statistics: RunStatistics, uow: Optional[AbstractUnitOfWork] = None):
+    uow = uow or SqlModelUnitOfWork()
+
+    log.run_statistics_save(statistics)
+    async with uow:
+        uow.import_runs.add(FromRunStatistics.to_import_run(statistics))
+
+        with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_INSERT):
+            await uow.commit()
 
 
-async def update_database(change: CollectionFileChange, item_no: int, uow: Optional[AbstractUnitOfWork] = None):
+async def update_database(
+    change: CollectionFileChange,
+    item_no: int,
+    uow: Optional[AbstractUnitOfWork] = None,
+    retry_policy: Optional[retry.RetryPolicy] = None,
+    now: Optional[datetime] = None,
+):
+    """Records the outcome of an attempt to import a file. A failed file is scheduled for another attempt according to `retry_policy`."""
     uow = uow or SqlModelUnitOfWork()
 
     async with uow:
@@ -286,8 +1000,20 @@ async def update_database(change: CollectionFileChange, item_no: int, uow: Optio
                 collection_file.imported = change.imported
             if change.error is not None:
                 collection_file.error = change.error
+            if change.error:
+                retry.schedule_retry(collection_file, change.last_error, retry_policy, now or utils.get_now())
+            elif change.imported:
+                collection_file.next_attempt_at = None
+            collection_file.lease_owner = None  # The file is done, for now.
+            collection_file.lease_expires_at = None
 
             collection_file = uow.collection_files.add(collection_file)
-            await uow.commit()
+            with metrics.DB_WRITE_DURATION.time(operation=metrics.OPERATION_DB_UPDATE):
+                await uow.commit()
 
             log.queue_item_update(item_no, change)
+
+
+def get_last_error(queue_item: QueueItem) -> Optional[str]:
+    failure = queue_item.status.failure
+    return failure.name if failure else None
@@ -0,0 +1,121 @@
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from ..core import utils
+from ..core.models.filesystem import FileSystem
+from ..log.log_importer import journal as log
+from ..models.queue_item import QueueItem, QueueItemState
+from . import utils as importer_utils
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    gdrive_file_id: str
+    state: QueueItemState
+
+
+class ImportJournal:
+    """An append-only log of the state transitions of the files in a chunk, so that the chunk can be resumed after the app stopped mid-chunk.
+
+    Each transition is appended as a line of JSON right away. A line cut short by a crash is skipped when replaying the journal.
+    """
+
+    def __init__(self, file_path: Union[Path, str], filesystem: FileSystem = FileSystem()):
+        self.file_path: Path = Path(file_path)
+        self.__filesystem: FileSystem = filesystem
+        self.__lock: threading.Lock = threading.Lock()
+
+    def record(self, queue_item: QueueItem, state: Optional[QueueItemState] = None):
+        """Appends `state` or else the current state of `queue_item`. It's safe to call from download threads."""
+        state = state or queue_item.status.state
+        line = json.dumps(
+            {"gdrive_file_id": queue_item.gdrive_file.id, "state": state.name, "at": utils.get_now().isoformat()},
+            separators=(",", ":"),
+        )
+        with self.__lock:
+            self.__filesystem.write(self.file_path, line + "\n", "a")
+
+    def record_downloaded(self, queue_item: QueueItem):
+        self.record(queue_item, QueueItemState.DOWNLOADED)
+
+    def replay(self) -> dict[str, JournalEntry]:
+        """Returns the latest entry of each file in the journal."""
+        if not self.__filesystem.exists(self.file_path):
+            return {}
+
+        entries = {}
+        for line_no, line in enumerate(self.__filesystem.read(self.file_path).splitlines(), 1):
+            try:
+                entry = json.loads(line)
+                entries[entry["gdrive_file_id"]] = JournalEntry(entry["gdrive_file_id"], QueueItemState[entry["state"]])
+            except (ValueError, KeyError, TypeError):
+                log.entry_invalid(self.file_path, line_no)
+
+        return entries
+
+    def compact(self, gdrive_file_ids: Iterable[str]):
+        """Drops the entries of the files with `gdrive_file_ids`, e.g. once their chunk has been finished. Deletes the journal, if it's empty."""
+        dropped_gdrive_file_ids = set(gdrive_file_ids) | {None}  # Lines cut short are dropped, too.
+
+        with self.__lock:
+            if not self.__filesystem.exists(self.file_path):
+                return
+
+            lines = [line for line in self.__filesystem.read(self.file_path).splitlines() if get_gdrive_file_id(line) not in dropped_gdrive_file_ids]
+
+            if lines:
+                self.__filesystem.write(self.file_path, "\n".join(lines) + "\n")
+            else:
+                self.__filesystem.delete(self.file_path, missing_ok=True)
+
+
+def get_gdrive_file_id(line: str) -> Optional[str]:
+    """Returns the ID of the file of a journal entry or `None`, if the line isn't a valid entry."""
+    try:
+        return json.loads(line)["gdrive_file_id"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def restore_queue_items(queue_items: Iterable[QueueItem], entries: dict[str, JournalEntry], filesystem: FileSystem = FileSystem()) -> tuple[int, int]:
+    """Moves queue items forward to the state recorded in the journal: imported files won't be imported again & downloaded files, which are
+    still on disk, won't be downloaded again. Failed files are attempted again. Restored files aren't counted as downloaded or imported by
+    this run.
+
+    Returns:
+        tuple[int, int]: The number of queue items restored as imported and as downloaded.
+    """
+    imported_count = 0
+    downloaded_count = 0
+
+    for queue_item in queue_items:
+        entry = entries.get(queue_item.gdrive_file.id)
+        if entry is None:
+            continue
+
+        if entry.state == QueueItemState.IMPORTED:
+            queue_item.status.restore(QueueItemState.IMPORTED)
+            imported_count += 1
+        elif entry.state == QueueItemState.DOWNLOADED and importer_utils.check_if_exists(
+            queue_item.target_file_path, queue_item.gdrive_file.size, filesystem
+        ):
+            queue_item.status.downloaded_at = utils.get_now()
+            queue_item.status.restore(QueueItemState.DOWNLOADED)
+            downloaded_count += 1
+
+    if imported_count or downloaded_count:
+        log.queue_items_restored(imported_count, downloaded_count)
+    return imported_count, downloaded_count
+
+
+__all__ = [
+    # Classes
+    ImportJournal.__name__,
+    JournalEntry.__name__,
+    # Functions
+    get_gdrive_file_id.__name__,
+    restore_queue_items.__name__,
+]
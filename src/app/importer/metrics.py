@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from ..core import utils
+from ..core.clock import Clock, SystemClock
+from ..core.metrics import MetricsRegistry
+from ..core.models.aimd_limiter import AimdLimiter
+from ..core.models.circuit_breaker import CircuitBreaker
+from ..models.run_statistics import RunStatistics
+
+
+REGISTRY = MetricsRegistry(prefix="pss_fleet_data_importer_")
+
+# Google Drive
+GDRIVE_LIST_DURATION = REGISTRY.histogram("gdrive_list_duration_seconds", "Duration of listing the files in the Google Drive folder.")
+DOWNLOAD_DURATION = REGISTRY.histogram("download_duration_seconds", "Duration of downloading the contents of a single file.")
+DOWNLOADED_BYTES = REGISTRY.counter("downloaded_bytes", "Number of bytes downloaded from Google Drive.")
+
+# PSS Fleet Data API
+UPLOAD_DURATION = REGISTRY.histogram("upload_duration_seconds", "Duration of uploading or updating a single Collection.", ["operation"])
+UPLOADED_BYTES = REGISTRY.counter("uploaded_bytes", "Number of bytes of Collections uploaded to the PSS Fleet Data API.")
+
+# Database
+DB_WRITE_DURATION = REGISTRY.histogram("db_write_duration_seconds", "Duration of writing Collection File records to the database.", ["operation"])
+
+# Pipeline
+QUEUE_ITEMS = REGISTRY.gauge("queue_items", "Number of queue items of the current bulk import per state.", ["state"])
+RETRIES = REGISTRY.counter("retries", "Number of retried operations.", ["operation"])
+PUSH_NOTIFICATIONS = REGISTRY.counter("push_notifications", "Number of change notifications received from Google Drive.", ["resource_state"])
+CONCURRENCY_LIMIT = REGISTRY.gauge("concurrency_limit", "Maximum number of concurrent operations, as tuned while importing.", ["operation"])
+SPOOLED_FILES = REGISTRY.gauge("spooled_files", "Number of files downloaded, but kept for later, because the PSS Fleet Data API was unavailable.")
+API_CIRCUIT_OPEN = REGISTRY.gauge("api_circuit_open", "1, if uploads to the PSS Fleet Data API are paused, because it's unavailable.")
+CHUNK_SIZE = REGISTRY.gauge("chunk_size", "Maximum number of files imported by the current or next bulk import.")
+WATERMARK_LAG = REGISTRY.gauge("watermark_lag_seconds", "Seconds between now and the modified date up to which files have been imported.")
+
+OPERATION_DB_INSERT = "insert"
+OPERATION_DB_UPDATE = "update"
+OPERATION_DOWNLOAD = "download"
+OPERATION_UPDATE = "update"
+OPERATION_UPLOAD = "upload"
+OPERATION_WRITE = "write"
+
+
+def track_run_statistics(statistics: Optional[RunStatistics]):
+    """Reports the number of queue items per state of the run `statistics` belong to on each scrape. Pass `None` to stop tracking."""
+    if statistics is None:
+        QUEUE_ITEMS.set_collect_function(None)
+        return
+
+    def collect() -> dict[tuple[str], int]:
+        return {(state.name.lower(),): count for state, count in statistics.state_counts.items()}
+
+    QUEUE_ITEMS.set_collect_function(collect)
+
+
+def track_watermark(watermark: Optional[datetime], clock: Optional[Clock] = None):
+    """Reports the lag between the time of `clock` and `watermark` on each scrape."""
+    if watermark is None:
+        WATERMARK_LAG.set_collect_function(None)
+        return
+
+    watermark = utils.remove_timezone(watermark)
+    clock = clock or SystemClock()
+
+    def collect() -> dict[tuple, float]:
+        return {(): (clock.now() - watermark).total_seconds()}
+
+    WATERMARK_LAG.set_collect_function(collect)
+
+
+def track_concurrency_limits(limiters: Iterable[AimdLimiter]):
+    """Reports the current limit of each of the `limiters` on each scrape, labelled by its name."""
+    limiters = list(limiters)
+
+    def collect() -> dict[tuple[str], int]:
+        return {(limiter.name,): limiter.limit for limiter in limiters}
+
+    CONCURRENCY_LIMIT.set_collect_function(collect)
+
+
+def track_circuit_breaker(circuit_breaker: CircuitBreaker):
+    """Reports whether the `circuit_breaker` of the PSS Fleet Data API is open on each scrape."""
+
+    def collect() -> dict[tuple, int]:
+        return {(): int(circuit_breaker.is_open)}
+
+    API_CIRCUIT_OPEN.set_collect_function(collect)
@@ -0,0 +1,67 @@
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Awaitable, Callable, Mapping, Optional
+
+from ..log.log_importer import preflight as log
+
+
+PreflightStep = Callable[[], Awaitable[Optional[bool]]]
+
+
+STEP_API_SERVER = "PSS Fleet Data API connection"
+STEP_DATABASE = "Database initialization"
+STEP_GDRIVE = "Google Drive authentication"
+
+
+@dataclass(frozen=True)
+class PreflightStepResult:
+    name: str
+    duration: float
+    success: bool
+    error: Optional[Exception] = None
+
+
+async def run_steps(steps: Mapping[str, PreflightStep]) -> list[PreflightStepResult]:
+    """Runs the start-up checks concurrently. A step fails, if it raises an error or returns `False`.
+
+    Args:
+        steps (Mapping[str, PreflightStep]): The steps to run by name.
+
+    Returns:
+        list[PreflightStepResult]: The results of the steps in the order they've been passed in.
+    """
+    log.preflight_start(steps.keys())
+
+    start = perf_counter()
+    results = await asyncio.gather(*(run_step(name, step) for name, step in steps.items()))
+
+    log.preflight_finished(perf_counter() - start, all(result.success for result in results))
+    return list(results)
+
+
+async def run_step(name: str, step: PreflightStep) -> PreflightStepResult:
+    start = perf_counter()
+
+    try:
+        success = await step()
+    except Exception as exc:
+        result = PreflightStepResult(name, perf_counter() - start, False, exc)
+        log.step_error(result.name, result.duration, exc)
+        return result
+
+    result = PreflightStepResult(name, perf_counter() - start, success is not False)
+    if result.success:
+        log.step_finished(result.name, result.duration)
+    else:
+        log.step_failed(result.name, result.duration)
+    return result
+
+
+__all__ = [
+    # Classes
+    PreflightStepResult.__name__,
+    # Functions
+    run_step.__name__,
+    run_steps.__name__,
+]
@@ -0,0 +1,152 @@
+import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic
+from typing import Generator, Optional
+
+from ..log.log_importer import progress as log
+from ..models.run_statistics import RunStatistics
+
+
+@dataclass(frozen=True)
+class Progress:
+    chunk_file_count: int
+    chunk_done_count: int
+    chunk_bytes_downloaded: int
+    chunk_bytes_imported: int
+    total_done_count: int
+    total_bytes_downloaded: int
+    total_bytes_imported: int
+    remaining_count: int
+    files_per_second: float
+    download_bytes_per_second: float
+    import_bytes_per_second: float
+    eta: Optional[timedelta]
+
+
+class ProgressReporter:
+    """Periodically logs the progress of the bulk imports of this process.
+
+    It only reads the counters of the current run's `RunStatistics`, so the download & import workers aren't slowed down. Throughput is an
+    exponential moving average over the reports, and the ETA is based on the number of files left in the last Google Drive listing.
+    """
+
+    def __init__(self, interval: float, smoothing: float = 0.3):
+        self.interval: float = interval
+        self.smoothing: float = smoothing
+
+        self.__statistics: Optional[RunStatistics] = None
+        self.__finished_done_count: int = 0
+        self.__finished_bytes_downloaded: int = 0
+        self.__finished_bytes_imported: int = 0
+
+        self.__last_sample: Optional[tuple[float, int, int, int]] = None
+        self.__files_per_second: Optional[float] = None
+        self.__download_bytes_per_second: Optional[float] = None
+        self.__import_bytes_per_second: Optional[float] = None
+        self.__report_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def get_progress(self, now: Optional[float] = None) -> Optional[Progress]:
+        """Takes a sample of the current run's statistics and updates the moving averages.
+
+        Args:
+            now (float, optional): The `time.monotonic()` timestamp of the sample. Defaults to now.
+
+        Returns:
+            Optional[Progress]: The progress, if a run is being tracked.
+        """
+        statistics = self.__statistics
+        if statistics is None:
+            return None
+
+        now = monotonic() if now is None else now
+        sample = self.__take_sample(statistics, now)
+        self.__update_rates(sample)
+
+        remaining_count = max(statistics.listed_file_count - statistics.done_count, 0)
+        eta = timedelta(seconds=remaining_count / self.__files_per_second) if self.__files_per_second else None
+
+        return Progress(
+            chunk_file_count=statistics.file_count,
+            chunk_done_count=statistics.done_count,
+            chunk_bytes_downloaded=statistics.bytes_downloaded,
+            chunk_bytes_imported=statistics.bytes_imported,
+            total_done_count=sample[1],
+            total_bytes_downloaded=sample[2],
+            total_bytes_imported=sample[3],
+            remaining_count=remaining_count,
+            files_per_second=self.__files_per_second or 0.0,
+            download_bytes_per_second=self.__download_bytes_per_second or 0.0,
+            import_bytes_per_second=self.__import_bytes_per_second or 0.0,
+            eta=eta,
+        )
+
+    @contextmanager
+    def track(self, statistics: RunStatistics) -> Generator[None, None, None]:
+        """Reports the progress of the run `statistics` belong to every `interval` seconds while in the `with` block.
+
+        Must be entered from within a running event loop, if enabled.
+        """
+        self.__statistics = statistics
+        if self.__last_sample is None:
+            self.__last_sample = self.__take_sample(statistics, monotonic())
+
+        stopped = asyncio.Event()
+        if self.enabled:
+            self.__report_task = asyncio.get_running_loop().create_task(self.__report_periodically(stopped))
+
+        try:
+            yield
+        finally:
+            stopped.set()
+
+            self.__finished_done_count += statistics.done_count
+            self.__finished_bytes_downloaded += statistics.bytes_downloaded
+            self.__finished_bytes_imported += statistics.bytes_imported
+            self.__statistics = None
+
+    async def __report_periodically(self, stopped: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(stopped.wait(), timeout=self.interval)
+                return
+            except TimeoutError:
+                progress = self.get_progress()
+                if progress:
+                    log.progress(progress)
+
+    def __take_sample(self, statistics: RunStatistics, now: float) -> tuple[float, int, int, int]:
+        return (
+            now,
+            self.__finished_done_count + statistics.done_count,
+            self.__finished_bytes_downloaded + statistics.bytes_downloaded,
+            self.__finished_bytes_imported + statistics.bytes_imported,
+        )
+
+    def __update_rates(self, sample: tuple[float, int, int, int]):
+        last_sample = self.__last_sample
+        self.__last_sample = sample
+        if last_sample is None or sample[0] <= last_sample[0]:
+            return
+
+        elapsed = sample[0] - last_sample[0]
+        self.__files_per_second = self.__smooth(self.__files_per_second, (sample[1] - last_sample[1]) / elapsed)
+        self.__download_bytes_per_second = self.__smooth(self.__download_bytes_per_second, (sample[2] - last_sample[2]) / elapsed)
+        self.__import_bytes_per_second = self.__smooth(self.__import_bytes_per_second, (sample[3] - last_sample[3]) / elapsed)
+
+    def __smooth(self, average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * average
+
+
+__all__ = [
+    # Classes
+    Progress.__name__,
+    ProgressReporter.__name__,
+]
@@ -0,0 +1,118 @@
+import asyncio
+import secrets
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from ..core.clock import Clock, SystemClock
+from ..core.gdrive import DriveChannel, GoogleDriveClient
+from ..core.webhook import DriveNotification, NotificationReceiver
+from ..log.log_importer import push as log
+from . import metrics
+
+
+RENEW_BEFORE_EXPIRATION = timedelta(minutes=10)
+
+
+class PushNotifications:
+    """Watches the Google Drive folder through a notification channel and wakes up the import loop, when Google Drive reports a change.
+
+    Google Drive posts notifications to `address`, which must be an HTTPS URL forwarded to the local receiver listening on `port`.
+    """
+
+    def __init__(self, address: str, port: int, channel_ttl: float, clock: Optional[Clock] = None, host: str = "0.0.0.0"):
+        self.__address: str = address
+        self.__channel_ttl: timedelta = timedelta(seconds=channel_ttl)
+        self.__clock: Clock = clock or SystemClock()
+        self.__receiver: NotificationReceiver = NotificationReceiver(self.__on_notification, port, host=host)
+
+        self.__channel: Optional[DriveChannel] = None
+        self.__gdrive_client: Optional[GoogleDriveClient] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__notified: asyncio.Event = asyncio.Event()
+
+    @property
+    def channel(self) -> Optional[DriveChannel]:
+        return self.__channel
+
+    @property
+    def port(self) -> int:
+        return self.__receiver.port
+
+    async def start(self, gdrive_client: GoogleDriveClient):
+        """Starts the receiver and registers a channel for the Google Drive folder."""
+        self.__loop = asyncio.get_running_loop()
+        self.__gdrive_client = gdrive_client
+        self.__receiver.start()
+        await self.__register_channel()
+
+    async def stop(self):
+        if self.__channel:
+            await self.__stop_channel(self.__channel)
+            self.__channel = None
+        self.__receiver.stop()
+
+    async def renew_if_expiring(self):
+        """Replaces the channel with a new one, if it expires soon. Google Drive doesn't renew channels.
+
+        If the new channel can't be registered, the expiring one is kept. Once it's expired, the import loop falls back to importing hourly.
+        """
+        if not self.__channel or not self.__channel.expiration:
+            return
+
+        if self.__channel.expiration - self.__clock.now() > RENEW_BEFORE_EXPIRATION:
+            return
+
+        expiring_channel = self.__channel
+        try:
+            await self.__register_channel()
+        except Exception:
+            return
+        await self.__stop_channel(expiring_channel)
+
+    async def wait(self, seconds: float) -> bool:
+        """Waits for a notification for up to `seconds`.
+
+        Returns:
+            bool: `True`, if Google Drive reported a change. `False`, if the time ran out.
+        """
+        notified_task = asyncio.create_task(self.__notified.wait())
+        sleep_task = asyncio.create_task(self.__clock.sleep(max(seconds, 0.0)))
+        done, pending = await asyncio.wait((notified_task, sleep_task), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+        notified = notified_task in done
+        self.__notified.clear()
+        return notified
+
+    async def __register_channel(self):
+        expiration = self.__clock.now() + self.__channel_ttl
+        channel_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
+
+        self.__receiver.expect_channel(channel_id, token)
+        try:
+            self.__channel = await asyncio.to_thread(self.__gdrive_client.watch_folder, self.__address, channel_id, token, expiration)
+        except Exception as exc:
+            self.__receiver.forget_channel(channel_id)
+            log.channel_register_error(exc)
+            raise
+
+    async def __stop_channel(self, channel: DriveChannel):
+        self.__receiver.forget_channel(channel.id)
+        try:
+            await asyncio.to_thread(self.__gdrive_client.stop_channel, channel)
+        except Exception as exc:  # The channel expires anyway.
+            log.channel_stop_error(channel.id, exc)
+
+    def __on_notification(self, notification: DriveNotification):
+        """Called from the receiver's thread."""
+        metrics.PUSH_NOTIFICATIONS.inc(resource_state=notification.resource_state)
+        self.__loop.call_soon_threadsafe(self.__notified.set)
+
+
+__all__ = [
+    # Classes
+    PushNotifications.__name__,
+]
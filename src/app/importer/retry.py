@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from ..core.gdrive import GDriveFile, GoogleDriveClient
+from ..database.models import CollectionFileDB
+from ..database.unit_of_work import AbstractUnitOfWork, SqlModelUnitOfWork
+from ..log.log_importer import retry as log
+
+
+GDRIVE_FILE_MISSING = "GDRIVE_FILE_MISSING"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Schedules another attempt to import a failed file with exponential backoff: `base_delay`, then twice as long after each failure."""
+
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_attempts > 1
+
+    def get_next_attempt_at(self, attempt_count: int, now: datetime) -> Optional[datetime]:
+        """Returns when to attempt importing a file again after `attempt_count` failed attempts or `None`, if it's out of attempts."""
+        if attempt_count >= self.max_attempts:
+            return None
+
+        delay = min(self.base_delay * 2 ** max(attempt_count - 1, 0), self.max_delay)
+        return now + timedelta(seconds=delay)
+
+
+def schedule_retry(collection_file: CollectionFileDB, last_error: Optional[str], retry_policy: Optional[RetryPolicy], now: datetime):
+    """Records a failed attempt to import `collection_file` and when to attempt it again, if at all."""
+    collection_file.attempt_count = (collection_file.attempt_count or 0) + 1
+    collection_file.last_error = last_error
+    collection_file.next_attempt_at = retry_policy.get_next_attempt_at(collection_file.attempt_count, now) if retry_policy else None
+
+    if collection_file.next_attempt_at:
+        log.retry_scheduled(collection_file.file_name, collection_file.attempt_count, collection_file.next_attempt_at)
+    elif retry_policy and retry_policy.enabled:
+        log.retry_given_up(collection_file.file_name, collection_file.attempt_count, last_error)
+
+
+async def list_due_retries(now: datetime, limit: Optional[int] = None, uow: Optional[AbstractUnitOfWork] = None) -> list[CollectionFileDB]:
+    uow = uow or SqlModelUnitOfWork()
+
+    async with uow:
+        return await uow.collection_files.list_due_retries(now, limit=limit)
+
+
+def find_gdrive_files(gdrive_client: GoogleDriveClient, collection_files: Iterable[CollectionFileDB]) -> list[GDriveFile]:
+    """Looks up the files in Google Drive by name, which is much cheaper than listing them by modified date, since they're scattered in time.
+
+    Returns:
+        list[GDriveFile]: The files found, in the order of `collection_files`.
+    """
+    gdrive_files = []
+
+    for collection_file in collection_files:
+        gdrive_file = next(
+            (
+                gdrive_file
+                for gdrive_file in gdrive_client.list_files_by_name_prefix(collection_file.file_name)
+                if gdrive_file.id == collection_file.gdrive_file_id
+            ),
+            None,
+        )
+
+        if gdrive_file:
+            gdrive_files.append(gdrive_file)
+        else:
+            log.file_missing(collection_file.file_name)
+
+    return gdrive_files
+
+
+__all__ = [
+    # Classes
+    RetryPolicy.__name__,
+    # Functions
+    find_gdrive_files.__name__,
+    list_due_retries.__name__,
+    schedule_retry.__name__,
+]
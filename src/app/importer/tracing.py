@@ -0,0 +1,45 @@
+from typing import Iterable, Optional
+
+from ..core.tracing import AttributeValue, Span, Tracer
+from ..models.queue_item import QueueItem
+
+
+TRACER = Tracer()
+
+SPAN_BULK_IMPORT = "bulk_import"
+SPAN_DB_INSERT = "db.insert"
+SPAN_DB_UPDATE = "db.update"
+SPAN_DOWNLOAD = "download"
+SPAN_DOWNLOAD_FETCH = "download.fetch"
+SPAN_DOWNLOAD_QUEUED = "download.queued"
+SPAN_DOWNLOAD_WRITE = "download.write"
+SPAN_GDRIVE_LIST = "gdrive.list"
+SPAN_IMPORT = "import"
+SPAN_QUEUE_ITEM = "queue_item"
+SPAN_RETRY = "retry"
+SPAN_VALIDATE = "validate"
+
+
+def get_queue_item_attributes(queue_item: QueueItem) -> dict[str, AttributeValue]:
+    return {
+        "item_no": queue_item.item_no,
+        "collection_file_id": queue_item.collection_file_id,
+        "gdrive_file.id": queue_item.gdrive_file.id,
+        "gdrive_file.name": queue_item.gdrive_file.name,
+        "gdrive_file.size": queue_item.gdrive_file.size,
+    }
+
+
+def get_queue_item_status_attributes(queue_item: QueueItem) -> dict[str, AttributeValue]:
+    attributes = {"state": queue_item.status.state.name.lower()}
+    if queue_item.status.failure:
+        attributes["failure"] = queue_item.status.failure.name.lower()
+    return attributes
+
+
+def start_queue_item_spans(queue_items: Iterable[QueueItem], parent: Optional[Span]):
+    if not TRACER.enabled:
+        return
+
+    for queue_item in queue_items:
+        queue_item.trace_span = TRACER.start_span(SPAN_QUEUE_ITEM, parent=parent, attributes=get_queue_item_attributes(queue_item))
@@ -1,35 +1,66 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import time
 from pathlib import Path
-from typing import Optional, Union
-
-from httpx import URL
+from typing import TYPE_CHECKING, Optional, Union
 
 from ..core.config import Config
 from ..core.models.filesystem import FileSystem
 from . import LOGGER_BASE, filter
 
 
+if TYPE_CHECKING:
+    from httpx import URL
+
+
 def aborted():
     LOGGER_BASE.warn("\nAborted by user, shutting down.")
 
 
+QUEUE_HANDLER_NAME = "queue"
+QUEUE_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+
 def configure_logging(logging_config: dict, log_folder_path: Optional[Union[Path, str]], filesystem: FileSystem = FileSystem()):
+    stop_queue_listener()
+
     logging.config.dictConfig(dict(logging_config))
     logging.Formatter.converter = time.gmtime
     if log_folder_path:
         filesystem.mkdir(log_folder_path, create_parents=True, exist_ok=True)
 
+    start_queue_listener()
+
 
 def configure_logging_from_app_config(app_config: Config):
     configure_logging(get_logging_base_config(app_config), app_config.log_folder_path)
 
 
-def connection_failure(api_url: Union[URL, str]):
+def connection_failure(api_url: Union["URL", str]):
     LOGGER_BASE.critical("Cannot connect to server at: %s", api_url)
 
 
+def start_queue_listener():
+    """Starts the thread writing the records of the queue handler to the actual handlers. It'll be stopped at exit, flushing pending records."""
+    global QUEUE_LISTENER
+
+    queue_handler: Optional[logging.handlers.QueueHandler] = logging.getHandlerByName(QUEUE_HANDLER_NAME)
+    if queue_handler and queue_handler.listener:
+        QUEUE_LISTENER = queue_handler.listener
+        QUEUE_LISTENER.start()
+        atexit.register(stop_queue_listener)
+
+
+def stop_queue_listener():
+    global QUEUE_LISTENER
+
+    if QUEUE_LISTENER:
+        QUEUE_LISTENER.stop()
+        QUEUE_LISTENER = None
+
+
 def get_logging_base_config(config: Config):
     logging_base_config = {
         "version": 1,
@@ -55,6 +86,7 @@ def get_logging_base_config(config: Config):
             },
         },
         "filters": {
+            "rate_limit_debug": {"()": filter.RateLimitFilter, "rate": config.log_debug_rate_limit},
             "remove_src": {"()": filter.RemoveSrcFromLoggerNameFilter},
         },
         "handlers": {
@@ -85,7 +117,8 @@ def get_logging_base_config(config: Config):
         },
         "loggers": {
             "importer": {
-                "handlers": ["stderr", "log_file"] if config.log_file_path else ["stderr"],
+                # Records are only put into a queue by the logging threads. A single background thread writes them to stderr & the log file.
+                "handlers": [QUEUE_HANDLER_NAME],
                 "level": config.app_log_level,
                 "propagate": False,
             },
@@ -111,6 +144,14 @@ def get_logging_base_config(config: Config):
         },
     }
 
+    logging_base_config["handlers"][QUEUE_HANDLER_NAME] = {
+        "class": "logging.handlers.QueueHandler",
+        "handlers": ["stderr", "log_file"] if config.log_file_path else ["stderr"],
+        "respect_handler_level": True,
+    }
+    if config.log_debug_rate_limit > 0:
+        logging_base_config["handlers"][QUEUE_HANDLER_NAME]["filters"] = ["rate_limit_debug"]
+
     if config.log_file_path:
         logging_base_config["handlers"]["log_file"] = {
             "level": logging.DEBUG,
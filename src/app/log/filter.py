@@ -1,4 +1,6 @@
 import logging
+import threading
+import time
 
 
 class OnlyDebugInfoFilter(logging.Filter):
@@ -6,6 +8,43 @@ class OnlyDebugInfoFilter(logging.Filter):
         return record.levelno <= logging.INFO
 
 
+class RateLimitFilter(logging.Filter):
+    """Lets through at most `rate` records per second of each message template of a logger at or below `max_level`.
+
+    The number of suppressed records is appended to the next record let through.
+    """
+
+    def __init__(self, rate: int, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.rate: int = rate
+        self.max_level: int = max_level
+        self.__windows: dict[tuple[str, str], list[float]] = {}  # (logger name, message template) -> [window start, passed, suppressed]
+        self.__lock: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.rate <= 0:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+
+        with self.__lock:
+            window = self.__windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                suppressed = int(window[2]) if window else 0
+                self.__windows[key] = [now, 1, 0]
+            elif window[1] < self.rate:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
 class RemoveSrcFromLoggerNameFilter(logging.Filter):
     remove_str = "importer.src."
 
@@ -18,5 +57,6 @@ class RemoveSrcFromLoggerNameFilter(logging.Filter):
 
 __all__ = [
     OnlyDebugInfoFilter.__name__,
+    RateLimitFilter.__name__,
     RemoveSrcFromLoggerNameFilter.__name__,
 ]
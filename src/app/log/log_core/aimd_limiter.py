@@ -0,0 +1,12 @@
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("aimdLimiter")
+
+
+def limit_decreased(name: str, limit: int, reason: str):
+    LOGGER.info("Decreasing the %s concurrency to %i due to %s.", name, limit, reason)
+
+
+def limit_increased(name: str, limit: int):
+    LOGGER.debug("Increasing the %s concurrency to %i.", name, limit)
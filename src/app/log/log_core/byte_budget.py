@@ -0,0 +1,10 @@
+from typing import Optional
+
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("byteBudget")
+
+
+def wait_for_budget(size: int, in_flight: int, max_bytes: Optional[int]):
+    LOGGER.debug("Waiting to reserve %i bytes: %i of %s bytes in flight.", size, in_flight, max_bytes)
@@ -0,0 +1,8 @@
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("chunkSizer")
+
+
+def size_changed(previous_size: int, size: int, files_per_second: float):
+    LOGGER.info("Changing the chunk size from %i to %i files at %.2f files per second.", previous_size, size, files_per_second)
@@ -0,0 +1,14 @@
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("circuitBreaker")
+
+
+def circuit_closed(name: str):
+    LOGGER.info("The %s is available again. Resuming calls.", name)
+
+
+def circuit_opened(name: str, consecutive_failures: int):
+    LOGGER.warning(
+        "The %s seems to be unavailable after %i failed calls in a row. Pausing calls until it responds again.", name, consecutive_failures
+    )
@@ -1,7 +1,8 @@
 from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from time import perf_counter
-from typing import Union
+from typing import Optional, Union
 
 from .. import LOGGER_BASE
 
@@ -9,6 +10,18 @@ from .. import LOGGER_BASE
 LOGGER = LOGGER_BASE.getChild("GoogleDriveClient")
 
 
+def api_endpoint_set(api_endpoint: str):
+    LOGGER.warning("Using the Google Drive API at: %s", api_endpoint)
+
+
+def channel_registered(channel_id: str, expiration: Optional[datetime]):
+    LOGGER.info("Registered notification channel '%s' for the Google Drive folder, expiring at: %s", channel_id, expiration)
+
+
+def channel_stopped(channel_id: str):
+    LOGGER.info("Stopped notification channel: %s", channel_id)
+
+
 def client_creating():
     LOGGER.info("Creating GoogleDriveClient.")
 
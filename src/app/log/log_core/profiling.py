@@ -0,0 +1,8 @@
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("Profiler")
+
+
+def profiler_unavailable(exception: Exception):
+    LOGGER.warn("Could not start profiling: %s", exception)
@@ -0,0 +1,8 @@
+from .. import LOGGER_BASE
+
+
+LOGGER = LOGGER_BASE.getChild("rateLimiter")
+
+
+def wait_for_slot(duration: float):
+    LOGGER.debug("Rate limit reached. Waiting for %.3f seconds.", duration)
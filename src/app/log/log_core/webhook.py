@@ -0,0 +1,20 @@
+from typing import TYPE_CHECKING
+
+from .. import LOGGER_BASE
+
+
+if TYPE_CHECKING:
+    from ...core.webhook import DriveNotification
+
+
+LOGGER = LOGGER_BASE.getChild("NotificationReceiver")
+
+
+def notification_received(notification: "DriveNotification"):
+    LOGGER.debug(
+        "Received notification no. %i of channel '%s': %s", notification.message_number, notification.channel_id, notification.resource_state
+    )
+
+
+def notification_rejected(channel_id: str):
+    LOGGER.warning("Rejected a notification with an unknown channel ID or token. Channel ID: %s", channel_id)
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+from .importer import LOGGER as LOGGER_IMPORTER
+from .progress import format_bytes
+
+
+if TYPE_CHECKING:
+    from ...importer.backfill import BackfillProgress, BackfillWindow, WindowProgress
+
+
+LOGGER = LOGGER_IMPORTER.getChild("backfill")
+
+
+def backfill_finish(progress: "BackfillProgress", duration: timedelta):
+    LOGGER.info(
+        "Backfill finished in %s: %i of %i windows completed, %i of %i files (%s) imported.",
+        str(duration).split(".")[0],
+        progress.finished_window_count,
+        len(progress.windows),
+        progress.imported_count,
+        progress.file_count,
+        format_bytes(progress.bytes_imported),
+    )
+
+
+def backfill_progress(progress: "BackfillProgress", eta: Optional[timedelta]):
+    LOGGER.info(
+        "Backfill progress: %.1f %% of the time range covered, %i of %i windows completed, %i of %i files (%s) imported. ETA: %s",
+        progress.covered_fraction * 100,
+        progress.finished_window_count,
+        len(progress.windows),
+        progress.imported_count,
+        progress.file_count,
+        format_bytes(progress.bytes_imported),
+        str(eta).split(".")[0] if eta is not None else "unknown",
+    )
+
+
+def backfill_start(start: datetime, end: datetime, window_count: int, worker_count: int):
+    LOGGER.info(
+        "Backfilling files modified from %s to %s in %i windows with %i workers.", start.isoformat(), end.isoformat(), window_count, worker_count
+    )
+
+
+def window_error(window: "BackfillWindow", exc: BaseException):
+    LOGGER.error("Backfill window %i (%s to %s) failed: %s", window.index, window.modified_after.isoformat(), window.modified_before.isoformat(), exc)
+
+
+def window_finish(window: "BackfillWindow", progress: "WindowProgress"):
+    LOGGER.info(
+        "Backfill window %i finished at %s: %i of %i files imported.", window.index, progress.watermark, progress.imported_count, progress.file_count
+    )
+
+
+def window_stalled(window: "BackfillWindow", watermark: datetime):
+    LOGGER.warning(
+        "Backfill window %i stopped at %s, because the next file hasn't been imported. It's left unfinished for the next backfill.",
+        window.index,
+        watermark.isoformat(),
+    )
+
+
+def window_start(window: "BackfillWindow", watermark: datetime):
+    LOGGER.info(
+        "Backfilling window %i from %s to %s, continuing from %s.",
+        window.index,
+        window.modified_after.isoformat(),
+        window.modified_before.isoformat(),
+        watermark.isoformat(),
+    )
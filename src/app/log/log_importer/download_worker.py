@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from ...core.models.cancellation_token import CancellationToken
 from .importer import LOGGER as LOGGER_IMPORTER
@@ -61,8 +61,11 @@ def thread_pool_cancel():
     LOGGER.debug("Shutting down thread pool, waiting for running downloads to complete.")
 
 
-def thread_pool_setup(worker_count: int):
-    LOGGER.debug("Setting up thread pool for downloads with %i workers.", worker_count)
+def thread_pool_setup(worker_count: int, memory_budget: Optional[int]):
+    if memory_budget:
+        LOGGER.debug("Setting up thread pool for downloads with %i workers and a memory budget of %i bytes.", worker_count, memory_budget)
+    else:
+        LOGGER.debug("Setting up thread pool for downloads with %i workers.", worker_count)
 
 
 def wait_for_futures():
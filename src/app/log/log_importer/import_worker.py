@@ -20,7 +20,13 @@ def collection_upload_skipped(item_no: int, file_path: Union[Path, str]):
 
 def file_import_error(item_no: int, gdrive_file_name: str, exception: Exception):
     if exception.args:
-        LOGGER.warn("Could not import file no. %i: %s - %s (%s)", item_no, gdrive_file_name, type(exception).__qualname__, " - ".join(exception.args))
+        LOGGER.warn(
+            "Could not import file no. %i: %s - %s (%s)",
+            item_no,
+            gdrive_file_name,
+            type(exception).__qualname__,
+            " - ".join(str(arg) for arg in exception.args),
+        )
     else:
         LOGGER.warn("Could not import file no. %i: %s - %s", item_no, gdrive_file_name, type(exception).__qualname__)
 
@@ -5,19 +5,31 @@ from typing import Optional, Union
 
 from ...core.models.cancellation_token import CancellationToken
 from ...core.models.collection_file_change import CollectionFileChange
-from ...models.queue_item import QueueItem
+from ...models.run_statistics import RunStatistics
 from .. import LOGGER_BASE
 
 
 LOGGER = LOGGER_BASE.getChild("Importer")
 
 
-def bulk_import_finish(queue_items: list[QueueItem], modified_after: Optional[datetime], modified_before: Optional[datetime]):
-    total_item_count = len(queue_items)
-    downloaded_item_count = len([queue_item for queue_item in queue_items if queue_item.status.downloaded])
-    imported_item_count = len([queue_item for queue_item in queue_items if queue_item.status.imported])
+def api_probe_failed(probe_interval: float):
+    LOGGER.info("The PSS Fleet Data API is still unavailable. Pinging it again in %.2f seconds.", probe_interval)
 
-    base_message = f"Finished bulk import. Downloaded {downloaded_item_count}, imported {imported_item_count} out of {total_item_count} files"
+
+def api_recovery_wait(duration: float):
+    LOGGER.info("Waiting for up to %.2f seconds for the PSS Fleet Data API to become available again.", duration)
+
+
+def bulk_import_finish(statistics: RunStatistics):
+    modified_after = statistics.modified_after
+    modified_before = statistics.modified_before
+
+    base_message = (
+        f"Finished bulk import. Downloaded {statistics.downloaded_count} ({statistics.bytes_downloaded} bytes), "
+        f"imported {statistics.imported_count} ({statistics.bytes_imported} bytes) out of {statistics.file_count} files "
+        f"({statistics.restored_count} restored from the journal) "
+        f"with {statistics.download_error_count} download errors, {statistics.import_error_count} import errors & {statistics.retry_count} retries"
+    )
 
     if modified_after:
         if modified_before:
@@ -31,9 +43,10 @@ def bulk_import_finish(queue_items: list[QueueItem], modified_after: Optional[da
             LOGGER.info("%s.", base_message)
 
 
-def bulk_import_finish_time(item_count: int, start: datetime, end: datetime):
-    LOGGER.info("### Finished bulk import of %i files at: %s (after: %s)", item_count, end.isoformat(), str(end - start))
-    print(f"### Finished bulk import of {item_count} files at: {end.isoformat()} (after: {end - start})")
+def bulk_import_finish_time(statistics: RunStatistics):
+    end = statistics.finished_at
+    LOGGER.info("### Finished bulk import of %i files at: %s (after: %s)", statistics.file_count, end.isoformat(), str(statistics.duration))
+    print(f"### Finished bulk import of {statistics.file_count} files at: {end.isoformat()} (after: {statistics.duration})")
 
 
 def bulk_import_start(modified_after: Optional[datetime], modified_before: Optional[datetime]):
@@ -56,6 +69,21 @@ def bulk_import_start_time(start: datetime):
     print(f"### Starting bulk import at: {start.isoformat()}")
 
 
+def checkpoint_resume(checkpoint_name: str, watermark: datetime):
+    LOGGER.info("Resuming from checkpoint '%s' at: %s", checkpoint_name, watermark.isoformat())
+
+
+def checkpoint_save(checkpoint_name: str, watermark: datetime):
+    LOGGER.debug("Saved checkpoint '%s' at: %s", checkpoint_name, watermark.isoformat())
+
+
+def collection_files_claimed(claimed_count: int, file_count: int):
+    if claimed_count < file_count:
+        LOGGER.info("Skipping %i of %i files leased by other instances.", file_count - claimed_count, file_count)
+    else:
+        LOGGER.debug("Leased all %i files.", file_count)
+
+
 def database_entries_create():
     LOGGER.debug("Creating database entries.")
 
@@ -104,12 +132,42 @@ def download_gdrive_file_list_params(modified_after: Optional[datetime], modifie
         LOGGER.info("Retrieving all gdrive files.")
 
 
-def downloads_imports_count(queue_items: list[QueueItem]):
-    download_count = len([_ for _ in queue_items if not _.status.downloaded])
-    import_count = len([_ for _ in queue_items if not _.status.imported])
+def downloads_imports_count(download_count: int, import_count: int):
     LOGGER.info(f"Downloading {download_count} Collection files and importing {import_count} Collection files.")
 
 
+def expired_leases_found(gdrive_modified_date: datetime):
+    LOGGER.warning("Found files with an expired lease. Listing files modified after %s again.", gdrive_modified_date.isoformat())
+
+
+def files_spooled(file_count: int):
+    LOGGER.warning("Kept %i downloaded files to import once the PSS Fleet Data API is available again.", file_count)
+
+
+def import_task_error(exc: Exception):
+    LOGGER.error("Could not import a file: %s", exc, exc_info=exc)
+
+
+def instance_id_created(instance_id: str, file_path: Union[Path, str]):
+    LOGGER.info("Leasing files as instance %s. The ID is kept in: %s", instance_id, file_path)
+
+
+def leases_renewal_error(lease_owner: str, exc: Exception):
+    LOGGER.warning("Could not renew the leases of '%s': %s", lease_owner, exc)
+
+
+def leases_renewed(renewed_count: int, lease_owner: str, lease_expires_at: datetime):
+    LOGGER.debug("Renewed %i leases of '%s' until: %s", renewed_count, lease_owner, lease_expires_at.isoformat())
+
+
+def profile_written(file_path: Union[Path, str]):
+    LOGGER.info("Wrote profile of bulk import to: %s", file_path)
+
+
+def queue_item_spooled(item_no: int, file_name: str):
+    LOGGER.debug("Keeping file no. %i (%s) until the PSS Fleet Data API is available again.", item_no, file_name)
+
+
 def queue_item_update(item_no: int, change: CollectionFileChange):
     LOGGER.debug("Updated queue item no. %i: %s", item_no, change)
 
@@ -118,10 +176,54 @@ def queue_items_create():
     LOGGER.debug("Creating queue items.")
 
 
+def retries_due(file_count: int):
+    LOGGER.info("Retrying %i files, which failed to import before.", file_count)
+
+
+def retries_error(exc: Exception):
+    LOGGER.error("Could not retry the files, which failed to import before: %s", exc)
+
+
+def retries_finished(imported_count: int, file_count: int):
+    LOGGER.info("Imported %i of %i files retried.", imported_count, file_count)
+
+
+def run_statistics_save(statistics: RunStatistics):
+    LOGGER.debug("Saving statistics of bulk import: %s", statistics)
+
+
 def wait_for_import(duration: float, until: datetime):
     LOGGER.info("Waiting for %.2f seconds until next import run at %s.", duration, until.isoformat())
 
 
+def push_notifications_disabled(exc: Exception):
+    LOGGER.error("Could not set up change notifications from Google Drive, importing at each full hour instead: %s", exc)
+
+
+def push_notification_triggers_import():
+    LOGGER.info("Google Drive reported a change. Starting an import.")
+
+
+def push_notification_wait(duration: float):
+    LOGGER.info("Waiting for up to %.2f seconds for Google Drive to report a change.", duration)
+
+
+def watch_deadline_passed(file_name_prefix: str):
+    LOGGER.warning("No file starting with '%s' appeared within its hour. Importing whatever has been modified since.", file_name_prefix)
+
+
+def watch_file_found(file_name_prefix: str):
+    LOGGER.info("Found the next file starting with: %s", file_name_prefix)
+
+
+def watch_file_missing(file_name_prefix: str, poll_interval: float):
+    LOGGER.debug("The next file starting with '%s' hasn't appeared yet. Checking again in %.2f seconds.", file_name_prefix, poll_interval)
+
+
+def watch_wait(duration: float, file_name_prefix: str):
+    LOGGER.info("Waiting for %.2f seconds until the next file starting with '%s' is due.", duration, file_name_prefix)
+
+
 def worker_ended(worker_name: str, cancel_token: CancellationToken = None):
     if cancel_token and cancel_token.cancelled:
         LOGGER.info("%s worker cancelled.", worker_name.strip())
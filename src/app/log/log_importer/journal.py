@@ -0,0 +1,15 @@
+from pathlib import Path
+from typing import Union
+
+from .importer import LOGGER as LOGGER_IMPORTER
+
+
+LOGGER = LOGGER_IMPORTER.getChild("journal")
+
+
+def entry_invalid(file_path: Union[Path, str], line_no: int):
+    LOGGER.warning("Skipping invalid line no. %i of the journal: %s", line_no, file_path)
+
+
+def queue_items_restored(imported_count: int, downloaded_count: int):
+    LOGGER.info("Resuming the chunk from the journal: %i files have been imported & %i downloaded before.", imported_count, downloaded_count)
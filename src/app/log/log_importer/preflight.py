@@ -0,0 +1,38 @@
+from typing import Iterable
+
+from .importer import LOGGER as LOGGER_IMPORTER
+
+
+LOGGER = LOGGER_IMPORTER.getChild("preflight")
+
+
+def preflight_finished(duration: float, success: bool):
+    if success:
+        LOGGER.info("Start-up checks finished after %.2f seconds.", duration)
+    else:
+        LOGGER.error("Start-up checks failed after %.2f seconds.", duration)
+
+
+def preflight_start(step_names: Iterable[str]):
+    LOGGER.info("Running start-up checks concurrently: %s", ", ".join(step_names))
+
+
+def step_error(step_name: str, duration: float, exception: Exception):
+    LOGGER.error("%s failed after %.2f seconds: %s", step_name, duration, exception, exc_info=exception)
+
+
+def step_failed(step_name: str, duration: float):
+    LOGGER.error("%s failed after %.2f seconds.", step_name, duration)
+
+
+def step_finished(step_name: str, duration: float):
+    LOGGER.info("%s took %.2f seconds.", step_name, duration)
+
+
+__all__ = [
+    preflight_finished.__name__,
+    preflight_start.__name__,
+    step_error.__name__,
+    step_failed.__name__,
+    step_finished.__name__,
+]
@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING
+
+from .importer import LOGGER as LOGGER_IMPORTER
+
+
+if TYPE_CHECKING:
+    from ...importer.progress import Progress
+
+
+LOGGER = LOGGER_IMPORTER.getChild("progress")
+
+
+def progress(progress: "Progress"):
+    eta = str(progress.eta).split(".")[0] if progress.eta is not None else "unknown"
+    LOGGER.info(
+        "Progress: %i of %i files (%s downloaded, %s imported) in this chunk, %i files (%s imported) overall, %i files left. "
+        "Throughput: %.2f files/s, download %s/s, import %s/s. ETA: %s",
+        progress.chunk_done_count,
+        progress.chunk_file_count,
+        format_bytes(progress.chunk_bytes_downloaded),
+        format_bytes(progress.chunk_bytes_imported),
+        progress.total_done_count,
+        format_bytes(progress.total_bytes_imported),
+        progress.remaining_count,
+        progress.files_per_second,
+        format_bytes(progress.download_bytes_per_second),
+        format_bytes(progress.import_bytes_per_second),
+        eta,
+    )
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
@@ -0,0 +1,12 @@
+from .importer import LOGGER as LOGGER_IMPORTER
+
+
+LOGGER = LOGGER_IMPORTER.getChild("push")
+
+
+def channel_register_error(exc: Exception):
+    LOGGER.error("Could not register a notification channel with Google Drive: %s", exc)
+
+
+def channel_stop_error(channel_id: str, exc: Exception):
+    LOGGER.warning("Could not stop the notification channel '%s', it'll expire on its own: %s", channel_id, exc)
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from .importer import LOGGER as LOGGER_IMPORTER
+
+
+LOGGER = LOGGER_IMPORTER.getChild("retry")
+
+
+def file_missing(file_name: str):
+    LOGGER.warning("The file '%s' to retry isn't in Google Drive anymore.", file_name)
+
+
+def retry_given_up(file_name: str, attempt_count: int, last_error: str):
+    LOGGER.error("Giving up on file '%s' after %i attempts. Last error: %s", file_name, attempt_count, last_error)
+
+
+def retry_scheduled(file_name: str, attempt_count: int, next_attempt_at: datetime):
+    LOGGER.info("Attempt no. %i to import file '%s' failed. Retrying at: %s", attempt_count, file_name, next_attempt_at.isoformat())
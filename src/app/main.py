@@ -1,34 +1,80 @@
+import argparse
 import asyncio
 import logging
+import os
 import sys
-from datetime import datetime  # noqa
+from datetime import datetime
+from typing import Optional, Sequence
 
-from pss_fleet_data import PssFleetDataClient
-
-from ..app import __version__
+from ..app import __app_name__, __version__
 from .core import config
-from .core.gdrive import GoogleDriveClient
-from .importer import Importer
 from .log import base as logger_base
 
 
-async def main():
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog=__app_name__,
+        description="Imports PSS Fleet Data from Google Drive to the PSS Fleet Data API. Configuration is read from environment variables.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+
+    subparsers = parser.add_subparsers(dest="command")
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Import the files modified within a time range in parallel, then exit.",
+        description="Splits a time range into windows and imports each window in a worker process with its own clients.",
+    )
+    backfill_parser.add_argument(
+        "--from",
+        dest="backfill_from",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Import files modified after this date & time in UTC (ISO format). Defaults to the earliest date of PSS Fleet Data.",
+    )
+    backfill_parser.add_argument(
+        "--until",
+        dest="backfill_until",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Import files modified before this date & time in UTC (ISO format). Defaults to now.",
+    )
+    backfill_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="The number of worker processes. Defaults to the number of CPUs."
+    )
+    backfill_parser.add_argument(
+        "--windows",
+        type=int,
+        default=None,
+        help="The number of windows to split the time range into. More windows than workers balance the load better. Defaults to the number of workers.",
+    )
+    return parser.parse_args(args)
+
+
+async def main(args: Optional[Sequence[str]] = None):
+    arguments = parse_args(args)
+
+    # The Google Drive client, the Importer and the PSS Fleet Data client pull in heavy dependencies, so they're imported after parsing the arguments.
+    from pss_fleet_data import PssFleetDataClient
+
+    from .core.gdrive import GoogleDriveClient
+    from .importer import Importer
+
     configuration = config.ConfigRepository.get_config()
     logger_base.configure_logging_from_app_config(configuration)
 
-    print()
-    print("  ===========================")
-    print("    PSS FLEET DATA IMPORTER")
-    print("  ===========================")
-    print()
-    print(f"  Version: {__version__}")
-    print(f"  Log level: {logging.getLevelName(configuration.app_log_level)}")
-    print(f"  Debug mode: {configuration.debug_mode}")
-    print(f"  API server URL: {configuration.api_default_server_url}")
-    print(f"  Google Drive folder ID: {configuration.gdrive_folder_id}")
-    print(f"  Download folder: {configuration.temp_download_folder}")
-    print(f"  Download thread pool size: {configuration.download_thread_pool_size}")
-    print()
+    print_configuration(configuration)
+
+    if configuration.metrics_port:
+        from .core.metrics import MetricsServer
+        from .importer import metrics
+
+        MetricsServer(metrics.REGISTRY, configuration.metrics_port).start()
+
+    if configuration.trace_file_path:
+        from .core.tracing import JsonLinesSpanExporter
+        from .importer import tracing
+
+        tracing.TRACER.set_exporter(JsonLinesSpanExporter(configuration.trace_file_path))
 
     gdrive_client = GoogleDriveClient(
         configuration.gdrive_project_id,
@@ -40,9 +86,8 @@ async def main():
         configuration.gdrive_folder_id,
         configuration.gdrive_service_account_file_path,
         configuration.gdrive_settings_file_path,
+        api_endpoint=configuration.gdrive_api_endpoint,
     )
-    gdrive_client.initialize()
-
     pss_fleet_data_client = PssFleetDataClient(configuration.api_default_server_url, configuration.api_key)
 
     importer = Importer(
@@ -50,11 +95,20 @@ async def main():
         pss_fleet_data_client,
     )
 
+    preflight_results = await importer.run_preflight(gdrive_client)
+    preflight_errors = [result.error for result in preflight_results if result.error]
+    if preflight_errors:
+        raise preflight_errors[0]
+
     if configuration.app_log_level <= logging.INFO:
         print()
-    print("  Starting import loop.")
+    print("  Starting backfill." if arguments.command == "backfill" else "  Starting import loop.")
 
-    if await importer.check_api_server_connection():
+    if not all(result.success for result in preflight_results):
+        logger_base.connection_failure(pss_fleet_data_client.base_url)
+    elif arguments.command == "backfill":
+        await run_backfill(configuration, arguments)
+    else:
         try:
             # await importer.run_import_loop(modified_after=datetime(2024, 8, 16, 12), modified_before=datetime(2024, 8, 16, 13))
             # await importer.run_import_loop(modified_after=datetime(2024, 8, 20, 10))
@@ -65,8 +119,40 @@ async def main():
             logger_base.aborted()
             importer.cancel_workers()
             sys.exit(1)
+
+
+def print_configuration(configuration: config.Config):
+    print()
+    print("  ===========================")
+    print("    PSS FLEET DATA IMPORTER")
+    print("  ===========================")
+    print()
+    print(f"  Version: {__version__}")
+    print(f"  Log level: {logging.getLevelName(configuration.app_log_level)}")
+    print(f"  Debug mode: {configuration.debug_mode}")
+    print(f"  API server URL: {configuration.api_default_server_url}")
+    print(f"  Google Drive folder ID: {configuration.gdrive_folder_id}")
+    print(f"  Download folder: {configuration.temp_download_folder}")
+    print(f"  Download thread pool size: {configuration.download_thread_pool_size}")
+    print(f"  Concurrency autotuning: {configuration.autotune_concurrency}")
+    if configuration.chunk_target_duration > 0:
+        print(f"  Chunk size: {configuration.chunk_size} files, adapted to {configuration.chunk_target_duration:g} seconds per chunk")
     else:
-        logger_base.connection_failure(pss_fleet_data_client.base_url)
+        print(f"  Chunk size: {configuration.chunk_size} files")
+    if configuration.metrics_port:
+        print(f"  Metrics port: {configuration.metrics_port}")
+    if configuration.trace_file_path:
+        print(f"  Trace file: {configuration.trace_file_path}")
+    print()
+
+
+async def run_backfill(configuration: config.Config, arguments: argparse.Namespace):
+    from .core import utils
+    from .importer.backfill import run_backfill
+
+    start = arguments.backfill_from or configuration.earliest_data_date
+    end = arguments.backfill_until or utils.get_now()
+    await run_backfill(configuration, start, end, arguments.workers, window_count=arguments.windows)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 from ..core.models.cancellation_token import CancellationToken
 from ..core.models.collection_file_change import CollectionFileChange
 from ..core.models.status import ImportStatus, StatusFlag
-from .queue_item import QueueItem
+from .queue_item import QueueItem, QueueItemFailure, QueueItemState, QueueItemStatus
+from .run_statistics import RunStatistics
 
 
 __all__ = [
@@ -9,6 +10,10 @@ __all__ = [
     CancellationToken.__name__,
     CollectionFileChange.__name__,
     QueueItem.__name__,
+    QueueItemFailure.__name__,
+    QueueItemState.__name__,
+    QueueItemStatus.__name__,
+    RunStatistics.__name__,
     ImportStatus.__name__,
     StatusFlag.__name__,
 ]
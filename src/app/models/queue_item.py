@@ -1,53 +1,170 @@
 from datetime import datetime
+from enum import IntEnum
 from pathlib import Path
 from threading import Lock
-from typing import Optional, Union
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional, Union
 
 from ..core.gdrive import GDriveFile
 from ..core.models.cancellation_token import CancellationToken
-from ..core.models.status import StatusFlag
-from ..database.models import CollectionFileDB
+from ..core.tracing import Span
+
+
+if TYPE_CHECKING:
+    from .run_statistics import RunStatistics
+
+
+class QueueItemState(IntEnum):
+    QUEUED = 0
+    DOWNLOADING = 1
+    DOWNLOADED = 2
+    IMPORTING = 3
+    IMPORTED = 4
+    FAILED = 5
+
+
+class QueueItemFailure(IntEnum):
+    DOWNLOAD_ERROR = 1
+    DOWNLOAD_TIMED_OUT = 2
+    IMPORT_ERROR = 3
 
 
 class QueueItemStatus:
-    def __init__(self, cancel_token: CancellationToken):
-        self.downloaded = StatusFlag("downloaded", False)
-        self.download_error = StatusFlag("download_error", False)
-        self.download_timed_out = StatusFlag("download_timed_out", False)
-        self.imported = StatusFlag("imported", False)
-        self.import_error = StatusFlag("import_error", False)
-        self.__downloaded_at: datetime = None
-        self.__downloaded_at_lock = Lock()
-        self.__imported_at: datetime = None
-        self.__imported_at_lock = Lock()
-        self.cancel_token = cancel_token
+    __slots__ = (
+        "__state",
+        "__state_entered_at",
+        "__failure",
+        "cancel_token",
+        "download_started_at",
+        "downloaded_at",
+        "imported_at",
+        "size",
+        "statistics",
+    )
+    __transition_lock: Lock = Lock()  # Shared by all items. Only held while changing the state, reading the state doesn't require it.
+
+    def __init__(self, cancel_token: CancellationToken, size: int = 0, statistics: Optional["RunStatistics"] = None):
+        self.__state: QueueItemState = QueueItemState.QUEUED
+        self.__state_entered_at: float = perf_counter()
+        self.__failure: Optional[QueueItemFailure] = None
+        self.cancel_token: CancellationToken = cancel_token
+        self.download_started_at: Optional[float] = None  # `perf_counter()`, once the download got a slot & memory to start
+        self.downloaded_at: Optional[datetime] = None
+        self.imported_at: Optional[datetime] = None
+        self.size: int = size
+        self.statistics: Optional["RunStatistics"] = statistics
+
+    def __repr__(self) -> str:
+        return f"<QueueItemStatus state={self.__state.name}, failure={self.__failure.name if self.__failure else None}>"
+
+    @property
+    def state(self) -> QueueItemState:
+        return self.__state
+
+    @property
+    def failure(self) -> Optional[QueueItemFailure]:
+        return self.__failure
 
     @property
     def done(self) -> bool:
-        return self.imported.value or self.import_error.value or self.download_error.value
+        return self.__state >= QueueItemState.IMPORTED
+
+    @property
+    def downloaded(self) -> bool:
+        return QueueItemState.DOWNLOADED <= self.__state <= QueueItemState.IMPORTED or self.__failure == QueueItemFailure.IMPORT_ERROR
+
+    @property
+    def download_error(self) -> bool:
+        return self.__failure in (QueueItemFailure.DOWNLOAD_ERROR, QueueItemFailure.DOWNLOAD_TIMED_OUT)
 
     @property
-    def downloaded_at(self) -> Optional[datetime]:
-        with self.__downloaded_at_lock:
-            return self.__downloaded_at
+    def download_timed_out(self) -> bool:
+        return self.__failure == QueueItemFailure.DOWNLOAD_TIMED_OUT
 
-    @downloaded_at.setter
-    def downloaded_at(self, value: datetime):
-        with self.__downloaded_at_lock:
-            self.__downloaded_at = value
+    @property
+    def imported(self) -> bool:
+        return self.__state == QueueItemState.IMPORTED
 
     @property
-    def imported_at(self) -> Optional[datetime]:
-        with self.__imported_at_lock:
-            return self.__imported_at
+    def import_error(self) -> bool:
+        return self.__failure == QueueItemFailure.IMPORT_ERROR
+
+    def transition(self, state: QueueItemState) -> bool:
+        """Moves the item forward to the given state. `IMPORTED` and `FAILED` are final states.
+
+        Args:
+            state (QueueItemState): The new state. Use `fail()` to move the item to state `FAILED`.
+
+        Returns:
+            bool: `True`, if the state has been changed. `False`, if the item is already in this or a later state.
+        """
+        moved = self.__move_forward(state)
+        if moved and self.statistics:
+            previous_state, duration = moved
+            self.statistics.record_transition(previous_state, state, duration, self.size)
+        return bool(moved)
+
+    def restore(self, state: QueueItemState) -> bool:
+        """Moves the item forward to a state reached by an earlier run, e.g. as recorded in the import journal. Unlike `transition()`, the
+        item isn't counted as downloaded or imported by this run.
+
+        Returns:
+            bool: `True`, if the state has been changed. `False`, if the item is already in this or a later state.
+        """
+        moved = self.__move_forward(state)
+        if moved and self.statistics:
+            previous_state, duration = moved
+            self.statistics.record_restore(previous_state, state, duration)
+        return bool(moved)
+
+    def fail(self, failure: QueueItemFailure) -> bool:
+        """Moves the item to state `FAILED`, unless it's in a final state already.
+
+        Args:
+            failure (QueueItemFailure): The reason of the failure.
 
-    @imported_at.setter
-    def imported_at(self, value: datetime):
-        with self.__imported_at_lock:
-            self.__imported_at = value
+        Returns:
+            bool: `True`, if the state has been changed.
+        """
+        with QueueItemStatus.__transition_lock:
+            if self.done:
+                return False
+            previous_state = self.__state
+            self.__failure = failure  # Set before the state, so that readers seeing `FAILED` also see the reason.
+            self.__state = QueueItemState.FAILED
+            duration = self.__enter_state()
+
+        if self.statistics:
+            self.statistics.record_failure(previous_state, failure, duration)
+        return True
+
+    def record_retry(self):
+        if self.statistics:
+            self.statistics.record_retry()
+
+    def __move_forward(self, state: QueueItemState) -> Optional[tuple[QueueItemState, float]]:
+        """Returns the previous state and the number of seconds spent in it, if the item has been moved to `state`."""
+        if state == QueueItemState.FAILED:
+            raise ValueError(f"Use {QueueItemStatus.fail.__name__}() to move a queue item to state {QueueItemState.FAILED.name}.")
+
+        with QueueItemStatus.__transition_lock:
+            if self.__state >= state or self.done:
+                return None
+            previous_state = self.__state
+            self.__state = state
+            return previous_state, self.__enter_state()
+
+    def __enter_state(self) -> float:
+        """Resets the time the current state has been entered and returns the number of seconds spent in the previous state."""
+        now = perf_counter()
+        duration = now - self.__state_entered_at
+        self.__state_entered_at = now
+        return duration
 
 
 class QueueItem:
+    __slots__ = ("item_no", "gdrive_file", "collection_file_id", "target_directory_path", "target_file_path", "status", "trace_span")
+
     def __init__(
         self,
         item_no: int,
@@ -55,20 +172,21 @@ class QueueItem:
         collection_file_id: int,
         target_directory: Union[Path, str],
         cancel_token: CancellationToken,
+        statistics: Optional["RunStatistics"] = None,
     ):
         self.item_no: int = item_no
         self.gdrive_file: GDriveFile = gdrive_file
-        self.collection_file_id: CollectionFileDB = collection_file_id
+        self.collection_file_id: int = collection_file_id
         self.target_directory_path: Path = Path(target_directory)
-        self.status = QueueItemStatus(cancel_token)
-
-    @property
-    def target_file_path(self) -> Path:
-        return self.target_directory_path.joinpath(self.gdrive_file.name)
+        self.target_file_path: Path = self.target_directory_path.joinpath(gdrive_file.name)
+        self.status = QueueItemStatus(cancel_token, size=gdrive_file.size, statistics=statistics)
+        self.trace_span: Optional[Span] = None
 
 
 __all__ = [
     # Classes
     QueueItem.__name__,
+    QueueItemFailure.__name__,
+    QueueItemState.__name__,
     QueueItemStatus.__name__,
 ]
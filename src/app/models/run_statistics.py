@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
+
+from ..core import utils
+from .queue_item import QueueItemFailure, QueueItemState
+
+
+class RunStatistics:
+    """Counters of a single bulk import run. They're updated by the queue items of the run, whenever their state changes.
+
+    Reading a counter doesn't require a lock, so logs, metrics & progress reports can read them at any time without iterating the queue items.
+    """
+
+    def __init__(self, modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None):
+        self.modified_after: Optional[datetime] = modified_after
+        self.modified_before: Optional[datetime] = modified_before
+        self.started_at: datetime = utils.get_now()
+        self.finished_at: Optional[datetime] = None
+
+        self.file_count: int = 0
+        self.listed_file_count: int = 0  # Files in the Google Drive listing, including those left for later runs
+        self.bytes_downloaded: int = 0
+        self.bytes_imported: int = 0
+        self.downloaded_count: int = 0
+        self.imported_count: int = 0
+        self.restored_count: int = 0  # Files downloaded or imported by an earlier run, as recorded in the import journal
+        self.retry_count: int = 0
+
+        self.__failure_counts: dict[QueueItemFailure, int] = {failure: 0 for failure in QueueItemFailure}
+        self.__state_counts: dict[QueueItemState, int] = {state: 0 for state in QueueItemState}
+        self.__state_durations: dict[QueueItemState, float] = {state: 0.0 for state in QueueItemState}
+        self.__lock: Lock = Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RunStatistics files={self.file_count}, downloaded={self.downloaded_count}, imported={self.imported_count}, restored={self.restored_count}, "
+            f"download_errors={self.download_error_count}, import_errors={self.import_error_count}, retries={self.retry_count}>"
+        )
+
+    @property
+    def download_error_count(self) -> int:
+        return self.__failure_counts[QueueItemFailure.DOWNLOAD_ERROR] + self.__failure_counts[QueueItemFailure.DOWNLOAD_TIMED_OUT]
+
+    @property
+    def done_count(self) -> int:
+        return self.__state_counts[QueueItemState.IMPORTED] + self.__state_counts[QueueItemState.FAILED]
+
+    @property
+    def duration(self) -> timedelta:
+        return (self.finished_at or utils.get_now()) - self.started_at
+
+    @property
+    def import_error_count(self) -> int:
+        return self.__failure_counts[QueueItemFailure.IMPORT_ERROR]
+
+    @property
+    def state_counts(self) -> dict[QueueItemState, int]:
+        """The number of queue items currently in each state."""
+        return dict(self.__state_counts)
+
+    @property
+    def state_durations(self) -> dict[QueueItemState, float]:
+        """The total number of seconds the queue items have spent in each state, before moving on to the next one."""
+        return dict(self.__state_durations)
+
+    def add_files(self, count: int):
+        with self.__lock:
+            self.file_count += count
+            self.__state_counts[QueueItemState.QUEUED] += count
+
+    def finish(self):
+        self.finished_at = utils.get_now()
+
+    def record_failure(self, previous_state: QueueItemState, failure: QueueItemFailure, duration: float):
+        with self.__lock:
+            self.__move(previous_state, QueueItemState.FAILED, duration)
+            self.__failure_counts[failure] += 1
+
+    def record_restore(self, previous_state: QueueItemState, state: QueueItemState, duration: float):
+        """Records that a queue item moved from `previous_state` to `state` reached by an earlier run, without counting it as downloaded or imported."""
+        with self.__lock:
+            self.__move(previous_state, state, duration)
+            self.restored_count += 1
+
+    def record_retry(self):
+        with self.__lock:
+            self.retry_count += 1
+
+    def record_transition(self, previous_state: QueueItemState, state: QueueItemState, duration: float, size: int):
+        """Records that a queue item of `size` bytes moved from `previous_state` to `state` after `duration` seconds."""
+        with self.__lock:
+            self.__move(previous_state, state, duration)
+
+            if previous_state < QueueItemState.DOWNLOADED <= state:
+                self.downloaded_count += 1
+                self.bytes_downloaded += size
+
+            if state == QueueItemState.IMPORTED:
+                self.imported_count += 1
+                self.bytes_imported += size
+
+    def __move(self, previous_state: QueueItemState, state: QueueItemState, duration: float):
+        self.__state_counts[previous_state] -= 1
+        self.__state_counts[state] += 1
+        self.__state_durations[previous_state] += duration
+
+
+__all__ = [
+    # Classes
+    RunStatistics.__name__,
+]
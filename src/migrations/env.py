@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 from sqlmodel import SQLModel
 
 from src.app.core.config import ConfigRepository
-from src.app.database.models import CollectionFileDB  # noqa: F401
+from src.app.database.models import CollectionFileDB, ImportRunDB  # noqa: F401
 
 
 # this is the Alembic Config object, which provides
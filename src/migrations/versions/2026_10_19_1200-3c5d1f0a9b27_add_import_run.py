@@ -0,0 +1,51 @@
+"""add import_run
+
+Revision ID: 3c5d1f0a9b27
+Revises: 7fda994f3831
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5d1f0a9b27"
+down_revision: Union[str, None] = "7fda994f3831"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_run",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=False),
+        sa.Column("modified_after", sa.DateTime(), nullable=True),
+        sa.Column("modified_before", sa.DateTime(), nullable=True),
+        sa.Column("file_count", sa.Integer(), nullable=False),
+        sa.Column("downloaded_count", sa.Integer(), nullable=False),
+        sa.Column("imported_count", sa.Integer(), nullable=False),
+        sa.Column("download_error_count", sa.Integer(), nullable=False),
+        sa.Column("import_error_count", sa.Integer(), nullable=False),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column("bytes_downloaded", sa.BigInteger(), nullable=False),
+        sa.Column("bytes_imported", sa.BigInteger(), nullable=False),
+        sa.Column("queued_seconds", sa.Float(), nullable=False),
+        sa.Column("downloading_seconds", sa.Float(), nullable=False),
+        sa.Column("downloaded_seconds", sa.Float(), nullable=False),
+        sa.Column("importing_seconds", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_run_id"), "import_run", ["id"], unique=False)
+    op.create_index(op.f("ix_import_run_started_at"), "import_run", ["started_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_import_run_started_at"), table_name="import_run")
+    op.drop_index(op.f("ix_import_run_id"), table_name="import_run")
+    op.drop_table("import_run")
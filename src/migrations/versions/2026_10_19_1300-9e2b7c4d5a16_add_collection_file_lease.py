@@ -0,0 +1,33 @@
+"""add collection_file lease
+
+Revision ID: 9e2b7c4d5a16
+Revises: 3c5d1f0a9b27
+Create Date: 2026-10-19 13:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e2b7c4d5a16"
+down_revision: Union[str, None] = "3c5d1f0a9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("collection_file", sa.Column("lease_owner", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column("collection_file", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+    op.create_index(op.f("ix_collection_file_lease_expires_at"), "collection_file", ["lease_expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_collection_file_lease_expires_at"), table_name="collection_file")
+    with op.batch_alter_table("collection_file") as batch_op:  # SQLite can't drop columns without recreating the table.
+        batch_op.drop_column("lease_expires_at")
+        batch_op.drop_column("lease_owner")
@@ -0,0 +1,44 @@
+"""add collection_file retries
+
+Revision ID: b4f8e1c2d3a7
+Revises: 9e2b7c4d5a16
+Create Date: 2026-10-19 14:00:00.000000+00:00
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4f8e1c2d3a7"
+down_revision: Union[str, None] = "9e2b7c4d5a16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("collection_file", sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("collection_file", sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+    op.add_column("collection_file", sa.Column("last_error", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.create_index(op.f("ix_collection_file_next_attempt_at"), "collection_file", ["next_attempt_at"], unique=False)
+
+    # Files, which failed before retries were scheduled, are retried right away.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    op.execute(
+        sa.text("UPDATE collection_file SET next_attempt_at = :now WHERE error = :error AND imported = :imported").bindparams(
+            now=now, error=True, imported=False
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_collection_file_next_attempt_at"), table_name="collection_file")
+    with op.batch_alter_table("collection_file") as batch_op:  # SQLite can't drop columns without recreating the table.
+        batch_op.drop_column("last_error")
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("attempt_count")
@@ -0,0 +1,39 @@
+"""add import_checkpoint
+
+Revision ID: d1a6c3e9f052
+Revises: b4f8e1c2d3a7
+Create Date: 2026-10-19 15:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d1a6c3e9f052"
+down_revision: Union[str, None] = "b4f8e1c2d3a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_checkpoint",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_checkpoint_id"), "import_checkpoint", ["id"], unique=False)
+    op.create_index(op.f("ix_import_checkpoint_name"), "import_checkpoint", ["name"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_import_checkpoint_name"), table_name="import_checkpoint")
+    op.drop_index(op.f("ix_import_checkpoint_id"), table_name="import_checkpoint")
+    op.drop_table("import_checkpoint")
@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.app.core.config import ConfigRepository
-from src.app.core.gdrive import GDriveFile
+from src.app.core.gdrive import FromGoogleDriveFile, GDriveFile
 from src.app.core.models.status import StatusFlag
 from src.app.database.db_repository import DatabaseRepository
 from src.app.database.models import *  # noqa: F403, F401
@@ -160,7 +160,7 @@ def google_drive_file(
 
 @pytest.fixture(scope="function")
 def gdrive_file(google_drive_file: GoogleDriveFile) -> GDriveFile:
-    return GDriveFile(google_drive_file)
+    return FromGoogleDriveFile.to_gdrive_file(google_drive_file)
 
 
 @pytest.fixture(scope="function")
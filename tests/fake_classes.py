@@ -11,11 +11,11 @@ import yaml
 from pss_fleet_data.core.exceptions import CollectionNotFoundError, ConflictError
 from pss_fleet_data.models.client_models import CollectionMetadata
 
-from src.app.adapters.repository import AbstractCollectionFileRepository
+from src.app.adapters.repository import AbstractCollectionFileRepository, AbstractImportCheckpointRepository, AbstractImportRunRepository
 from src.app.core import utils
 from src.app.core.config import ConfigBase
 from src.app.core.gdrive import GDriveFile
-from src.app.database.models import CollectionFileDB
+from src.app.database.models import CollectionFileDB, ImportCheckpointDB, ImportRunDB
 from src.app.database.unit_of_work import AbstractUnitOfWork
 from src.app.importer.importer import Importer
 
@@ -25,6 +25,7 @@ class FakeConfig(ConfigBase):
     def __init__(self, db_async_connection_str: Optional[str] = None, db_sync_connection_str: Optional[str] = None):
         self.__db_async_connection_str = db_async_connection_str
         self.__db_sync_connection_str = db_sync_connection_str
+        self.instance_id = "fake-instance"  # Keeps tests from saving an instance ID in the download folder
 
     @property
     def db_async_connection_str(self) -> str:
@@ -53,16 +54,20 @@ class FakeGDriveFile:
         self.md5_checksum = md5(content.encode()).hexdigest()
         self.exception = get_content_exception
 
-    def get_content_string(self, mimetype: Optional[str] = None, encoding: str = "utf-8", remove_bom: bool = False):
-        if self.exception:
-            raise self.exception
-
-        return self.content
-
 
 class FakeGoogleDriveClient:
     def __init__(self):
         self.files: list[Union[FakeGDriveFile, GDriveFile]] = []
+        self.initialized: bool = False
+
+    def initialize(self):
+        self.initialized = True
+
+    def get_file_content_string(self, gdrive_file: FakeGDriveFile, encoding: str = "utf-8") -> str:
+        if gdrive_file.exception:
+            raise gdrive_file.exception
+
+        return gdrive_file.content
 
     def list_files_by_modified_date(
         self,
@@ -76,6 +81,11 @@ class FakeGoogleDriveClient:
         ):
             yield f
 
+    def list_files_by_name_prefix(self, prefix: str) -> Generator[Union[FakeGDriveFile, GDriveFile], None, None]:
+        for f in self.list_files_by_modified_date():
+            if f.name.startswith(prefix):
+                yield f
+
 
 class FakePssFleetDataClient:
     def __init__(self):
@@ -171,7 +181,9 @@ class FakeFileSystem:
             return self.__files[path]
         raise FileNotFoundError()
 
-    def write(self, path: Union[Path, str], content: str, _: str = "w"):
+    def write(self, path: Union[Path, str], content: str, mode: str = "w"):
+        if mode == "a" and self.exists(path):
+            content = self.read(path) + content
         self.__files[Path(path)] = content
 
 
@@ -188,19 +200,57 @@ class FakeCollectionFileRepository(AbstractCollectionFileRepository):
     def add(self, collection_file: CollectionFileDB):
         self._collection_files.append(CollectionFileDB(**collection_file.model_dump()))
 
+    async def claim_files(
+        self, collection_file_ids: Iterable[int], lease_owner: str, lease_expires_at: datetime, now: datetime
+    ) -> list[CollectionFileDB]:
+        collection_file_ids = set(collection_file_ids)
+        collection_files = [
+            collection_file
+            for collection_file in self._collection_files
+            if collection_file.collection_file_id in collection_file_ids
+            and not collection_file.imported
+            and (not collection_file.error or (collection_file.next_attempt_at and collection_file.next_attempt_at <= now))
+            and (collection_file.lease_owner in (None, lease_owner) or collection_file.lease_expires_at <= now)
+        ]
+        for collection_file in collection_files:
+            collection_file.lease_owner = lease_owner
+            collection_file.lease_expires_at = lease_expires_at
+        return collection_files
+
+    async def get_earliest_expired_lease_gdrive_modified_date(self, now: datetime) -> Optional[datetime]:
+        modified_dates = [
+            collection_file.gdrive_modified_date
+            for collection_file in self._collection_files
+            if collection_file.lease_owner is not None and collection_file.lease_expires_at <= now
+        ]
+        return min(modified_dates, default=None)
+
     async def get_by_id(self, collection_file_id: int) -> Optional[CollectionFileDB]:
         collection_files = [collection_file for collection_file in self._collection_files if collection_file.collection_file_id == collection_file_id]
         if collection_files:
             return collection_files[0]
         return None
 
-    async def get_latest_imported_gdrive_modified_date(self) -> Optional[datetime]:
-        collection_files = [collection_file for collection_file in self._collection_files if collection_file.imported]
+    async def get_latest_imported_gdrive_modified_date(self, modified_before: Optional[datetime] = None) -> Optional[datetime]:
+        collection_files = [
+            collection_file
+            for collection_file in self._collection_files
+            if collection_file.imported and (modified_before is None or collection_file.gdrive_modified_date < modified_before)
+        ]
         if collection_files:
             result = sorted(collection_files, key=lambda collection_file: collection_file.gdrive_modified_date, reverse=True)
             return result[0].gdrive_modified_date
         return None
 
+    async def list_due_retries(self, now: datetime, limit: Optional[int] = None) -> list[CollectionFileDB]:
+        collection_files = [
+            collection_file
+            for collection_file in self._collection_files
+            if collection_file.error and not collection_file.imported and collection_file.next_attempt_at and collection_file.next_attempt_at <= now
+        ]
+        collection_files.sort(key=lambda collection_file: collection_file.next_attempt_at)
+        return collection_files[:limit]
+
     async def list_files(self, imported: Optional[bool] = None, gdrive_file_ids: Optional[list[str]] = None) -> list[CollectionFileDB]:
         collection_files = list(self._collection_files)
 
@@ -216,10 +266,51 @@ class FakeCollectionFileRepository(AbstractCollectionFileRepository):
         gdrive_file_ids = [collection_file.gdrive_file_id for collection_file in collection_files]
         return [collection_file for collection_file in self._collection_files if collection_file.gdrive_file_id in gdrive_file_ids]
 
+    async def renew_leases(self, lease_owner: str, lease_expires_at: datetime) -> int:
+        collection_files = [collection_file for collection_file in self._collection_files if collection_file.lease_owner == lease_owner]
+        for collection_file in collection_files:
+            collection_file.lease_expires_at = lease_expires_at
+        return len(collection_files)
+
+
+class FakeImportCheckpointRepository(AbstractImportCheckpointRepository):
+    def __init__(self, import_checkpoints: Iterable[ImportCheckpointDB]):
+        self._import_checkpoints: dict[str, ImportCheckpointDB] = {
+            import_checkpoint.name: import_checkpoint for import_checkpoint in import_checkpoints
+        }
+
+    async def get_watermark(self, name: str) -> Optional[datetime]:
+        import_checkpoint = self._import_checkpoints.get(name)
+        return import_checkpoint.watermark if import_checkpoint else None
+
+    async def advance_watermark(self, name: str, watermark: datetime, updated_at: datetime) -> bool:
+        current_watermark = await self.get_watermark(name)
+        if current_watermark is not None and current_watermark >= watermark:
+            return False
+
+        self._import_checkpoints[name] = ImportCheckpointDB(name=name, watermark=watermark, updated_at=updated_at)
+        return True
+
+
+class FakeImportRunRepository(AbstractImportRunRepository):
+    def __init__(self, import_runs: Iterable[ImportRunDB]):
+        self._import_runs: list[ImportRunDB] = list(import_runs)
+
+    def add(self, import_run: ImportRunDB):
+        self._import_runs.append(ImportRunDB(**import_run.model_dump()))
+
+    async def list_runs(self, limit: Optional[int] = None) -> list[ImportRunDB]:
+        import_runs = sorted(self._import_runs, key=lambda import_run: import_run.started_at, reverse=True)
+        if limit is not None:
+            import_runs = import_runs[:limit]
+        return import_runs
+
 
 class FakeUnitOfWork(AbstractUnitOfWork):
     def __init__(self):
         self.collection_files = FakeCollectionFileRepository([])
+        self.import_checkpoints = FakeImportCheckpointRepository([])
+        self.import_runs = FakeImportRunRepository([])
         self.committed = False
 
     async def commit(self):
@@ -234,6 +325,9 @@ class FakeUnitOfWork(AbstractUnitOfWork):
                 else:
                     collection_file.collection_file_id = 1
 
+        for i, import_run in enumerate(self.import_runs._import_runs, 1):
+            import_run.import_run_id = i
+
         self.committed = True
 
     async def rollback(self):
@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.import_time import measure
+
+
+test_cases_entry_points = [
+    # module
+    pytest.param("src.app.main", id="main"),
+    pytest.param("src.app.core.config", id="config"),
+    pytest.param("src.app.log.base", id="log_base"),
+]
+"""module: str"""
+
+
+@pytest.mark.parametrize(["module"], test_cases_entry_points)
+def test_no_heavy_packages_loaded_on_import(module: str):
+    report = measure(module)
+
+    assert report.cumulative_us > 0
+    assert report.heavy_packages_loaded == []
@@ -0,0 +1,174 @@
+import threading
+
+import pytest
+
+from src.app.core.models.aimd_limiter import AimdLimiter, get_percentile
+from src.app.core.models.cancellation_token import CancellationToken, OperationCancelledError
+
+
+def record_window(limiter: AimdLimiter, latency: float, count: int = 10):
+    for _ in range(count):
+        limiter.record_success(latency)
+
+
+def test_increase_after_healthy_window():
+    limiter = AimdLimiter("test", 2, max_limit=4)
+
+    record_window(limiter, 1.0, count=9)
+    assert limiter.limit == 2
+
+    limiter.record_success(1.0)
+    assert limiter.limit == 3
+
+
+def test_increase_stops_at_max_limit():
+    limiter = AimdLimiter("test", 2, max_limit=3)
+
+    for _ in range(3):
+        record_window(limiter, 1.0)
+
+    assert limiter.limit == 3
+
+
+def test_decrease_on_overload():
+    limiter = AimdLimiter("test", 8, max_limit=16)
+
+    limiter.record_overload("throttling")
+
+    assert limiter.limit == 4
+
+
+def test_decrease_stops_at_min_limit():
+    limiter = AimdLimiter("test", 3, min_limit=2, max_limit=16)
+
+    limiter.record_overload("throttling")
+    limiter.record_overload("throttling")
+
+    assert limiter.limit == 2
+
+
+def test_decrease_once_for_operations_in_flight_during_cut():
+    limiter = AimdLimiter("test", 8, max_limit=16)
+    for _ in range(3):
+        limiter.acquire()
+
+    limiter.record_overload("throttling")
+    limiter.release()
+    for _ in range(2):
+        limiter.record_overload("throttling")
+        limiter.release()
+
+    assert limiter.limit == 4
+
+    limiter.record_overload("throttling")
+    assert limiter.limit == 2
+
+
+def test_decrease_on_rising_latency():
+    limiter = AimdLimiter("test", 8, max_limit=16, latency_tolerance=2.0)
+
+    record_window(limiter, 1.0)
+    assert limiter.limit == 9
+
+    record_window(limiter, 2.5)
+    assert limiter.limit == 4
+
+
+def test_latency_ignored_without_tolerance():
+    limiter = AimdLimiter("test", 8, max_limit=16, latency_tolerance=None)
+
+    record_window(limiter, 1.0)
+    record_window(limiter, 10.0)
+
+    assert limiter.limit == 10
+
+
+def test_fixed_limit_without_max_limit():
+    limiter = AimdLimiter("test", 3, min_limit=3)
+
+    record_window(limiter, 1.0)
+    limiter.record_overload("throttling")
+
+    assert limiter.limit == 3
+
+
+def test_try_acquire():
+    limiter = AimdLimiter("test", 2)
+
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is False
+
+    limiter.release()
+    assert limiter.try_acquire() is True
+    assert limiter.in_flight == 2
+
+
+def test_acquire_blocks_until_released():
+    limiter = AimdLimiter("test", 1, poll_interval=0.01)
+    limiter.acquire()
+    admitted = threading.Event()
+
+    def acquire():
+        with limiter.slot():
+            admitted.set()
+
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+
+    assert not admitted.wait(0.1)
+
+    limiter.release()
+
+    assert admitted.wait(1.0)
+    thread.join(1.0)
+    assert limiter.in_flight == 0
+
+
+def test_acquire_grants_slots_in_order():
+    limiter = AimdLimiter("test", 1, poll_interval=0.01)
+    limiter.acquire()
+    admitted: list[int] = []
+    threads: list[threading.Thread] = []
+
+    def acquire(operation_no: int):
+        limiter.acquire()
+        admitted.append(operation_no)
+
+    for operation_no in range(3):
+        thread = threading.Thread(target=acquire, args=(operation_no,), daemon=True)
+        thread.start()
+        threads.append(thread)
+        thread.join(0.05)  # Waits for the thread to queue up.
+
+    assert limiter.try_acquire() is False  # Operations are waiting for a slot.
+
+    for _ in range(3):
+        limiter.release()
+        threads[len(admitted)].join(1.0)
+
+    assert admitted == [0, 1, 2]
+
+
+def test_acquire_raises_when_cancelled():
+    limiter = AimdLimiter("test", 1, poll_interval=0.01)
+    limiter.acquire()
+    cancel_token = CancellationToken()
+    cancel_token.cancel()
+
+    with pytest.raises(OperationCancelledError):
+        limiter.acquire(cancel_token)
+
+
+test_cases_get_percentile = [
+    # values: list[float], percentile: float, expected_result: float
+    pytest.param([1.0], 95, 1.0, id="single_value"),
+    pytest.param([float(value) for value in range(1, 21)], 95, 19.0, id="twenty_values"),
+    pytest.param([5.0, 1.0, 3.0, 2.0, 4.0], 50, 3.0, id="median_unsorted"),
+]
+"""values: list[float], percentile: float, expected_result: float"""
+
+
+@pytest.mark.parametrize(["values", "percentile", "expected_result"], test_cases_get_percentile)
+def test_get_percentile(values: list[float], percentile: float, expected_result: float):
+    assert get_percentile(values, percentile) == expected_result
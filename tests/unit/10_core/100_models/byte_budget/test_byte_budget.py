@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+
+from src.app.core.models.byte_budget import ByteBudget
+from src.app.core.models.cancellation_token import CancellationToken, OperationCancelledError
+
+
+test_cases_admitted = [
+    # max_bytes: int, reserved: int, size: int
+    pytest.param(None, 10_000, 10_000, id="no_limit"),
+    pytest.param(0, 10_000, 10_000, id="zero_limit"),
+    pytest.param(100, 0, 1_000, id="oversized_nothing_in_flight"),
+    pytest.param(100, 40, 60, id="fits_exactly"),
+    pytest.param(100, 10, 20, id="fits"),
+]
+"""max_bytes: int, reserved: int, size: int"""
+
+
+@pytest.mark.parametrize(["max_bytes", "reserved", "size"], test_cases_admitted)
+def test_acquire_admitted(max_bytes: int, reserved: int, size: int):
+    budget = ByteBudget(max_bytes)
+    if reserved:
+        budget.acquire(reserved)
+
+    budget.acquire(size)
+
+    assert budget.in_flight == reserved + size
+
+
+def test_release():
+    budget = ByteBudget(100)
+
+    with budget.reserve(60):
+        assert budget.in_flight == 60
+
+    assert budget.in_flight == 0
+
+
+def test_acquire_blocks_until_released():
+    budget = ByteBudget(100, poll_interval=0.01)
+    budget.acquire(60)
+    admitted = threading.Event()
+
+    def acquire():
+        budget.acquire(50)
+        admitted.set()
+
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+
+    assert not admitted.wait(0.1)
+    assert budget.in_flight == 60
+
+    budget.release(60)
+
+    assert admitted.wait(1.0)
+    assert budget.in_flight == 50
+    thread.join(1.0)
+
+
+def test_acquire_admits_in_order():
+    budget = ByteBudget(100, poll_interval=0.01)
+    budget.acquire(60)
+    large_admitted = threading.Event()
+    small_admitted = threading.Event()
+
+    def acquire(size: int, admitted: threading.Event):
+        budget.acquire(size)
+        admitted.set()
+
+    large_thread = threading.Thread(target=acquire, args=(80, large_admitted), daemon=True)
+    large_thread.start()
+    assert not large_admitted.wait(0.1)
+
+    small_thread = threading.Thread(target=acquire, args=(30, small_admitted), daemon=True)
+    small_thread.start()
+
+    # The small reservation would fit, but waits behind the large one.
+    assert not small_admitted.wait(0.1)
+
+    budget.release(60)
+
+    assert large_admitted.wait(1.0)
+    assert not small_admitted.wait(0.1)
+    assert budget.in_flight == 80
+
+    budget.release(80)
+
+    assert small_admitted.wait(1.0)
+    assert budget.in_flight == 30
+    large_thread.join(1.0)
+    small_thread.join(1.0)
+
+
+def test_acquire_skips_cancelled_reservation():
+    budget = ByteBudget(100, poll_interval=0.01)
+    budget.acquire(60)
+    cancel_token = CancellationToken()
+    cancelled = threading.Event()
+    small_admitted = threading.Event()
+
+    def acquire_large():
+        try:
+            budget.acquire(80, cancel_token=cancel_token)
+        except OperationCancelledError:
+            cancelled.set()
+
+    def acquire_small():
+        budget.acquire(30)
+        small_admitted.set()
+
+    large_thread = threading.Thread(target=acquire_large, daemon=True)
+    large_thread.start()
+    assert not cancelled.wait(0.1)
+
+    small_thread = threading.Thread(target=acquire_small, daemon=True)
+    small_thread.start()
+    assert not small_admitted.wait(0.1)
+
+    cancel_token.cancel()
+
+    assert cancelled.wait(1.0)
+    assert small_admitted.wait(1.0)
+    assert budget.in_flight == 90
+    large_thread.join(1.0)
+    small_thread.join(1.0)
+
+
+def test_acquire_raises_when_cancelled():
+    budget = ByteBudget(100, poll_interval=0.01)
+    budget.acquire(60)
+    cancel_token = CancellationToken()
+    cancel_token.cancel()
+
+    with pytest.raises(OperationCancelledError):
+        budget.acquire(50, cancel_token=cancel_token)
+
+    assert budget.in_flight == 60
+
+
+def test_reserve_releases_on_error():
+    budget = ByteBudget(100)
+
+    with pytest.raises(ValueError):
+        with budget.reserve(60):
+            raise ValueError()
+
+    assert budget.in_flight == 0
@@ -0,0 +1,57 @@
+import pytest
+
+from src.app.core.models.chunk_sizer import ChunkSizer
+
+
+test_cases_record = [
+    # file_count: int, duration: float, expected_size: int
+    pytest.param(100, 100.0, 100, id="on_target"),
+    pytest.param(100, 80.0, 125, id="faster"),
+    pytest.param(100, 125.0, 80, id="slower"),
+    pytest.param(100, 10.0, 200, id="much_faster_doubles_at_most"),
+    pytest.param(100, 1000.0, 50, id="much_slower_halves_at_most"),
+    pytest.param(0, 100.0, 100, id="no_files"),
+    pytest.param(100, 0.0, 100, id="no_duration"),
+]
+"""file_count: int, duration: float, expected_size: int"""
+
+
+@pytest.mark.parametrize(["file_count", "duration", "expected_size"], test_cases_record)
+def test_record(file_count: int, duration: float, expected_size: int):
+    chunk_sizer = ChunkSizer(100, 10, 1000, target_duration=100.0)
+
+    assert chunk_sizer.record(file_count, duration) == expected_size
+    assert chunk_sizer.size == expected_size
+
+
+test_cases_bounds = [
+    # min_size: int, max_size: int, duration: float, expected_size: int
+    pytest.param(10, 150, 10.0, 150, id="max_size"),
+    pytest.param(90, 1000, 1000.0, 90, id="min_size"),
+]
+"""min_size: int, max_size: int, duration: float, expected_size: int"""
+
+
+@pytest.mark.parametrize(["min_size", "max_size", "duration", "expected_size"], test_cases_bounds)
+def test_record_within_bounds(min_size: int, max_size: int, duration: float, expected_size: int):
+    chunk_sizer = ChunkSizer(100, min_size, max_size, target_duration=100.0)
+
+    assert chunk_sizer.record(100, duration) == expected_size
+
+
+def test_record_smooths_throughput():
+    chunk_sizer = ChunkSizer(100, 10, 1000, target_duration=100.0)
+
+    chunk_sizer.record(100, 100.0)
+    chunk_sizer.record(100, 50.0)
+
+    assert chunk_sizer.files_per_second == pytest.approx(1.5)
+    assert chunk_sizer.size == 150
+
+
+@pytest.mark.parametrize("target_duration", [None, 0.0], ids=["none", "zero"])
+def test_record_disabled(target_duration: float):
+    chunk_sizer = ChunkSizer(100, 10, 1000, target_duration=target_duration)
+
+    assert chunk_sizer.enabled is False
+    assert chunk_sizer.record(100, 10.0) == 100
@@ -0,0 +1,45 @@
+import pytest
+
+from src.app.core.models.circuit_breaker import CircuitBreaker
+
+
+def test_open_after_consecutive_failures():
+    circuit_breaker = CircuitBreaker("test", failure_threshold=3)
+
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open is False
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open is True
+
+
+def test_success_resets_failures():
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2)
+
+    circuit_breaker.record_failure()
+    circuit_breaker.record_success()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.is_open is False
+    assert circuit_breaker.consecutive_failures == 1
+
+
+def test_close_on_success():
+    circuit_breaker = CircuitBreaker("test", failure_threshold=1)
+    circuit_breaker.record_failure()
+
+    circuit_breaker.record_success()
+
+    assert circuit_breaker.is_open is False
+    assert circuit_breaker.consecutive_failures == 0
+
+
+@pytest.mark.parametrize("failure_threshold", [0, -1], ids=["zero", "negative"])
+def test_never_open_without_threshold(failure_threshold: int):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=failure_threshold)
+
+    for _ in range(10):
+        circuit_breaker.record_failure()
+
+    assert circuit_breaker.is_open is False
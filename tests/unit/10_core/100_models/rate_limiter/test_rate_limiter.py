@@ -0,0 +1,43 @@
+import pytest
+
+from src.app.core.models.rate_limiter import RateLimiter
+
+
+test_cases_disabled = [
+    # max_per_second
+    pytest.param(None, id="none"),
+    pytest.param(0, id="zero"),
+    pytest.param(-1, id="negative"),
+]
+"""max_per_second: Optional[float]"""
+
+
+@pytest.mark.parametrize(["max_per_second"], test_cases_disabled)
+def test_disabled_rate_limiter_does_not_wait(max_per_second: float):
+    rate_limiter = RateLimiter(max_per_second)
+
+    assert rate_limiter.max_per_second is None
+    assert [rate_limiter.reserve() for _ in range(10)] == [0.0] * 10
+
+
+def test_reserve_spaces_out_slots():
+    rate_limiter = RateLimiter(10)
+
+    waits = [rate_limiter.reserve() for _ in range(5)]
+
+    assert rate_limiter.max_per_second == pytest.approx(10)
+    assert waits[0] == pytest.approx(0.0, abs=0.01)
+    for previous_wait, wait in zip(waits, waits[1:], strict=False):
+        assert wait - previous_wait == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.usefixtures("patch_sleep")
+def test_acquire_sleeps_until_slot(mocker):
+    sleep = mocker.patch("src.app.core.models.rate_limiter.time.sleep")
+    rate_limiter = RateLimiter(10)
+
+    rate_limiter.acquire()
+    rate_limiter.acquire()
+
+    assert sleep.call_count == 1
+    assert sleep.call_args.args[0] == pytest.approx(0.1, abs=0.01)
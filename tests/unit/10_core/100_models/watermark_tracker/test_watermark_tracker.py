@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from src.app.core.models.watermark_tracker import WatermarkTracker
+
+
+POSITIONS = {
+    "a": datetime(2024, 1, 1, 10),
+    "b": datetime(2024, 1, 1, 11),
+    "c": datetime(2024, 1, 1, 11),
+    "d": datetime(2024, 1, 1, 12),
+}
+
+
+test_cases_complete = [
+    # completed_keys, expected
+    pytest.param([], None, id="none_completed"),
+    pytest.param(["a"], datetime(2024, 1, 1, 10), id="first"),
+    pytest.param(["d", "b", "c"], None, id="first_pending"),
+    pytest.param(["a", "b"], datetime(2024, 1, 1, 10), id="position_shared_with_pending"),
+    pytest.param(["c", "a", "b"], datetime(2024, 1, 1, 11), id="out_of_order"),
+    pytest.param(["d", "c", "b", "a"], datetime(2024, 1, 1, 12), id="reversed"),
+]
+"""completed_keys: list[str], expected: Optional[datetime]"""
+
+
+@pytest.mark.parametrize(["completed_keys", "expected"], test_cases_complete)
+def test_complete(completed_keys: list[str], expected: Optional[datetime]):
+    tracker = WatermarkTracker(POSITIONS)
+
+    for key in completed_keys:
+        tracker.complete(key)
+
+    assert tracker.watermark == expected
+    assert tracker.pending_count == len(POSITIONS) - len(completed_keys)
+
+
+def test_complete_reports_advances():
+    tracker = WatermarkTracker(POSITIONS)
+
+    assert tracker.complete("b") is False
+    assert tracker.complete("a") is True
+    assert tracker.complete("a") is False
+    assert tracker.complete("unknown") is False
+    assert tracker.complete("c") is True
+
+
+def test_ignores_items_at_or_before_the_initial_watermark():
+    tracker = WatermarkTracker(POSITIONS, watermark=datetime(2024, 1, 1, 11))
+
+    assert tracker.pending_count == 1
+    assert tracker.complete("a") is False
+    assert tracker.watermark == datetime(2024, 1, 1, 11)
+    assert tracker.complete("d") is True
+    assert tracker.watermark == datetime(2024, 1, 1, 12)
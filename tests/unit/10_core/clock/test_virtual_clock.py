@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.app.core.clock import VirtualClock
+
+
+async def test_sleep_advances_the_clock():
+    clock = VirtualClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    await clock.sleep(3600)
+    await clock.sleep(-5)
+
+    assert clock.now() == datetime(2024, 1, 1, 1)
+    assert clock.slept_seconds == 3600
+
+
+def test_advance_rejects_going_back():
+    clock = VirtualClock(datetime(2024, 1, 1))
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
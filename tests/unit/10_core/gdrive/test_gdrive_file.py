@@ -3,7 +3,7 @@ from datetime import datetime
 import pytest
 from pydrive2.files import GoogleDriveFile
 
-from src.app.core.gdrive import GDriveFile
+from src.app.core.gdrive import FromGoogleDriveFile, GDriveFile, GoogleDriveClient
 
 
 def test_create(
@@ -13,7 +13,7 @@ def test_create(
     google_drive_file_name: str,
     google_drive_file_modified_date: datetime,
 ):
-    gdrive_file = GDriveFile(google_drive_file)
+    gdrive_file = FromGoogleDriveFile.to_gdrive_file(google_drive_file)
 
     assert isinstance(gdrive_file.id, str)
     assert isinstance(gdrive_file.size, int)
@@ -26,10 +26,25 @@ def test_create(
     assert gdrive_file.modified_date == google_drive_file_modified_date
 
 
-def test_get_content_string_returns_content(gdrive_file: GDriveFile, google_drive_file_content: str, monkeypatch: pytest.MonkeyPatch):
-    def mock_GetContentString(*args):
-        return google_drive_file_content
+def test_slots(gdrive_file: GDriveFile):
+    assert not hasattr(gdrive_file, "__dict__")
 
-    monkeypatch.setattr(GoogleDriveFile, GoogleDriveFile.GetContentString.__name__, mock_GetContentString)
+    with pytest.raises(AttributeError):
+        gdrive_file.google_drive_file = None
 
-    assert gdrive_file.get_content_string() == google_drive_file_content
+
+def test_get_file_content_string_returns_content(gdrive_file: GDriveFile, google_drive_file_content: str, monkeypatch: pytest.MonkeyPatch):
+    class MockGoogleDrive:
+        def CreateFile(self, metadata: dict) -> GoogleDriveFile:
+            assert metadata == {"id": gdrive_file.id}
+            return GoogleDriveFile(None, metadata, uploaded=True)
+
+    def mock_GetContentIOBuffer(*args):
+        content = google_drive_file_content.encode()
+        return iter((content[:10], content[10:]))
+
+    client = GoogleDriveClient("", "", "", "", "", [], "", "", "")
+    monkeypatch.setattr(client, "_GoogleDriveClient__drive", MockGoogleDrive())
+    monkeypatch.setattr(GoogleDriveFile, GoogleDriveFile.GetContentIOBuffer.__name__, mock_GetContentIOBuffer)
+
+    assert client.get_file_content_string(gdrive_file) == google_drive_file_content
@@ -0,0 +1,115 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.app.core.metrics import MetricsRegistry, MetricsServer
+
+
+def test_counter_render():
+    registry = MetricsRegistry(prefix="test_")
+    counter = registry.counter("retries", "Retries.", ["operation"])
+
+    counter.inc(operation="download")
+    counter.inc(2, operation="download")
+    counter.inc(operation="upload")
+
+    assert counter.get(operation="download") == 3
+    assert registry.render().splitlines() == [
+        "# HELP test_retries Retries.",
+        "# TYPE test_retries counter",
+        'test_retries_total{operation="download"} 3',
+        'test_retries_total{operation="upload"} 1',
+    ]
+
+
+def test_counter_decrease_raises():
+    counter = MetricsRegistry().counter("retries", "Retries.")
+
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+
+
+test_cases_invalid_labels = [
+    # labels: dict[str, str]
+    pytest.param({}, id="missing"),
+    pytest.param({"operation": "download", "state": "queued"}, id="additional"),
+    pytest.param({"state": "queued"}, id="wrong"),
+]
+"""labels: dict[str, str]"""
+
+
+@pytest.mark.parametrize(["labels"], test_cases_invalid_labels)
+def test_invalid_labels_raise(labels: dict[str, str]):
+    counter = MetricsRegistry().counter("retries", "Retries.", ["operation"])
+
+    with pytest.raises(ValueError):
+        counter.inc(**labels)
+
+
+def test_gauge_collect_function():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("queue_items", "Queue items.", ["state"])
+    gauge.set(5, state="queued")
+
+    gauge.set_collect_function(lambda: {("downloaded",): 2})
+    assert 'queue_items{state="downloaded"} 2' in registry.render()
+    assert "queued" not in registry.render()
+
+    gauge.set_collect_function(None)
+    assert 'queue_items{state="queued"} 5' in registry.render()
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1.0))
+
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    assert histogram.get_count() == 3
+    assert histogram.get_sum() == 5.55
+    assert registry.render().splitlines()[2:] == [
+        'duration_seconds_bucket{le="0.1"} 1',
+        'duration_seconds_bucket{le="1.0"} 2',
+        'duration_seconds_bucket{le="+Inf"} 3',
+        "duration_seconds_sum 5.55",
+        "duration_seconds_count 3",
+    ]
+
+
+def test_histogram_time_observes_on_error():
+    histogram = MetricsRegistry().histogram("duration_seconds", "Duration.")
+
+    with pytest.raises(ValueError):
+        with histogram.time():
+            raise ValueError()
+
+    assert histogram.get_count() == 1
+
+
+def test_register_duplicate_name_raises():
+    registry = MetricsRegistry()
+    registry.counter("retries", "Retries.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("retries", "Retries.")
+
+
+def test_server_serves_metrics():
+    registry = MetricsRegistry()
+    registry.counter("retries", "Retries.").inc()
+    server = MetricsServer(registry, 0, host="127.0.0.1")
+    server.start()
+
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert response.read().decode() == registry.render()
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/", timeout=5)
+    finally:
+        server.stop()
@@ -0,0 +1,56 @@
+import cProfile
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.app.core.profiling import Profiler
+
+
+def profiled_function() -> int:
+    return sum(range(100))
+
+
+def get_call_count(stats: pstats.Stats, function_name: str) -> int:
+    return sum(call_count for (_, _, name), (call_count, *_) in stats.stats.items() if name == function_name)
+
+
+def test_disabled_profiler_does_nothing(tmp_path: Path):
+    profiler = Profiler(enabled=False)
+
+    with profiler.profile():
+        profiled_function()
+
+    assert profiler.dump(tmp_path.joinpath("profile.prof")) is False
+    assert not tmp_path.joinpath("profile.prof").exists()
+
+
+def test_profiles_threads(tmp_path: Path):
+    profiler = Profiler()
+    file_path = tmp_path.joinpath("profile.prof")
+
+    with profiler.profile():
+        threads = [threading.Thread(target=profiled_function) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert profiler.dump(file_path) is True
+    assert get_call_count(pstats.Stats(str(file_path)), profiled_function.__name__) == 3
+
+
+def test_other_profiler_active(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    profiler = Profiler()
+    other_profile = cProfile.Profile()
+
+    other_profile.enable()
+    try:
+        with profiler.profile():
+            profiled_function()
+    finally:
+        other_profile.disable()
+
+    assert "Could not start profiling" in caplog.text
+    assert profiler.dump(tmp_path.joinpath("profile.prof")) is False
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.app.core.tracing import STATUS_CODE_ERROR, STATUS_CODE_UNSET, JsonLinesSpanExporter, Span, Tracer
+
+
+class ListSpanExporter:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+
+def test_disabled_tracer_creates_no_spans():
+    tracer = Tracer()
+
+    with tracer.span("test") as span:
+        assert span is None
+
+    assert tracer.start_span("test") is None
+    tracer.end_span(None)
+
+
+def test_child_span_shares_trace():
+    exporter = ListSpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("parent") as parent:
+        with tracer.span("child", parent=parent, attributes={"item_no": 1}) as child:
+            pass
+
+    assert [span.name for span in exporter.spans] == ["child", "parent"]
+    assert child.trace_id == parent.trace_id
+    assert child.parent_span_id == parent.span_id
+    assert parent.parent_span_id is None
+    assert child.start_time_ns <= child.end_time_ns
+    assert child.attributes == {"item_no": 1}
+    assert child.status_code == STATUS_CODE_UNSET
+
+
+def test_span_error_status():
+    exporter = ListSpanExporter()
+    tracer = Tracer(exporter)
+
+    with pytest.raises(ValueError):
+        with tracer.span("test"):
+            raise ValueError("broken")
+
+    assert exporter.spans[0].status_code == STATUS_CODE_ERROR
+    assert exporter.spans[0].status_message == "ValueError: broken"
+
+
+def test_end_span_exports_once():
+    exporter = ListSpanExporter()
+    tracer = Tracer(exporter)
+
+    span = tracer.start_span("test")
+    tracer.end_span(span, attributes={"state": "imported"})
+    tracer.end_span(span, attributes={"state": "failed"})
+
+    assert exporter.spans == [span]
+    assert span.attributes == {"state": "imported"}
+
+
+def test_json_lines_exporter(tmp_path: Path):
+    file_path = tmp_path.joinpath("trace.jsonl")
+    tracer = Tracer(JsonLinesSpanExporter(file_path))
+
+    with tracer.span("parent", attributes={"name": "file.json", "size": 5, "ratio": 0.5, "cached": False}) as parent:
+        tracer.record_span("child", parent.start_time_ns, parent=parent)
+
+    lines = [json.loads(line) for line in file_path.read_text().splitlines()]
+
+    assert [line["name"] for line in lines] == ["child", "parent"]
+    assert lines[0]["parentSpanId"] == lines[1]["spanId"]
+    assert lines[0]["traceId"] == lines[1]["traceId"]
+    assert len(lines[1]["traceId"]) == 32
+    assert len(lines[1]["spanId"]) == 16
+    assert int(lines[1]["startTimeUnixNano"]) <= int(lines[1]["endTimeUnixNano"])
+    assert lines[1]["attributes"] == [
+        {"key": "name", "value": {"stringValue": "file.json"}},
+        {"key": "size", "value": {"intValue": "5"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": False}},
+    ]
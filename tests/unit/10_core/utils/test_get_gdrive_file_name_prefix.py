@@ -0,0 +1,10 @@
+from datetime import datetime
+
+from src.app.core.utils import extract_timestamp_from_gdrive_file_name, get_gdrive_file_name_prefix
+
+
+def test_get_gdrive_file_name_prefix():
+    result = get_gdrive_file_name_prefix(datetime(2024, 8, 16, 12, 34, 56))
+
+    assert result == "pss-top-100_20240816-12"
+    assert extract_timestamp_from_gdrive_file_name(f"{result}0512.json") == datetime(2024, 8, 16, 12, 5, 12)
@@ -0,0 +1,90 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.app.core.webhook import DriveNotification, NotificationReceiver
+
+
+def create_headers(channel_id: str = "channel-id", token: str = "token", resource_state: str = "update") -> dict[str, str]:
+    return {
+        "X-Goog-Channel-ID": channel_id,
+        "X-Goog-Channel-Token": token,
+        "X-Goog-Message-Number": "2",
+        "X-Goog-Resource-ID": "resource-id",
+        "X-Goog-Resource-State": resource_state,
+        "X-Goog-Changed": "children",
+    }
+
+
+test_cases_rejected = [
+    # headers
+    pytest.param(create_headers(token="wrong"), id="wrong_token"),
+    pytest.param(create_headers(channel_id="unknown"), id="unknown_channel"),
+    pytest.param({}, id="no_headers"),
+]
+"""headers: dict[str, str]"""
+
+
+def test_handle_accepts_notification():
+    notifications: list[DriveNotification] = []
+    receiver = NotificationReceiver(notifications.append, 0, host="127.0.0.1")
+    receiver.expect_channel("channel-id", "token")
+
+    status = receiver.handle(create_headers())
+
+    assert status == 200
+    assert len(notifications) == 1
+    assert notifications[0].channel_id == "channel-id"
+    assert notifications[0].resource_id == "resource-id"
+    assert notifications[0].resource_state == "update"
+    assert notifications[0].message_number == 2
+    assert notifications[0].changed == ("children",)
+
+
+@pytest.mark.parametrize(["headers"], test_cases_rejected)
+def test_handle_rejects_notification(headers: dict[str, str]):
+    notifications: list[DriveNotification] = []
+    receiver = NotificationReceiver(notifications.append, 0, host="127.0.0.1")
+    receiver.expect_channel("channel-id", "token")
+
+    assert receiver.handle(headers) == 403
+    assert not notifications
+
+
+def test_handle_ignores_sync_notification():
+    notifications: list[DriveNotification] = []
+    receiver = NotificationReceiver(notifications.append, 0, host="127.0.0.1")
+    receiver.expect_channel("channel-id", "token")
+
+    assert receiver.handle(create_headers(resource_state="sync")) == 200
+    assert not notifications
+
+
+def test_handle_rejects_forgotten_channel():
+    notifications: list[DriveNotification] = []
+    receiver = NotificationReceiver(notifications.append, 0, host="127.0.0.1")
+    receiver.expect_channel("channel-id", "token")
+    receiver.forget_channel("channel-id")
+
+    assert receiver.handle(create_headers()) == 403
+
+
+def test_receiver_serves_notifications():
+    notifications: list[DriveNotification] = []
+    receiver = NotificationReceiver(notifications.append, 0, host="127.0.0.1")
+    receiver.expect_channel("channel-id", "token")
+    receiver.start()
+
+    try:
+        url = f"http://127.0.0.1:{receiver.port}/"
+        with urllib.request.urlopen(urllib.request.Request(url, data=b"", headers=create_headers(), method="POST"), timeout=5) as response:
+            assert response.status == 200
+
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(urllib.request.Request(url, data=b"", headers=create_headers(token="wrong"), method="POST"), timeout=5)
+        assert exc_info.value.code == 403
+    finally:
+        receiver.stop()
+
+    assert len(notifications) == 1
@@ -0,0 +1,52 @@
+import logging
+import logging.handlers
+import queue
+import time
+
+import pytest
+
+from src.app.log import base
+
+
+class SlowCollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        time.sleep(0.001)  # Keeps records waiting in the queue.
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture(scope="function")
+def collecting_handler() -> SlowCollectingHandler:
+    return SlowCollectingHandler()
+
+
+@pytest.fixture(scope="function")
+def queue_logger(collecting_handler: SlowCollectingHandler):
+    queue_handler = logging.handlers.QueueHandler(queue.Queue())
+    queue_handler.listener = logging.handlers.QueueListener(queue_handler.queue, collecting_handler)
+    queue_handler.set_name(base.QUEUE_HANDLER_NAME)
+
+    logger = logging.getLogger("importer.test_queue_listener")
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    yield logger
+
+    base.stop_queue_listener()
+    logger.removeHandler(queue_handler)
+    queue_handler.close()
+
+
+def test_stop_queue_listener_flushes_pending_records(queue_logger: logging.Logger, collecting_handler: SlowCollectingHandler):
+    base.start_queue_listener()
+    for message_no in range(200):
+        queue_logger.debug("Message no. %i", message_no)
+
+    base.stop_queue_listener()
+
+    assert collecting_handler.messages == [f"Message no. {message_no}" for message_no in range(200)]
+    assert base.QUEUE_LISTENER is None
@@ -0,0 +1,63 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.log import filter
+from src.app.log.filter import RateLimitFilter
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now: float = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def monotonic(monkeypatch: pytest.MonkeyPatch) -> FakeMonotonic:
+    fake_monotonic = FakeMonotonic()
+    monkeypatch.setattr(filter, "time", SimpleNamespace(monotonic=fake_monotonic))
+    return fake_monotonic
+
+
+def create_record(msg: str, level: int = logging.DEBUG, name: str = "importer.test") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, (), None)
+
+
+def test_drops_records_over_rate(monotonic: FakeMonotonic):
+    rate_limit_filter = RateLimitFilter(2)
+
+    passed = [rate_limit_filter.filter(create_record("Downloaded file no. %i")) for _ in range(5)]
+
+    assert passed == [True, True, False, False, False]
+
+
+def test_reports_dropped_count_with_next_record(monotonic: FakeMonotonic):
+    rate_limit_filter = RateLimitFilter(2)
+    for _ in range(5):
+        rate_limit_filter.filter(create_record("Downloaded file no. %i"))
+
+    monotonic.now += 1.0
+    record = create_record("Downloaded file no. %i")
+
+    assert rate_limit_filter.filter(record) is True
+    assert record.msg == "Downloaded file no. %i (3 similar messages suppressed)"
+
+
+def test_limits_each_message_template_separately(monotonic: FakeMonotonic):
+    rate_limit_filter = RateLimitFilter(1)
+
+    assert rate_limit_filter.filter(create_record("Downloaded file no. %i")) is True
+    assert rate_limit_filter.filter(create_record("Imported file no. %i")) is True
+    assert rate_limit_filter.filter(create_record("Imported file no. %i", name="importer.other")) is True
+    assert rate_limit_filter.filter(create_record("Downloaded file no. %i")) is False
+
+
+def test_lets_through_records_above_max_level(monotonic: FakeMonotonic):
+    rate_limit_filter = RateLimitFilter(1)
+
+    passed = [rate_limit_filter.filter(create_record("Could not import file no. %i", level=logging.WARNING)) for _ in range(3)]
+
+    assert passed == [True, True, True]
@@ -22,5 +22,9 @@ def test_properties(
     queue_item: QueueItem,
     gdrive_file: GDriveFile,
 ):
-    # read-only properties
+    # precomputed attributes
     assert queue_item.target_file_path == Path(f"/dev/null/{gdrive_file.name}")
+
+
+def test_slots(queue_item: QueueItem):
+    assert not hasattr(queue_item, "__dict__")
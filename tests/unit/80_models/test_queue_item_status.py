@@ -1,24 +1,31 @@
 from datetime import datetime
 
+import pytest
+
 from src.app.core.models.cancellation_token import CancellationToken
-from src.app.core.models.status import StatusFlag
-from src.app.models.queue_item import QueueItemStatus
+from src.app.models.queue_item import QueueItemFailure, QueueItemState, QueueItemStatus
 
 
 def test_create(cancel_token: CancellationToken):
     queue_item_status = QueueItemStatus(cancel_token)
 
     assert queue_item_status.cancel_token == cancel_token
-    assert isinstance(queue_item_status.downloaded, StatusFlag)
-    assert queue_item_status.downloaded.value is False
-    assert isinstance(queue_item_status.download_error, StatusFlag)
-    assert queue_item_status.download_error.value is False
-    assert isinstance(queue_item_status.download_timed_out, StatusFlag)
-    assert queue_item_status.download_timed_out.value is False
-    assert isinstance(queue_item_status.imported, StatusFlag)
-    assert queue_item_status.imported.value is False
-    assert isinstance(queue_item_status.import_error, StatusFlag)
-    assert queue_item_status.import_error.value is False
+    assert queue_item_status.state == QueueItemState.QUEUED
+    assert queue_item_status.failure is None
+    assert queue_item_status.downloaded is False
+    assert queue_item_status.download_error is False
+    assert queue_item_status.download_timed_out is False
+    assert queue_item_status.imported is False
+    assert queue_item_status.import_error is False
+    assert queue_item_status.done is False
+
+
+def test_slots(cancel_token: CancellationToken):
+    queue_item_status = QueueItemStatus(cancel_token)
+
+    assert not hasattr(queue_item_status, "__dict__")
+    with pytest.raises(AttributeError):
+        queue_item_status.downloaded_attempts = 1
 
 
 def test_properties(cancel_token: CancellationToken):
@@ -35,3 +42,86 @@ def test_properties(cancel_token: CancellationToken):
     assert queue_item_status.imported_at == timestamp
     queue_item_status.imported_at = None
     assert queue_item_status.imported_at is None
+
+
+def test_transition_happy_path(cancel_token: CancellationToken):
+    queue_item_status = QueueItemStatus(cancel_token)
+
+    assert queue_item_status.transition(QueueItemState.DOWNLOADING) is True
+    assert queue_item_status.downloaded is False
+
+    assert queue_item_status.transition(QueueItemState.DOWNLOADED) is True
+    assert queue_item_status.downloaded is True
+
+    assert queue_item_status.transition(QueueItemState.IMPORTING) is True
+    assert queue_item_status.imported is False
+    assert queue_item_status.done is False
+
+    assert queue_item_status.transition(QueueItemState.IMPORTED) is True
+    assert queue_item_status.downloaded is True
+    assert queue_item_status.imported is True
+    assert queue_item_status.done is True
+
+
+def test_transition_only_moves_forward(cancel_token: CancellationToken):
+    queue_item_status = QueueItemStatus(cancel_token)
+    queue_item_status.transition(QueueItemState.DOWNLOADED)
+
+    assert queue_item_status.transition(QueueItemState.DOWNLOADING) is False
+    assert queue_item_status.transition(QueueItemState.DOWNLOADED) is False
+    assert queue_item_status.state == QueueItemState.DOWNLOADED
+
+
+def test_transition_to_failed_raises(cancel_token: CancellationToken):
+    queue_item_status = QueueItemStatus(cancel_token)
+
+    with pytest.raises(ValueError):
+        queue_item_status.transition(QueueItemState.FAILED)
+
+
+test_cases_fail = [
+    # failure, expected_download_error, expected_download_timed_out, expected_import_error, expected_downloaded
+    pytest.param(QueueItemFailure.DOWNLOAD_ERROR, True, False, False, False, id="download_error"),
+    pytest.param(QueueItemFailure.DOWNLOAD_TIMED_OUT, True, True, False, False, id="download_timed_out"),
+    pytest.param(QueueItemFailure.IMPORT_ERROR, False, False, True, True, id="import_error"),
+]
+"""failure: QueueItemFailure, expected_download_error: bool, expected_download_timed_out: bool, expected_import_error: bool, expected_downloaded: bool"""
+
+
+@pytest.mark.parametrize(
+    ["failure", "expected_download_error", "expected_download_timed_out", "expected_import_error", "expected_downloaded"], test_cases_fail
+)
+def test_fail(
+    cancel_token: CancellationToken,
+    failure: QueueItemFailure,
+    expected_download_error: bool,
+    expected_download_timed_out: bool,
+    expected_import_error: bool,
+    expected_downloaded: bool,
+):
+    queue_item_status = QueueItemStatus(cancel_token)
+
+    assert queue_item_status.fail(failure) is True
+    assert queue_item_status.state == QueueItemState.FAILED
+    assert queue_item_status.failure == failure
+    assert queue_item_status.done is True
+    assert queue_item_status.imported is False
+    assert queue_item_status.download_error is expected_download_error
+    assert queue_item_status.download_timed_out is expected_download_timed_out
+    assert queue_item_status.import_error is expected_import_error
+    assert queue_item_status.downloaded is expected_downloaded
+
+
+def test_final_states_are_final(cancel_token: CancellationToken):
+    queue_item_status = QueueItemStatus(cancel_token)
+    queue_item_status.fail(QueueItemFailure.DOWNLOAD_ERROR)
+
+    assert queue_item_status.transition(QueueItemState.IMPORTED) is False
+    assert queue_item_status.fail(QueueItemFailure.IMPORT_ERROR) is False
+    assert queue_item_status.failure == QueueItemFailure.DOWNLOAD_ERROR
+
+    queue_item_status = QueueItemStatus(cancel_token)
+    queue_item_status.transition(QueueItemState.IMPORTED)
+
+    assert queue_item_status.fail(QueueItemFailure.IMPORT_ERROR) is False
+    assert queue_item_status.imported is True
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from src.app.converters import FromRunStatistics
+from src.app.core.models.cancellation_token import CancellationToken
+from src.app.models.queue_item import QueueItemFailure, QueueItemState, QueueItemStatus
+from src.app.models.run_statistics import RunStatistics
+
+
+def test_create():
+    modified_after = datetime(2024, 8, 1)
+    statistics = RunStatistics(modified_after=modified_after)
+
+    assert statistics.modified_after == modified_after
+    assert statistics.modified_before is None
+    assert statistics.finished_at is None
+    assert statistics.file_count == 0
+    assert statistics.retry_count == 0
+    assert all(count == 0 for count in statistics.state_counts.values())
+
+
+def test_transitions_update_counters(cancel_token: CancellationToken):
+    statistics = RunStatistics()
+    statistics.add_files(2)
+    imported_status = QueueItemStatus(cancel_token, size=100, statistics=statistics)
+    failed_status = QueueItemStatus(cancel_token, size=50, statistics=statistics)
+
+    assert statistics.state_counts[QueueItemState.QUEUED] == 2
+
+    for state in (QueueItemState.DOWNLOADING, QueueItemState.DOWNLOADED, QueueItemState.IMPORTING, QueueItemState.IMPORTED):
+        imported_status.transition(state)
+    failed_status.transition(QueueItemState.DOWNLOADING)
+    failed_status.record_retry()
+    failed_status.fail(QueueItemFailure.DOWNLOAD_ERROR)
+
+    assert statistics.file_count == 2
+    assert statistics.downloaded_count == 1
+    assert statistics.imported_count == 1
+    assert statistics.bytes_downloaded == 100
+    assert statistics.bytes_imported == 100
+    assert statistics.download_error_count == 1
+    assert statistics.import_error_count == 0
+    assert statistics.retry_count == 1
+    assert statistics.state_counts[QueueItemState.QUEUED] == 0
+    assert statistics.state_counts[QueueItemState.IMPORTED] == 1
+    assert statistics.state_counts[QueueItemState.FAILED] == 1
+    assert all(duration >= 0.0 for duration in statistics.state_durations.values())
+
+
+def test_rejected_transition_is_not_counted(cancel_token: CancellationToken):
+    statistics = RunStatistics()
+    statistics.add_files(1)
+    status = QueueItemStatus(cancel_token, size=100, statistics=statistics)
+
+    assert status.transition(QueueItemState.DOWNLOADED) is True
+    assert status.transition(QueueItemState.DOWNLOADING) is False
+    assert statistics.downloaded_count == 1
+    assert statistics.state_counts[QueueItemState.DOWNLOADING] == 0
+    assert statistics.state_counts[QueueItemState.DOWNLOADED] == 1
+
+
+def test_restored_items_are_not_counted_as_downloaded_or_imported(cancel_token: CancellationToken):
+    statistics = RunStatistics()
+    statistics.add_files(2)
+    restored_imported = QueueItemStatus(cancel_token, size=100, statistics=statistics)
+    restored_downloaded = QueueItemStatus(cancel_token, size=50, statistics=statistics)
+
+    assert restored_imported.restore(QueueItemState.IMPORTED) is True
+    assert restored_downloaded.restore(QueueItemState.DOWNLOADED) is True
+    restored_downloaded.transition(QueueItemState.IMPORTING)
+    restored_downloaded.transition(QueueItemState.IMPORTED)
+
+    assert statistics.restored_count == 2
+    assert statistics.downloaded_count == 0
+    assert statistics.bytes_downloaded == 0
+    assert statistics.imported_count == 1
+    assert statistics.bytes_imported == 50
+    assert statistics.done_count == 2
+    assert statistics.state_counts[QueueItemState.IMPORTED] == 2
+
+
+def test_to_import_run():
+    statistics = RunStatistics(modified_before=datetime(2024, 8, 1))
+    statistics.add_files(3)
+    statistics.record_retry()
+    statistics.finish()
+
+    import_run = FromRunStatistics.to_import_run(statistics)
+
+    assert import_run.started_at == statistics.started_at
+    assert import_run.finished_at == statistics.finished_at
+    assert import_run.modified_before == datetime(2024, 8, 1)
+    assert import_run.file_count == 3
+    assert import_run.retry_count == 1
+    assert import_run.imported_count == 0
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.app.importer.backfill import BackfillProgress, BackfillWindow, WindowProgress
+
+
+def test_backfill_progress_merges_windows():
+    windows = [
+        BackfillWindow(0, datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 10)),
+        BackfillWindow(1, datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 20)),
+    ]
+    progress = BackfillProgress(windows)
+
+    progress.update(WindowProgress(0, datetime(2024, 1, 1, 5), file_count=5, imported_count=4, bytes_imported=400))
+    progress.update(WindowProgress(1, datetime(2024, 1, 1, 20), file_count=10, imported_count=10, bytes_imported=1000, finished=True))
+
+    assert progress.file_count == 15
+    assert progress.imported_count == 14
+    assert progress.bytes_imported == 1400
+    assert progress.finished_window_count == 1
+    assert progress.covered_fraction == pytest.approx(0.75)
+    assert progress.get_eta(30.0) == timedelta(seconds=10)
+
+
+def test_backfill_progress_without_progress():
+    progress = BackfillProgress([BackfillWindow(0, datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 10))])
+
+    assert progress.covered_fraction == 0.0
+    assert progress.get_eta(30.0) is None
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+from fake_classes import FakeGoogleDriveClient, FakeImporter, create_fake_gdrive_files
+from src.app.core.models.chunk_sizer import ChunkSizer
+from src.app.database.unit_of_work import SqlModelUnitOfWork
+from src.app.importer import Importer
+from src.app.importer.backfill import BackfillWindow, WindowProgress, backfill_window
+from src.app.models import RunStatistics
+
+
+WINDOW = BackfillWindow(1, datetime(2020, 1, 1), datetime(2020, 3, 1))
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_backfill_window_imports_files_within_window(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_importer.chunk_sizer = ChunkSizer(3, 3, 3)
+    window_files = create_fake_gdrive_files(7, modified_date_after=WINDOW.modified_after, modified_date_before=WINDOW.modified_before)
+    other_files = create_fake_gdrive_files(3, modified_date_after=WINDOW.modified_before)
+    fake_gdrive_client.files = window_files + other_files
+    reports: list[WindowProgress] = []
+
+    progress = await backfill_window(fake_importer, fake_gdrive_client, WINDOW, report=reports.append)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert sorted(collection_file.gdrive_file_id for collection_file in collection_files) == sorted(gdrive_file.id for gdrive_file in window_files)
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert progress.finished is True
+    assert progress.file_count == 7
+    assert progress.imported_count == 7
+    assert len(reports) >= 3  # One per chunk & one when finished
+    assert reports[-1] == progress
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_backfill_window_continues_after_latest_imported_file(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_gdrive_client.files = create_fake_gdrive_files(4, modified_date_after=WINDOW.modified_after, modified_date_before=WINDOW.modified_before)
+    await backfill_window(fake_importer, fake_gdrive_client, WINDOW)
+
+    progress = await backfill_window(fake_importer, fake_gdrive_client, WINDOW)
+
+    assert progress.finished is True
+    assert progress.file_count == 0
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_backfill_window_cancelled(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_gdrive_client.files = create_fake_gdrive_files(4, modified_date_after=WINDOW.modified_after, modified_date_before=WINDOW.modified_before)
+    fake_importer.cancel_workers()
+
+    progress = await backfill_window(fake_importer, fake_gdrive_client, WINDOW)
+
+    assert progress.finished is False
+    assert progress.file_count == 0
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_backfill_window_stalled(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, monkeypatch: pytest.MonkeyPatch):
+    bulk_import_count = 0
+
+    async def mock_run_bulk_import(gdrive_client: FakeGoogleDriveClient, modified_after: datetime, *args, **kwargs) -> datetime:
+        nonlocal bulk_import_count
+        bulk_import_count += 1
+        fake_importer.status.run_statistics = RunStatistics()
+        fake_importer.status.run_statistics.listed_file_count = 3  # The first file listed didn't complete, e.g. due to a download timeout.
+        return modified_after
+
+    monkeypatch.setattr(fake_importer, Importer.run_bulk_import.__name__, mock_run_bulk_import)
+
+    progress = await backfill_window(fake_importer, fake_gdrive_client, WINDOW)
+
+    assert bulk_import_count == 1
+    assert progress.finished is False
+    assert progress.watermark == WINDOW.modified_after
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_backfill_window_imports_files_left_within_hour(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_importer.chunk_sizer = ChunkSizer(2, 2, 2)
+    fake_gdrive_client.files = sorted(create_fake_gdrive_files(3), key=lambda gdrive_file: gdrive_file.name)
+    for minute, gdrive_file in zip((10, 20, 30), fake_gdrive_client.files):
+        gdrive_file.modified_date = datetime(2020, 2, 1, 12, minute)
+
+    progress = await backfill_window(fake_importer, fake_gdrive_client, WINDOW)
+
+    assert progress.finished is True
+    assert progress.imported_count == 3
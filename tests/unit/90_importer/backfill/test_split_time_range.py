@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from src.app.importer.backfill import BackfillWindow, split_time_range
+
+
+test_cases_split_time_range = [
+    # start, end, window_count, expected
+    pytest.param(
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 1, 6),
+        3,
+        [
+            BackfillWindow(0, datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 2)),
+            BackfillWindow(1, datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 4)),
+            BackfillWindow(2, datetime(2024, 1, 1, 4), datetime(2024, 1, 1, 6)),
+        ],
+        id="even",
+    ),
+    pytest.param(
+        datetime(2024, 1, 1, 0, 30),
+        datetime(2024, 1, 1, 5, 10),
+        2,
+        [
+            BackfillWindow(0, datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 2)),
+            BackfillWindow(1, datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 5, 10)),
+        ],
+        id="uneven",
+    ),
+    pytest.param(
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 1, 2),
+        4,
+        [
+            BackfillWindow(0, datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 1)),
+            BackfillWindow(1, datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 2)),
+        ],
+        id="fewer_hours_than_windows",
+    ),
+    pytest.param(datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 1), 2, [], id="empty"),
+]
+"""start: datetime, end: datetime, window_count: int, expected: list[BackfillWindow]"""
+
+
+@pytest.mark.parametrize(["start", "end", "window_count", "expected"], test_cases_split_time_range)
+def test_split_time_range(start: datetime, end: datetime, window_count: int, expected: list[BackfillWindow]):
+    assert split_time_range(start, end, window_count) == expected
@@ -0,0 +1,64 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from fake_classes import create_fake_gdrive_files
+from src.app.core.models.cancellation_token import CancellationToken
+from src.app.importer.backfill import BackfillWindow, WorkerConfig, get_window_config_overrides
+from src.app.importer.importer import get_instance_id
+from src.app.importer.journal import ImportJournal
+from src.app.models.queue_item import QueueItem
+
+
+WINDOWS = [
+    BackfillWindow(0, datetime(2024, 1, 1), datetime(2024, 1, 2)),
+    BackfillWindow(1, datetime(2024, 1, 2), datetime(2024, 1, 3)),
+]
+
+
+def create_window_config(temp_download_folder: str, window: BackfillWindow) -> WorkerConfig:
+    configuration = WorkerConfig({"temp_download_folder": temp_download_folder, "journal_file_path": None, "instance_id": None})
+    return WorkerConfig({"temp_download_folder": temp_download_folder, **get_window_config_overrides(configuration, window)})
+
+
+def import_window(temp_download_folder: str, window: BackfillWindow) -> str:
+    """Records & compacts the journal of `window` like a backfill worker importing a few chunks."""
+    configuration = create_window_config(temp_download_folder, window)
+    journal = ImportJournal(configuration.import_journal_file_path)
+    instance_id = get_instance_id(configuration)
+
+    queue_items = [
+        QueueItem(item_no, gdrive_file, item_no, temp_download_folder, CancellationToken())
+        for item_no, gdrive_file in enumerate(create_fake_gdrive_files(200), 1)
+    ]
+    for chunk_start in range(0, len(queue_items), 20):
+        chunk = queue_items[chunk_start : chunk_start + 20]
+        for queue_item in chunk:
+            journal.record_downloaded(queue_item)
+        journal.compact(queue_item.gdrive_file.id for queue_item in chunk[:10])
+
+    return instance_id
+
+
+def test_window_config_overrides_journal_and_instance_id(tmp_path: Path):
+    configuration = WorkerConfig({"temp_download_folder": str(tmp_path), "journal_file_path": None, "instance_id": "backfill"})
+
+    overrides = [get_window_config_overrides(configuration, window) for window in WINDOWS]
+
+    assert overrides[0]["journal_file_path"] != overrides[1]["journal_file_path"]
+    assert all(Path(window_overrides["journal_file_path"]).parent.parent == tmp_path for window_overrides in overrides)
+    assert overrides[0]["instance_id"] != overrides[1]["instance_id"]
+
+
+def test_workers_keep_their_journals_apart(tmp_path: Path):
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(len(WINDOWS), mp_context=context) as executor:
+        instance_ids = list(executor.map(import_window, [str(tmp_path)] * len(WINDOWS), WINDOWS))
+
+    assert len(set(instance_ids)) == len(WINDOWS)
+    for window, instance_id in zip(WINDOWS, instance_ids):
+        configuration = create_window_config(str(tmp_path), window)
+        assert len(ImportJournal(configuration.import_journal_file_path).replay()) == 100
+        assert configuration.instance_id_file_path.read_text() == instance_id
@@ -1,6 +1,22 @@
 import pytest
 
 from src.app.database import crud
+from tests.fake_classes import FakeConfig, FakeFileSystem, FakeImporter, FakePssFleetDataClient
+
+
+@pytest.fixture(scope="function")
+def fake_fleet_data_client() -> FakePssFleetDataClient:
+    return FakePssFleetDataClient()
+
+
+@pytest.fixture(scope="function")
+def fake_importer(
+    fake_config: FakeConfig,
+    fake_fleet_data_client: FakePssFleetDataClient,
+    filesystem: FakeFileSystem,
+) -> FakeImporter:
+
+    return FakeImporter(fake_config, fake_fleet_data_client, filesystem=filesystem)
 
 
 @pytest.fixture(scope="function")
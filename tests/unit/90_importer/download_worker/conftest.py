@@ -45,7 +45,9 @@ def download_function() -> DownloadFunction:
 
 @pytest.fixture(scope="function")
 def patch_download_gdrive_file_contents_return_something(google_drive_file_content: str, monkeypatch: pytest.MonkeyPatch):
-    def mock_return_google_drive_file_content(gdrive_file, gdrive_client, cancel_token, item_no, max_download_attempts, log_stack_trace):
+    def mock_return_google_drive_file_content(
+        gdrive_file, gdrive_client, cancel_token, item_no, max_download_attempts, log_stack_trace, on_retry=None, concurrency_limiter=None
+    ):
         return google_drive_file_content
 
     monkeypatch.setattr(download_worker, download_worker.download_gdrive_file_contents.__name__, mock_return_google_drive_file_content)
@@ -4,6 +4,7 @@ from typing import Optional
 import pytest
 from importer_test_cases import test_cases_raised_error_caught
 
+from src.app.core.models.byte_budget import ByteBudget
 from src.app.core.models.filesystem import FileSystem
 from src.app.importer import download_worker
 from src.app.importer.download_worker import download_gdrive_file
@@ -39,6 +40,8 @@ def test_raise_download_error_on_google_api_errors(
         item_no,
         max_download_attempts,
         log_stack_trace,
+        on_retry=None,
+        concurrency_limiter=None,
     ):
         raise google_api_errors[exception_type]
 
@@ -76,6 +79,8 @@ def test_raise_download_error_on_downloaded_file_contents_empty_or_none(
         item_no,
         max_download_attempts,
         log_stack_trace,
+        on_retry=None,
+        concurrency_limiter=None,
     ):
         return file_contents
 
@@ -98,6 +103,8 @@ def test_raise_download_error_on_io_error(queue_item: QueueItem, monkeypatch: py
         item_no,
         max_download_attempts,
         log_stack_trace,
+        on_retry=None,
+        concurrency_limiter=None,
     ):
         raise IOError()
 
@@ -120,6 +127,8 @@ def test_log_file_downloaded_on_success(queue_item: QueueItem, caplog: pytest.Lo
         item_no,
         max_download_attempts,
         log_stack_trace,
+        on_retry=None,
+        concurrency_limiter=None,
     ):
         pass
 
@@ -130,3 +139,23 @@ def test_log_file_downloaded_on_success(queue_item: QueueItem, caplog: pytest.Lo
 
     assert "downloaded" in caplog.text.lower()
     assert len(caplog.records) == 1
+
+
+@pytest.mark.usefixtures("patch_file_already_exists_returns_false")
+@pytest.mark.usefixtures("patch_write_gdrive_file_to_disk_pass")
+def test_reserves_file_size_in_byte_budget(queue_item: QueueItem, google_drive_file_content: str, monkeypatch: pytest.MonkeyPatch):
+    byte_budget = ByteBudget(1)
+    in_flight_during_download = []
+
+    def mock_download_gdrive_file_contents(
+        gdrive_file, gdrive_client, cancel_token, item_no, max_download_attempts, log_stack_trace, on_retry=None, concurrency_limiter=None
+    ):
+        in_flight_during_download.append(byte_budget.in_flight)
+        return google_drive_file_content
+
+    monkeypatch.setattr(download_worker, download_worker.download_gdrive_file_contents.__name__, mock_download_gdrive_file_contents)
+
+    download_gdrive_file(queue_item, None, False, byte_budget=byte_budget)
+
+    assert in_flight_during_download == [queue_item.gdrive_file.size]
+    assert byte_budget.in_flight == 0
@@ -0,0 +1,32 @@
+import json
+from typing import Optional
+
+import googleapiclient.errors
+import pydrive2.files
+import pytest
+
+from src.app.importer.download_worker import is_throttled
+from tests.conftest import MockHttpResponse
+
+
+def create_api_request_error(code: int, reason: Optional[str] = None) -> pydrive2.files.ApiRequestError:
+    content = {"error": {"code": code, "errors": [{"reason": reason}] if reason else []}}
+    http_error = googleapiclient.errors.HttpError(MockHttpResponse(), json.dumps(content).encode())
+    return pydrive2.files.ApiRequestError(http_error)
+
+
+test_cases = [
+    # download_error: Exception, expected_result: bool
+    pytest.param(create_api_request_error(429), True, id="too_many_requests"),
+    pytest.param(create_api_request_error(403, "userRateLimitExceeded"), True, id="user_rate_limit_exceeded"),
+    pytest.param(create_api_request_error(503), True, id="service_unavailable"),
+    pytest.param(create_api_request_error(403, "insufficientFilePermissions"), False, id="forbidden"),
+    pytest.param(create_api_request_error(404, "notFound"), False, id="not_found"),
+    pytest.param(pydrive2.files.FileNotDownloadableError("No downloadLink/exportLinks for mimetype found in metadata"), False, id="not_downloadable"),
+]
+"""download_error: Exception, expected_result: bool"""
+
+
+@pytest.mark.parametrize(["download_error", "expected_result"], test_cases)
+def test_is_throttled(download_error: Exception, expected_result: bool):
+    assert is_throttled(download_error) is expected_result
@@ -1,3 +1,4 @@
+import time
 from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 import pytest
@@ -16,8 +17,8 @@ def test_set_downloaded_true_error_false_and_return_queue_item_on_success(queue_
 
     returned_queue_item = wait_for_download(Future(), queue_item, None)
 
-    assert returned_queue_item.status.downloaded.value is True
-    assert returned_queue_item.status.download_error.value is False
+    assert returned_queue_item.status.downloaded is True
+    assert returned_queue_item.status.download_error is False
     assert id(returned_queue_item) == id(queue_item)
 
 
@@ -29,8 +30,8 @@ def test_set_downloaded_false_error_false_on_future_cancelled(queue_item: QueueI
 
     returned_queue_item = wait_for_download(Future(), queue_item, None)
 
-    assert returned_queue_item.status.downloaded.value is False
-    assert returned_queue_item.status.download_error.value is False
+    assert returned_queue_item.status.downloaded is False
+    assert returned_queue_item.status.download_error is False
 
 
 def test_set_downloaded_false_error_false_on_cancel_token_cancelled(queue_item: QueueItem, monkeypatch: pytest.MonkeyPatch):
@@ -41,8 +42,8 @@ def test_set_downloaded_false_error_false_on_cancel_token_cancelled(queue_item:
 
     returned_queue_item = wait_for_download(Future(), queue_item, None)
 
-    assert returned_queue_item.status.downloaded.value is False
-    assert returned_queue_item.status.download_error.value is False
+    assert returned_queue_item.status.downloaded is False
+    assert returned_queue_item.status.download_error is False
 
 
 def test_set_downloaded_false_error_true_on_download_failed_error(queue_item: QueueItem, monkeypatch: pytest.MonkeyPatch):
@@ -53,8 +54,8 @@ def test_set_downloaded_false_error_true_on_download_failed_error(queue_item: Qu
 
     returned_queue_item = wait_for_download(Future(), queue_item, None)
 
-    assert returned_queue_item.status.downloaded.value is False
-    assert returned_queue_item.status.download_error.value is True
+    assert returned_queue_item.status.downloaded is False
+    assert returned_queue_item.status.download_error is True
 
 
 def test_set_downloaded_false_error_true_timeout_flag_true_shutdown_executor_on_timeout_error(
@@ -64,9 +65,34 @@ def test_set_downloaded_false_error_true_timeout_flag_true_shutdown_executor_on_
         raise TimeoutError()
 
     monkeypatch.setattr(Future, Future.result.__name__, mock_future_result_cancelled)
+    queue_item.status.download_started_at = time.perf_counter()
 
     returned_queue_item = wait_for_download(Future(), queue_item, thread_pool_executor_1)
 
-    assert returned_queue_item.status.downloaded.value is False
-    assert returned_queue_item.status.download_error.value is True
+    assert returned_queue_item.status.downloaded is False
+    assert returned_queue_item.status.download_error is True
+    assert returned_queue_item.status.download_timed_out is True
     assert thread_pool_executor_1._shutdown is True
+
+
+def test_timeout_starts_once_download_started(queue_item: QueueItem, thread_pool_executor_1: ThreadPoolExecutor):
+    future = Future()
+    timeouts = []
+
+    def mock_future_result(timeout=None):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            # The download waited for a slot behind other downloads & started just now.
+            queue_item.status.download_started_at = time.perf_counter()
+            raise TimeoutError()
+        return None
+
+    future.result = mock_future_result
+
+    returned_queue_item = wait_for_download(future, queue_item, thread_pool_executor_1, timeout=60.0)
+
+    assert returned_queue_item.status.downloaded is True
+    assert returned_queue_item.status.download_timed_out is False
+    assert timeouts[0] == 60.0
+    assert 59.0 < timeouts[1] <= 60.0
+    assert thread_pool_executor_1._shutdown is False
@@ -3,8 +3,18 @@ from datetime import datetime
 import pytest
 from pss_fleet_data import ApiError, CollectionMetadata
 
+from fake_classes import create_fake_gdrive_file
 from src.app.core import utils
+from src.app.core.models.cancellation_token import CancellationToken
+from src.app.database.models import CollectionFileDB
 from src.app.importer import import_worker
+from src.app.models.queue_item import QueueItem
+
+
+@pytest.fixture(scope="function")
+def queue_item(collection_file_db: CollectionFileDB, cancel_token: CancellationToken) -> QueueItem:
+    # The file name needs to be a valid Collection file name to extract the timestamp from it.
+    return QueueItem(1, create_fake_gdrive_file(), collection_file_db.collection_file_id, "/dev/null", cancel_token)
 
 
 @pytest.fixture(scope="function")
@@ -25,7 +35,14 @@ def mock_collection_metadata():
 
 @pytest.fixture(scope="function")
 def patch_upload_collection_returns_timestamp(monkeypatch: pytest.MonkeyPatch):
-    async def mock_import_file_returns_timestamp(fleet_data_client, inner_queue_item, import_attempts=2, reraise_non_unique_timestamp_error=False):
+    async def mock_import_file_returns_timestamp(
+        fleet_data_client,
+        inner_queue_item,
+        import_attempts=2,
+        reraise_non_unique_timestamp_error=False,
+        concurrency_limiter=None,
+        circuit_breaker=None,
+    ):
         return utils.get_now()
 
     monkeypatch.setattr(import_worker, import_worker.upload_collection.__name__, mock_import_file_returns_timestamp)
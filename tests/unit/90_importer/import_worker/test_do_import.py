@@ -5,8 +5,10 @@ from pss_fleet_data import ApiError
 from pss_fleet_data.core.exceptions import NonUniqueTimestampError
 
 from fake_classes import FakeFileSystem, FakePssFleetDataClient
+from src.app.core.models.circuit_breaker import CircuitBreaker
 from src.app.importer import import_worker
 from src.app.importer.import_worker import do_import
+from src.app.models import QueueItemFailure
 from src.app.models.queue_item import QueueItem
 
 
@@ -21,6 +23,7 @@ async def test_delete_file_after_import_if_specified(
     await do_import(fake_pss_fleet_data_client, queue_item, False, filesystem=filesystem)
 
     assert filesystem.exists(queue_item.target_file_path) == False
+    assert queue_item.status.imported_at
 
 
 @pytest.mark.usefixtures("patch_upload_collection_returns_timestamp")
@@ -45,7 +48,12 @@ async def test_log_raised_api_error_on_upload_and_return(
     caplog: pytest.LogCaptureFixture,
 ):
     async def mock_upload_collection_returns_timestamp(
-        fleet_data_client, inner_queue_item, import_attempts=2, reraise_non_unique_timestamp_error=False
+        fleet_data_client,
+        inner_queue_item,
+        import_attempts=2,
+        reraise_non_unique_timestamp_error=False,
+        concurrency_limiter=None,
+        circuit_breaker=None,
     ):
         raise api_error
 
@@ -59,6 +67,27 @@ async def test_log_raised_api_error_on_upload_and_return(
     assert caplog.text
 
 
+@pytest.mark.usefixtures("patch_asyncio_sleep")
+async def test_fail_import_on_local_error_without_opening_circuit(
+    fake_pss_fleet_data_client: FakePssFleetDataClient,
+    queue_item: QueueItem,
+    filesystem: FakeFileSystem,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=1)
+
+    async def mock_upload_collection_raises_value_error(file_path, api_key=None):
+        raise ValueError("Invalid JSON")
+
+    monkeypatch.setattr(fake_pss_fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection_raises_value_error)
+    filesystem.write(queue_item.target_file_path, "abc")
+
+    await do_import(fake_pss_fleet_data_client, queue_item, False, filesystem=filesystem, circuit_breaker=circuit_breaker)
+
+    assert queue_item.status.failure == QueueItemFailure.IMPORT_ERROR
+    assert circuit_breaker.is_open is False
+
+
 async def test_consider_file_as_imported_if_non_unique_timestamp_error_raised(
     fake_pss_fleet_data_client: FakePssFleetDataClient,
     queue_item: QueueItem,
@@ -68,7 +97,12 @@ async def test_consider_file_as_imported_if_non_unique_timestamp_error_raised(
     caplog: pytest.LogCaptureFixture,
 ):
     async def mock_upload_collection_raises_non_unique_timestamp_error(
-        fleet_data_client, inner_queue_item, import_attempts=2, reraise_non_unique_timestamp_error=False
+        fleet_data_client,
+        inner_queue_item,
+        import_attempts=2,
+        reraise_non_unique_timestamp_error=False,
+        concurrency_limiter=None,
+        circuit_breaker=None,
     ):
         raise NonUniqueTimestampError(None, None, None, None, None, [])
 
@@ -90,11 +124,16 @@ async def test_update_file_on_non_unique_timestamp_error_if_specified(
     caplog: pytest.LogCaptureFixture,
 ):
     async def mock_upload_collection_raises_non_unique_timestamp_error(
-        fleet_data_client, inner_queue_item, import_attempts=2, reraise_non_unique_timestamp_error=False
+        fleet_data_client,
+        inner_queue_item,
+        import_attempts=2,
+        reraise_non_unique_timestamp_error=False,
+        concurrency_limiter=None,
+        circuit_breaker=None,
     ):
         raise NonUniqueTimestampError(None, None, None, None, None, [])
 
-    async def mock_update_collection_succeeds(fleet_data_client, queue_item, import_attempts=2):
+    async def mock_update_collection_succeeds(fleet_data_client, queue_item, import_attempts=2, concurrency_limiter=None, circuit_breaker=None):
         return
 
     monkeypatch.setattr(import_worker, import_worker.upload_collection.__name__, mock_upload_collection_raises_non_unique_timestamp_error)
@@ -115,11 +154,18 @@ async def test_log_raised_api_error_on_update_and_return(
     caplog: pytest.LogCaptureFixture,
 ):
     async def mock_upload_collection_raises_non_unique_timestamp_error(
-        fleet_data_client, inner_queue_item, import_attempts=2, reraise_non_unique_timestamp_error=False
+        fleet_data_client,
+        inner_queue_item,
+        import_attempts=2,
+        reraise_non_unique_timestamp_error=False,
+        concurrency_limiter=None,
+        circuit_breaker=None,
     ):
         raise NonUniqueTimestampError(None, None, None, None, None, [])
 
-    async def mock_update_collection_raises_api_error(fleet_data_client, queue_item, import_attempts=2):
+    async def mock_update_collection_raises_api_error(
+        fleet_data_client, queue_item, import_attempts=2, concurrency_limiter=None, circuit_breaker=None
+    ):
         raise api_error
 
     monkeypatch.setattr(import_worker, import_worker.upload_collection.__name__, mock_upload_collection_raises_non_unique_timestamp_error)
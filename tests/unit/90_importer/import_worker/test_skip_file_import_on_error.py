@@ -3,7 +3,7 @@ from pss_fleet_data import CollectionMetadata
 
 from fake_classes import FakeFileSystem
 from src.app.importer.import_worker import skip_file_import_on_error
-from src.app.models.queue_item import QueueItem
+from src.app.models.queue_item import QueueItem, QueueItemFailure
 
 
 def test_return_true_if_queue_item_cancelled(queue_item: QueueItem):
@@ -13,7 +13,7 @@ def test_return_true_if_queue_item_cancelled(queue_item: QueueItem):
 
 
 def test_return_true_if_queue_item_error_while_download(queue_item: QueueItem):
-    queue_item.status.download_error.value = True
+    queue_item.status.fail(QueueItemFailure.DOWNLOAD_ERROR)
 
     assert skip_file_import_on_error(queue_item) is True
 
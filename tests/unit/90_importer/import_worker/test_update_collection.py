@@ -5,7 +5,7 @@ import pytest
 from pss_fleet_data import CollectionMetadata
 from pss_fleet_data.core.exceptions import ConflictError
 
-from fake_classes import FakePssFleetDataClient, create_fake_gdrive_file
+from fake_classes import FakePssFleetDataClient
 from src.app.core import utils
 from src.app.importer.import_worker import update_collection
 from src.app.models.queue_item import QueueItem
@@ -31,7 +31,6 @@ async def test_log_import_on_success(
     queue_item: QueueItem,
     caplog: pytest.LogCaptureFixture,
 ):
-    queue_item.gdrive_file = create_fake_gdrive_file()
     add_collection_to_be_updated(queue_item, fake_pss_fleet_data_client)
 
     with caplog.at_level(logging.INFO):
@@ -46,7 +45,6 @@ async def test_log_skip_on_conflict_error(
     monkeypatch: pytest.MonkeyPatch,
     caplog: pytest.LogCaptureFixture,
 ):
-    queue_item.gdrive_file = create_fake_gdrive_file()
     add_collection_to_be_updated(queue_item, fake_pss_fleet_data_client)
 
     async def mock_update_collection_raises_conflict_error(file_path, api_key=None):
@@ -69,7 +67,6 @@ async def test_log_generic_exception_then_reraise(
 ):
     exception = ValueError()
 
-    queue_item.gdrive_file = create_fake_gdrive_file()
     add_collection_to_be_updated(queue_item, fake_pss_fleet_data_client)
 
     async def mock_update_collection_raises_non_unique_timestamp_error(file_path, api_key=None):
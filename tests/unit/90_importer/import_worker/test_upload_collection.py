@@ -1,9 +1,12 @@
 import logging
 
 import pytest
-from pss_fleet_data.core.exceptions import NonUniqueTimestampError
+from pss_fleet_data.core.exceptions import NonUniqueTimestampError, ServerError, TooManyRequestsError, UnsupportedSchemaError
 
-from fake_classes import FakePssFleetDataClient, create_fake_gdrive_file
+from fake_classes import FakePssFleetDataClient
+from src.app.core.models.aimd_limiter import AimdLimiter
+from src.app.core.models.circuit_breaker import CircuitBreaker
+from src.app.importer.exceptions import ApiUnavailableError
 from src.app.importer.import_worker import upload_collection
 from src.app.models.queue_item import QueueItem
 
@@ -13,7 +16,6 @@ async def test_log_import_on_success(
     queue_item: QueueItem,
     caplog: pytest.LogCaptureFixture,
 ):
-    queue_item.gdrive_file = create_fake_gdrive_file()
 
     with caplog.at_level(logging.INFO):
         await upload_collection(fake_pss_fleet_data_client, queue_item)
@@ -27,7 +29,6 @@ async def test_log_skip_on_non_unique_timestamp_error(
     monkeypatch: pytest.MonkeyPatch,
     caplog: pytest.LogCaptureFixture,
 ):
-    queue_item.gdrive_file = create_fake_gdrive_file()
 
     async def mock_upload_collection_raises_non_unique_timestamp_error(file_path, api_key=None):
         raise NonUniqueTimestampError(None, None, None, None, None, [])
@@ -47,7 +48,6 @@ async def test_raise_on_non_unique_timestamp_error_if_specified(
     queue_item: QueueItem,
     monkeypatch: pytest.MonkeyPatch,
 ):
-    queue_item.gdrive_file = create_fake_gdrive_file()
 
     async def mock_upload_collection_raises_non_unique_timestamp_error(file_path, api_key=None):
         raise NonUniqueTimestampError(None, None, None, None, None, [])
@@ -69,8 +69,6 @@ async def test_log_generic_exception_then_reraise(
 ):
     exception = ValueError()
 
-    queue_item.gdrive_file = create_fake_gdrive_file()
-
     async def mock_upload_collection_raises_non_unique_timestamp_error(file_path, api_key=None):
         raise exception
 
@@ -84,3 +82,66 @@ async def test_log_generic_exception_then_reraise(
 
     assert "could not import file" in caplog.text.lower()
     assert type(exception).__qualname__ in caplog.text
+
+
+test_cases_record_upload_error = [
+    # upload_error: Exception, expected_limit: int
+    pytest.param(TooManyRequestsError(None, None, None, None, None, []), 2, id="too_many_requests"),
+    pytest.param(ServerError(None, None, None, None, None, []), 2, id="server_error"),
+    pytest.param(TimeoutError(), 2, id="timeout"),
+    pytest.param(UnsupportedSchemaError(None, None, None, None, None, []), 4, id="invalid_file"),
+    pytest.param(OSError(), 4, id="local_error"),
+]
+"""upload_error: Exception, expected_limit: int"""
+
+
+@pytest.mark.parametrize(["upload_error", "expected_limit"], test_cases_record_upload_error)
+async def test_record_upload_error(
+    fake_pss_fleet_data_client: FakePssFleetDataClient,
+    queue_item: QueueItem,
+    monkeypatch: pytest.MonkeyPatch,
+    upload_error: Exception,
+    expected_limit: int,
+):
+    concurrency_limiter = AimdLimiter("upload", 4, max_limit=8)
+
+    async def mock_upload_collection_raises(file_path, api_key=None):
+        raise upload_error
+
+    monkeypatch.setattr(fake_pss_fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection_raises)
+
+    with pytest.raises(type(upload_error)):
+        await upload_collection(fake_pss_fleet_data_client, queue_item, import_attempts=1, concurrency_limiter=concurrency_limiter)
+
+    assert concurrency_limiter.limit == expected_limit
+
+
+@pytest.mark.usefixtures("patch_asyncio_sleep")
+async def test_stop_attempts_once_circuit_opens(
+    fake_pss_fleet_data_client: FakePssFleetDataClient,
+    queue_item: QueueItem,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=1)
+    upload_calls = []
+
+    async def mock_upload_collection_raises_server_error(file_path, api_key=None):
+        upload_calls.append(file_path)
+        raise ServerError(None, None, None, None, None, [])
+
+    monkeypatch.setattr(fake_pss_fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection_raises_server_error)
+
+    with pytest.raises(ApiUnavailableError):
+        await upload_collection(fake_pss_fleet_data_client, queue_item, import_attempts=3, circuit_breaker=circuit_breaker)
+
+    assert len(upload_calls) == 1
+    assert circuit_breaker.is_open is True
+
+
+async def test_close_circuit_on_response(fake_pss_fleet_data_client: FakePssFleetDataClient, queue_item: QueueItem):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2)
+    circuit_breaker.record_failure()
+
+    await upload_collection(fake_pss_fleet_data_client, queue_item, circuit_breaker=circuit_breaker)
+
+    assert circuit_breaker.consecutive_failures == 0
@@ -2,22 +2,7 @@ from unittest import mock
 
 import pytest
 
-from tests.fake_classes import FakeConfig, FakeFileSystem, FakeImporter, FakePssFleetDataClient, FakeUnitOfWork
-
-
-@pytest.fixture(scope="function")
-def fake_fleet_data_client() -> FakePssFleetDataClient:
-    return FakePssFleetDataClient()
-
-
-@pytest.fixture(scope="function")
-def fake_importer(
-    fake_config: FakeConfig,
-    fake_fleet_data_client: FakePssFleetDataClient,
-    filesystem: FakeFileSystem,
-) -> FakeImporter:
-
-    return FakeImporter(fake_config, fake_fleet_data_client, filesystem=filesystem)
+from tests.fake_classes import FakeUnitOfWork
 
 
 @pytest.fixture(scope="function")
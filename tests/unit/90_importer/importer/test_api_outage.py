@@ -0,0 +1,115 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from importer_test_cases import test_cases_transport_error
+from pss_fleet_data.core.exceptions import ServerError
+from pydrive2.files import ApiRequestError
+
+from fake_classes import FakeGoogleDriveClient, FakeImporter, FakePssFleetDataClient, create_fake_gdrive_files
+from src.app.core.clock import VirtualClock
+from src.app.core.models.circuit_breaker import CircuitBreaker
+from src.app.database.unit_of_work import SqlModelUnitOfWork
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test", "patch_sleep")
+async def test_keeps_downloaded_files_during_outage(
+    fake_importer: FakeImporter,
+    fake_gdrive_client: FakeGoogleDriveClient,
+    api_request_error: ApiRequestError,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+):
+    fake_importer.config.temp_download_folder = tmp_path
+    fake_importer.api_circuit = CircuitBreaker("PSS Fleet Data API", failure_threshold=1)
+    fake_gdrive_client.files = create_fake_gdrive_files(3)
+
+    async def mock_upload_collection_raises_server_error(file_path, api_key=None):
+        raise ServerError(None, None, None, None, None, [])
+
+    with monkeypatch.context() as patch:
+        patch.setattr(fake_importer.fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection_raises_server_error)
+        await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    assert fake_importer.api_circuit.is_open is True
+    assert all((tmp_path / gdrive_file.name).exists() for gdrive_file in fake_gdrive_client.files)
+    assert not any(collection_file.error or collection_file.imported for collection_file in await list_collection_files())
+
+    # Once the API is available again, the files kept are imported without downloading them again.
+    for gdrive_file in fake_gdrive_client.files:
+        gdrive_file.exception = api_request_error
+    assert await fake_importer.probe_api() is True
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    assert all(collection_file.imported for collection_file in await list_collection_files())
+    assert len(fake_importer.fleet_data_client.collections) == 3
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test", "patch_sleep")
+@pytest.mark.parametrize(["transport_error"], test_cases_transport_error)
+async def test_keeps_downloaded_files_on_transport_errors(
+    fake_importer: FakeImporter,
+    fake_gdrive_client: FakeGoogleDriveClient,
+    transport_error: Exception,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+):
+    fake_importer.config.temp_download_folder = tmp_path
+    fake_gdrive_client.files = create_fake_gdrive_files(6)
+
+    async def mock_upload_collection_raises_transport_error(file_path, api_key=None):
+        raise transport_error
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            fake_importer.fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection_raises_transport_error
+        )
+        await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    # The files failing before the circuit opened are kept, too, rather than recorded as failed.
+    assert fake_importer.api_circuit.is_open is True
+    assert all((tmp_path / gdrive_file.name).exists() for gdrive_file in fake_gdrive_client.files)
+    assert not any(collection_file.error or collection_file.imported for collection_file in await list_collection_files())
+
+
+async def test_wait_for_api_recovery(fake_importer: FakeImporter, monkeypatch: pytest.MonkeyPatch):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12))
+    fake_importer.config.api_circuit_probe_interval = 60
+    fake_importer.api_circuit = CircuitBreaker("PSS Fleet Data API", failure_threshold=1)
+    fake_importer.api_circuit.record_failure()
+    pings = []
+
+    async def mock_ping() -> str:
+        pings.append(fake_importer.clock.now())
+        if len(pings) < 3:
+            raise TimeoutError()
+        return "Pong!"
+
+    monkeypatch.setattr(fake_importer.fleet_data_client, FakePssFleetDataClient.ping.__name__, mock_ping)
+
+    assert await fake_importer.wait_for_api_recovery() is True
+    assert pings == [datetime(2024, 1, 1, 12), datetime(2024, 1, 1, 12, 1), datetime(2024, 1, 1, 12, 2)]
+    assert fake_importer.api_circuit.is_open is False
+
+
+async def test_wait_for_api_recovery_until_next_full_hour(fake_importer: FakeImporter, monkeypatch: pytest.MonkeyPatch):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 58))
+    fake_importer.config.api_circuit_probe_interval = 60
+    fake_importer.api_circuit = CircuitBreaker("PSS Fleet Data API", failure_threshold=1)
+    fake_importer.api_circuit.record_failure()
+
+    async def mock_ping() -> str:
+        raise TimeoutError()
+
+    monkeypatch.setattr(fake_importer.fleet_data_client, FakePssFleetDataClient.ping.__name__, mock_ping)
+
+    assert await fake_importer.wait_for_api_recovery() is True
+    assert fake_importer.clock.now() == datetime(2024, 1, 1, 13, 1)
+    assert fake_importer.api_circuit.is_open is True
+
+
+async def list_collection_files():
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        return await uow.collection_files.list_files()
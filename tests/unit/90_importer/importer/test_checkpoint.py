@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from fake_classes import FakeGoogleDriveClient, FakeImporter, FakeUnitOfWork, create_fake_gdrive_files
+from src.app.core.clock import VirtualClock
+from src.app.core.models.chunk_sizer import ChunkSizer
+from src.app.database.unit_of_work import SqlModelUnitOfWork
+from src.app.importer import Importer
+from src.app.importer.importer import get_checkpoint_modified_after, get_checkpoint_name, save_checkpoint
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+def test_get_checkpoint_name():
+    assert get_checkpoint_name() == "import"
+    assert get_checkpoint_name(datetime(2024, 1, 1), datetime(2024, 2, 1)) == "import:2024-01-01T00:00:00..2024-02-01T00:00:00"
+    assert get_checkpoint_name(modified_before=datetime(2024, 2, 1)) == "import:..2024-02-01T00:00:00"
+
+
+async def test_save_checkpoint_only_moves_forward():
+    uow = FakeUnitOfWork()
+
+    await save_checkpoint("import", datetime(2024, 1, 1, 10), NOW, uow)
+    await save_checkpoint("import", datetime(2024, 1, 1, 9), NOW, uow)
+
+    assert await uow.import_checkpoints.get_watermark("import") == datetime(2024, 1, 1, 10)
+    assert await get_checkpoint_modified_after("import", uow=uow) == datetime(2024, 1, 1, 10)
+    assert await get_checkpoint_modified_after("import", modified_after=datetime(2024, 1, 1, 11), uow=uow) == datetime(2024, 1, 1, 11)
+
+
+async def get_saved_watermark(checkpoint_name: str) -> Optional[datetime]:
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        return await uow.import_checkpoints.get_watermark(checkpoint_name)
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_run_bulk_import_saves_watermark(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_gdrive_client.files = create_fake_gdrive_files(5)
+
+    watermark = await fake_importer.run_bulk_import(fake_gdrive_client, checkpoint_name="import")
+
+    assert watermark == max(gdrive_file.modified_date for gdrive_file in fake_gdrive_client.files)
+    assert await get_saved_watermark("import") == watermark
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_run_bulk_import_keeps_watermark_before_files_left_for_later(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_importer.chunk_sizer = ChunkSizer(3, 3, 3)
+    fake_gdrive_client.files = sorted(create_fake_gdrive_files(5), key=lambda gdrive_file: gdrive_file.name)
+    # Files are imported in the order of their names, so the file last by name is left for later, although it's been modified first.
+    fake_gdrive_client.files[-1].modified_date = min(gdrive_file.modified_date for gdrive_file in fake_gdrive_client.files) - timedelta(days=1)
+
+    watermark = await fake_importer.run_bulk_import(fake_gdrive_client, checkpoint_name="import")
+
+    assert watermark is None
+    assert await get_saved_watermark("import") is None
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_run_import_loop_imports_files_left_within_hour(
+    fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, monkeypatch: pytest.MonkeyPatch
+):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 40))
+    fake_importer.chunk_sizer = ChunkSizer(2, 2, 2)
+    fake_gdrive_client.files = sorted(create_fake_gdrive_files(3), key=lambda gdrive_file: gdrive_file.name)
+    for minute, gdrive_file in zip((10, 20, 30), fake_gdrive_client.files):
+        gdrive_file.modified_date = datetime(2024, 1, 1, 12, minute)
+    run_bulk_import = fake_importer.run_bulk_import
+    modified_afters = []
+
+    async def mock_run_bulk_import(gdrive_client: FakeGoogleDriveClient, modified_after: Optional[datetime] = None, **kwargs) -> datetime:
+        modified_afters.append(modified_after)
+        last_modified_date = await run_bulk_import(gdrive_client, modified_after=modified_after, **kwargs)
+        if len(modified_afters) == 2:
+            fake_importer.cancel_workers()
+        return last_modified_date
+
+    monkeypatch.setattr(fake_importer, Importer.create_gdrive_client.__name__, lambda: fake_gdrive_client)
+    monkeypatch.setattr(fake_importer, Importer.run_bulk_import.__name__, mock_run_bulk_import)
+
+    await fake_importer.run_import_loop()
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert modified_afters == [None, datetime(2024, 1, 1, 12, 20)]  # The next import lists from the exact watermark, not from 13:00.
+    assert fake_importer.clock.now() >= datetime(2024, 1, 1, 14)  # It waits for the files of the next hour, though.
+    assert len(collection_files) == 3
+    assert all(collection_file.imported for collection_file in collection_files)
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from fake_classes import FakeImporter, create_fake_gdrive_files
+from src.app.core.clock import VirtualClock
+from src.app.core.models.collection_file_change import CollectionFileChange
+from src.app.database.models import CollectionFileDB
+from src.app.database.unit_of_work import SqlModelUnitOfWork
+from src.app.importer.importer import (
+    claim_collection_files,
+    create_collection_files,
+    get_expired_lease_modified_after,
+    insert_new_collection_files,
+    update_database,
+)
+from src.app.importer.retry import RetryPolicy
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+async def insert_collection_files(count: int) -> list[CollectionFileDB]:
+    return await insert_new_collection_files(create_collection_files(create_fake_gdrive_files(count)))
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_claim_collection_files_skips_files_leased_by_others():
+    collection_files = await insert_collection_files(4)
+
+    claimed_by_first = await claim_collection_files(collection_files[:2], "first", NOW + timedelta(hours=1), NOW)
+    claimed_by_second = await claim_collection_files(collection_files, "second", NOW + timedelta(hours=1), NOW)
+    claimed_again_by_first = await claim_collection_files(collection_files[:2], "first", NOW + timedelta(hours=2), NOW)
+
+    assert [collection_file.collection_file_id for collection_file in claimed_by_first] == [file.collection_file_id for file in collection_files[:2]]
+    assert [collection_file.collection_file_id for collection_file in claimed_by_second] == [file.collection_file_id for file in collection_files[2:]]
+    assert len(claimed_again_by_first) == 2
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_claim_collection_files_reclaims_expired_leases():
+    collection_files = await insert_collection_files(2)
+    await claim_collection_files(collection_files, "crashed", NOW + timedelta(hours=1), NOW)
+
+    claimed_before_expiry = await claim_collection_files(collection_files, "other", NOW + timedelta(hours=1), NOW + timedelta(minutes=59))
+    claimed_after_expiry = await claim_collection_files(collection_files, "other", NOW + timedelta(hours=2), NOW + timedelta(hours=1))
+
+    assert claimed_before_expiry == []
+    assert len(claimed_after_expiry) == 2
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        lease_owners = {collection_file.lease_owner for collection_file in await uow.collection_files.list_files()}
+    assert lease_owners == {"other"}
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_claim_collection_files_skips_finished_files():
+    collection_files = await insert_collection_files(4)
+    await claim_collection_files(collection_files[:3], "first", NOW + timedelta(hours=1), NOW)
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=600, max_delay=3600)
+    await update_database(CollectionFileChange(collection_file_id=collection_files[0].collection_file_id, imported=True), 1, now=NOW)
+    await update_database(
+        CollectionFileChange(collection_file_id=collection_files[1].collection_file_id, error=True), 2, retry_policy=retry_policy, now=NOW
+    )
+    await update_database(CollectionFileChange(collection_file_id=collection_files[2].collection_file_id, error=True), 3, now=NOW)
+
+    claimed = await claim_collection_files(collection_files, "second", NOW + timedelta(hours=1), NOW)
+    claimed_once_retry_due = await claim_collection_files(collection_files, "second", NOW + timedelta(hours=2), NOW + timedelta(hours=1))
+
+    # Imported files & failed files, whose retry isn't due (yet), have been released, but mustn't be imported again.
+    assert [collection_file.collection_file_id for collection_file in claimed] == [collection_files[3].collection_file_id]
+    assert [collection_file.collection_file_id for collection_file in claimed_once_retry_due] == [
+        collection_files[1].collection_file_id,
+        collection_files[3].collection_file_id,
+    ]
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_get_expired_lease_modified_after():
+    collection_files = await insert_collection_files(3)
+    earliest_modified_date = min(collection_file.gdrive_modified_date for collection_file in collection_files)
+    latest_modified_date = max(collection_file.gdrive_modified_date for collection_file in collection_files)
+    await claim_collection_files(collection_files, "crashed", NOW + timedelta(hours=1), NOW)
+
+    assert await get_expired_lease_modified_after(latest_modified_date, NOW) == latest_modified_date
+    assert await get_expired_lease_modified_after(latest_modified_date, NOW + timedelta(hours=1)) == earliest_modified_date - timedelta(seconds=1)
+    assert await get_expired_lease_modified_after(None, NOW + timedelta(hours=1)) == earliest_modified_date - timedelta(seconds=1)
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_hold_leases_renews_leases(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(NOW)
+    fake_importer.config.lease_duration = 0.02
+    collection_files = await insert_collection_files(2)
+    await claim_collection_files(collection_files, "first", NOW + timedelta(seconds=0.02), NOW)
+
+    async with fake_importer.hold_leases("first"):
+        fake_importer.clock.advance(3600)  # The chunk takes longer than the lease duration.
+        await asyncio.sleep(0.05)
+
+    claimed_by_other = await claim_collection_files(collection_files, "other", NOW + timedelta(hours=2), fake_importer.clock.now())
+
+    assert claimed_by_other == []
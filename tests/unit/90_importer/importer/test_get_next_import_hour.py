@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from src.app.importer.importer import get_next_import_hour
+
+
+test_cases_get_next_import_hour = [
+    # import_hour, watermark, last_modified_date, now, expected
+    pytest.param(
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12, 5),
+        datetime(2024, 1, 1, 12, 6),
+        datetime(2024, 1, 1, 13),
+        id="imported",
+    ),
+    pytest.param(
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12, 10),
+        datetime(2024, 1, 1, 12, 20),
+        datetime(2024, 1, 1, 12, 40),
+        datetime(2024, 1, 1, 13),
+        id="partially_imported_hour",
+    ),
+    pytest.param(
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12, 6),
+        datetime(2024, 1, 1, 12),
+        id="nothing_within_hour",
+    ),
+    pytest.param(
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 1, 13, 1),
+        datetime(2024, 1, 1, 13),
+        id="nothing_after_hour",
+    ),
+    pytest.param(None, None, datetime(2024, 1, 1, 12, 5), datetime(2024, 1, 1, 12, 6), datetime(2024, 1, 1, 13), id="first_import"),
+    pytest.param(None, None, None, datetime(2024, 1, 1, 12, 6), datetime(2024, 1, 1, 13), id="nothing_listed"),
+]
+"""import_hour: Optional[datetime], watermark: Optional[datetime], last_modified_date: Optional[datetime], now: datetime, expected: datetime"""
+
+
+@pytest.mark.parametrize(["import_hour", "watermark", "last_modified_date", "now", "expected"], test_cases_get_next_import_hour)
+def test_get_next_import_hour(
+    import_hour: Optional[datetime], watermark: Optional[datetime], last_modified_date: Optional[datetime], now: datetime, expected: datetime
+):
+    assert get_next_import_hour(import_hour, watermark, last_modified_date, now) == expected
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pydrive2.files import ApiRequestError
+
+from fake_classes import FakeGoogleDriveClient, FakeImporter, create_fake_gdrive_files
+from src.app.core.clock import VirtualClock
+from src.app.database.unit_of_work import SqlModelUnitOfWork
+from src.app.importer.retry import GDRIVE_FILE_MISSING, list_due_retries
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test", "patch_sleep")
+async def test_retries_failed_files_once_due(
+    fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, api_request_error: ApiRequestError
+):
+    fake_importer.clock = VirtualClock(NOW)
+    broken_fake_gdrive_files = create_fake_gdrive_files(2, get_content_exception=api_request_error)
+    fake_gdrive_client.files = create_fake_gdrive_files(3) + broken_fake_gdrive_files
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+    for gdrive_file in broken_fake_gdrive_files:
+        gdrive_file.exception = None
+
+    assert await fake_importer.retry_failed_files(fake_gdrive_client) == 0
+    assert await list_due_retries(NOW + timedelta(seconds=fake_importer.config.retry_base_delay)) != []
+
+    fake_importer.clock.advance(fake_importer.config.retry_base_delay)
+    imported_count = await fake_importer.retry_failed_files(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert imported_count == 2
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert all(collection_file.next_attempt_at is None for collection_file in collection_files)
+    assert sorted(collection_file.attempt_count for collection_file in collection_files) == [0, 0, 0, 1, 1]
+    assert await list_due_retries(fake_importer.clock.now()) == []
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test", "patch_sleep")
+async def test_backs_off_files_missing_in_gdrive(
+    fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, api_request_error: ApiRequestError
+):
+    fake_importer.clock = VirtualClock(NOW)
+    fake_gdrive_client.files = create_fake_gdrive_files(1, get_content_exception=api_request_error)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+    fake_gdrive_client.files = []
+
+    fake_importer.clock.advance(fake_importer.config.retry_base_delay)
+    imported_count = await fake_importer.retry_failed_files(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_file = (await uow.collection_files.list_files())[0]
+
+    assert imported_count == 0
+    assert collection_file.attempt_count == 2
+    assert collection_file.last_error == GDRIVE_FILE_MISSING
+    assert collection_file.next_attempt_at == fake_importer.clock.now() + timedelta(seconds=fake_importer.config.retry_base_delay * 2)
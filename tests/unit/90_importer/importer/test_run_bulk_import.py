@@ -1,11 +1,25 @@
-from datetime import datetime
+import asyncio
+import pstats
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
 
 import pytest
+from pss_fleet_data.models.client_models import CollectionMetadata
 from pydrive2.files import ApiRequestError
 
-from fake_classes import FakeGoogleDriveClient, FakeImporter, create_fake_gdrive_files
+from fake_classes import FakeGoogleDriveClient, FakeImporter, FakePssFleetDataClient, create_fake_gdrive_files
+from src.app.core import utils
+from src.app.core.clock import VirtualClock
+from src.app.core.models.aimd_limiter import AimdLimiter
+from src.app.core.models.cancellation_token import CancellationToken
+from src.app.core.models.chunk_sizer import ChunkSizer
+from src.app.core.tracing import Span, Tracer
 from src.app.database.unit_of_work import SqlModelUnitOfWork
-from src.app.importer.importer import create_collection_files
+from src.app.importer import Importer, metrics, tracing
+from src.app.importer.importer import claim_collection_files, create_collection_files, get_instance_id, insert_new_collection_files
+from src.app.importer.journal import ImportJournal
+from src.app.models.queue_item import QueueItem, QueueItemState
 
 
 @pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
@@ -106,3 +120,207 @@ async def test_happy_path_with_files_not_downloaded_from_gdrive(
     assert len(collection_files) == create_n_ok_files + create_n_broken_files
     assert len([collection_file for collection_file in collection_files if collection_file.imported]) == create_n_ok_files
     assert len([collection_file for collection_file in collection_files if collection_file.error]) == create_n_broken_files
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_records_trace_spans(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, monkeypatch: pytest.MonkeyPatch):
+    class ListSpanExporter:
+        def __init__(self):
+            self.spans: list[Span] = []
+
+        def export(self, span: Span):
+            self.spans.append(span)
+
+    exporter = ListSpanExporter()
+    monkeypatch.setattr(tracing, "TRACER", Tracer(exporter))
+
+    create_n_files = 3
+    fake_gdrive_client.files = create_fake_gdrive_files(create_n_files)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    bulk_import_spans = [span for span in exporter.spans if span.name == tracing.SPAN_BULK_IMPORT]
+    queue_item_spans = [span for span in exporter.spans if span.name == tracing.SPAN_QUEUE_ITEM]
+
+    assert len(bulk_import_spans) == 1
+    assert len(queue_item_spans) == create_n_files
+    assert all(span.trace_id == bulk_import_spans[0].trace_id for span in exporter.spans)
+    assert all(span.parent_span_id == bulk_import_spans[0].span_id for span in queue_item_spans)
+    assert all(span.attributes["state"] == "imported" for span in queue_item_spans)
+
+    for queue_item_span in queue_item_spans:
+        child_span_names = {span.name for span in exporter.spans if span.parent_span_id == queue_item_span.span_id}
+        assert child_span_names == {
+            tracing.SPAN_DOWNLOAD_QUEUED,
+            tracing.SPAN_DOWNLOAD,
+            tracing.SPAN_VALIDATE,
+            tracing.SPAN_IMPORT,
+            tracing.SPAN_DB_UPDATE,
+        }
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_writes_profile(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, tmp_path: Path):
+    fake_importer.config.profile_bulk_imports = True
+    fake_importer.config.log_folder = str(tmp_path)
+    fake_gdrive_client.files = create_fake_gdrive_files(3)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    profile_file_paths = list(tmp_path.glob("*.prof"))
+    assert len(profile_file_paths) == 1
+    assert profile_file_paths[0].name.endswith("_3_files.prof")
+    assert pstats.Stats(str(profile_file_paths[0])).total_calls > 0
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test", "patch_sleep")
+async def test_saves_run_statistics(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, api_request_error: ApiRequestError):
+    create_n_ok_files = 4
+    create_n_broken_files = 1
+
+    ok_fake_gdrive_files = create_fake_gdrive_files(create_n_ok_files)
+    broken_fake_gdrive_files = create_fake_gdrive_files(create_n_broken_files, get_content_exception=api_request_error)
+    fake_gdrive_client.files = ok_fake_gdrive_files + broken_fake_gdrive_files
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    statistics = fake_importer.status.run_statistics
+    assert statistics.file_count == create_n_ok_files + create_n_broken_files
+    assert statistics.imported_count == create_n_ok_files
+    assert statistics.download_error_count == create_n_broken_files
+    assert statistics.bytes_imported == sum(gdrive_file.size for gdrive_file in ok_fake_gdrive_files)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        import_runs = await uow.import_runs.list_runs()
+
+    assert len(import_runs) == 1
+    assert import_runs[0].file_count == create_n_ok_files + create_n_broken_files
+    assert import_runs[0].imported_count == create_n_ok_files
+    assert import_runs[0].download_error_count == create_n_broken_files
+    assert import_runs[0].retry_count == statistics.retry_count > 0
+    assert import_runs[0].finished_at >= import_runs[0].started_at
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_skips_files_leased_by_other_instances(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_gdrive_client.files = create_fake_gdrive_files(6)
+    collection_files = await insert_new_collection_files(create_collection_files(fake_gdrive_client.files))
+    now = fake_importer.clock.now()
+    leased_collection_files = await claim_collection_files(collection_files[:3], "other-instance", now + timedelta(hours=1), now)
+
+    watermark = await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    leased_ids = {collection_file.collection_file_id for collection_file in leased_collection_files}
+    assert all(collection_file.imported is (collection_file.collection_file_id not in leased_ids) for collection_file in collection_files)
+    assert all(collection_file.lease_owner is None for collection_file in collection_files if collection_file.imported)
+    assert watermark == max(gdrive_file.modified_date for gdrive_file in fake_gdrive_client.files)
+
+    fake_importer.clock = VirtualClock(now + timedelta(hours=2))  # The other instance stopped & its leases expired.
+    await fake_importer.run_bulk_import(fake_gdrive_client, modified_after=utils.get_next_full_hour(watermark))
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert all(collection_file.lease_owner is None for collection_file in collection_files)
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_resumes_chunk_from_journal(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, tmp_path: Path):
+    fake_importer.config.journal_file_path = str(tmp_path / "journal.jsonl")
+    fake_gdrive_client.files = create_fake_gdrive_files(4)
+    collection_files = await insert_new_collection_files(create_collection_files(fake_gdrive_client.files))
+
+    # The app stopped after importing a file, but before recording it in the database.
+    imported_queue_item = QueueItem(1, fake_gdrive_client.files[0], collection_files[0].collection_file_id, tmp_path, CancellationToken())
+    imported_queue_item.status.transition(QueueItemState.IMPORTED)
+    ImportJournal(fake_importer.config.journal_file_path).record(imported_queue_item)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert len(fake_importer.fleet_data_client.collections) == 3
+    assert not Path(fake_importer.config.journal_file_path).exists()
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_restarted_instance_reclaims_its_leases(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, tmp_path: Path):
+    fake_importer.config.journal_file_path = str(tmp_path / "journal.jsonl")
+    fake_importer.config.instance_id = None  # The ID is kept next to the journal.
+    fake_gdrive_client.files = create_fake_gdrive_files(4)
+    collection_files = await insert_new_collection_files(create_collection_files(fake_gdrive_client.files))
+
+    # The app stopped mid-chunk, after importing a file, with the files of the chunk still leased for an hour.
+    instance_id = get_instance_id(fake_importer.config)
+    now = fake_importer.clock.now()
+    await claim_collection_files(collection_files, instance_id, now + timedelta(hours=1), now)
+    imported_queue_item = QueueItem(1, fake_gdrive_client.files[0], collection_files[0].collection_file_id, tmp_path, CancellationToken())
+    imported_queue_item.status.transition(QueueItemState.IMPORTED)
+    ImportJournal(fake_importer.config.journal_file_path).record(imported_queue_item)
+
+    restarted_importer = Importer(fake_importer.config, fake_importer.fleet_data_client)
+    watermark = await restarted_importer.run_bulk_import(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert get_instance_id(restarted_importer.config) == instance_id
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert all(collection_file.lease_owner is None for collection_file in collection_files)
+    assert len(fake_importer.fleet_data_client.collections) == 3
+    assert watermark == max(gdrive_file.modified_date for gdrive_file in fake_gdrive_client.files)
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_sizes_next_chunk_after_full_chunk(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    fake_importer.chunk_sizer = ChunkSizer(2, 1, 100, target_duration=3600.0)
+    fake_gdrive_client.files = create_fake_gdrive_files(5)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    assert fake_importer.chunk_sizer.size == 4
+    assert metrics.CHUNK_SIZE.get() == 4
+
+
+@pytest.mark.usefixtures("patch_get_config_return_fake", "reset_database_after_test")
+async def test_imports_files_concurrently(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, monkeypatch: pytest.MonkeyPatch):
+    fake_importer.upload_limiter = AimdLimiter(metrics.OPERATION_UPLOAD, 3, min_limit=3)
+    fake_gdrive_client.files = create_fake_gdrive_files(10)
+    upload_collection = fake_importer.fleet_data_client.upload_collection
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_upload_collection(file_path: Union[Path, str], api_key: Optional[str] = None) -> CollectionMetadata:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            return await upload_collection(file_path, api_key=api_key)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(fake_importer.fleet_data_client, FakePssFleetDataClient.upload_collection.__name__, mock_upload_collection)
+
+    await fake_importer.run_bulk_import(fake_gdrive_client)
+
+    uow = SqlModelUnitOfWork()
+    async with uow:
+        collection_files = await uow.collection_files.list_files()
+
+    assert len(collection_files) == 10
+    assert all(collection_file.imported for collection_file in collection_files)
+    assert len(fake_importer.fleet_data_client.collections) == 10
+    assert fake_importer.upload_limiter.in_flight == 0
+    assert max_in_flight == 3
@@ -0,0 +1,30 @@
+from httpx import ConnectError
+
+from fake_classes import FakeGoogleDriveClient, FakeImporter, FakePssFleetDataClient
+from src.app.importer import preflight
+
+
+async def test_all_steps_run(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient):
+    database_initialized = []
+
+    results = await fake_importer.run_preflight(fake_gdrive_client, initialize_database=lambda: database_initialized.append(True))
+
+    assert [result.name for result in results] == [preflight.STEP_GDRIVE, preflight.STEP_API_SERVER, preflight.STEP_DATABASE]
+    assert all(result.success for result in results)
+    assert fake_gdrive_client.initialized is True
+    assert database_initialized == [True]
+
+
+async def test_api_server_unreachable(fake_importer: FakeImporter, fake_gdrive_client: FakeGoogleDriveClient, monkeypatch):
+    async def mock_ping(*args):
+        raise ConnectError(None)
+
+    monkeypatch.setattr(fake_importer.fleet_data_client, FakePssFleetDataClient.ping.__name__, mock_ping)
+
+    results = await fake_importer.run_preflight(fake_gdrive_client, initialize_database=lambda: None)
+    results_by_name = {result.name: result for result in results}
+
+    assert results_by_name[preflight.STEP_API_SERVER].success is False
+    assert results_by_name[preflight.STEP_API_SERVER].error is None
+    assert results_by_name[preflight.STEP_GDRIVE].success is True
+    assert results_by_name[preflight.STEP_DATABASE].success is True
@@ -1,7 +1,10 @@
+from datetime import datetime, timedelta
+
 from fake_classes import FakeUnitOfWork
 from src.app.core.models.collection_file_change import CollectionFileChange
 from src.app.database.models import CollectionFileDB
 from src.app.importer.importer import update_database
+from src.app.importer.retry import RetryPolicy
 
 
 async def test_commits(collection_file_db: CollectionFileDB):
@@ -29,3 +32,40 @@ async def test_change_is_applied(collection_file_db: CollectionFileDB):
 
     assert (await uow.collection_files.get_by_id(collection_file_db.collection_file_id)).imported is False
     assert (await uow.collection_files.get_by_id(collection_file_db.collection_file_id)).error is True
+
+
+async def test_failure_schedules_retry(collection_file_db: CollectionFileDB):
+    uow = FakeUnitOfWork()
+    uow.collection_files.add(collection_file_db)
+    retry_policy = RetryPolicy(max_attempts=2, base_delay=600, max_delay=3600)
+    now = datetime(2024, 1, 1, 12)
+
+    change = CollectionFileChange(collection_file_id=collection_file_db.collection_file_id, error=True, last_error="DOWNLOAD_ERROR")
+    await update_database(change, 1, uow, retry_policy=retry_policy, now=now)
+
+    collection_file = await uow.collection_files.get_by_id(collection_file_db.collection_file_id)
+    assert collection_file.attempt_count == 1
+    assert collection_file.last_error == "DOWNLOAD_ERROR"
+    assert collection_file.next_attempt_at == now + timedelta(minutes=10)
+
+    change = CollectionFileChange(collection_file_id=collection_file_db.collection_file_id, error=True, last_error="IMPORT_ERROR")
+    await update_database(change, 1, uow, retry_policy=retry_policy, now=now)
+
+    collection_file = await uow.collection_files.get_by_id(collection_file_db.collection_file_id)
+    assert collection_file.attempt_count == 2
+    assert collection_file.last_error == "IMPORT_ERROR"
+    assert collection_file.next_attempt_at is None
+
+
+async def test_success_clears_retry(collection_file_db: CollectionFileDB):
+    uow = FakeUnitOfWork()
+    collection_file_db.error = True
+    collection_file_db.next_attempt_at = datetime(2024, 1, 1, 12)
+    uow.collection_files.add(collection_file_db)
+
+    change = CollectionFileChange(collection_file_id=collection_file_db.collection_file_id, imported=True, error=False)
+    await update_database(change, 1, uow)
+
+    collection_file = await uow.collection_files.get_by_id(collection_file_db.collection_file_id)
+    assert collection_file.error is False
+    assert collection_file.next_attempt_at is None
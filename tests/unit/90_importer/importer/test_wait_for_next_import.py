@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from src.app.core.clock import VirtualClock
+from src.app.importer.importer import wait_for_next_import
+
+
+async def test_wait_for_next_import():
+    clock = VirtualClock(datetime(2024, 1, 1, 12, 30))
+
+    await wait_for_next_import(clock)
+
+    assert clock.now() == datetime(2024, 1, 1, 13, 1)
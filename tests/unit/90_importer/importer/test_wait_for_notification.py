@@ -0,0 +1,84 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from src.app.core.clock import VirtualClock
+from src.app.importer import Importer
+from tests.fake_classes import FakeImporter
+
+
+class FakePushNotifications:
+    def __init__(self, notified: bool):
+        self.notified: bool = notified
+        self.renewed: bool = False
+        self.waited_seconds: Optional[float] = None
+
+    async def renew_if_expiring(self):
+        self.renewed = True
+
+    async def wait(self, seconds: float) -> bool:
+        self.waited_seconds = seconds
+        return self.notified
+
+
+async def test_wait_for_notification_notified(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 30))
+    push_notifications = FakePushNotifications(notified=True)
+
+    result = await fake_importer.wait_for_notification(push_notifications)
+
+    assert result is True
+    assert push_notifications.renewed is True
+
+
+async def test_wait_for_notification_waits_until_next_import(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 30))
+    push_notifications = FakePushNotifications(notified=False)
+
+    result = await fake_importer.wait_for_notification(push_notifications)
+
+    assert result is False
+    assert push_notifications.waited_seconds == 31 * 60  # Until 13:01, when the regular import runs.
+
+
+async def test_start_push_notifications_disabled(fake_importer: FakeImporter):
+    fake_importer.config.push_webhook_url = None
+
+    assert await fake_importer.start_push_notifications() is None
+
+
+async def test_wait_for_next_run_prefers_notifications(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 30))
+    fake_importer.config.watch_mode = True
+    push_notifications = FakePushNotifications(notified=True)
+
+    result = await fake_importer.wait_for_next_run(datetime(2024, 1, 1, 12), push_notifications)
+
+    assert result is True
+    assert push_notifications.waited_seconds is not None
+
+
+async def test_wait_for_next_run_reuses_watch_client(fake_importer: FakeImporter, monkeypatch: pytest.MonkeyPatch):
+    fake_importer.config.watch_mode = True
+    created_in_threads = []
+    watched_with = []
+
+    def mock_create_gdrive_client() -> object:
+        created_in_threads.append(threading.current_thread())
+        return object()
+
+    async def mock_watch_for_next_file(gdrive_client: object, watermark: datetime) -> bool:
+        watched_with.append(gdrive_client)
+        return True
+
+    monkeypatch.setattr(fake_importer, Importer.create_gdrive_client.__name__, mock_create_gdrive_client)
+    monkeypatch.setattr(fake_importer, Importer.watch_for_next_file.__name__, mock_watch_for_next_file)
+
+    assert await fake_importer.wait_for_next_run(datetime(2024, 1, 1, 12)) is True
+    assert await fake_importer.wait_for_next_run(datetime(2024, 1, 1, 13)) is True
+
+    assert len(created_in_threads) == 1
+    assert created_in_threads[0] is not threading.main_thread()  # Authenticating doesn't block the event loop.
+    assert watched_with[0] is watched_with[1]
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from src.app.core.clock import VirtualClock
+from tests.fake_classes import FakeGDriveFile, FakeGoogleDriveClient, FakeImporter
+
+
+class ArrivingGoogleDriveClient(FakeGoogleDriveClient):
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock: VirtualClock = clock
+        self.list_count: int = 0
+
+    def list_files_by_name_prefix(self, prefix: str):
+        self.list_count += 1
+        return (gdrive_file for gdrive_file in super().list_files_by_name_prefix(prefix) if gdrive_file.modified_date <= self.clock.now())
+
+
+def create_gdrive_client(clock: VirtualClock, arrives_at: datetime) -> ArrivingGoogleDriveClient:
+    gdrive_client = ArrivingGoogleDriveClient(clock)
+    gdrive_client.files = [FakeGDriveFile("file-id", "pss-top-100_20240101-130000.json", 2, arrives_at, "{}")]
+    return gdrive_client
+
+
+async def test_watch_for_next_file_waits_and_backs_off(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 12, 10))
+    fake_importer.config.watch_poll_interval = 30
+    fake_importer.config.watch_max_poll_interval = 60
+    gdrive_client = create_gdrive_client(fake_importer.clock, datetime(2024, 1, 1, 13, 2))
+
+    result = await fake_importer.watch_for_next_file(gdrive_client, datetime(2024, 1, 1, 13))
+
+    assert result is True
+    assert fake_importer.clock.now() == datetime(2024, 1, 1, 13, 2, 30)  # Polled at 13:00:00, 13:00:30, 13:01:30 & 13:02:30
+    assert gdrive_client.list_count == 4
+
+
+async def test_watch_for_next_file_gives_up_after_the_hour(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 13))
+    gdrive_client = create_gdrive_client(fake_importer.clock, datetime(2024, 1, 1, 15))
+
+    result = await fake_importer.watch_for_next_file(gdrive_client, datetime(2024, 1, 1, 13))
+
+    assert result is True
+    assert fake_importer.clock.now() == datetime(2024, 1, 1, 14)
+
+
+async def test_watch_for_next_file_cancelled(fake_importer: FakeImporter):
+    fake_importer.clock = VirtualClock(datetime(2024, 1, 1, 13))
+    fake_importer.cancel_workers()
+    gdrive_client = create_gdrive_client(fake_importer.clock, datetime(2024, 1, 1, 13) + timedelta(minutes=5))
+
+    result = await fake_importer.watch_for_next_file(gdrive_client, datetime(2024, 1, 1, 13))
+
+    assert result is False
+    assert gdrive_client.list_count == 0
@@ -1,3 +1,4 @@
+import httpx
 import pytest
 from pydrive2.files import ApiRequestError, FileNotDownloadableError
 
@@ -8,3 +9,11 @@ test_cases_raised_error_caught = [
     pytest.param(FileNotDownloadableError, id="file_not_downloadable_error"),
 ]
 """exception_type: type[Exception]"""
+
+
+test_cases_transport_error = [
+    # transport_error
+    pytest.param(httpx.ConnectError("Connection refused"), id="connect_error"),
+    pytest.param(httpx.ReadTimeout("Timed out"), id="read_timeout"),
+]
+"""transport_error: Exception"""
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from fake_classes import FakeFileSystem, create_fake_gdrive_files
+from src.app.core.models.cancellation_token import CancellationToken
+from src.app.importer.journal import ImportJournal, JournalEntry, restore_queue_items
+from src.app.models.queue_item import QueueItem, QueueItemState
+
+
+JOURNAL_FILE_PATH = Path("downloads/journal.jsonl")
+
+
+def create_queue_items(count: int) -> list[QueueItem]:
+    return [
+        QueueItem(item_no, gdrive_file, item_no, "downloads", CancellationToken())
+        for item_no, gdrive_file in enumerate(create_fake_gdrive_files(count), 1)
+    ]
+
+
+def test_replay_returns_latest_entry_per_file(filesystem: FakeFileSystem):
+    queue_items = create_queue_items(2)
+    journal = ImportJournal(JOURNAL_FILE_PATH, filesystem=filesystem)
+
+    journal.record_downloaded(queue_items[0])
+    journal.record_downloaded(queue_items[1])
+    queue_items[0].status.transition(QueueItemState.IMPORTED)
+    journal.record(queue_items[0])
+
+    assert journal.replay() == {
+        queue_items[0].gdrive_file.id: JournalEntry(queue_items[0].gdrive_file.id, QueueItemState.IMPORTED),
+        queue_items[1].gdrive_file.id: JournalEntry(queue_items[1].gdrive_file.id, QueueItemState.DOWNLOADED),
+    }
+
+
+def test_replay_skips_line_cut_short(filesystem: FakeFileSystem):
+    queue_item = create_queue_items(1)[0]
+    journal = ImportJournal(JOURNAL_FILE_PATH, filesystem=filesystem)
+
+    journal.record_downloaded(queue_item)
+    filesystem.write(JOURNAL_FILE_PATH, '{"gdrive_file_id":"abc","sta', "a")
+
+    assert list(journal.replay().keys()) == [queue_item.gdrive_file.id]
+
+
+def test_compact_drops_entries_and_deletes_empty_journal(filesystem: FakeFileSystem):
+    queue_items = create_queue_items(2)
+    journal = ImportJournal(JOURNAL_FILE_PATH, filesystem=filesystem)
+    for queue_item in queue_items:
+        journal.record_downloaded(queue_item)
+
+    journal.compact([queue_items[0].gdrive_file.id])
+    assert list(journal.replay().keys()) == [queue_items[1].gdrive_file.id]
+
+    journal.compact([queue_items[1].gdrive_file.id])
+    assert filesystem.exists(JOURNAL_FILE_PATH) is False
+
+
+def test_restore_queue_items(filesystem: FakeFileSystem):
+    imported, downloaded, downloaded_but_deleted, failed, unknown = create_queue_items(5)
+    filesystem.write(downloaded.target_file_path, downloaded.gdrive_file.content)
+    entries = {
+        queue_item.gdrive_file.id: JournalEntry(queue_item.gdrive_file.id, state)
+        for queue_item, state in [
+            (imported, QueueItemState.IMPORTED),
+            (downloaded, QueueItemState.DOWNLOADED),
+            (downloaded_but_deleted, QueueItemState.DOWNLOADED),
+            (failed, QueueItemState.FAILED),
+        ]
+    }
+
+    result = restore_queue_items([imported, downloaded, downloaded_but_deleted, failed, unknown], entries, filesystem=filesystem)
+
+    assert result == (1, 1)
+    assert imported.status.state == QueueItemState.IMPORTED
+    assert downloaded.status.state == QueueItemState.DOWNLOADED
+    assert downloaded_but_deleted.status.state == QueueItemState.QUEUED
+    assert failed.status.state == QueueItemState.QUEUED
+    assert unknown.status.state == QueueItemState.QUEUED
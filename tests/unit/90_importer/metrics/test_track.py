@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from src.app.core import utils
+from src.app.core.clock import VirtualClock
+from src.app.core.models.aimd_limiter import AimdLimiter
+from src.app.core.models.circuit_breaker import CircuitBreaker
+from src.app.importer import metrics
+from src.app.models import QueueItem, QueueItemFailure, QueueItemState, RunStatistics
+
+
+def test_track_run_statistics(queue_item: QueueItem):
+    statistics = RunStatistics()
+    queue_item.status.statistics = statistics
+    statistics.add_files(1)
+    metrics.track_run_statistics(statistics)
+
+    assert 'pss_fleet_data_importer_queue_items{state="queued"} 1' in metrics.REGISTRY.render()
+
+    queue_item.status.transition(QueueItemState.DOWNLOADING)
+    queue_item.status.fail(QueueItemFailure.DOWNLOAD_ERROR)
+    rendered = metrics.REGISTRY.render()
+
+    assert 'pss_fleet_data_importer_queue_items{state="queued"} 0' in rendered
+    assert 'pss_fleet_data_importer_queue_items{state="failed"} 1' in rendered
+
+    metrics.track_run_statistics(None)
+    assert "pss_fleet_data_importer_queue_items{" not in metrics.REGISTRY.render()
+
+
+def test_track_watermark():
+    metrics.track_watermark(utils.get_now() - timedelta(hours=2))
+
+    samples = get_samples("pss_fleet_data_importer_watermark_lag_seconds ")
+
+    assert len(samples) == 1
+    assert 7200 <= float(samples[0].split()[1]) < 7260
+
+    metrics.track_watermark(None)
+    assert not get_samples("pss_fleet_data_importer_watermark_lag_seconds ")
+
+
+def test_track_watermark_with_clock():
+    clock = VirtualClock(datetime(2024, 1, 1, 3))
+    metrics.track_watermark(datetime(2024, 1, 1), clock=clock)
+
+    assert get_samples("pss_fleet_data_importer_watermark_lag_seconds ") == ["pss_fleet_data_importer_watermark_lag_seconds 10800.0"]
+
+    clock.advance(60)
+    assert get_samples("pss_fleet_data_importer_watermark_lag_seconds ") == ["pss_fleet_data_importer_watermark_lag_seconds 10860.0"]
+
+    metrics.track_watermark(None)
+
+
+def test_track_concurrency_limits():
+    download_limiter = AimdLimiter(metrics.OPERATION_DOWNLOAD, 4, max_limit=8)
+    metrics.track_concurrency_limits([download_limiter, AimdLimiter(metrics.OPERATION_UPLOAD, 1)])
+
+    assert get_samples("pss_fleet_data_importer_concurrency_limit{") == [
+        'pss_fleet_data_importer_concurrency_limit{operation="download"} 4',
+        'pss_fleet_data_importer_concurrency_limit{operation="upload"} 1',
+    ]
+
+    download_limiter.record_overload("throttling")
+    assert 'pss_fleet_data_importer_concurrency_limit{operation="download"} 2' in metrics.REGISTRY.render()
+
+
+def test_track_circuit_breaker():
+    circuit_breaker = CircuitBreaker("PSS Fleet Data API", failure_threshold=1)
+    metrics.track_circuit_breaker(circuit_breaker)
+    assert get_samples("pss_fleet_data_importer_api_circuit_open ") == ["pss_fleet_data_importer_api_circuit_open 0"]
+
+    circuit_breaker.record_failure()
+    assert get_samples("pss_fleet_data_importer_api_circuit_open ") == ["pss_fleet_data_importer_api_circuit_open 1"]
+
+
+def get_samples(prefix: str) -> list[str]:
+    return [line for line in metrics.REGISTRY.render().splitlines() if line.startswith(prefix)]
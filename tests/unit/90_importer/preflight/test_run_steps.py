@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from src.app.importer.preflight import run_steps
+
+
+async def test_all_steps_succeed():
+    async def step_returns_none():
+        return None
+
+    async def step_returns_true():
+        return True
+
+    results = await run_steps({"none": step_returns_none, "true": step_returns_true})
+
+    assert [result.name for result in results] == ["none", "true"]
+    assert all(result.success for result in results)
+    assert all(result.error is None for result in results)
+    assert all(result.duration >= 0 for result in results)
+
+
+async def test_step_returning_false_fails():
+    async def step_returns_false():
+        return False
+
+    results = await run_steps({"false": step_returns_false})
+
+    assert results[0].success is False
+    assert results[0].error is None
+
+
+async def test_step_raising_error_fails_without_cancelling_others():
+    error = ValueError("broken")
+    finished = []
+
+    async def step_raises():
+        raise error
+
+    async def step_slow():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    results = await run_steps({"raises": step_raises, "slow": step_slow})
+
+    assert results[0].success is False
+    assert results[0].error is error
+    assert results[1].success is True
+    assert finished == [True]
+
+
+async def test_steps_run_concurrently():
+    step_count = 3
+    sleep_for = 0.2
+
+    async def step_sleeps():
+        await asyncio.to_thread(time.sleep, sleep_for)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await run_steps({str(i): step_sleeps for i in range(step_count)})
+    duration = loop.time() - start
+
+    assert all(result.success for result in results)
+    assert duration < sleep_for * step_count
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import pytest
+
+from src.app.importer.progress import ProgressReporter
+from src.app.models import QueueItemState, RunStatistics
+
+
+def test_no_progress_without_run():
+    assert ProgressReporter(60).get_progress() is None
+
+
+async def test_rates_and_eta():
+    reporter = ProgressReporter(60, smoothing=0.5)
+    statistics = RunStatistics()
+    statistics.listed_file_count = 100
+    statistics.add_files(10)
+
+    with reporter.track(statistics):
+        reporter.get_progress(now=0.0)
+        import_files(statistics, 2, size=1000)
+        progress_1 = reporter.get_progress(now=1.0)
+        import_files(statistics, 4, size=1000)
+        progress_2 = reporter.get_progress(now=2.0)
+
+    assert progress_1.chunk_done_count == 2
+    assert progress_1.files_per_second == 2.0
+    assert progress_1.eta == timedelta(seconds=49)
+
+    assert progress_2.chunk_done_count == 6
+    assert progress_2.chunk_bytes_imported == 6000
+    assert progress_2.files_per_second == 3.0  # 0.5 * 4 + 0.5 * 2
+    assert progress_2.import_bytes_per_second == 3000.0
+    assert progress_2.remaining_count == 94
+    assert reporter.get_progress() is None
+
+
+async def test_overall_progress_spans_runs():
+    reporter = ProgressReporter(60)
+
+    first_statistics = RunStatistics()
+    first_statistics.add_files(3)
+    with reporter.track(first_statistics):
+        import_files(first_statistics, 3, size=10)
+
+    second_statistics = RunStatistics()
+    second_statistics.add_files(2)
+    with reporter.track(second_statistics):
+        import_files(second_statistics, 1, size=10)
+        progress = reporter.get_progress()
+
+    assert progress.chunk_done_count == 1
+    assert progress.total_done_count == 4
+    assert progress.total_bytes_imported == 40
+
+
+async def test_reports_periodically(caplog: pytest.LogCaptureFixture):
+    reporter = ProgressReporter(0.01)
+    statistics = RunStatistics()
+    statistics.add_files(1)
+
+    with caplog.at_level(logging.INFO), reporter.track(statistics):
+        await asyncio.sleep(0.05)
+
+    assert any(record.getMessage().startswith("Progress: ") for record in caplog.records)
+
+
+def import_files(statistics: RunStatistics, count: int, size: int):
+    for _ in range(count):
+        statistics.record_transition(QueueItemState.QUEUED, QueueItemState.IMPORTED, 0.0, size)
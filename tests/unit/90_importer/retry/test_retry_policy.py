@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from src.app.importer.retry import RetryPolicy
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+test_cases_get_next_attempt_at = [
+    # attempt_count, expected
+    pytest.param(1, NOW + timedelta(minutes=10), id="first_retry"),
+    pytest.param(2, NOW + timedelta(minutes=20), id="second_retry"),
+    pytest.param(3, NOW + timedelta(minutes=40), id="third_retry"),
+    pytest.param(4, NOW + timedelta(hours=1), id="max_delay"),
+    pytest.param(5, None, id="out_of_attempts"),
+]
+"""attempt_count: int, expected: Optional[datetime]"""
+
+
+@pytest.mark.parametrize(["attempt_count", "expected"], test_cases_get_next_attempt_at)
+def test_get_next_attempt_at(attempt_count: int, expected: Optional[datetime]):
+    retry_policy = RetryPolicy(max_attempts=5, base_delay=600, max_delay=3600)
+    assert retry_policy.get_next_attempt_at(attempt_count, NOW) == expected
+
+
+def test_single_attempt_disables_retries():
+    retry_policy = RetryPolicy(max_attempts=1, base_delay=600, max_delay=3600)
+
+    assert retry_policy.enabled is False
+    assert retry_policy.get_next_attempt_at(1, NOW) is None
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.pipeline import MODE_BULK, MODE_LOOP, BenchmarkOptions, create_corpus, percentile, run_benchmark
+from src.app.core import utils
+
+
+test_cases_percentile = [
+    # values, p, expected
+    pytest.param([], 50, 0.0, id="empty"),
+    pytest.param([3.0], 99, 3.0, id="single"),
+    pytest.param([4.0, 1.0, 3.0, 2.0], 50, 2.0, id="p50"),
+    pytest.param([float(value) for value in range(1, 101)], 99, 99.0, id="p99"),
+]
+"""values: list[float], p: float, expected: float"""
+
+
+def test_create_corpus():
+    corpus = create_corpus(3, 1000)
+
+    assert [gdrive_file.size for gdrive_file in corpus] == [1000, 1000, 1000]
+    assert [utils.extract_timestamp_from_gdrive_file_name(gdrive_file.name).hour for gdrive_file in corpus] == [0, 1, 2]
+    assert all(json.loads(gdrive_file.content)["meta"] for gdrive_file in corpus)
+
+
+@pytest.mark.parametrize(["values", "p", "expected"], test_cases_percentile)
+def test_percentile(values: list[float], p: float, expected: float):
+    assert percentile(values, p) == expected
+
+
+@pytest.mark.parametrize("mode", [MODE_BULK, MODE_LOOP])
+async def test_run_benchmark(mode: str, tmp_path: Path):
+    options = BenchmarkOptions(mode=mode, file_count=5, file_size=500, chunk_size=2)
+
+    report = await run_benchmark(options, tmp_path)
+
+    assert report.imported_count == 5
+    assert report.failed_count == 0
+    assert report.bytes_imported == 2500
+    assert report.files_per_second > 0
+    assert report.item_latency_seconds.p50 <= report.item_latency_seconds.p99 <= report.item_latency_seconds.max
@@ -0,0 +1,74 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from benchmarks.pipeline import MODE_BULK, MODE_LOOP, create_corpus
+from benchmarks.replay import RecordedFile, Recording, ReplayOptions, TimingProfile, read_timings, record, run_replay
+from src.app.core.tracing import JsonLinesSpanExporter, Tracer
+from src.app.importer import tracing
+from tests.fake_classes import FakeGoogleDriveClient
+
+
+@pytest.fixture(scope="function")
+def recording() -> Recording:
+    files = tuple(
+        RecordedFile(gdrive_file.name, gdrive_file.size, gdrive_file.modified_date, download_seconds, 0.5)
+        for gdrive_file, download_seconds in zip(create_corpus(4, 500), [0.1, None, 0.3, None], strict=True)
+    )
+    return Recording(datetime(2024, 1, 1), files)
+
+
+def test_recording_save_and_load(recording: Recording, tmp_path: Path):
+    file_path = tmp_path / "recording.json.gz"
+
+    recording.save(file_path)
+
+    assert Recording.load(file_path) == recording
+
+
+def test_recording_between(recording: Recording):
+    result = recording.between(recording.files[0].modified_date, recording.files[3].modified_date)
+
+    assert result.files == recording.files[1:3]
+
+
+def test_record_drops_ids_and_reads_timings(tmp_path: Path):
+    gdrive_client = FakeGoogleDriveClient()
+    gdrive_client.files = create_corpus(2, 500)
+    trace_file_path = tmp_path / "traces.jsonl"
+    tracer = Tracer(JsonLinesSpanExporter(trace_file_path))
+
+    queue_item_span = tracer.start_span(tracing.SPAN_QUEUE_ITEM, attributes={"gdrive_file.name": gdrive_client.files[0].name})
+    download_span = tracer.start_span(tracing.SPAN_DOWNLOAD, parent=queue_item_span)
+    for start_time_ns in (1_000_000_000, 5_000_000_000):  # Two attempts of 2 seconds each
+        tracer.record_span(tracing.SPAN_DOWNLOAD_FETCH, start_time_ns, start_time_ns + 2_000_000_000, parent=download_span)
+    tracer.record_span(tracing.SPAN_IMPORT, 8_000_000_000, 8_500_000_000, parent=queue_item_span)
+    tracer.end_span(download_span)
+    tracer.end_span(queue_item_span)
+
+    result = record(gdrive_client, trace_file_path)
+
+    assert [file.name for file in result.files] == [gdrive_file.name for gdrive_file in gdrive_client.files]
+    assert (result.files[0].download_seconds, result.files[0].import_seconds) == (4.0, 0.5)
+    assert (result.files[1].download_seconds, result.files[1].import_seconds) == (None, None)
+    assert read_timings(trace_file_path) == ({gdrive_client.files[0].name: 4.0}, {gdrive_client.files[0].name: 0.5})
+
+
+def test_timing_profile():
+    timing_profile = TimingProfile({"a": 1.0, "b": None, "c": 3.0}, time_scale=0.5)
+
+    assert timing_profile.get_seconds("a") == 0.5
+    assert timing_profile.get_seconds("b") in (0.5, 1.5)
+    assert TimingProfile({"a": None}).get_seconds("a") == 0.0
+
+
+@pytest.mark.parametrize("mode", [MODE_BULK, MODE_LOOP])
+async def test_run_replay(mode: str, recording: Recording, tmp_path: Path):
+    options = ReplayOptions("recording.json.gz", len(recording.files), mode=mode, chunk_size=2, time_scale=0.0)
+
+    report = await run_replay(recording, options, tmp_path)
+
+    assert report.imported_count == 4
+    assert report.failed_count == 0
+    assert report.options == options
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from benchmarks.soak import SoakOptions, run_soak
+
+
+async def test_run_soak(tmp_path: Path):
+    options = SoakOptions(days=1, file_size=500)
+
+    report = await run_soak(options, tmp_path)
+
+    assert report.imported_count == 24
+    assert report.virtual_duration_seconds >= 24 * 3600
+    assert report.cycle_count > 1
+    assert 0 < report.arrival_to_import_seconds.p50 <= report.arrival_to_import_seconds.max
+
+
+async def test_run_soak_watch_mode(tmp_path: Path):
+    options = SoakOptions(days=1, file_size=500, watch=True)
+
+    report = await run_soak(options, tmp_path)
+
+    assert report.imported_count == 24
+    assert report.arrival_to_import_seconds.max < 60
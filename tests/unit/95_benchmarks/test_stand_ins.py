@@ -0,0 +1,199 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pydrive2.files
+import pytest
+from pss_fleet_data import PssFleetDataClient
+from pss_fleet_data.core.exceptions import ConflictError, NonUniqueTimestampError, TooManyRequestsError
+
+from benchmarks.pipeline import MODE_BULK, TRANSPORT_HTTP, BenchmarkOptions, create_collection_content, run_benchmark
+from benchmarks.stand_ins import (
+    FAULT_CONFLICT,
+    FAULT_ERROR,
+    FAULT_THROTTLE,
+    ConstantLatency,
+    DriveFile,
+    DriveStandIn,
+    ExponentialLatency,
+    FaultInjector,
+    FaultProfile,
+    FleetDataApiStandIn,
+    LogNormalLatency,
+    UniformLatency,
+    create_private_key,
+    parse_latency,
+)
+from src.app.core.gdrive import GDriveFile, GoogleDriveClient
+from src.app.importer.push import PushNotifications
+
+
+test_cases_parse_latency = [
+    # value, expected
+    pytest.param("0.05", ConstantLatency(0.05), id="constant"),
+    pytest.param("uniform:0.01,0.1", UniformLatency(0.01, 0.1), id="uniform"),
+    pytest.param("exponential:0.05", ExponentialLatency(0.05), id="exponential"),
+    pytest.param("lognormal:0.05,0.8", LogNormalLatency(0.05, 0.8), id="lognormal"),
+]
+"""value: str, expected: LatencyDistribution"""
+
+
+@pytest.fixture(scope="module")
+def private_key() -> str:
+    return create_private_key()
+
+
+@pytest.fixture(scope="function")
+def drive_files() -> list[DriveFile]:
+    timestamps = [datetime(2020, 1, 1, hour, tzinfo=timezone.utc) for hour in range(3)]
+    return [
+        DriveFile(f"file-{i}", timestamp.strftime("pss-top-100_%Y%m%d-%H%M%S.json"), create_collection_content(timestamp, 1000).encode(), timestamp)
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+
+def create_gdrive_client(api_endpoint: str, private_key: str, tmp_path: Path) -> GoogleDriveClient:
+    gdrive_client = GoogleDriveClient(
+        "project",
+        "private_key_id",
+        private_key,
+        "client@project.iam.gserviceaccount.com",
+        "client_id",
+        ["https://www.googleapis.com/auth/drive"],
+        "folder_id",
+        str(tmp_path / "service_account.json"),
+        str(tmp_path / "settings.yaml"),
+        api_endpoint=api_endpoint,
+    )
+    gdrive_client.initialize()
+    return gdrive_client
+
+
+@pytest.mark.parametrize(["value", "expected"], test_cases_parse_latency)
+def test_parse_latency(value: str, expected):
+    assert parse_latency(value) == expected
+
+
+def test_parse_latency_unknown_distribution():
+    with pytest.raises(ValueError):
+        parse_latency("normal:0.05")
+
+
+def test_fault_injector_rates():
+    faults = FaultInjector(FaultProfile(throttle_rate=0.2, error_rate=0.3, conflict_rate=0.5), seed=0)
+
+    results = [faults.get_fault() for _ in range(10_000)]
+
+    assert FAULT_CONFLICT not in results
+    assert 0.17 < results.count(FAULT_THROTTLE) / len(results) < 0.23
+    assert 0.27 < results.count(FAULT_ERROR) / len(results) < 0.33
+
+
+def test_fault_injector_seed_is_deterministic():
+    profile = FaultProfile(latency=LogNormalLatency(0.05, 0.8), error_rate=0.5)
+    faults_1 = FaultInjector(profile, seed=42)
+    faults_2 = FaultInjector(profile, seed=42)
+
+    assert [(faults_1.get_delay(), faults_1.get_fault()) for _ in range(100)] == [(faults_2.get_delay(), faults_2.get_fault()) for _ in range(100)]
+
+
+def test_drive_stand_in_list_and_download(drive_files: list[DriveFile], private_key: str, tmp_path: Path):
+    with DriveStandIn(drive_files) as drive:
+        gdrive_client = create_gdrive_client(drive.url, private_key, tmp_path)
+
+        gdrive_files = list(gdrive_client.list_files_by_modified_date(modified_after=datetime(2020, 1, 1, 0, 30, tzinfo=timezone.utc)))
+        content = gdrive_client.get_file_content_string(gdrive_files[0])
+        gdrive_files_by_name = list(gdrive_client.list_files_by_name_prefix("pss-top-100_20200101-02"))
+
+    assert [gdrive_file.id for gdrive_file in gdrive_files] == ["file-1", "file-2"]
+    assert gdrive_files[0].size == len(drive_files[1].content)
+    assert gdrive_files[0].md5_checksum == drive_files[1].md5_checksum
+    assert content.encode() == drive_files[1].content
+    assert [gdrive_file.id for gdrive_file in gdrive_files_by_name] == ["file-2"]
+
+
+def test_drive_stand_in_throttles(drive_files: list[DriveFile], private_key: str, tmp_path: Path):
+    with DriveStandIn(drive_files) as drive:
+        gdrive_client = create_gdrive_client(drive.url, private_key, tmp_path)
+        drive.faults = FaultInjector(FaultProfile(throttle_rate=1.0))
+
+        with pytest.raises(pydrive2.files.ApiRequestError) as exc_info:
+            gdrive_client.get_file_content_string(GDriveFile(drive_files[0].file_id, drive_files[0].name, 1000, None, drive_files[0].modified_date))
+
+    assert exc_info.value.error["code"] == 429
+    assert drive.fault_counts[FAULT_THROTTLE] >= 1
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_drive_stand_in_watch_and_notify(drive_files: list[DriveFile], private_key: str, tmp_path: Path):
+    port = get_free_port()
+    push_notifications = PushNotifications(f"http://127.0.0.1:{port}/", port, 3600, host="127.0.0.1")
+
+    with DriveStandIn(drive_files) as drive:
+        gdrive_client = create_gdrive_client(drive.url, private_key, tmp_path)
+        await push_notifications.start(gdrive_client)
+        try:
+            channel = push_notifications.channel
+            assert [watch_channel.channel_id for watch_channel in drive.channels] == [channel.id]
+            assert channel.resource_id == "resource-folder_id"
+            assert timedelta(minutes=59) < channel.expiration - datetime.now(timezone.utc).replace(tzinfo=None) <= timedelta(hours=1)
+            assert await push_notifications.wait(0.01) is False
+
+            status_codes = await asyncio.to_thread(drive.notify_channels)
+            notified = await push_notifications.wait(5)
+        finally:
+            await push_notifications.stop()
+
+        assert status_codes == [200]
+        assert notified is True
+        assert drive.channels == []
+
+
+async def test_fleet_data_api_stand_in_upload_and_update(tmp_path: Path):
+    file_path = tmp_path / "collection.json"
+    file_path.write_text(create_collection_content(datetime(2020, 1, 1), 1000))
+
+    with FleetDataApiStandIn() as fleet_data_api:
+        client = PssFleetDataClient(fleet_data_api.url.rstrip("/"))
+
+        collection_metadata = await client.upload_collection(file_path)
+        with pytest.raises(NonUniqueTimestampError):
+            await client.upload_collection(file_path)
+        updated_collection_metadata = await client.update_collection(collection_metadata.collection_id, file_path)
+        most_recent_collection_metadata = await client.get_most_recent_collection_metadata_by_timestamp(datetime(2020, 1, 1, 0, 30))
+
+    assert collection_metadata.collection_id == updated_collection_metadata.collection_id == most_recent_collection_metadata.collection_id
+    assert len(fleet_data_api.collections) == 1
+
+
+@pytest.mark.parametrize(
+    ["profile", "expected_exception"],
+    [
+        pytest.param(FaultProfile(throttle_rate=1.0), TooManyRequestsError, id="throttle"),
+        pytest.param(FaultProfile(conflict_rate=1.0), ConflictError, id="conflict"),
+    ],
+)
+async def test_fleet_data_api_stand_in_faults(profile: FaultProfile, expected_exception: type[Exception], tmp_path: Path):
+    file_path = tmp_path / "collection.json"
+    file_path.write_text(create_collection_content(datetime(2020, 1, 1), 1000))
+
+    with FleetDataApiStandIn(FaultInjector(profile, seed=0)) as fleet_data_api:
+        client = PssFleetDataClient(fleet_data_api.url.rstrip("/"))
+
+        with pytest.raises(expected_exception):
+            await client.upload_collection(file_path)
+
+
+async def test_run_benchmark_over_http(tmp_path: Path):
+    options = BenchmarkOptions(mode=MODE_BULK, transport=TRANSPORT_HTTP, file_count=3, file_size=500)
+
+    report = await run_benchmark(options, tmp_path)
+
+    assert report.imported_count == 3
+    assert report.failed_count == 0